@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark of case study matching on a large synthetic settings table.
+
+Runs the indexed matchCaseStudies / getTopCaseStudiesForIssues from
+index.html against the scan-and-sort versions they replaced, under Node.js,
+over the same prospects' issue sets, and checks both return identical
+studies in identical order.
+
+Usage:
+    python benchmarks/case_studies.py [--studies 400] [--prospects 500] [--calls 6] [--seed 1]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+import cro_scoring  # noqa: E402
+
+# Matching as it was before case studies were indexed
+REFERENCE_MATCHING_JS = '''
+function referenceMatchCaseStudies(issues) {
+    const caseStudies = getCaseStudies();
+    const matched = [];
+    const usedClients = new Set();
+    for (const cs of caseStudies) {
+        if (matched.length >= 3) break;
+        const hasMatch = cs.triggerIssues.some(ti => issues.includes(ti));
+        if (hasMatch && !usedClients.has(cs.clientName)) {
+            matched.push(cs);
+            usedClients.add(cs.clientName);
+        }
+    }
+    return matched;
+}
+
+function referenceGetTopCaseStudiesForIssues(issues) {
+    const studies = getCaseStudies().filter(s => s.active && s.emailSnippet);
+    const scored = studies.map(s => ({
+        ...s,
+        relevance: s.triggerIssues.filter(t => issues.includes(t)).length
+    }));
+    scored.sort((a, b) => b.relevance - a.relevance);
+    const seen = new Set();
+    const top = [];
+    for (const s of scored) {
+        if (top.length >= 3) break;
+        if (s.relevance > 0 && !seen.has(s.clientName)) { seen.add(s.clientName); top.push(s); }
+    }
+    if (top.length < 3) {
+        for (const s of studies) {
+            if (top.length >= 3) break;
+            if (!seen.has(s.clientName)) { seen.add(s.clientName); top.push(s); }
+        }
+    }
+    return top;
+}
+'''
+
+MATCHING_DECLARATIONS = ('getCaseStudies', 'CASE_STUDY_CACHE_LIMIT', 'caseStudyIndex', 'invalidateCaseStudyIndex',
+                         'newBitset', 'setBit', 'popcount32', 'forEachBit', 'getCaseStudyIndex', 'caseStudyIssueKey',
+                         'caseStudyQuery', 'cacheCaseStudies', 'matchCaseStudies', 'getTopCaseStudiesForIssues')
+
+# getCaseStudies re-reads the saved list each call, like the page's in-memory store
+NODE_RUNNER = '''
+const [studies, issueSets, calls] = JSON.parse(require('fs').readFileSync(process.argv[2], 'utf8'));
+const DEFAULT_CASE_STUDIES = studies;
+const storageData = { caseStudies: studies };
+function loadAllData() { return storageData; }
+const summary = list => list.map(cs => [cs.id, cs.relevance === undefined ? null : cs.relevance]);
+function time(match, top) {
+    const results = [];
+    const start = process.hrtime.bigint();
+    for (const issues of issueSets) {
+        // Email, WhatsApp and each follow-up step ask for the same issue set
+        for (let c = 1; c < calls; c++) top(issues);
+        results.push([summary(match(issues)), summary(top(issues))]);
+    }
+    return [results, Number(process.hrtime.bigint() - start) / 1e6];
+}
+const [reference, referenceMs] = time(referenceMatchCaseStudies, referenceGetTopCaseStudiesForIssues);
+const [indexed, indexedMs] = time(matchCaseStudies, getTopCaseStudiesForIssues);
+// Editing a study must be picked up once the index is invalidated
+studies.forEach(cs => { cs.triggerIssues.reverse(); cs.active = !cs.active; });
+invalidateCaseStudyIndex();
+const [referenceEdited] = time(referenceMatchCaseStudies, referenceGetTopCaseStudiesForIssues);
+const [indexedEdited] = time(matchCaseStudies, getTopCaseStudiesForIssues);
+process.stdout.write(JSON.stringify({ reference, indexed, referenceEdited, indexedEdited, referenceMs, indexedMs }));
+'''
+
+
+def matching_js(html):
+    return '\n'.join(build_v2.page_declaration(html, name) for name in MATCHING_DECLARATIONS) + REFERENCE_MATCHING_JS
+
+
+def synthetic_studies(n, seed):
+    """A settings table with repeated triggers and clients, inactive rows and empty snippets."""
+    rng = random.Random(seed)
+    issues = list(cro_scoring.FINDING_REGISTRY) + ['custom_issue_a', 'custom_issue_b']
+    clients = [f'Client {i}' for i in range(max(1, n // 3))]
+    studies = []
+    for i in range(n):
+        triggers = rng.sample(issues, rng.randint(0, 4))
+        if triggers and rng.random() < 0.1:
+            triggers.append(rng.choice(triggers))
+        studies.append({
+            'id': f'cs_{i}', 'clientName': rng.choice(clients), 'triggerIssues': triggers,
+            'emailSnippet': '' if rng.random() < 0.1 else f'Snippet {i}', 'active': rng.random() < 0.9,
+        })
+    return studies
+
+
+def synthetic_issue_sets(n, seed):
+    """Issue lists as prospects produce them: some repeat, some carry duplicates or unknown issues."""
+    rng = random.Random(seed)
+    issues = list(cro_scoring.FINDING_REGISTRY) + ['not_a_trigger']
+    sets = []
+    for _ in range(n):
+        if sets and rng.random() < 0.3:
+            sets.append(list(rng.choice(sets)))
+            continue
+        picked = rng.sample(issues, rng.randint(0, 10))
+        if picked and rng.random() < 0.2:
+            picked.append(picked[0])
+        sets.append(picked)
+    return sets
+
+
+def run(html, studies, issue_sets, calls=1):
+    node = shutil.which('node')
+    if node is None:
+        raise SystemExit("node is required to run the matchers")
+    with tempfile.TemporaryDirectory() as tmp:
+        script_path = os.path.join(tmp, 'case_studies.js')
+        data_path = os.path.join(tmp, 'data.json')
+        with open(script_path, 'w') as f:
+            f.write(matching_js(html) + NODE_RUNNER)
+        with open(data_path, 'w') as f:
+            json.dump([studies, issue_sets, calls], f)
+        result = subprocess.run([node, script_path, data_path], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the indexed case study matching.')
+    parser.add_argument('--studies', type=int, default=400, help='case studies in the settings table (default: 400)')
+    parser.add_argument('--prospects', type=int, default=500, help='issue sets to match (default: 500)')
+    parser.add_argument('--calls', type=int, default=6, help='lookups per prospect (default: 6)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    studies = synthetic_studies(args.studies, args.seed)
+    issue_sets = synthetic_issue_sets(args.prospects, args.seed)
+    out = run(html, studies, issue_sets, args.calls)
+
+    print(f"{args.studies} case studies, {args.prospects} prospects, {args.calls} lookups each")
+    print(f"  scan and sort per call: {out['referenceMs']:8.2f} ms")
+    print(f"  indexed and cached:     {out['indexedMs']:8.2f} ms ({out['referenceMs'] / out['indexedMs']:.1f}x)")
+    if out['reference'] != out['indexed'] or out['referenceEdited'] != out['indexedEdited']:
+        raise SystemExit("MISMATCH: indexed matching differs from the reference")
+    print(f"  results identical on all {args.prospects} prospects, before and after an edit")
+
+
+if __name__ == '__main__':
+    main()
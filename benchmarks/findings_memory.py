@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Benchmark of Flow A extraction memory on a large synthetic audit deck.
+
+Runs parsePDF (against a stand-in pdf.js serving the deck's pages) and
+extractFindings from index.html against the versions they replaced, which
+kept a copy of every page's text, lowercased the whole deck and returned it
+as rawText. Each version runs in its own Node.js process with --expose-gc;
+live heap is sampled after a full collection at every progress update, when
+deck-sized text is first scanned and after every copy of it. The report
+gives the peak and the heap the findings still hold, both above what was
+live before extraction started, and checks both versions find the same
+things.
+
+Usage:
+    python benchmarks/findings_memory.py [--pages 300] [--words 400] [--seed 1]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+from benchmarks.title_matcher import FILLER  # noqa: E402
+
+SHARED_DECLARATIONS = ('TITLE_ISSUE_MAP', 'TITLE_ISSUE_MATCHER', 'SECTION_DIVIDERS', 'OBSERVATION_SECTIONS',
+                       'titleIssueTable', 'titleIssueMatcherTable')
+PAGE_DECLARATIONS = ('EVIDENCE_CHARS', 'matchIssueEntries', 'matchIssuesFromText', 'matchIssueSpans',
+                     'matchPageIssues', 'evidenceSnippet', 'createIssueRecord', 'forEachPageRange',
+                     'findLowercaseTerms', 'createFindingsExtractor', 'extractFindings', 'finishFindings',
+                     'parsePDF')
+# Findings fields only one version has
+COMPACT_FIELDS = ('rawText', 'evidence')
+
+# Extraction as it was before it worked over one deck text with page ranges
+REFERENCE_EXTRACTION_JS = r'''
+function matchIssuesFromText(txt) {
+    var tl = txt.toLowerCase();
+    var table = titleIssueMatcherTable();
+    var seen = [], hits = [], matched = [];
+    var state = 0;
+    for (var i = 0; i < tl.length; i++) {
+        var code = tl.charCodeAt(i);
+        state = table.delta[state * table.width + (code < 128 ? table.classes[code] : 0)];
+        var found = table.out[state];
+        if (!found) continue;
+        for (var fi = 0; fi < found.length; fi++) {
+            var k = found[fi];
+            if (seen[k]) continue;
+            seen[k] = true;
+            var entries = TITLE_ISSUE_MATCHER.entries[k];
+            for (var ei = 0; ei < entries.length; ei++) {
+                var e = entries[ei];
+                hits[e] = (hits[e] || 0) + 1;
+                if (hits[e] === TITLE_ISSUE_MATCHER.need[e]) matched.push(e);
+            }
+        }
+    }
+    matched.sort(function(a, b) { return a - b; });
+    return matched.map(function(e) { return TITLE_ISSUE_MAP[e].issue; });
+}
+
+function matchPageIssues(pg) {
+    // Extract "title" — first significant line (> 20 chars, not just a label)
+    var lines = pg.text.split('\n').map(function(l) { return l.trim(); }).filter(function(l) { return l.length > 15; });
+    var title = lines.length > 0 ? lines[0] : '';
+
+    // Pass 1: Match title
+    var titleMatches = matchIssuesFromText(title);
+    if (titleMatches.length > 0) return titleMatches;
+
+    // Pass 2: Title didn't match, scan observation text
+    var matched = [];
+    // Extract text between "Observation" and "Recommendation" headers
+    var obsMatch = pg.text.match(/observations?[\s\S]*?(?=recommendations?|recommendation\/hypothesis|$)/i);
+    var obsText = obsMatch ? obsMatch[0] : '';
+    // Also try the "(Issue/observation)" format from performance slides
+    if (!obsText || obsText.length < 30) {
+        var issueObsMatch = pg.text.match(/\(issue\/observation\)[\s\S]*?(?=recommendation|$)/i);
+        if (issueObsMatch) obsText = issueObsMatch[0];
+    }
+    if (obsText && obsText.length > 20) {
+        matched = matched.concat(matchIssuesFromText(obsText));
+    }
+    // Pass 3: Also try full page text for shorter pages (Theme Architecture detail slides)
+    if (obsText.length < 30 && pg.text.length < 500) {
+        matched = matched.concat(matchIssuesFromText(pg.text));
+    }
+    return matched;
+}
+
+function createFindingsExtractor() {
+    var pages = [];
+    var issueSet = new Set();
+    var currentSection = 'INTRO';
+
+    function addPage(text) {
+        // Check if this page is a section divider
+        var pageText = text.trim();
+        var isDivider = false;
+        for (var si = 0; si < SECTION_DIVIDERS.length; si++) {
+            if (SECTION_DIVIDERS[si].pattern.test(pageText)) {
+                currentSection = SECTION_DIVIDERS[si].section;
+                isDivider = true;
+                break;
+            }
+        }
+        var pg = { num: pages.length + 1, text: text, section: currentSection, isDivider: isDivider };
+        pages.push(pg);
+        // Section-aware: only observation section pages carry issues
+        if (!isDivider && OBSERVATION_SECTIONS.indexOf(pg.section) !== -1) {
+            matchPageIssues(pg).forEach(function(issue) { issueSet.add(issue); });
+        }
+        return pg;
+    }
+
+    return {
+        addPage: addPage,
+        issueCount: function() { return issueSet.size; },
+        finish: function(text, fileName) {
+            // No pages fed — treat entire text as one page
+            var hasMarkers = pages.length > 0;
+            if (!hasMarkers) addPage(text);
+            return finishFindings(text, fileName, pages, hasMarkers, issueSet);
+        }
+    };
+}
+
+function extractFindings(text, fileName) {
+    var extractor = createFindingsExtractor();
+    // ---- STEP 1: Split text into pages/slides ----
+    var pageChunks = text.split(/---\s*(?:PAGE|SLIDE)\s*\d+\s*---/i);
+    for (var i = 1; i < pageChunks.length; i++) {
+        extractor.addPage(pageChunks[i]);
+    }
+    return extractor.finish(text, fileName);
+}
+
+function finishFindings(text, fileName, pages, hasMarkers, issueSet) {
+    var t = text.toLowerCase();
+    var findings = {
+        brandName: '',
+        websiteUrl: '',
+        mobilePS: null,
+        desktopPS: null,
+        industry: '',
+        issues: [],
+        competitors: [],
+        auditedSections: [],
+        rawText: text
+    };
+
+    // Track which sections were found
+    var foundSections = new Set();
+    for (var fi = 0; fi < pages.length; fi++) {
+        foundSections.add(pages[fi].section);
+    }
+    if (foundSections.has('PERFORMANCE')) findings.auditedSections.push('performance');
+    if (foundSections.has('UX_OBS')) findings.auditedSections.push('ux');
+    if (foundSections.has('THEME_OBS')) findings.auditedSections.push('theme');
+    if (foundSections.has('HEURISTICS_OBS')) findings.auditedSections.push('heuristics');
+    if (foundSections.has('ANALYTICS')) findings.auditedSections.push('analytics_info');
+
+    // ---- STEP 3: Brand name extraction (unchanged — reliable) ----
+    if (fileName) {
+        var fn = fileName.replace(/\.(pdf|pptx|ppt)$/i, '');
+        var fnPatterns = [
+            /^(.+?)\s*[-–—]\s*(?:cro|audit|website|conversion|technical)/i,
+            /(?:cro|audit|website|conversion|technical).+?[-–—]\s*(.+?)$/i,
+            /^(.+?)\s*[-–—]/
+        ];
+        for (var fp = 0; fp < fnPatterns.length; fp++) {
+            var m = fn.match(fnPatterns[fp]);
+            if (m) {
+                var candidate = m[1].trim();
+                if (!/growisto/i.test(candidate) && candidate.length > 1 && candidate.length < 50) {
+                    findings.brandName = candidate;
+                    break;
+                }
+            }
+        }
+    }
+    if (!findings.brandName) {
+        var brandPatterns = [
+            /(?:cro\s+audit|audit\s+report|analysis)\s+(?:for\s+|[-–—]\s*)([A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-]+)?)/i,
+            /^---\s*(?:PAGE|SLIDE)\s*1\s*---\s*(?:.*?[\u00d7×]\s*)?([A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-]+)?)/m,
+            /GROWISTO\s*[\u00d7×]\s*([A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-]+)?)/
+        ];
+        for (var bp = 0; bp < brandPatterns.length; bp++) {
+            var bm = text.match(brandPatterns[bp]);
+            if (bm) {
+                var bc = bm[1].trim();
+                if (!/^growisto$/i.test(bc)) { findings.brandName = bc; break; }
+            }
+        }
+    }
+    if (!findings.brandName) {
+        var stopWords = new Set(['the','and','for','are','but','not','you','all','can','had','her','was','one','our','out','has','its','this','that','with','will','from','they','been','have','many','some','them','than','each','make','like','long','look','very','after','into','more','also','most','want','what','your','when','just','make','know','back','only','come','could','same','over','take','other','about','should','would','which','there','their','these','those','being','through','where','before','between','under','again','page','slide','audit','cro','shopify','website','mobile','desktop','google','analytics','speed','score','above','below','using','present','missing','recommended','add','implement','ensure','improve','update','current','status','data','growisto','observation','recommendation','conversion','strategy','roadmap','implementation','growth','technical']);
+        var words = text.match(/[A-Z][a-zA-Z']+(?:\s+[A-Z][a-zA-Z']+)*/g) || [];
+        var freq = {};
+        for (var wi = 0; wi < words.length; wi++) {
+            var wl = words[wi].toLowerCase();
+            if (wl.length > 2 && !stopWords.has(wl) && !/growisto/i.test(words[wi])) {
+                freq[words[wi]] = (freq[words[wi]] || 0) + 1;
+            }
+        }
+        var bestWord = '', bestCount = 0;
+        for (var fw in freq) {
+            if (freq[fw] > bestCount && freq[fw] >= 3) { bestWord = fw; bestCount = freq[fw]; }
+        }
+        if (bestWord) findings.brandName = bestWord;
+    }
+    if (findings.brandName && /^growisto$/i.test(findings.brandName.trim())) {
+        findings.brandName = '';
+    }
+
+    // ---- STEP 4: PageSpeed extraction (PERFORMANCE section only) ----
+    var perfText = '';
+    for (var psi = 0; psi < pages.length; psi++) {
+        if (pages[psi].section === 'PERFORMANCE') perfText += '\n' + pages[psi].text;
+    }
+    // Also include INTRO pages for cases where performance data is on early pages
+    var introText = '';
+    for (var ini = 0; ini < pages.length; ini++) {
+        if (pages[ini].section === 'INTRO') introText += '\n' + pages[ini].text;
+    }
+    var psSearchText = hasMarkers ? perfText : text;
+    if (psSearchText) {
+        // Specific "Score: XX/100" format from PDF performance boxes
+        var mpsMatch = psSearchText.match(/mobile\s+performance[\s\S]{0,200}?score[:\s]*(\d{1,2})\/100/i);
+        if (!mpsMatch) mpsMatch = psSearchText.match(/score[:\s]*(\d{1,2})\/100[\s\S]{0,50}?mobile/i);
+        if (!mpsMatch) mpsMatch = psSearchText.match(/mobile\s*(?:page\s*speed|pagespeed|psi|speed\s*score)[:\s]*(\d{1,3})/i);
+        if (!mpsMatch) mpsMatch = psSearchText.match(/(\d{1,2})\/100[\s\S]{0,100}?mobile/i);
+        if (mpsMatch) {
+            var mpsVal = parseInt(mpsMatch[1]);
+            if (mpsVal > 0 && mpsVal < 100) findings.mobilePS = mpsVal;
+        }
+        var dpsMatch = psSearchText.match(/desktop\s+performance[\s\S]{0,200}?score[:\s]*(\d{1,2})\/100/i);
+        if (!dpsMatch) dpsMatch = psSearchText.match(/score[:\s]*(\d{1,2})\/100[\s\S]{0,50}?desktop/i);
+        if (!dpsMatch) dpsMatch = psSearchText.match(/desktop\s*(?:page\s*speed|pagespeed|psi|speed\s*score)[:\s]*(\d{1,3})/i);
+        if (!dpsMatch) dpsMatch = psSearchText.match(/(\d{1,2})\/100[\s\S]{0,100}?desktop/i);
+        if (dpsMatch) {
+            var dpsVal = parseInt(dpsMatch[1]);
+            if (dpsVal > 0 && dpsVal < 100) findings.desktopPS = dpsVal;
+        }
+        // Also try competition table: brand name row with mobile page speed score
+        if (!findings.mobilePS && findings.brandName) {
+            var brandLc = findings.brandName.toLowerCase();
+            var compTableMatch = psSearchText.match(new RegExp(brandLc.replace(/[.*+?^${}()|[\]\\]/g, '\\$&') + '[\\s\\S]{0,100}?(\\d{1,2})(?:\\s|$)', 'i'));
+            if (compTableMatch) {
+                var ctVal = parseInt(compTableMatch[1]);
+                if (ctVal > 0 && ctVal < 100) findings.mobilePS = ctVal;
+            }
+        }
+    }
+
+    // ---- STEP 5: URL extraction (INTRO + PERFORMANCE sections only) ----
+    var urlSearchText = hasMarkers ? (introText + '\n' + perfText) : text;
+    // Prefer URL that matches brand name
+    var brandSlug = findings.brandName ? findings.brandName.toLowerCase().replace(/[^a-z0-9]/g, '') : '';
+    var allUrls = urlSearchText.match(/(?:https?:\/\/)?(?:www\.)?([a-zA-Z0-9-]+\.(?:com|in|co\.in|io|net|org|co)(?:\/[^\s]*)?)/gi) || [];
+    var brandUrl = null;
+    var firstNonGrowistoUrl = null;
+    for (var ui = 0; ui < allUrls.length; ui++) {
+        var cleanUrl = allUrls[ui].replace(/^https?:\/\//i, '').replace(/^www\./i, '').replace(/\/+$/, '');
+        if (/growisto/i.test(cleanUrl)) continue;
+        if (!firstNonGrowistoUrl) firstNonGrowistoUrl = cleanUrl;
+        if (brandSlug && cleanUrl.toLowerCase().replace(/[^a-z0-9]/g, '').includes(brandSlug)) {
+            brandUrl = cleanUrl;
+            break;
+        }
+    }
+    findings.websiteUrl = brandUrl || firstNonGrowistoUrl || '';
+
+    // ---- STEP 6: Industry detection (full text) ----
+    if (t.includes('skincare') || t.includes('beauty') || t.includes('cosmetic') || t.includes('skin care')) findings.industry = 'skincare';
+    else if (t.includes('fashion') || t.includes('apparel') || t.includes('clothing')) findings.industry = 'fashion';
+    else if (t.includes('electronics') || t.includes('gadget') || t.includes('earbuds') || t.includes('headphone') || t.includes('speaker')) findings.industry = 'electronics';
+    else if (t.includes('health') || t.includes('wellness') || t.includes('supplement') || t.includes('ayurved') || t.includes('pharma')) findings.industry = 'health';
+    else if (t.includes('food') || t.includes('beverage') || t.includes('coffee') || t.includes('tea') || t.includes('chai')) findings.industry = 'food';
+    else if (t.includes('jewel') || t.includes('accessor')) findings.industry = 'jewelry';
+    else if (t.includes('water') || t.includes('filter') || t.includes('purif')) findings.industry = 'home';
+    else if (t.includes('motorcycle') || t.includes('auto') || t.includes('bike')) findings.industry = 'automotive';
+
+    // ---- STEP 7: Issue detection ----
+    // Observation pages were matched as they were added
+    if (!hasMarkers) {
+        // No markers — fallback: scan full text with keyword matching (minus GA4/SEO)
+        var fallbackMatches = matchIssuesFromText(text);
+        for (var fbi = 0; fbi < fallbackMatches.length; fbi++) {
+            issueSet.add(fallbackMatches[fbi]);
+        }
+    }
+
+    // Convert Set to array
+    findings.issues = Array.from(issueSet);
+
+    // ---- STEP 8: Competitor extraction ----
+    var knownBrands = ['Nykaaman', 'Nykaa', 'Dermaco', 'WOW', 'Mamaearth', 'Minimalist', 'Plum', 'mCaffeine',
+        'Sugar', 'Lakme', 'Biotique', 'Khadi', 'Forest Essentials', 'Kama Ayurveda', 'Boat', 'JBL', 'Pebble',
+        'VPLAK', 'Access', 'Noise', 'boAt', 'Pilgrim', 'Kaya'];
+    for (var bi = 0; bi < knownBrands.length; bi++) {
+        if (t.includes(knownBrands[bi].toLowerCase()) && findings.brandName.toLowerCase() !== knownBrands[bi].toLowerCase()) {
+            findings.competitors.push(knownBrands[bi]);
+        }
+    }
+
+    return findings;
+}
+
+async function parsePDF(file) {
+    const [arrayBuffer, pdfSrc] = await Promise.all([file.arrayBuffer(), loadVendorScript('pdfjs')]);
+    const worker = VENDOR_SCRIPTS.pdfjsWorker;
+    pdfjsLib.GlobalWorkerOptions.workerSrc = pdfSrc === VENDOR_SCRIPTS.pdfjs.src ? worker.src : worker.cdn;
+    const pdf = await pdfjsLib.getDocument({ data: arrayBuffer }).promise;
+    const numPages = pdf.numPages;
+    const extractor = createFindingsExtractor();
+    const pageTexts = new Array(numPages);
+    let nextPage = 1, parsed = 0, fed = 0;
+
+    updateProgress(20, 'Parsing PDF (' + numPages + ' pages)...');
+
+    // Up to 4 pages in flight at once; results are fed to the extractor in page order
+    async function readPages() {
+        while (nextPage <= numPages) {
+            const i = nextPage++;
+            const page = await pdf.getPage(i);
+            const content = await page.getTextContent();
+            page.cleanup();
+            pageTexts[i - 1] = content.items.map(item => item.str).join(' ');
+            parsed++;
+            while (fed < numPages && pageTexts[fed] !== undefined) {
+                // Same framing extractFindings sees when splitting the joined text
+                extractor.addPage('\n' + pageTexts[fed] + (fed < numPages - 1 ? '\n' : ''));
+                fed++;
+            }
+            updateProgress(20 + Math.round((parsed / numPages) * 70),
+                'Parsed ' + parsed + ' of ' + numPages + ' pages, ' + extractor.issueCount() + ' issues found...');
+        }
+    }
+    await Promise.all(Array.from({ length: Math.min(4, numPages) }, readPages));
+
+    const fullText = pageTexts.map((pageText, i) => '\n--- PAGE ' + (i + 1) + ' ---\n' + pageText).join('');
+    return extractor.finish(fullText, file.name);
+}
+'''
+
+NODE_RUNNER = '''
+const fs = require('fs');
+const { pages, fileName } = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'));
+const mode = process.argv[3];
+// Strings at least this long are deck-sized (no single page comes close)
+const LARGE = 16 * 1024;
+let peak = 0, sampling = false;
+function liveHeap() {
+    global.gc();
+    return process.memoryUsage().heapUsed;
+}
+function sample() {
+    if (sampling) return;
+    sampling = true;
+    peak = Math.max(peak, liveHeap());
+    sampling = false;
+}
+// Sample when a deck-sized string is first scanned or sliced, and after every
+// operation copying one (with the copy still live)
+const scanned = new Set();
+function sampleScan(text) {
+    if (typeof text !== 'string' || text.length < LARGE || scanned.has(text.length)) return;
+    scanned.add(text.length);
+    sample();
+}
+for (const name of ['toLowerCase', 'split', 'match', 'includes', 'slice']) {
+    const original = String.prototype[name];
+    const copies = name !== 'includes' && name !== 'slice';
+    String.prototype[name] = function() {
+        sampleScan(String(this));
+        const result = original.apply(this, arguments);
+        if (copies && this.length >= LARGE) sample();
+        return result;
+    };
+}
+const exec = RegExp.prototype.exec;
+RegExp.prototype.exec = function(text) {
+    sampleScan(text);
+    return exec.apply(this, arguments);
+};
+function updateProgress() { sample(); }
+var VENDOR_SCRIPTS = { pdfjs: { src: 'pdf.min.js' }, pdfjsWorker: { src: 'pdf.worker.min.js', cdn: 'pdf.worker.min.js' } };
+async function loadVendorScript(name) { return VENDOR_SCRIPTS[name].src; }
+// pdf.js stand-in: each page's text content is its words as separate items
+var pdfjsLib = { GlobalWorkerOptions: {}, getDocument: () => ({ promise: Promise.resolve({
+    numPages: pages.length,
+    getPage: async i => ({
+        getTextContent: async () => ({ items: pages[i - 1].split(' ').map(str => ({ str })) }),
+        cleanup() {}
+    })
+}) }) };
+// The text parsePPTX returns for the same deck, dropped once extraction returns
+function extractSlides() {
+    const text = pages.map((page, i) => '\\n--- SLIDE ' + (i + 1) + ' ---\\n' + page).join('');
+    return extractFindings(text, fileName);
+}
+(async () => {
+    const base = liveHeap();
+    peak = base;
+    const findings = mode === 'pdf'
+        ? await parsePDF({ name: fileName, arrayBuffer: async () => new ArrayBuffer(0) })
+        : extractSlides();
+    const after = liveHeap();
+    peak = Math.max(peak, after);
+    process.stdout.write(JSON.stringify({ peak: peak - base, retained: after - base, findings: findings }));
+})();
+'''
+
+MODES = (('pdf', 'parsePDF'), ('text', 'extractFindings'))
+SECTIONS = (('UX Insights', 0.5), ('Theme Architecture', 0.2), ('Heuristics Review', 0.3))
+
+
+def synthetic_deck(html, pages, words, seed):
+    """Page texts of a `pages`-page audit: intro, performance and observation sections, case studies."""
+    _, entries = build_v2.parse_title_issue_map(html)
+    rng = random.Random(seed)
+    filler = lambda n: ' '.join(rng.choice(FILLER) for _ in range(n))
+    deck = ['Acme Skin GROWISTO × Acme Skin CRO Audit for Acme Skin https://www.acmeskin.com skincare',
+            'Performance Insights',
+            'Mobile Performance Score: 38/100 ' + filler(words // 2),
+            'Desktop Performance Score: 71/100 ' + filler(words // 2)]
+    closing = ['Proven Results', 'Mamaearth ' + filler(words), 'Plum ' + filler(words), 'They trust us']
+    observations = pages - len(deck) - len(closing) - len(SECTIONS)
+    for si, (name, share) in enumerate(SECTIONS):
+        deck.append(name)
+        # The last section takes whatever is left over
+        count = round(observations * share) if si < len(SECTIONS) - 1 else pages - len(deck) - len(closing)
+        for _ in range(max(1, count)):
+            keywords, _ = rng.choice(entries)
+            # Most titles name an issue; the rest leave it to the observation text
+            title = ' '.join(keywords) + ' ' + filler(4) if rng.random() < 0.7 else filler(6)
+            body = filler(words // 2)
+            if rng.random() < 0.3:
+                body += ' ' + ' '.join(rng.choice(entries)[0])
+            deck.append(title + '\n' + 'Observation: ' + body + '\n' + 'Recommendation: ' + filler(words // 2))
+    deck += closing
+    return deck[:pages]
+
+
+def script(html, mode):
+    shared = '\n'.join(build_v2.page_declaration(html, name) for name in SHARED_DECLARATIONS)
+    if mode == 'reference':
+        return shared + REFERENCE_EXTRACTION_JS + NODE_RUNNER
+    return shared + '\n'.join(build_v2.page_declaration(html, name) for name in PAGE_DECLARATIONS) + NODE_RUNNER
+
+
+def run(html, deck, file_name='Acme Skin - CRO Audit.pdf'):
+    """{mode: {'reference': result, 'page': result}} with each result's peak/retained bytes and findings."""
+    node = shutil.which('node')
+    if node is None:
+        raise SystemExit("node is required to run the extractors")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        deck_path = os.path.join(tmp, 'deck.json')
+        with open(deck_path, 'w') as f:
+            json.dump({'pages': deck, 'fileName': file_name}, f)
+        for version in ('reference', 'page'):
+            script_path = os.path.join(tmp, version + '.js')
+            with open(script_path, 'w') as f:
+                f.write(script(html, version))
+            for mode, _ in MODES:
+                result = subprocess.run([node, '--expose-gc', script_path, deck_path, mode],
+                                        capture_output=True, text=True, check=True)
+                results.setdefault(mode, {})[version] = json.loads(result.stdout)
+    return results
+
+
+def comparable(findings):
+    return {key: value for key, value in findings.items() if key not in COMPACT_FIELDS}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure Flow A extraction heap use.')
+    parser.add_argument('--pages', type=int, default=300, help='synthetic deck size (default: 300)')
+    parser.add_argument('--words', type=int, default=400, help='words per observation page (default: 400)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    deck = synthetic_deck(html, args.pages, args.words, args.seed)
+    results = run(html, deck)
+
+    kb = lambda n: n / 1024
+    issues = len(results['pdf']['page']['findings']['issues'])
+    print(f"{len(deck)} pages, {kb(sum(map(len, deck))):.0f} KB of deck text, {issues} issues found")
+    mismatch = False
+    for mode, label in MODES:
+        ref, cur = results[mode]['reference'], results[mode]['page']
+        print(f"  {label + ':':17} peak {kb(ref['peak']):7.0f} KB -> {kb(cur['peak']):7.0f} KB "
+              f"({100 * (1 - cur['peak'] / ref['peak']):.0f}% less), "
+              f"retained {kb(ref['retained']):7.0f} KB -> {kb(cur['retained']):5.0f} KB")
+        mismatch = mismatch or comparable(ref['findings']) != comparable(cur['findings'])
+    if mismatch:
+        raise SystemExit("MISMATCH: findings differ from the reference")
+    evidence = results['pdf']['page']['findings']['evidence']
+    print(f"  findings identical apart from rawText; {len(evidence)} evidence snippets of "
+          f"{max(len(e['text']) for e in evidence)} chars at most")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for build_v2.py and the generated page.
+
+The build side times each build phase against a synthetic v1 template (every
+patch anchor, padded with page text) at 1x, 10x and 100x its size, plus the
+phases that run on the built page. The page side runs functions copied out
+of index.html under Node.js: extractFindings and matchIssuesFromText on
+synthetic decks of 10 to 500 pages, and calculateEstimatedCROScore and the
+message generators on issue sets of every size.
+
+Results are written as JSON; compare flags benchmarks whose median time
+grew by more than the threshold against a saved baseline.
+
+Usage:
+    python benchmarks/suite.py run [-o benchmarks/latest.json] [--quick] [--only build|page]
+    python benchmarks/suite.py compare BASELINE.json [CURRENT.json] [--threshold 0.15]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+import cro_scoring  # noqa: E402
+import release  # noqa: E402
+from benchmarks import title_matcher  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(ROOT, 'benchmarks', 'latest.json')
+TEMPLATE_SCALES = (1, 10, 100)
+DECK_PAGES = (10, 50, 100, 500)
+ISSUE_SETS_PER_SIZE = 40
+# Timed runs per benchmark; the 100x template gets fewer
+REPEAT = {'full': 7, 'quick': 3}
+
+EXTRACTION_DECLARATIONS = (
+    'TITLE_ISSUE_MAP', 'TITLE_ISSUE_MATCHER', 'SECTION_DIVIDERS', 'OBSERVATION_SECTIONS', 'EVIDENCE_CHARS',
+    'titleIssueTable', 'titleIssueMatcherTable', 'matchIssueEntries', 'matchIssuesFromText', 'matchIssueSpans',
+    'matchPageIssues', 'evidenceSnippet', 'createIssueRecord', 'forEachPageRange', 'findLowercaseTerms',
+    'createFindingsExtractor', 'extractFindings', 'finishFindings',
+)
+GENERATOR_DECLARATIONS = (
+    'DEFAULT_CASE_STUDIES', 'DEFAULT_CLIENT_NAMES', 'FINDING_REGISTRY', 'getCaseStudies',
+    'getClientNamesForIndustry', 'CASE_STUDY_CACHE_LIMIT', 'caseStudyIndex', 'invalidateCaseStudyIndex',
+    'newBitset', 'setBit', 'popcount32', 'forEachBit', 'getCaseStudyIndex', 'caseStudyIssueKey', 'caseStudyQuery',
+    'cacheCaseStudies', 'getTopCaseStudiesForIssues', 'scoreFindingsByImpact', 'newScoreTally', 'tallyIssue',
+    'scoreFromTally', 'calculateEstimatedCROScore', 'ANALYSIS_STATS', 'currentAnalysis', 'analysisSignature',
+    'getAnalysis', 'MESSAGE_TEMPLATES', 'renderTemplate', 'scoreBand', 'generateSmartBullets', 'generateEmail',
+    'generateWhatsApp', 'generateFollowUpSequence',
+)
+
+# Each benchmark is [name, function, inputs]; a run calls the function on every input
+NODE_RUNNER = '''
+function loadAllData() {
+    return { caseStudies: DEFAULT_CASE_STUDIES, clientNames: DEFAULT_CLIENT_NAMES };
+}
+const { decks, issueSets, repeat } = JSON.parse(require('fs').readFileSync(process.argv[2], 'utf8'));
+const benches = [];
+for (const [pages, text, blocks] of decks) {
+    benches.push(['page.extractFindings@' + pages + 'p', t => extractFindings(t, 'Bench - CRO Audit.pdf'), [text]]);
+    benches.push(['page.matchIssuesFromText@' + pages + 'p', matchIssuesFromText, blocks]);
+}
+for (const [size, sets] of issueSets) {
+    const data = sets.map(issues => ({
+        brandName: 'Bench', websiteUrl: 'https://bench.example', recipientName: 'Asha', senderName: 'Ravi',
+        mobilePS: 45, desktopPS: 80, industry: 'fashion', clientType: 'new', issues: issues
+    }));
+    benches.push(['page.calculateEstimatedCROScore@' + size + 'issues', d => calculateEstimatedCROScore(d.issues, d), data]);
+    // One generate click: email, WhatsApp and the follow-up sequence
+    benches.push(['page.generators@' + size + 'issues', d => [generateEmail(d), generateWhatsApp(d), generateFollowUpSequence(d)], data]);
+}
+const results = {};
+for (const [name, fn, inputs] of benches) {
+    inputs.forEach(input => fn(input));  // warm up
+    const runs = [];
+    for (let r = 0; r < repeat; r++) {
+        currentAnalysis = null;
+        const start = process.hrtime.bigint();
+        for (const input of inputs) fn(input);
+        runs.push(Number(process.hrtime.bigint() - start) / 1e6);
+    }
+    results[name] = runs;
+}
+process.stdout.write(JSON.stringify(results));
+'''
+
+
+def read_page():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        return f.read()
+
+
+def summarize(runs):
+    return {'unit': 'ms', 'runs': [round(r, 4) for r in runs],
+            'median': round(statistics.median(runs), 4), 'min': round(min(runs), 4)}
+
+
+def time_phase(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return runs
+
+
+# ===========================
+# BUILD
+# ===========================
+def synthetic_template(html, scale=1):
+    """A v1-shaped template: every anchor as often as its patch expects, inside `scale` copies of filler."""
+    filler = html
+    changed = True
+    while changed:
+        changed = False
+        for p in build_v2.PATCHES:
+            if p.anchor in filler:
+                filler = filler.replace(p.anchor, '')
+                changed = True
+    anchors = ''.join('\n<!-- anchor -->\n' + p.anchor for p in build_v2.PATCHES for _ in range(p.count))
+    half = len(filler) // 2
+    return filler * (scale - 1) + filler[:half] + anchors + '\n' + filler[half:]
+
+
+def build_benchmarks(html, mode):
+    repeat = REPEAT[mode]
+    results = {}
+    scales = TEMPLATE_SCALES if mode == 'full' else TEMPLATE_SCALES[:2]
+    for scale in scales:
+        template = synthetic_template(html, scale)
+        n = repeat if scale < 100 else max(2, repeat // 2)
+        results[f'build.template_digest@{scale}x'] = time_phase(lambda: build_v2.digest(template), n)
+        results[f'build.anchor_scan@{scale}x'] = time_phase(lambda: build_v2.index_anchors(template, build_v2.PATCHES), n)
+        results[f'build.stage1@{scale}x'] = time_phase(lambda: build_v2.apply_patches(template, build_v2.PATCHES), n)
+    # Phases that read the built page
+    results['build.patch_set_digest'] = time_phase(lambda: build_v2.patch_set_digest(build_v2.PATCHES), repeat)
+    results['build.stage2'] = time_phase(
+        lambda: build_v2.apply_patches(html, [build_v2.title_matcher_patch(html)] + build_v2.message_template_patches(html)),
+        repeat)
+    results['build.flowa_worker'] = time_phase(lambda: build_v2.flowa_worker_js(html), repeat)
+    results['build.minify_html'] = time_phase(lambda: release.minify_html(html), repeat)
+    return results
+
+
+# ===========================
+# PAGE (Node.js)
+# ===========================
+def synthetic_decks(html, pages_list, seed):
+    """(pages, full deck text with page markers, title/observation/page blocks) per deck size."""
+    _, entries = build_v2.parse_title_issue_map(html)
+    keywords = sorted({k for kws, _ in entries for k in kws})
+    decks = []
+    for pages in pages_list:
+        blocks = title_matcher.synthetic_blocks(keywords, pages, seed)
+        text = ''.join(f'\n--- PAGE {i + 1} ---\n' + page for i, page in enumerate(blocks[2::3]))
+        decks.append([pages, 'Acme - CRO audit for www.acme.com' + text, blocks])
+    return decks
+
+
+def synthetic_issue_sets(seed, per_size):
+    """For every size from 0 to the whole registry, `per_size` random issue lists."""
+    rng = random.Random(seed)
+    keys = list(cro_scoring.FINDING_REGISTRY)
+    return [[size, [rng.sample(keys, size) for _ in range(per_size)]] for size in range(len(keys) + 1)]
+
+
+def page_script(html):
+    names = list(dict.fromkeys(EXTRACTION_DECLARATIONS + GENERATOR_DECLARATIONS))
+    return '\n'.join(build_v2.page_declaration(html, name) for name in names) + NODE_RUNNER
+
+
+def page_benchmarks(html, mode, seed=1):
+    node = shutil.which('node')
+    if node is None:
+        raise SystemExit("node is required for the page benchmarks (use --only build to skip them)")
+    pages_list = DECK_PAGES if mode == 'full' else DECK_PAGES[:2]
+    payload = {
+        'decks': synthetic_decks(html, pages_list, seed),
+        'issueSets': synthetic_issue_sets(seed, ISSUE_SETS_PER_SIZE if mode == 'full' else 10),
+        'repeat': REPEAT[mode],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        script_path = os.path.join(tmp, 'bench.js')
+        payload_path = os.path.join(tmp, 'payload.json')
+        with open(script_path, 'w') as f:
+            f.write(page_script(html))
+        with open(payload_path, 'w') as f:
+            json.dump(payload, f)
+        result = subprocess.run([node, script_path, payload_path], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+# ===========================
+# RUN / COMPARE
+# ===========================
+def node_version():
+    node = shutil.which('node')
+    if node is None:
+        return None
+    return subprocess.run([node, '--version'], capture_output=True, text=True).stdout.strip()
+
+
+def run_suite(mode='full', only=None):
+    html = read_page()
+    runs = {}
+    if only in (None, 'build'):
+        runs.update(build_benchmarks(html, mode))
+    if only in (None, 'page'):
+        runs.update(page_benchmarks(html, mode))
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'mode': mode,
+            'python': platform.python_version(),
+            'node': node_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'results': {name: summarize(r) for name, r in runs.items()},
+    }
+
+
+def compare(baseline, current, threshold=0.15, noise_ms=0.05):
+    """Rows of (name, baseline ms, current ms, ratio, regressed) for benchmarks present in both runs.
+
+    A benchmark regresses when its median grew by more than `threshold`
+    (a fraction) and by more than `noise_ms` in absolute terms.
+    """
+    rows = []
+    for name, cur in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        b, c = base['median'], cur['median']
+        ratio = c / b if b else float('inf') if c else 1.0
+        rows.append((name, b, c, ratio, ratio > 1 + threshold and c - b > noise_ms))
+    return rows
+
+
+def print_results(report):
+    for name, r in report['results'].items():
+        print(f"  {name:48} {r['median']:10.3f} ms  (min {r['min']:.3f})")
+
+
+def load(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offline benchmarks for build_v2.py and the generated page.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    run_p = sub.add_parser('run', help='run the suite and write JSON results')
+    run_p.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help='results file (default: benchmarks/latest.json)')
+    run_p.add_argument('--quick', action='store_true', help='smaller inputs and fewer runs')
+    run_p.add_argument('--only', choices=('build', 'page'), help='run one side only')
+    cmp_p = sub.add_parser('compare', help='flag regressions against a baseline')
+    cmp_p.add_argument('baseline')
+    cmp_p.add_argument('current', nargs='?', default=DEFAULT_OUTPUT, help='results to check (default: benchmarks/latest.json)')
+    cmp_p.add_argument('--threshold', type=float, default=0.15, help='allowed slowdown as a fraction (default: 0.15)')
+    cmp_p.add_argument('--noise-ms', type=float, default=0.05, help='ignore changes smaller than this (default: 0.05)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run_suite('quick' if args.quick else 'full', args.only)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print_results(report)
+        print(f"{len(report['results'])} benchmarks written to {args.output}")
+        return 0
+
+    baseline, current = load(args.baseline), load(args.current)
+    rows = compare(baseline, current, args.threshold, args.noise_ms)
+    for name, b, c, ratio, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        print(f"  {name:48} {b:10.3f} -> {c:10.3f} ms  {ratio:6.2f}x  {flag}")
+    missing = sorted(set(baseline['results']) - set(current['results']))
+    if missing:
+        print(f"  not in current run: {', '.join(missing)}")
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} of {len(rows)} benchmarks regressed by more than {args.threshold:.0%}")
+        return 1
+    print(f"No regressions in {len(rows)} benchmarks (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
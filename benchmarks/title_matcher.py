@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark of matchIssuesFromText on a large synthetic audit deck.
+
+Runs the compiled TITLE_ISSUE_MATCHER matcher from index.html against the
+per-entry includes() matcher it replaced, under Node.js, over the same
+title / observation / full-page blocks extractFindings feeds it, and checks
+both return identical results.
+
+Usage:
+    python benchmarks/title_matcher.py [--pages 120] [--repeat 20] [--seed 1]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+
+# The matcher as it was before TITLE_ISSUE_MAP was compiled
+REFERENCE_MATCHER_JS = '''
+function referenceMatchIssuesFromText(txt) {
+    var tl = txt.toLowerCase();
+    var matched = [];
+    for (var mi = 0; mi < TITLE_ISSUE_MAP.length; mi++) {
+        var entry = TITLE_ISSUE_MAP[mi];
+        var allMatch = true;
+        for (var ki = 0; ki < entry.keywords.length; ki++) {
+            if (!tl.includes(entry.keywords[ki])) { allMatch = false; break; }
+        }
+        if (allMatch) matched.push(entry.issue);
+    }
+    return matched;
+}
+'''
+
+MATCHER_DECLARATIONS = ('TITLE_ISSUE_MAP', 'TITLE_ISSUE_MATCHER', 'titleIssueTable',
+                        'titleIssueMatcherTable', 'matchIssueEntries', 'matchIssuesFromText')
+
+NODE_RUNNER = '''
+const blocks = JSON.parse(require('fs').readFileSync(process.argv[2], 'utf8'));
+const repeat = parseInt(process.argv[3]);
+function time(fn) {
+    let results;
+    fn(blocks[0]);  // warm up (and expand the compiled table)
+    const start = process.hrtime.bigint();
+    for (let r = 0; r < repeat; r++) results = blocks.map(fn);
+    return [results, Number(process.hrtime.bigint() - start) / 1e6 / repeat];
+}
+const [reference, referenceMs] = time(referenceMatchIssuesFromText);
+const [compiled, compiledMs] = time(matchIssuesFromText);
+process.stdout.write(JSON.stringify({ reference, compiled, referenceMs, compiledMs }));
+'''
+
+FILLER = ('the', 'product', 'page', 'users', 'mobile', 'checkout', 'we', 'observed', 'that', 'conversion',
+          'recommendation', 'banner', 'section', 'category', 'listing', 'filters', 'cart', 'review', 'trust')
+
+
+def matcher_js(html):
+    return '\n'.join(build_v2.page_declaration(html, name) for name in MATCHER_DECLARATIONS) + REFERENCE_MATCHER_JS
+
+
+def synthetic_blocks(keywords, pages, seed):
+    """Title, observation and full-page text for `pages` audit pages."""
+    rng = random.Random(seed)
+    word = lambda: rng.choice(keywords).upper() if rng.random() < 0.05 else rng.choice(keywords) if rng.random() < 0.15 else rng.choice(FILLER)
+    blocks = []
+    for _ in range(pages):
+        title = ' '.join(word() for _ in range(rng.randint(4, 12)))
+        observation = 'Observation: ' + ' '.join(word() for _ in range(rng.randint(40, 160)))
+        page = title + '\n' + observation + '\nRecommendation: ' + ' '.join(word() for _ in range(rng.randint(20, 80)))
+        blocks += [title, observation, page]
+    return blocks
+
+
+def run(html, blocks, repeat=1):
+    node = shutil.which('node')
+    if node is None:
+        raise SystemExit("node is required to run the matchers")
+    with tempfile.TemporaryDirectory() as tmp:
+        script_path = os.path.join(tmp, 'matcher.js')
+        blocks_path = os.path.join(tmp, 'blocks.json')
+        with open(script_path, 'w') as f:
+            f.write(matcher_js(html) + NODE_RUNNER)
+        with open(blocks_path, 'w') as f:
+            json.dump(blocks, f)
+        result = subprocess.run([node, script_path, blocks_path, str(repeat)], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the compiled TITLE_ISSUE_MAP matcher.')
+    parser.add_argument('--pages', type=int, default=120, help='synthetic deck size (default: 120)')
+    parser.add_argument('--repeat', type=int, default=20, help='timed passes over the deck (default: 20)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    _, entries = build_v2.parse_title_issue_map(html)
+    keywords = sorted({k for kws, _ in entries for k in kws})
+    blocks = synthetic_blocks(keywords, args.pages, args.seed)
+    out = run(html, blocks, args.repeat)
+
+    chars = sum(map(len, blocks))
+    print(f"{len(blocks)} blocks, {chars / 1024:.0f} KB of text, {len(entries)} map entries")
+    print(f"  includes() per entry: {out['referenceMs']:8.2f} ms per deck")
+    print(f"  compiled matcher:     {out['compiledMs']:8.2f} ms per deck ({out['referenceMs'] / out['compiledMs']:.1f}x)")
+    if out['reference'] != out['compiled']:
+        raise SystemExit("MISMATCH: compiled matcher results differ from the reference")
+    print(f"  results identical on all {len(blocks)} blocks")
+
+
+if __name__ == '__main__':
+    main()
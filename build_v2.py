@@ -8,22 +8,102 @@ Reads v1 index.html and applies targeted transformations:
 4. Add scoring engine JavaScript
 5. Update message generators to use smart scoring
 6. Add score summary card to output section
+7. Lazy-load pdf.js and JSZip on first Flow A upload
+8. Stream PDF pages into an incremental findings extractor
+9. Run Flow A extraction in a Web Worker (also writes flowa-worker.js)
+10. Compile TITLE_ISSUE_MAP into an Aho-Corasick matcher
+11. Keep brand/message history in IndexedDB object stores
+12. Window the brand history list and filter it by status and phase
+13. Render messages from the precompiled cro_templates.py table
+14. Index case studies by trigger issue and cache their rankings
+15. Optionally (--perf) instrument key stages and add a Settings timing panel
+16. Stream PPTX slide and notes text out of the archive entry by entry
+17. Cache Flow A findings in IndexedDB by file hash and extractor version
+18. Extract over one deck text with page ranges, keeping evidence snippets
+19. Export history as NDJSON and merge imports by record id
+
+Every transformation is registered as an anchored patch. The anchors are
+located in a single scan of the v1 source, each must match exactly the
+expected number of times, and the output is assembled in one pass.
+
+Usage:
+    python build_v2.py [--force] [--stats] [--release dist]
+    python build_v2.py --perf
+    python build_v2.py --manifest pods.json [--workers N]
 """
 
+import argparse
+import hashlib
+import inspect
+import json
 import re
 import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from cro_scoring import registry_js
+from cro_templates import templates_js, validate_templates
+from release import print_prune_report, print_report, prune_page, release_page
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 V1_PATH = os.path.join(BASE_DIR, "index.html.v1.bak")
 OUTPUT_PATH = os.path.join(BASE_DIR, "index.html")
+CACHE_DIR = os.path.join(BASE_DIR, ".build_cache")
+
+# ===========================
+# PATCH ENGINE
+# ===========================
+Patch = namedtuple('Patch', 'name anchor replacement count')
+PATCHES = []
+
+
+class PatchError(Exception):
+    """Raised when a patch anchor is missing, repeated or overlapping."""
+
+
+def patch(name, anchor, replacement, count=1):
+    """Register a replacement of `anchor` that must match exactly `count` times."""
+    PATCHES.append(Patch(name, anchor, replacement, count))
+
+
+def index_anchors(source, patches):
+    """Locate every anchor in one scan and return sorted (start, end, patch) spans."""
+    by_anchor = {}
+    for p in patches:
+        if p.anchor in by_anchor:
+            raise PatchError(f"patch '{p.name}' reuses the anchor of '{by_anchor[p.anchor].name}'")
+        by_anchor[p.anchor] = p
+    # Longest anchors first so an anchor that prefixes another cannot shadow it
+    pattern = re.compile('|'.join(re.escape(a) for a in sorted(by_anchor, key=len, reverse=True)))
+    spans = [(m.start(), m.end(), by_anchor[m.group()]) for m in pattern.finditer(source)]
+
+    counts = {p.name: 0 for p in patches}
+    for _, _, p in spans:
+        counts[p.name] += 1
+    errors = [f"patch '{p.name}': expected {p.count} match(es), found {counts[p.name]}"
+              for p in patches if counts[p.name] != p.count]
+    if errors:
+        raise PatchError('\n'.join(errors))
+    return spans
+
+
+def apply_patches(source, patches):
+    """Apply all patches against the original source in a single assembly pass."""
+    out = []
+    pos = 0
+    for start, end, p in index_anchors(source, patches):
+        out.append(source[pos:start])
+        out.append(p.replacement)
+        pos = end
+    out.append(source[pos:])
+    return ''.join(out)
 
-with open(V1_PATH, 'r') as f:
-    html = f.read()
 
 # ===========================
 # 1. UPDATE TITLE
 # ===========================
-html = html.replace(
+patch('title',
     '<title>CRO Reach-Out Generator | Growisto</title>',
     '<title>CRO Reach-Out Generator v2 | Growisto</title>'
 )
@@ -103,10 +183,10 @@ new_css = """
         .finding-item:last-child { border-bottom: none; }
 """
 
-html = html.replace('    </style>', new_css + '    </style>')
+patch('css', '    </style>', new_css + '    </style>')
 
 # Add responsive overrides for new components
-html = html.replace(
+patch('responsive-css',
     '            .cover-title { font-size: 28px; }\n            .tabs { flex-wrap: nowrap; }',
     '            .cover-title { font-size: 28px; }\n            .tabs { flex-wrap: nowrap; }\n            .path-options { grid-template-columns: 1fr; }\n            .score-summary-grid { grid-template-columns: 1fr; }'
 )
@@ -167,13 +247,13 @@ new_dashboard_grid = '''        <h1 class="dashboard-title">What would you like
 
 # The old dashboard has <h1> tag but the content says </h1> after the class
 # Let me match more carefully
-html = html.replace(
+patch('dashboard-subtitle',
     '<h1 class="dashboard-title">What would you like to do?</h1>\n        <p class="dashboard-subtitle">Choose a flow to get started with generating your outreach messages.</p>',
     '<h1 class="dashboard-title">What would you like to do?</h1>\n        <p class="dashboard-subtitle">Choose a path to generate personalized CRO outreach messages.</p>'
 )
 
 # Replace 3-card grid with 2-card grid
-html = html.replace(
+patch('dashboard-grid-css',
     '        .dashboard-grid { display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 24px; margin-bottom: 40px; }',
     '        .dashboard-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 24px; margin-bottom: 24px; }'
 )
@@ -220,7 +300,7 @@ new_cards = '''                <div class="dashboard-grid">
                     </div>
                 </div>'''
 
-html = html.replace(old_cards, new_cards)
+patch('dashboard-cards', old_cards, new_cards)
 
 # ===========================
 # 4. ADD PATH 2 SECTION (before follow-up section)
@@ -431,7 +511,7 @@ Website: [URL]</pre>
 '''
 
 # Insert Path 2 before the follow-up section
-html = html.replace(
+patch('path2-section',
     '    <!-- FOLLOW-UP MODE -->',
     path2_html + '    <!-- FOLLOW-UP MODE -->'
 )
@@ -461,7 +541,7 @@ score_card_html = '''
 
 '''
 
-html = html.replace(
+patch('score-card',
     '        <!-- Output Tabs -->',
     score_card_html + '        <!-- Output Tabs -->'
 )
@@ -474,75 +554,7 @@ scoring_engine_js = '''
 // ============================================
 // V2: FINDING REGISTRY & SCORING ENGINE
 // ============================================
-const FINDING_REGISTRY = {
-    no_ga4:              { category: 'Analytics', impactScore: 10, pointsAtStake: 5, criticalRule: 'caps_at_50', label: 'GA4 not installed', emailBullet: "GA4 is not installed \\u2014 you have zero visibility into user behavior or conversion funnel performance. This is the single most critical gap.", whatsappBullet: "\\ud83d\\udcca GA4 not installed \\u2014 zero visibility into your conversion funnel" },
-    no_ecom_events:      { category: 'Analytics', impactScore: 10, pointsAtStake: 20, criticalRule: 'caps_at_50', label: 'GA4 ecommerce events not firing', emailBullet: "GA4 ecommerce tracking is not set up \\u2014 you're flying blind on where users drop off. Without this, every marketing rupee is a guess.", whatsappBullet: "\\ud83d\\udcca GA4 ecommerce tracking not set up \\u2014 flying blind on funnel drop-offs" },
-    no_gtm:              { category: 'Analytics', impactScore: 7, pointsAtStake: 0, criticalRule: null, label: 'GTM not found', emailBullet: null, whatsappBullet: null },
-    no_view_item_list:   { category: 'Analytics', impactScore: 5, pointsAtStake: 4, criticalRule: null, label: 'view_item_list not firing', emailBullet: null, whatsappBullet: null },
-    no_view_item:        { category: 'Analytics', impactScore: 5, pointsAtStake: 4, criticalRule: null, label: 'view_item not firing', emailBullet: null, whatsappBullet: null },
-    no_add_to_cart_event:{ category: 'Analytics', impactScore: 6, pointsAtStake: 4, criticalRule: null, label: 'add_to_cart not firing', emailBullet: null, whatsappBullet: null },
-    no_begin_checkout:   { category: 'Analytics', impactScore: 6, pointsAtStake: 4, criticalRule: null, label: 'begin_checkout not firing', emailBullet: null, whatsappBullet: null },
-    no_purchase_event:   { category: 'Analytics', impactScore: 6, pointsAtStake: 4, criticalRule: null, label: 'purchase event not verified', emailBullet: null, whatsappBullet: null },
-    no_fb_pixel:         { category: 'Analytics', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'Facebook Pixel missing', emailBullet: null, whatsappBullet: null },
-    no_fb_capi:          { category: 'Analytics', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'Facebook CAPI missing', emailBullet: null, whatsappBullet: null },
-    no_clarity:          { category: 'Analytics', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'Microsoft Clarity missing', emailBullet: null, whatsappBullet: null },
-    no_hotjar:           { category: 'Analytics', impactScore: 2, pointsAtStake: 0, criticalRule: null, label: 'Hotjar missing', emailBullet: null, whatsappBullet: null },
-    no_gads:             { category: 'Analytics', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'Google Ads conversion missing', emailBullet: null, whatsappBullet: null },
-    no_email_platform:   { category: 'Analytics', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'No email platform', emailBullet: null, whatsappBullet: null },
-    slow_mobile:         { category: 'Performance', impactScore: 9, pointsAtStake: 10, criticalRule: 'deduct_15', label: 'Poor mobile PageSpeed', emailBullet: null, whatsappBullet: null },
-    very_slow_mobile:    { category: 'Performance', impactScore: 10, pointsAtStake: 10, criticalRule: 'deduct_15', label: 'Critical mobile PageSpeed', emailBullet: null, whatsappBullet: null },
-    poor_cwv:            { category: 'Performance', impactScore: 7, pointsAtStake: 5, criticalRule: null, label: 'Poor Core Web Vitals', emailBullet: "Core Web Vitals are failing \\u2014 this directly impacts Google rankings and user experience, especially on mobile.", whatsappBullet: "\\u26a1 Core Web Vitals failing \\u2014 hurts Google rankings and mobile UX" },
-    poor_mobile:         { category: 'Performance', impactScore: 6, pointsAtStake: 0, criticalRule: null, label: 'Poor mobile responsiveness', emailBullet: null, whatsappBullet: null },
-    multiple_h1:         { category: 'SEO', impactScore: 8, pointsAtStake: 3, criticalRule: 'deduct_10_seo', label: 'Multiple H1 tags', emailBullet: "Multiple H1 tags detected \\u2014 this confuses search engines about page hierarchy and can hurt organic rankings.", whatsappBullet: "\\ud83d\\udd0d Multiple H1 tags \\u2014 hurting SEO rankings" },
-    no_meta_desc:        { category: 'SEO', impactScore: 5, pointsAtStake: 2, criticalRule: null, label: 'Missing meta descriptions', emailBullet: null, whatsappBullet: null },
-    no_product_schema:   { category: 'SEO', impactScore: 7, pointsAtStake: 3, criticalRule: null, label: 'No Product schema', emailBullet: "No Product schema (JSON-LD) \\u2014 you're missing rich snippets in Google results (star ratings, price), which significantly impacts click-through rates.", whatsappBullet: "\\ud83d\\udd0d No Product schema \\u2014 missing rich snippets in Google results" },
-    no_breadcrumb_schema:{ category: 'SEO', impactScore: 4, pointsAtStake: 2, criticalRule: null, label: 'No Breadcrumb schema', emailBullet: null, whatsappBullet: null },
-    no_og_tags:          { category: 'SEO', impactScore: 3, pointsAtStake: 1, criticalRule: null, label: 'Missing OG tags', emailBullet: null, whatsappBullet: null },
-    no_canonical:        { category: 'SEO', impactScore: 5, pointsAtStake: 2, criticalRule: null, label: 'Missing canonical URL', emailBullet: null, whatsappBullet: null },
-    no_alt_tags:         { category: 'SEO', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'Missing alt tags', emailBullet: null, whatsappBullet: null },
-    no_sitemap:          { category: 'SEO', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'Missing sitemap', emailBullet: null, whatsappBullet: null },
-    no_structured_data:  { category: 'SEO', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'No structured data', emailBullet: null, whatsappBullet: null },
-    no_value_prop:       { category: 'Conversion', impactScore: 7, pointsAtStake: 2, criticalRule: null, label: 'No value proposition', emailBullet: "No clear value proposition on the homepage \\u2014 first-time visitors can't immediately understand why to buy from you vs competitors.", whatsappBullet: "\\ud83c\\udfe0 No clear value proposition \\u2014 visitors don't know why to choose you" },
-    no_hero_cta:         { category: 'Conversion', impactScore: 5, pointsAtStake: 0, criticalRule: null, label: 'Hero missing CTA', emailBullet: null, whatsappBullet: null },
-    no_trust_badges:     { category: 'Conversion', impactScore: 7, pointsAtStake: 2, criticalRule: null, label: 'No trust badges', emailBullet: "No trust badges visible \\u2014 this directly impacts purchase confidence, especially for first-time visitors.", whatsappBullet: "\\ud83d\\udee1\\ufe0f No trust badges \\u2014 impacts purchase confidence" },
-    no_social_proof:     { category: 'Conversion', impactScore: 7, pointsAtStake: 3, criticalRule: null, label: 'No social proof', emailBullet: "No social proof visible (reviews, logos, testimonials) \\u2014 brands with visible social proof see 15-20% higher conversion rates.", whatsappBullet: "\\u2b50 No social proof visible \\u2014 15-20% conversion impact" },
-    no_category_nav:     { category: 'UX', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'Poor category nav', emailBullet: null, whatsappBullet: null },
-    no_search:           { category: 'UX', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'Weak search', emailBullet: null, whatsappBullet: null },
-    no_announcement_bar: { category: 'UX', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'No announcement bar', emailBullet: null, whatsappBullet: null },
-    no_email_capture:    { category: 'Conversion', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'No email capture', emailBullet: null, whatsappBullet: null },
-    no_urgency_hp:       { category: 'Conversion', impactScore: 5, pointsAtStake: 2, criticalRule: null, label: 'No urgency elements', emailBullet: null, whatsappBullet: null },
-    no_sticky_nav:       { category: 'UX', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'No sticky nav', emailBullet: null, whatsappBullet: null },
-    no_press_mentions:   { category: 'Conversion', impactScore: 2, pointsAtStake: 0, criticalRule: null, label: 'No press mentions', emailBullet: null, whatsappBullet: null },
-    no_sticky_atc:       { category: 'Conversion', impactScore: 9, pointsAtStake: 0, criticalRule: null, label: 'No sticky ATC on mobile', emailBullet: "No sticky Add to Cart on mobile PDPs \\u2014 this one change alone usually improves conversions by 5-7%.", whatsappBullet: "\\ud83d\\uded2 No sticky Add to Cart on mobile \\u2014 usually a 5-7% conversion boost" },
-    no_buy_now:          { category: 'Conversion', impactScore: 6, pointsAtStake: 0, criticalRule: null, label: 'No Buy Now CTA', emailBullet: "No 'Buy Now' CTA on the PDP \\u2014 this forces high-intent users through extra steps, reducing impulse purchases.", whatsappBullet: "\\u26a1 No Buy Now CTA \\u2014 extra steps for high-intent buyers" },
-    no_size_chart:       { category: 'UX', impactScore: 5, pointsAtStake: 0, criticalRule: null, label: 'No size chart', emailBullet: null, whatsappBullet: null },
-    no_reviews_pdp:      { category: 'Conversion', impactScore: 7, pointsAtStake: 0, criticalRule: null, label: 'No reviews on PDP', emailBullet: "No customer reviews on product pages \\u2014 reviews are the #1 trust signal for online purchases.", whatsappBullet: "\\u2b50 No customer reviews on PDPs \\u2014 #1 trust signal missing" },
-    no_image_zoom:       { category: 'UX', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'No image zoom', emailBullet: null, whatsappBullet: null },
-    no_product_video:    { category: 'UX', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'No product video', emailBullet: null, whatsappBullet: null },
-    no_wishlist:         { category: 'UX', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'No wishlist', emailBullet: null, whatsappBullet: null },
-    no_recently_viewed:  { category: 'UX', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'No Recently Viewed', emailBullet: null, whatsappBullet: null },
-    no_product_badges:   { category: 'UX', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'No product badges', emailBullet: null, whatsappBullet: null },
-    no_notify_me:        { category: 'UX', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'No Notify Me', emailBullet: null, whatsappBullet: null },
-    no_emi_bnpl:         { category: 'Conversion', impactScore: 5, pointsAtStake: 0, criticalRule: null, label: 'No EMI/BNPL', emailBullet: null, whatsappBullet: null },
-    no_shipping_info:    { category: 'UX', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'No shipping info', emailBullet: null, whatsappBullet: null },
-    no_return_policy:    { category: 'UX', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'No returns policy', emailBullet: null, whatsappBullet: null },
-    no_stock_indicator:  { category: 'Conversion', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'No stock indicator', emailBullet: null, whatsappBullet: null },
-    no_urgency_pdp:      { category: 'Conversion', impactScore: 5, pointsAtStake: 0, criticalRule: null, label: 'No urgency on PDP', emailBullet: null, whatsappBullet: null },
-    no_cross_sell_pdp:   { category: 'Conversion', impactScore: 6, pointsAtStake: 2, criticalRule: null, label: 'No cross-sell on PDP', emailBullet: null, whatsappBullet: null },
-    no_quick_add:        { category: 'Conversion', impactScore: 7, pointsAtStake: 0, criticalRule: null, label: 'No quick-add', emailBullet: "No quick-add on collection pages \\u2014 we've seen this boost add-to-cart rates significantly. For TyresNmore, our funnel optimizations drove a 120% increase in user-to-add-to-cart rate.", whatsappBullet: "\\ud83d\\uded2 No quick-add on collections \\u2014 can boost add-to-cart rates significantly" },
-    no_cross_sell:       { category: 'Conversion', impactScore: 7, pointsAtStake: 2, criticalRule: null, label: 'No cross-sell on cart', emailBullet: "No product recommendations on the cart page \\u2014 a simple cross-sell setup can lift AOV by 5-10%. We helped a premium Ayurvedic brand increase AOV by 12%.", whatsappBullet: "\\ud83d\\udce6 No cross-sell on cart \\u2014 easy AOV lift of 5-10%" },
-    no_shipping_bar:     { category: 'Conversion', impactScore: 6, pointsAtStake: 0, criticalRule: null, label: 'No shipping progress bar', emailBullet: "No free shipping progress bar in cart \\u2014 this simple addition consistently drives higher AOV.", whatsappBullet: "\\ud83d\\ude9a No free shipping progress bar \\u2014 easy AOV driver" },
-    no_trust_cart:       { category: 'Conversion', impactScore: 5, pointsAtStake: 0, criticalRule: null, label: 'No trust in cart', emailBullet: null, whatsappBullet: null },
-    no_cart_drawer:      { category: 'UX', impactScore: 5, pointsAtStake: 0, criticalRule: null, label: 'No cart drawer', emailBullet: null, whatsappBullet: null },
-    no_discount_field:   { category: 'UX', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'No discount field', emailBullet: null, whatsappBullet: null },
-    checkout_friction:   { category: 'Conversion', impactScore: 8, pointsAtStake: 3, criticalRule: null, label: 'Checkout friction', emailBullet: "Checkout flow has friction that's likely increasing cart abandonment. 46% peak conversion rate growth for TyresNmore came from systematic CRO including checkout optimization.", whatsappBullet: "\\ud83d\\udd04 Checkout friction \\u2014 streamlining can reduce abandonment significantly" },
-    no_guest_checkout:   { category: 'UX', impactScore: 6, pointsAtStake: 0, criticalRule: null, label: 'No guest checkout', emailBullet: "No guest checkout option \\u2014 forcing account creation is one of the top reasons for cart abandonment.", whatsappBullet: "\\ud83d\\udeaa No guest checkout \\u2014 top cart abandonment reason" },
-    no_payment_options:  { category: 'UX', impactScore: 5, pointsAtStake: 0, criticalRule: null, label: 'Limited payments', emailBullet: null, whatsappBullet: null },
-    no_order_summary:    { category: 'UX', impactScore: 3, pointsAtStake: 0, criticalRule: null, label: 'No order summary', emailBullet: null, whatsappBullet: null },
-    no_estimated_delivery:{ category: 'UX', impactScore: 4, pointsAtStake: 0, criticalRule: null, label: 'No delivery date', emailBullet: null, whatsappBullet: null },
-    no_cart_abandonment: { category: 'Conversion', impactScore: 5, pointsAtStake: 2, criticalRule: null, label: 'No cart recovery', emailBullet: null, whatsappBullet: null },
-    no_tracking:         { category: 'Analytics', impactScore: 8, pointsAtStake: 0, criticalRule: null, label: 'No tracking', emailBullet: null, whatsappBullet: null }
-};
+''' + registry_js() + '''
 
 function scoreFindingsByImpact(issues, data) {
     const mps = data.mobilePS;
@@ -560,49 +572,146 @@ function scoreFindingsByImpact(issues, data) {
     });
 }
 
-function calculateEstimatedCROScore(issues, data) {
+// A score tally holds the per-category running totals of an issue list, so
+// the live worksheet score can apply one finding's delta at a time.
+// Repeated issues count once per occurrence, as in a full recompute.
+function newScoreTally() {
+    return { present: new Map(), analytics: 0, seo: 0, ux: 0, conversionLoss: 0 };
+}
+
+// Add (delta 1) or remove (delta -1) one occurrence of an issue
+function tallyIssue(tally, issue, delta) {
+    const count = (tally.present.get(issue) || 0) + delta;
+    if (count > 0) tally.present.set(issue, count);
+    else tally.present.delete(issue);
+    const reg = FINDING_REGISTRY[issue];
+    const category = reg ? reg.category : undefined;
+    if (category === 'Analytics') tally.analytics += delta;
+    else if (category === 'SEO') tally.seo += delta;
+    else if (category === 'UX') tally.ux += delta;
+    else if (category === 'Conversion') tally.conversionLoss += delta * (reg.pointsAtStake > 0 ? reg.pointsAtStake : 1);
+}
+
+function scoreFromTally(tally, data) {
     const mps = data.mobilePS;
     const dps = data.desktopPS;
+    const present = tally.present;
+    const analyticsAudited = tally.analytics > 0;
+    const seoAudited = tally.seo > 0;
+    const uxCount = tally.ux;
+    const conversionLoss = tally.conversionLoss;
+
+    // Analytics: full marks if not audited (absence != problem)
     let analytics = 25;
-    if (issues.includes('no_ga4')) analytics -= 5;
-    if (issues.includes('no_ecom_events')) analytics -= 20;
-    else {
-        ['no_view_item_list','no_view_item','no_add_to_cart_event','no_begin_checkout','no_purchase_event'].forEach(e => { if (issues.includes(e)) analytics -= 4; });
+    if (analyticsAudited) {
+        if (present.has('no_ga4')) analytics -= 5;
+        if (present.has('no_ecom_events')) analytics -= 20;
+        else {
+            ['no_view_item_list','no_view_item','no_add_to_cart_event','no_begin_checkout','no_purchase_event'].forEach(e => { if (present.has(e)) analytics -= 4; });
+        }
+        analytics = Math.max(0, analytics);
     }
-    analytics = Math.max(0, analytics);
+    // else: analytics stays at 25 (not audited)
+
+    // Performance: always scored (PageSpeed data is in these PDFs)
     let performance = 15;
-    if (mps !== null) { performance = Math.min(10, Math.round(mps / 10)); if (dps !== null) performance += Math.min(5, Math.round(dps / 20)); else performance += 3; if (!issues.includes('poor_cwv')) performance += 3; performance = Math.min(20, performance); }
-    else if (issues.includes('poor_cwv') || issues.includes('poor_mobile')) performance = 8;
+    if (mps !== null) {
+        performance = Math.min(10, Math.round(mps / 10));
+        if (dps !== null) performance += Math.min(5, Math.round(dps / 20));
+        else performance += 3;
+        if (!present.has('poor_cwv')) performance += 3;
+        performance = Math.min(20, performance);
+    } else if (present.has('poor_cwv') || present.has('poor_mobile')) {
+        performance = 8;
+    }
+
+    // SEO: full marks if not audited
     let seo = 15;
-    if (issues.includes('multiple_h1')) seo -= 3;
-    if (issues.includes('no_meta_desc')) seo -= 2;
-    if (issues.includes('no_canonical')) seo -= 2;
-    if (issues.includes('no_product_schema')) seo -= 3;
-    if (issues.includes('no_breadcrumb_schema')) seo -= 2;
-    if (issues.includes('no_og_tags')) seo -= 1;
-    seo = Math.max(0, seo);
+    if (seoAudited) {
+        if (present.has('multiple_h1')) seo -= 3;
+        if (present.has('no_meta_desc')) seo -= 2;
+        if (present.has('no_canonical')) seo -= 2;
+        if (present.has('no_product_schema')) seo -= 3;
+        if (present.has('no_breadcrumb_schema')) seo -= 2;
+        if (present.has('no_og_tags')) seo -= 1;
+        seo = Math.max(0, seo);
+    }
+
+    // UX: always scored (primary audit focus)
     let ux = 20;
-    const uxIssues = issues.filter(i => FINDING_REGISTRY[i]?.category === 'UX');
-    ux -= Math.min(14, uxIssues.length * 2);
+    ux -= Math.min(14, uxCount * 2);
     ux = Math.max(4, ux);
+
+    // Conversion: always scored
     let conversion = 20;
-    const convIssues = issues.filter(i => FINDING_REGISTRY[i]?.category === 'Conversion');
-    convIssues.forEach(i => { conversion -= (FINDING_REGISTRY[i]?.pointsAtStake > 0 ? FINDING_REGISTRY[i].pointsAtStake : 1); });
+    conversion -= conversionLoss;
     conversion = Math.max(0, Math.min(20, conversion));
+
     let total = analytics + performance + seo + ux + conversion;
-    const hasEcomGap = issues.includes('no_ecom_events') || (issues.includes('no_ga4'));
+
+    // GA4 cap only applies if analytics was actually audited and GA4 issues were found
+    const hasEcomGap = analyticsAudited && (present.has('no_ecom_events') || present.has('no_ga4'));
     if (hasEcomGap) total = Math.min(total, 50);
     if (mps !== null && mps < 40) total -= 15;
     total = Math.max(0, Math.min(100, total));
+
     const alerts = [];
     if (hasEcomGap) alerts.push({ type: 'danger', text: 'GA4 ecommerce tracking missing \\u2014 overall score capped at 50' });
     if (mps !== null && mps < 40) alerts.push({ type: 'danger', text: 'Mobile PageSpeed below 40 \\u2014 15 point deduction applied' });
-    if (issues.includes('multiple_h1')) alerts.push({ type: 'warning', text: 'Multiple H1 tags \\u2014 SEO penalty applied' });
+    if (seoAudited && present.has('multiple_h1')) alerts.push({ type: 'warning', text: 'Multiple H1 tags \\u2014 SEO penalty applied' });
     return { overall: total, analytics, performance, seo, ux, conversion, alerts };
 }
 
+function calculateEstimatedCROScore(issues, data) {
+    const tally = newScoreTally();
+    for (const issue of issues) tallyIssue(tally, issue, 1);
+    return scoreFromTally(tally, data);
+}
+
+// ============================================
+// ANALYSIS CONTEXT
+// ============================================
+// One generate click needs the same prospect's score, bullets and ranking in
+// the email, the WhatsApp message and the score card. getAnalysis() keeps
+// the analysis of the latest snapshot, keyed by its issue list and PageSpeed
+// scores, and runs each stage on first use only. ANALYSIS_STATS counts the
+// stages that actually ran (inspect it from the console).
+const ANALYSIS_STATS = { analyses: 0, reused: 0, ranking: 0, score: 0, bullets: 0, caseStudies: 0 };
+let currentAnalysis = null;
+
+function analysisSignature(data) {
+    return JSON.stringify([data.issues, data.mobilePS, data.desktopPS]);
+}
+
+function getAnalysis(data) {
+    const signature = analysisSignature(data);
+    if (currentAnalysis && currentAnalysis.signature === signature) {
+        ANALYSIS_STATS.reused++;
+        return currentAnalysis;
+    }
+    ANALYSIS_STATS.analyses++;
+    // Stages read a snapshot, so later edits to data cannot reach cached results
+    const snapshot = Object.assign({}, data, { issues: data.issues.slice() });
+    const stages = {};
+    function stage(key, counter, compute) {
+        if (!(key in stages)) {
+            ANALYSIS_STATS[counter]++;
+            stages[key] = compute();
+        }
+        return stages[key];
+    }
+    currentAnalysis = {
+        signature: signature,
+        ranked: () => stage('ranked', 'ranking', () => scoreFindingsByImpact(snapshot.issues, snapshot)),
+        score: () => stage('score', 'score', () => calculateEstimatedCROScore(snapshot.issues, snapshot)),
+        bullets: forWhatsApp => stage(forWhatsApp ? 'whatsappBullets' : 'emailBullets', 'bullets', () => generateSmartBullets(snapshot, forWhatsApp)),
+        caseStudies: () => stage('caseStudies', 'caseStudies', () => getTopCaseStudiesForIssues(snapshot.issues))
+    };
+    return currentAnalysis;
+}
+
 function generateSmartBullets(data, forWhatsApp) {
-    const ranked = scoreFindingsByImpact(data.issues, data);
+    const ranked = getAnalysis(data).ranked();
     const mps = data.mobilePS;
     const bullets = [];
     const max = forWhatsApp ? 4 : 5;
@@ -621,7 +730,7 @@ function generateSmartBullets(data, forWhatsApp) {
 }
 
 function displayScoreSummary(data) {
-    const score = calculateEstimatedCROScore(data.issues, data);
+    const score = getAnalysis(data).score();
     const card = document.getElementById('scoreSummaryCard');
     card.style.display = 'block';
     // Gauge
@@ -682,18 +791,55 @@ function copyClaudePrompt(btn) {
 
 function toggleWS(el) { el.classList.toggle('expanded'); }
 
-function updateLiveScore() {
-    const issues = [];
-    document.querySelectorAll('#p2_worksheet .checkbox-item input[type="checkbox"]:checked').forEach(cb => issues.push(cb.value));
+// The live score keeps how many sources (checkboxes, PageSpeed) select each
+// issue and tallies an issue only while at least one does, like the Set of
+// the full recompute. A checkbox change applies one delta; the score is
+// written to the page at most once per animation frame.
+const liveScore = { sources: new Map(), tally: newScoreTally(), speedIssues: [], frame: 0 };
+
+function selectLiveIssue(issue, delta) {
+    const count = (liveScore.sources.get(issue) || 0) + delta;
+    if (count > 0) liveScore.sources.set(issue, count);
+    else liveScore.sources.delete(issue);
+    if (count === (delta > 0 ? 1 : 0)) tallyIssue(liveScore.tally, issue, delta);
+}
+
+function readLiveSpeed() {
     const mps = parseInt(document.getElementById('ws_mobilePS').value) || null;
     const dps = parseInt(document.getElementById('ws_desktopPS').value) || null;
-    if (mps !== null && mps < 50) issues.push('slow_mobile');
-    if (mps !== null && mps < 30) issues.push('very_slow_mobile');
-    const score = calculateEstimatedCROScore([...new Set(issues)], { mobilePS: mps, desktopPS: dps });
-    const el = document.getElementById('liveScoreNum');
-    el.textContent = score.overall;
-    let color = '#ef4444'; if (score.overall >= 70) color = '#10b981'; else if (score.overall >= 50) color = '#f59e0b';
-    el.style.color = color;
+    const speedIssues = [];
+    if (mps !== null && mps < 50) speedIssues.push('slow_mobile');
+    if (mps !== null && mps < 30) speedIssues.push('very_slow_mobile');
+    liveScore.speedIssues.forEach(issue => selectLiveIssue(issue, -1));
+    speedIssues.forEach(issue => selectLiveIssue(issue, 1));
+    liveScore.speedIssues = speedIssues;
+    return { mobilePS: mps, desktopPS: dps };
+}
+
+function scheduleLiveScore() {
+    if (liveScore.frame) return;
+    liveScore.frame = requestAnimationFrame(() => {
+        liveScore.frame = 0;
+        const score = scoreFromTally(liveScore.tally, readLiveSpeed());
+        const el = document.getElementById('liveScoreNum');
+        el.textContent = score.overall;
+        let color = '#ef4444'; if (score.overall >= 70) color = '#10b981'; else if (score.overall >= 50) color = '#f59e0b';
+        el.style.color = color;
+    });
+}
+
+// Rebuild the tally from every checked box (when the worksheet is shown)
+function updateLiveScore() {
+    liveScore.sources = new Map();
+    liveScore.tally = newScoreTally();
+    liveScore.speedIssues = [];
+    document.querySelectorAll('#p2_worksheet .checkbox-item input[type="checkbox"]:checked').forEach(cb => selectLiveIssue(cb.value, 1));
+    scheduleLiveScore();
+}
+
+function toggleLiveScoreIssue(issue, checked) {
+    selectLiveIssue(issue, checked ? 1 : -1);
+    scheduleLiveScore();
 }
 
 function collectWorksheetData() {
@@ -774,13 +920,13 @@ function renderFollowupCards(followups) {
 
 // Worksheet checkbox listener for live score
 document.addEventListener('change', function(e) {
-    if (e.target.closest('#p2_worksheet') && e.target.type === 'checkbox') updateLiveScore();
+    if (e.target.closest('#p2_worksheet') && e.target.type === 'checkbox') toggleLiveScoreIssue(e.target.value, e.target.checked);
 });
 
 '''
 
 # Insert the scoring engine before the FINDING BULLET GENERATION section
-html = html.replace(
+patch('scoring-engine',
     '// ============================================\n// FINDING BULLET GENERATION\n// ============================================',
     scoring_engine_js + '// ============================================\n// FINDING BULLET GENERATION (V1 LEGACY - kept for compatibility)\n// ============================================'
 )
@@ -789,11 +935,11 @@ html = html.replace(
 # 7. UPDATE generateEmail and generateWhatsApp to use smart bullets
 # ===========================
 # Replace generateFindingBullets call in generateEmail with generateSmartBullets
-html = html.replace(
+patch('email-smart-bullets',
     'function generateEmail(data) {\n    const bullets = generateFindingBullets(data, false);',
     'function generateEmail(data) {\n    const bullets = generateSmartBullets(data, false);'
 )
-html = html.replace(
+patch('whatsapp-smart-bullets',
     'function generateWhatsApp(data) {\n    const bullets = generateFindingBullets(data, true);',
     'function generateWhatsApp(data) {\n    const bullets = generateSmartBullets(data, true);'
 )
@@ -801,7 +947,7 @@ html = html.replace(
 # ===========================
 # 8. ADD SMART LANGUAGE TO EMAIL BASED ON SCORE
 # ===========================
-html = html.replace(
+patch('email-score-opener',
     "I took a quick look at ${brandType} and spotted a few things that are likely leaving revenue on the table:",
     "${data.issues.length > 0 ? ((() => { const s = calculateEstimatedCROScore(data.issues, data); return s.overall < 40 ? 'I took a quick look at ' + brandType + ' and spotted some critical gaps that are likely costing significant revenue:' : s.overall < 60 ? 'I took a quick look at ' + brandType + ' and spotted a few high-impact opportunities that could meaningfully move your conversion numbers:' : 'I took a quick look at ' + brandType + ' and spotted some quick wins that could push your results even further:'; })()) : 'I took a quick look at ' + brandType + ' and spotted a few things that could improve your conversion numbers:'}"
 )
@@ -809,12 +955,12 @@ html = html.replace(
 # ===========================
 # 9. UPDATE generateMessages and generateFromFlowA to show score card
 # ===========================
-html = html.replace(
+patch('messages-score-summary',
     "    // Show output section\n    showSection('outputSection');\n    showToast('Messages generated successfully!');",
     "    // Show score summary\n    if (data.issues.length > 0) displayScoreSummary(data);\n    else document.getElementById('scoreSummaryCard').style.display = 'none';\n    // Show output section\n    showSection('outputSection');\n    showToast('Messages generated successfully!');"
 )
 
-html = html.replace(
+patch('flowa-score-summary',
     "    showSection('outputSection');\n    showToast('Messages generated from uploaded report!');",
     "    // Show score summary\n    if (data.issues.length > 0) displayScoreSummary(data);\n    else document.getElementById('scoreSummaryCard').style.display = 'none';\n    showSection('outputSection');\n    showToast('Messages generated from uploaded report!');"
 )
@@ -851,7 +997,7 @@ old_followup_render = """    followups.forEach((msg, i) => {
 new_followup_render = "    renderFollowupCards(followups);"
 
 # First occurrence (in generateMessages)
-html = html.replace(
+patch('followup-render-messages',
     """    const cardsContainer = document.getElementById('followupCards');
     cardsContainer.innerHTML = '';
 
@@ -860,7 +1006,7 @@ html = html.replace(
 )
 
 # Second occurrence (in generateFromFlowA) - find it
-html = html.replace(
+patch('followup-render-flowa',
     """    const cardsContainer = document.getElementById('followupCards');
     cardsContainer.innerHTML = '';
     followups.forEach((msg, i) => {
@@ -889,11 +1035,3133 @@ html = html.replace(
     "    renderFollowupCards(followups);"
 )
 
-# Write the final file
-with open(OUTPUT_PATH, 'w') as f:
-    f.write(html)
+# ===========================
+# 11. LAZY-LOAD pdf.js / JSZip ON FIRST FLOW A UPLOAD
+# ===========================
+# Neither library blocks page load any more. VENDOR_SCRIPTS points at local
+# copies (vendor/, filled by the release build) with the pinned CDN file as
+# a fallback; release.py rewrites it to hashed, integrity-checked paths.
+patch('vendor-script-tags',
+    '    <script src="https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.min.js"></script>\n'
+    '    <script src="https://cdnjs.cloudflare.com/ajax/libs/jszip/3.10.1/jszip.min.js"></script>\n',
+    ''
+)
+
+# Fonts are a progressive enhancement: never block rendering on them
+patch('font-stylesheet',
+    '<link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap" rel="stylesheet">',
+    '<link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap" rel="stylesheet" media="print" onload="this.media=\'all\'">'
+)
+
+vendor_loader_js = '''// Third-party parsers, loaded on first use
+const VENDOR_SCRIPTS = {
+    pdfjs: { src: 'vendor/pdf.min.js', cdn: 'https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.min.js' },
+    pdfjsWorker: { src: 'vendor/pdf.worker.min.js', cdn: 'https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.worker.min.js' },
+    jszip: { src: 'vendor/jszip.min.js', cdn: 'https://cdnjs.cloudflare.com/ajax/libs/jszip/3.10.1/jszip.min.js' }
+};
+const vendorLoads = {};
+
+function injectScript(src, integrity) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        if (integrity) script.integrity = integrity;
+        script.onload = () => resolve(src);
+        script.onerror = () => { script.remove(); reject(new Error('Could not load ' + src)); };
+        document.head.appendChild(script);
+    });
+}
+
+// Resolves with the URL the library was loaded from
+function loadVendorScript(name) {
+    const lib = VENDOR_SCRIPTS[name];
+    if (!vendorLoads[name]) {
+        vendorLoads[name] = injectScript(lib.src, lib.integrity)
+            .catch(err => lib.cdn ? injectScript(lib.cdn) : Promise.reject(err))
+            .catch(err => { delete vendorLoads[name]; throw err; });
+    }
+    return vendorLoads[name];
+}
+
+// PDF Parser using pdf.js
+async function parsePDF(file) {
+    const [arrayBuffer, pdfSrc] = await Promise.all([file.arrayBuffer(), loadVendorScript('pdfjs')]);
+    const worker = VENDOR_SCRIPTS.pdfjsWorker;
+    pdfjsLib.GlobalWorkerOptions.workerSrc = pdfSrc === VENDOR_SCRIPTS.pdfjs.src ? worker.src : worker.cdn;'''
+
+patch('vendor-loader',
+    "// PDF Parser using pdf.js\nasync function parsePDF(file) {\n    const arrayBuffer = await file.arrayBuffer();\n"
+    "    pdfjsLib.GlobalWorkerOptions.workerSrc = 'https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.worker.min.js';",
+    vendor_loader_js
+)
+
+# ===========================
+# 12. STREAM PDF PAGES INTO AN INCREMENTAL FINDINGS EXTRACTOR
+# ===========================
+# extractFindings is split into a per-page extractor (section classification
+# and TITLE_ISSUE_MAP matching) plus finishFindings for the whole-document
+# steps. parsePDF reads pages with bounded concurrency and feeds them in
+# order, so findings accumulate while the deck is still being parsed.
+# Pages are kept as offset ranges into the one deck text (see section 22).
+incremental_extractor_js = '''// ============================================
+// INCREMENTAL FINDINGS EXTRACTION
+// ============================================
+// Pages are classified into sections and matched against TITLE_ISSUE_MAP
+// one at a time, in order, so parsePDF can feed them while later pages are
+// still being read. Whole-document steps run once in finishFindings, over
+// the deck text and each page's offset range in it. Findings keep a short
+// evidence snippet per issue rather than the text itself.
+var SECTION_DIVIDERS = [
+    { pattern: /analytics\\s+insights/i, section: 'ANALYTICS' },
+    { pattern: /performance\\s+insights/i, section: 'PERFORMANCE' },
+    { pattern: /ux\\s+insights/i, section: 'UX_OBS' },
+    { pattern: /theme\\s+architecture/i, section: 'THEME_OBS' },
+    { pattern: /heuristics?\\s+(?:insights?|review)/i, section: 'HEURISTICS_OBS' },
+    { pattern: /proven\\s+results/i, section: 'CASE_STUDIES' },
+    { pattern: /we\\s+have\\s+worked/i, section: 'COMPANY_INFO' },
+    { pattern: /they\\s+trust\\s+us/i, section: 'COMPANY_INFO' },
+    { pattern: /our\\s+leadership/i, section: 'COMPANY_INFO' },
+    { pattern: /our\\s+partners/i, section: 'COMPANY_INFO' },
+    { pattern: /we\\s+leverage/i, section: 'COMPANY_INFO' },
+    { pattern: /we\\s+continue\\s+to\\s+expand/i, section: 'COMPANY_INFO' },
+    { pattern: /we\\s+provide\\s+array/i, section: 'COMPANY_INFO' }
+];
+var OBSERVATION_SECTIONS = ['UX_OBS', 'THEME_OBS', 'HEURISTICS_OBS', 'PERFORMANCE'];
+// Longest evidence snippet kept per issue, ending where its match completed
+var EVIDENCE_CHARS = 120;
+
+// TITLE_ISSUE_MATCHER (TITLE_ISSUE_MAP compiled by build_v2.py) expanded into
+// a dense transition table on first use
+var titleIssueTable = null;
+
+function titleIssueMatcherTable() {
+    if (titleIssueTable) return titleIssueTable;
+    var m = TITLE_ISSUE_MATCHER;
+    var width = m.alphabet.length + 1;   // column 0: characters in no keyword
+    var classes = new Uint8Array(128);
+    for (var ai = 0; ai < m.alphabet.length; ai++) classes[m.alphabet.charCodeAt(ai)] = ai + 1;
+    var states = m.fail.length;
+    var delta = new Int32Array(states * width);
+    for (var s = 1; s < states; s++) delta[m.parent[s] * width + classes[m.label.charCodeAt(s)]] = s;
+    // States are numbered breadth-first, so each failure target's row is already complete
+    for (var st = 1; st < states; st++) {
+        for (var c = 0; c < width; c++) {
+            if (!delta[st * width + c]) delta[st * width + c] = delta[m.fail[st] * width + c];
+        }
+    }
+    var out = [];
+    for (var key in m.out) out[key] = m.out[key];
+    titleIssueTable = { width: width, classes: classes, delta: delta, out: out };
+    return titleIssueTable;
+}
+
+// Match txt[start, end) against TITLE_ISSUE_MAP without copying or
+// lowercasing it first: one pass, lowercasing as it goes, then every entry
+// whose keywords were all seen, in map order, each with the offset just past
+// the keyword that completed it
+function matchIssueEntries(txt, start, end) {
+    var table = titleIssueMatcherTable();
+    var seen = [], hits = [], matched = [], ends = [];
+    var state = 0;
+    for (var i = start; i < end; i++) {
+        var code = txt.charCodeAt(i);
+        // ASCII lowercases in place; anything else as toLowerCase() would (it may grow)
+        var lower = code < 128 ? null : txt.charAt(i).toLowerCase();
+        var units = lower === null ? 1 : lower.length;
+        for (var u = 0; u < units; u++) {
+            var c = lower === null ? (code >= 65 && code <= 90 ? code + 32 : code) : lower.charCodeAt(u);
+            state = table.delta[state * table.width + (c < 128 ? table.classes[c] : 0)];
+            var found = table.out[state];
+            if (!found) continue;
+            for (var fi = 0; fi < found.length; fi++) {
+                var k = found[fi];
+                if (seen[k]) continue;
+                seen[k] = true;
+                var entries = TITLE_ISSUE_MATCHER.entries[k];
+                for (var ei = 0; ei < entries.length; ei++) {
+                    var e = entries[ei];
+                    hits[e] = (hits[e] || 0) + 1;
+                    if (hits[e] === TITLE_ISSUE_MATCHER.need[e]) {
+                        matched.push(e);
+                        ends[e] = i + 1;
+                    }
+                }
+            }
+        }
+    }
+    matched.sort(function(a, b) { return a - b; });
+    return matched.map(function(e) { return { issue: TITLE_ISSUE_MAP[e].issue, end: ends[e] }; });
+}
+
+// Match text against TITLE_ISSUE_MAP: the matching issues, in map order
+function matchIssuesFromText(txt) {
+    return matchIssueEntries(txt, 0, txt.length).map(function(m) { return m.issue; });
+}
+
+// Issues matched in text[start, end), each with the span evidencing it
+function matchIssueSpans(text, start, end) {
+    return matchIssueEntries(text, start, end).map(function(m) {
+        return { issue: m.issue, start: Math.max(start, m.end - EVIDENCE_CHARS), end: m.end };
+    });
+}
+
+// Issues on one observation page: its title, else its observation text
+function matchPageIssues(text) {
+    // Extract "title" — first significant line (> 15 chars trimmed), found in place
+    var titleStart = 0, titleEnd = 0;
+    for (var ls = 0; ls <= text.length; ) {
+        var le = text.indexOf('\\n', ls);
+        if (le === -1) le = text.length;
+        var line = text.slice(ls, le), trimmed = line.trim();
+        if (trimmed.length > 15) {
+            titleStart = ls + line.indexOf(trimmed);
+            titleEnd = titleStart + trimmed.length;
+            break;
+        }
+        ls = le + 1;
+    }
+
+    // Pass 1: Match title
+    var titleMatches = matchIssueSpans(text, titleStart, titleEnd);
+    if (titleMatches.length > 0) return titleMatches;
+
+    // Pass 2: Title didn't match, scan observation text
+    var matched = [];
+    // Extract text between "Observation" and "Recommendation" headers
+    var obsMatch = text.match(/observations?[\\s\\S]*?(?=recommendations?|recommendation\\/hypothesis|$)/i);
+    var obsStart = obsMatch ? obsMatch.index : 0, obsLength = obsMatch ? obsMatch[0].length : 0;
+    // Also try the "(Issue/observation)" format from performance slides
+    if (obsLength < 30) {
+        var issueObsMatch = text.match(/\\(issue\\/observation\\)[\\s\\S]*?(?=recommendation|$)/i);
+        if (issueObsMatch) {
+            obsStart = issueObsMatch.index;
+            obsLength = issueObsMatch[0].length;
+        }
+    }
+    if (obsLength > 20) {
+        matched = matched.concat(matchIssueSpans(text, obsStart, obsStart + obsLength));
+    }
+    // Pass 3: Also try full page text for shorter pages (Theme Architecture detail slides)
+    if (obsLength < 30 && text.length < 500) {
+        matched = matched.concat(matchIssueSpans(text, 0, text.length));
+    }
+    return matched;
+}
+
+// text[start, end) with whitespace runs collapsed, built character by
+// character so the snippet never holds on to the text it came from
+function evidenceSnippet(text, start, end) {
+    var out = '', space = false;
+    for (var i = start; i < end; i++) {
+        var ch = text.charAt(i);
+        if (/\\s/.test(ch)) {
+            space = out.length > 0;
+        } else {
+            if (space) out += ' ';
+            out += ch;
+            space = false;
+        }
+    }
+    return out;
+}
+
+// Issues found so far, each with the evidence of its first match
+function createIssueRecord() {
+    var record = { issues: new Set(), evidence: [] };
+    record.add = function(issue, page, text, start, end) {
+        if (record.issues.has(issue)) return;
+        record.issues.add(issue);
+        record.evidence.push({ issue: issue, page: page, start: start, end: end, text: evidenceSnippet(text, start, end) });
+    };
+    return record;
+}
+
+// Call fn(start, end) for the text after each PAGE/SLIDE marker, up to the next one
+function forEachPageRange(text, fn) {
+    var marker = /---\\s*(?:PAGE|SLIDE)\\s*\\d+\\s*---/gi;
+    var m = marker.exec(text);
+    while (m) {
+        var start = m.index + m[0].length;
+        var next = marker.exec(text);
+        fn(start, next ? next.index : text.length);
+        m = next;
+    }
+}
+
+// Which of the lowercase terms occur in text, lowercasing one page at a time
+// (never the whole text) and stopping once every term is found
+function findLowercaseTerms(text, pages, terms) {
+    var found = new Set();
+    var cuts = [0];
+    for (var pi = 0; pi < pages.length; pi++) {
+        if (pages[pi].start > cuts[cuts.length - 1]) cuts.push(pages[pi].start);
+    }
+    cuts.push(text.length);
+    for (var ci = 0; ci + 1 < cuts.length && found.size < terms.length; ci++) {
+        // Page starts follow a marker, so no term spans a cut
+        var lower = text.slice(cuts[ci], cuts[ci + 1]).toLowerCase();
+        for (var ti = 0; ti < terms.length; ti++) {
+            if (!found.has(terms[ti]) && lower.includes(terms[ti])) found.add(terms[ti]);
+        }
+    }
+    return found;
+}
+
+function createFindingsExtractor() {
+    var pages = [];
+    var found = createIssueRecord();
+    var currentSection = 'INTRO';
+
+    // Pages keep no text; finishFindings gives each its range in the deck text
+    function addPage(text) {
+        // Check if this page is a section divider
+        var pageText = text.trim();
+        var isDivider = false;
+        for (var si = 0; si < SECTION_DIVIDERS.length; si++) {
+            if (SECTION_DIVIDERS[si].pattern.test(pageText)) {
+                currentSection = SECTION_DIVIDERS[si].section;
+                isDivider = true;
+                break;
+            }
+        }
+        var pg = { num: pages.length + 1, section: currentSection, isDivider: isDivider };
+        pages.push(pg);
+        // Section-aware: only observation section pages carry issues
+        if (!isDivider && OBSERVATION_SECTIONS.indexOf(pg.section) !== -1) {
+            matchPageIssues(text).forEach(function(m) { found.add(m.issue, pg.num, text, m.start, m.end); });
+        }
+        return pg;
+    }
+
+    return {
+        addPage: addPage,
+        issueCount: function() { return found.issues.size; },
+        finish: function(text, fileName) {
+            // No pages fed — treat entire text as one page
+            var hasMarkers = pages.length > 0;
+            if (!hasMarkers) addPage(text);
+            return finishFindings(text, fileName, pages, hasMarkers, found);
+        }
+    };
+}
+
+function extractFindings(text, fileName) {
+    var extractor = createFindingsExtractor();
+    // ---- STEP 1: Feed each page/slide between markers ----
+    forEachPageRange(text, function(start, end) {
+        extractor.addPage(text.slice(start, end));
+    });
+    return extractor.finish(text, fileName);
+}
+
+function finishFindings(text, fileName, pages, hasMarkers, found) {
+    var issueSet = found.issues;
+    // Each page's offset range in the deck text; later steps slice what they need
+    if (hasMarkers) {
+        var pn = 0;
+        forEachPageRange(text, function(start, end) {
+            if (pn < pages.length) {
+                pages[pn].start = start;
+                pages[pn].end = end;
+            }
+            pn++;
+        });
+    } else {
+        pages[0].start = 0;
+        pages[0].end = text.length;
+    }
+    var findings = {
+        brandName: '',
+        websiteUrl: '',
+        mobilePS: null,
+        desktopPS: null,
+        industry: '',
+        issues: [],
+        competitors: [],
+        auditedSections: [],
+        evidence: found.evidence
+    };
+
+'''
+
+patch('incremental-extractor',
+    '''function extractFindings(text, fileName) {
+    var t = text.toLowerCase();
+    var findings = {
+        brandName: '',
+        websiteUrl: '',
+        mobilePS: null,
+        desktopPS: null,
+        industry: '',
+        issues: [],
+        competitors: [],
+        auditedSections: [],
+        rawText: text
+    };
+
+    // ---- STEP 1: Split text into pages/slides ----
+    var pages = [];
+    var pageChunks = text.split(/---\\s*(?:PAGE|SLIDE)\\s*\\d+\\s*---/i);
+    var hasMarkers = pageChunks.length > 1;
+    if (hasMarkers) {
+        for (var i = 1; i < pageChunks.length; i++) {
+            pages.push({ num: i, text: pageChunks[i], section: 'INTRO' });
+        }
+    } else {
+        // No markers — treat entire text as one page
+        pages.push({ num: 1, text: text, section: 'INTRO' });
+    }
+
+    // ---- STEP 2: Classify pages into sections ----
+    var currentSection = 'INTRO';
+    var sectionDividers = [
+        { pattern: /analytics\\s+insights/i, section: 'ANALYTICS' },
+        { pattern: /performance\\s+insights/i, section: 'PERFORMANCE' },
+        { pattern: /ux\\s+insights/i, section: 'UX_OBS' },
+        { pattern: /theme\\s+architecture/i, section: 'THEME_OBS' },
+        { pattern: /heuristics?\\s+(?:insights?|review)/i, section: 'HEURISTICS_OBS' },
+        { pattern: /proven\\s+results/i, section: 'CASE_STUDIES' },
+        { pattern: /we\\s+have\\s+worked/i, section: 'COMPANY_INFO' },
+        { pattern: /they\\s+trust\\s+us/i, section: 'COMPANY_INFO' },
+        { pattern: /our\\s+leadership/i, section: 'COMPANY_INFO' },
+        { pattern: /our\\s+partners/i, section: 'COMPANY_INFO' },
+        { pattern: /we\\s+leverage/i, section: 'COMPANY_INFO' },
+        { pattern: /we\\s+continue\\s+to\\s+expand/i, section: 'COMPANY_INFO' },
+        { pattern: /we\\s+provide\\s+array/i, section: 'COMPANY_INFO' }
+    ];
+    for (var pi = 0; pi < pages.length; pi++) {
+        var pageText = pages[pi].text.trim();
+        // Check if this page is a section divider
+        var isDivider = false;
+        for (var si = 0; si < sectionDividers.length; si++) {
+            if (sectionDividers[si].pattern.test(pageText)) {
+                currentSection = sectionDividers[si].section;
+                isDivider = true;
+                break;
+            }
+        }
+        pages[pi].section = currentSection;
+        pages[pi].isDivider = isDivider;
+    }
+
+''',
+    incremental_extractor_js
+)
+
+patch('extractor-issue-fallback',
+    '''    // ---- STEP 7: Section-aware issue detection ----
+    var issueSet = new Set();
+    var observationSections = ['UX_OBS', 'THEME_OBS', 'HEURISTICS_OBS', 'PERFORMANCE'];
+
+    // Helper: match text against TITLE_ISSUE_MAP
+    function matchIssuesFromText(txt) {
+        var tl = txt.toLowerCase();
+        var matched = [];
+        for (var mi = 0; mi < TITLE_ISSUE_MAP.length; mi++) {
+            var entry = TITLE_ISSUE_MAP[mi];
+            var allMatch = true;
+            for (var ki = 0; ki < entry.keywords.length; ki++) {
+                if (!tl.includes(entry.keywords[ki])) { allMatch = false; break; }
+            }
+            if (allMatch) matched.push(entry.issue);
+        }
+        return matched;
+    }
+
+    if (hasMarkers) {
+        // Section-aware: only scan observation section pages
+        for (var oi = 0; oi < pages.length; oi++) {
+            var pg = pages[oi];
+            if (observationSections.indexOf(pg.section) === -1) continue;
+            if (pg.isDivider) continue;
+
+            // Extract "title" — first significant line (> 20 chars, not just a label)
+            var lines = pg.text.split('\\n').map(function(l) { return l.trim(); }).filter(function(l) { return l.length > 15; });
+            var title = lines.length > 0 ? lines[0] : '';
+
+            // Pass 1: Match title
+            var titleMatches = matchIssuesFromText(title);
+            for (var ti = 0; ti < titleMatches.length; ti++) {
+                issueSet.add(titleMatches[ti]);
+            }
+
+            // Pass 2: If title didn't match, scan observation text
+            if (titleMatches.length === 0) {
+                // Extract text between "Observation" and "Recommendation" headers
+                var obsMatch = pg.text.match(/observations?[\\s\\S]*?(?=recommendations?|recommendation\\/hypothesis|$)/i);
+                var obsText = obsMatch ? obsMatch[0] : '';
+                // Also try the "(Issue/observation)" format from performance slides
+                if (!obsText || obsText.length < 30) {
+                    var issueObsMatch = pg.text.match(/\\(issue\\/observation\\)[\\s\\S]*?(?=recommendation|$)/i);
+                    if (issueObsMatch) obsText = issueObsMatch[0];
+                }
+                if (obsText && obsText.length > 20) {
+                    var obsMatches = matchIssuesFromText(obsText);
+                    for (var omi = 0; omi < obsMatches.length; omi++) {
+                        issueSet.add(obsMatches[omi]);
+                    }
+                }
+                // Pass 3: Also try full page text for shorter pages (Theme Architecture detail slides)
+                if (titleMatches.length === 0 && obsText.length < 30 && pg.text.length < 500) {
+                    var fullMatches = matchIssuesFromText(pg.text);
+                    for (var fmi = 0; fmi < fullMatches.length; fmi++) {
+                        issueSet.add(fullMatches[fmi]);
+                    }
+                }
+            }
+        }
+    } else {
+        // No markers — fallback: scan full text with keyword matching (minus GA4/SEO)
+        var fallbackMatches = matchIssuesFromText(text);
+        for (var fbi = 0; fbi < fallbackMatches.length; fbi++) {
+            issueSet.add(fallbackMatches[fbi]);
+        }
+    }
+
+''',
+    '''    // ---- STEP 7: Issue detection ----
+    // Observation pages were matched as they were added
+    if (!hasMarkers) {
+        // No markers — fallback: scan full text with keyword matching (minus GA4/SEO)
+        var fallbackMatches = matchIssueSpans(text, 0, text.length);
+        for (var fbi = 0; fbi < fallbackMatches.length; fbi++) {
+            found.add(fallbackMatches[fbi].issue, 1, text, fallbackMatches[fbi].start, fallbackMatches[fbi].end);
+        }
+    }
+
+'''
+)
+
+streaming_pdf_js = '''    const numPages = pdf.numPages;
+    const extractor = createFindingsExtractor();
+    const pageTexts = new Array(numPages);
+    let nextPage = 1, parsed = 0, fed = 0;
+    let fullText = '';
+
+    updateProgress(20, 'Parsing PDF (' + numPages + ' pages)...');
+
+    // Up to 4 pages in flight at once; results are fed to the extractor in page order
+    async function readPages() {
+        while (nextPage <= numPages) {
+            const i = nextPage++;
+            const page = await pdf.getPage(i);
+            const content = await page.getTextContent();
+            page.cleanup();
+            pageTexts[i - 1] = content.items.map(item => item.str).join(' ');
+            parsed++;
+            while (fed < numPages && pageTexts[fed] !== undefined) {
+                // Same framing extractFindings sees when splitting the joined text
+                extractor.addPage('\\n' + pageTexts[fed] + (fed < numPages - 1 ? '\\n' : ''));
+                // The deck text grows as pages are fed; the page's own copy is dropped
+                fullText += '\\n--- PAGE ' + (fed + 1) + ' ---\\n' + pageTexts[fed];
+                pageTexts[fed] = null;
+                fed++;
+            }
+            updateProgress(20 + Math.round((parsed / numPages) * 70),
+                'Parsed ' + parsed + ' of ' + numPages + ' pages, ' + extractor.issueCount() + ' issues found...');
+        }
+    }
+    await Promise.all(Array.from({ length: Math.min(4, numPages) }, readPages));
+
+    return extractor.finish(fullText, file.name);
+}
+
+// Parse an uploaded deck and extract its findings
+async function extractFlowAFindings(file, ext) {
+    if (ext === 'pdf') return parsePDF(file);
+    const extractedText = await parsePPTX(file);
+    updateProgress(70, 'Extracting findings...');
+    return extractFindings(extractedText, file.name);
+}
+'''
+
+patch('streaming-pdf',
+    '''    let fullText = '';
+
+    updateProgress(20, 'Parsing PDF (' + pdf.numPages + ' pages)...');
+
+    for (let i = 1; i <= pdf.numPages; i++) {
+        const page = await pdf.getPage(i);
+        const content = await page.getTextContent();
+        const pageText = content.items.map(item => item.str).join(' ');
+        fullText += '\\n--- PAGE ' + i + ' ---\\n' + pageText;
+        updateProgress(20 + Math.round((i / pdf.numPages) * 45), 'Parsing page ' + i + ' of ' + pdf.numPages + '...');
+    }
+
+    return fullText;
+}
+''',
+    streaming_pdf_js
+)
+
+# ===========================
+# 13. RUN FLOW A EXTRACTION IN A WEB WORKER
+# ===========================
+# Parsing and extraction move to flowa-worker.js (written next to the page,
+# see FLOW A WORKER below). The file's ArrayBuffer is transferred, progress
+# streams back, and resetFlowA terminates a running job. Pages opened from
+# file://, or whose worker script fails to load, keep the main-thread path.
+flowa_worker_client_js = '''// ============================================
+// FLOW A WORKER
+// ============================================
+const FLOWA_WORKER_SRC = 'flowa-worker.js';
+let flowAJob = null;
+let flowAWorkerFailed = false;
+
+function flowAWorkerAvailable() {
+    return typeof Worker !== 'undefined' && location.protocol !== 'file:' && !flowAWorkerFailed;
+}
+
+// The worker script could not be started (missing, blocked by CSP, or served
+// from another directory): extract on the main thread, as before the worker.
+// The File is read again, since a PDF's buffer went to the worker
+function extractWithoutWorker(file, ext, err) {
+    console.warn('Extraction worker unavailable, extracting on the main thread:', (err && err.message) || err);
+    flowAWorkerFailed = true;
+    return extractFlowAFindings(file, ext);
+}
+
+// Parse and extract in a worker. A PDF's ArrayBuffer is transferred, not
+// copied; a PPTX goes over as the File so only the entries needed are read
+async function extractInWorker(file, ext) {
+    cancelFlowAWorker();
+    const source = ext === 'pdf' ? { buffer: await file.arrayBuffer() } : { file: file };
+    // Library URLs are resolved here: the worker may live in another directory
+    const vendorScripts = {};
+    Object.keys(VENDOR_SCRIPTS).forEach(name => {
+        const lib = VENDOR_SCRIPTS[name];
+        vendorScripts[name] = { src: new URL(lib.src, location.href).href, cdn: lib.cdn };
+    });
+    return new Promise((resolve, reject) => {
+        let worker;
+        try {
+            worker = new Worker(FLOWA_WORKER_SRC);
+        } catch (err) {
+            resolve(extractWithoutWorker(file, ext, err));
+            return;
+        }
+        const job = flowAJob = { worker: worker, reject: reject };
+        const finish = () => { job.worker.terminate(); if (flowAJob === job) flowAJob = null; };
+        let started = false;
+        job.worker.onmessage = e => {
+            const msg = e.data;
+            started = true;
+            if (msg.type === 'progress') { updateProgress(msg.percent, msg.status); return; }
+            finish();
+            if (msg.type === 'done') resolve(msg.findings);
+            else reject(new Error(msg.message));
+        };
+        // The worker reports its own failures as messages; an error before the
+        // first one means its script never loaded
+        job.worker.onerror = e => {
+            finish();
+            if (started) reject(new Error(e.message || 'Extraction worker failed'));
+            else resolve(extractWithoutWorker(file, ext, e));
+        };
+        job.worker.postMessage(Object.assign({ name: file.name, ext: ext, vendorScripts: vendorScripts }, source),
+            source.buffer ? [source.buffer] : []);
+    });
+}
+
+function cancelFlowAWorker() {
+    if (!flowAJob) return;
+    const job = flowAJob;
+    flowAJob = null;
+    job.worker.terminate();
+    const err = new Error('Extraction cancelled');
+    err.name = 'AbortError';
+    job.reject(err);
+}
+
+function updateProgress(percent, status) {'''
+
+patch('flowa-worker-client', 'function updateProgress(percent, status) {', flowa_worker_client_js)
+
+patch('flowa-worker-extract',
+    '''        let extractedText = '';
+        if (ext === 'pdf') {
+            extractedText = await parsePDF(file);
+        } else {
+            extractedText = await parsePPTX(file);
+        }
+
+        updateProgress(70, 'Extracting findings...');
+
+        // Run extraction heuristics
+        const findings = extractFindings(extractedText, file.name);
+''',
+    '''        // Run extraction heuristics, or reuse a cached run on the same file
+        const findings = await extractUploadedFile(file, ext);
+'''
+)
+
+patch('flowa-worker-abort',
+    "    } catch (err) {\n        console.error('Parse error:', err);",
+    "    } catch (err) {\n        if (err.name === 'AbortError') return;\n        console.error('Parse error:', err);"
+)
+
+patch('flowa-worker-cancel',
+    'function resetFlowA() {\n',
+    'function resetFlowA() {\n    cancelFlowAWorker();\n'
+)
+
+# ===========================
+# 14. COMPILE TITLE_ISSUE_MAP INTO A MULTI-PATTERN MATCHER
+# ===========================
+# A second build stage: TITLE_ISSUE_MAP is read back from the patched page
+# and compiled into an Aho-Corasick automaton over its distinct keywords,
+# embedded as TITLE_ISSUE_MATCHER right after the map. matchIssuesFromText
+# then makes one pass over the text instead of an includes() per keyword.
+TITLE_ISSUE_MAP_JS = re.compile(r'^var TITLE_ISSUE_MAP = \[.*?^\];\n', re.M | re.S)
+TITLE_ISSUE_ENTRY = re.compile(r"\{ keywords: \[([^\]]*)\], issue: '([^']+)' \}")
+
+
+def parse_title_issue_map(html):
+    """Return the TITLE_ISSUE_MAP statement and its [(keywords, issue)] entries."""
+    m = TITLE_ISSUE_MAP_JS.search(html)
+    if not m:
+        raise PatchError("var TITLE_ISSUE_MAP not found in the v2 page")
+    entries = [(re.findall(r"'([^'\\]*)'", keywords), issue)
+               for keywords, issue in TITLE_ISSUE_ENTRY.findall(m.group())]
+    if len(entries) != m.group().count('keywords:'):
+        raise PatchError("TITLE_ISSUE_MAP has entries the matcher compiler cannot read")
+    return m.group(), entries
+
+
+def compile_title_matcher(entries):
+    """Compile TITLE_ISSUE_MAP entries into the TITLE_ISSUE_MATCHER data.
+
+    States are numbered breadth-first: `parent`/`label` describe the trie,
+    `fail` the failure links and `out` the keyword ids recognised at each
+    state (already merged along the failure chain). `entries[k]` lists the
+    map entries using keyword k, and `need[e]` how many distinct keywords
+    entry e requires.
+    """
+    keywords, keyword_ids, keyword_entries, need = [], {}, [], []
+    for e, (kws, _) in enumerate(entries):
+        distinct = list(dict.fromkeys(kws))
+        if not distinct or '' in distinct or not all(k.isascii() for k in distinct):
+            raise PatchError(f"TITLE_ISSUE_MAP entry {e} needs non-empty ASCII keywords")
+        need.append(len(distinct))
+        for k in distinct:
+            if k not in keyword_ids:
+                keyword_ids[k] = len(keywords)
+                keywords.append(k)
+                keyword_entries.append([])
+            keyword_entries[keyword_ids[k]].append(e)
+
+    trie = [{}]
+    terminal = {}
+    for k, word in enumerate(keywords):
+        node = 0
+        for ch in word:
+            if ch not in trie[node]:
+                trie.append({})
+                trie[node][ch] = len(trie) - 1
+            node = trie[node][ch]
+        terminal[node] = k
+
+    # Renumber breadth-first so every failure link points at a lower state
+    order, parent, label = [0], [0], [' ']
+    number = {0: 0}
+    for node in order:
+        for ch, child in sorted(trie[node].items()):
+            number[child] = len(order)
+            order.append(child)
+            parent.append(number[node])
+            label.append(ch)
+
+    fail = [0] * len(order)
+    out = [[] for _ in order]
+    for s, node in enumerate(order):
+        if node in terminal:
+            out[s].append(terminal[node])
+        for ch, child in sorted(trie[node].items()):
+            c = number[child]
+            if s:
+                f = fail[s]
+                while f and ch not in trie[order[f]]:
+                    f = fail[f]
+                fail[c] = number[trie[order[f]][ch]] if ch in trie[order[f]] else 0
+        if s:
+            out[s] += out[fail[s]]
+
+    return {
+        'alphabet': ''.join(sorted(set(''.join(keywords)))),
+        'parent': parent,
+        'label': ''.join(label),
+        'fail': fail,
+        'out': {str(s): ids for s, ids in enumerate(out) if ids},
+        'entries': keyword_entries,
+        'need': need,
+    }
+
+
+def title_matcher_patch(html):
+    """Patch appending TITLE_ISSUE_MATCHER to the page's TITLE_ISSUE_MAP."""
+    statement, entries = parse_title_issue_map(html)
+    data = json.dumps(compile_title_matcher(entries), separators=(',', ':'))
+    return Patch('title-issue-matcher', statement,
+                 statement + '// Generated by build_v2.py from TITLE_ISSUE_MAP; do not edit\n'
+                 'var TITLE_ISSUE_MATCHER = ' + data + ';\n', 1)
+
+
+# ===========================
+# 15. KEEP HISTORY IN INDEXEDDB OBJECT STORES
+# ===========================
+# The single localStorage JSON blob is replaced by per-entity object stores
+# (brands, messages, conversations, settings) indexed by brandId, lastUpdated
+# and status. Saves write only the records they touch; the old blob is
+# migrated once on first load and removed.
+storage_js = '''// ============================================
+// STORAGE (IndexedDB)
+// ============================================
+// Brands, messages and conversations each have an object store and are
+// written one record at a time; case studies and client names are short
+// lists kept in a settings store. Brands and settings are mirrored in memory
+// so rendering and generation stay synchronous, while messages and
+// conversations are only read back for export. Without IndexedDB the single
+// localStorage blob is used as before.
+const STORAGE_DB = 'cro_reachout';
+const STORAGE_VERSION = 2;
+const LEGACY_STORAGE_KEY = 'cro_reachout_data';
+const STORES = ['brands', 'messages', 'conversations', 'settings'];
+let storageDb = null;
+let storageData = defaultData();
+
+function defaultData() {
+    return {
+        brands: {},
+        messages: [],
+        conversations: [],
+        caseStudies: JSON.parse(JSON.stringify(DEFAULT_CASE_STUDIES)),
+        clientNames: [...DEFAULT_CLIENT_NAMES]
+    };
+}
+
+function idbRequest(request) {
+    return new Promise((resolve, reject) => {
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+function idbTransaction(storeNames, work) {
+    return new Promise((resolve, reject) => {
+        const tx = storageDb.transaction(storeNames, 'readwrite');
+        tx.oncomplete = () => resolve();
+        tx.onerror = tx.onabort = () => reject(tx.error);
+        work(tx);
+    });
+}
+
+function openStorage() {
+    if (typeof indexedDB === 'undefined') {
+        loadLegacyData();
+        return Promise.resolve();
+    }
+    const request = indexedDB.open(STORAGE_DB, STORAGE_VERSION);
+    // A tab still running an older version holds the upgrade until it closes
+    request.onblocked = () => showToast('Close the other tabs of this tool to finish loading your saved brands.');
+    request.onupgradeneeded = e => {
+        const db = request.result;
+        if (e.oldVersion < 1) {
+            const brands = db.createObjectStore('brands', { keyPath: 'id' });
+            brands.createIndex('lastUpdated', 'lastUpdated');
+            brands.createIndex('status', 'status');
+            db.createObjectStore('messages', { keyPath: 'id' }).createIndex('brandId', 'brandId');
+            db.createObjectStore('conversations', { keyPath: 'id' }).createIndex('brandId', 'brandId');
+            db.createObjectStore('settings', { keyPath: 'key' });
+        }
+        // Flow A extraction cache (not part of exports or imports)
+        if (e.oldVersion < 2) db.createObjectStore('extractions', { keyPath: 'hash' }).createIndex('usedAt', 'usedAt');
+    };
+    return idbRequest(request)
+        .then(db => {
+            // Let a newer version opened in another tab upgrade the database;
+            // until this tab is reloaded its saves go to localStorage, which
+            // the next load migrates back in
+            db.onversionchange = () => {
+                db.close();
+                storageDb = null;
+                showToast('This tool was updated in another tab. Reload this tab to keep saving to it.');
+            };
+            storageDb = db;
+            return migrateLegacyData();
+        })
+        .then(readStoredData)
+        .catch(err => {
+            console.error('IndexedDB unavailable, using localStorage:', err);
+            storageDb = null;
+            loadLegacyData();
+        });
+}
+
+// One-time move of the localStorage blob into the object stores
+function migrateLegacyData() {
+    let legacy = null;
+    try { legacy = JSON.parse(localStorage.getItem(LEGACY_STORAGE_KEY)); } catch(e) {}
+    if (!legacy) return Promise.resolve();
+    return writeAllData(legacy, false).then(() => localStorage.removeItem(LEGACY_STORAGE_KEY));
+}
+
+function readStoredData() {
+    const tx = storageDb.transaction(['brands', 'settings'], 'readonly');
+    return Promise.all([
+        idbRequest(tx.objectStore('brands').getAll()),
+        idbRequest(tx.objectStore('settings').getAll())
+    ]).then(([brands, settings]) => {
+        const data = defaultData();
+        brands.forEach(brand => { data.brands[brand.id] = brand; });
+        settings.forEach(setting => { data[setting.key] = setting.value; });
+        storageData = data;
+        invalidateCaseStudyIndex();
+    });
+}
+
+function withId(record) {
+    if (!record.id) record.id = generateUUID();
+    return record;
+}
+
+function writeAllData(data, replace) {
+    return idbTransaction(STORES, tx => {
+        if (replace) STORES.forEach(name => tx.objectStore(name).clear());
+        Object.entries(data.brands || {}).forEach(([id, brand]) => tx.objectStore('brands').put(Object.assign({ id: id }, brand)));
+        (data.messages || []).forEach(m => tx.objectStore('messages').put(withId(m)));
+        (data.conversations || []).forEach(c => tx.objectStore('conversations').put(withId(c)));
+        if (data.caseStudies) tx.objectStore('settings').put({ key: 'caseStudies', value: data.caseStudies });
+        if (data.clientNames) tx.objectStore('settings').put({ key: 'clientNames', value: data.clientNames });
+    });
+}
+
+function loadLegacyData() {
+    try {
+        const raw = localStorage.getItem(LEGACY_STORAGE_KEY);
+        if (raw) storageData = Object.assign(defaultData(), JSON.parse(raw));
+    } catch(e) {}
+    invalidateCaseStudyIndex();
+}
+
+function saveLegacyData() {
+    localStorage.setItem(LEGACY_STORAGE_KEY, JSON.stringify(storageData));
+}
+
+function storageError(err) {
+    console.error('Storage error:', err);
+    showToast('Could not save to browser storage: ' + (err ? err.message : 'unknown error'));
+}
+
+// In-memory view of brands, case studies and client names (live objects)
+function loadAllData() {
+    return storageData;
+}
+
+// Persist records to one store. Brands must already be in loadAllData().brands;
+// messages and conversations are only kept in memory without IndexedDB.
+function putRecords(storeName, records) {
+    records = records.map(withId);
+    if (!storageDb) {
+        if (storeName !== 'brands') storageData[storeName].push(...records);
+        saveLegacyData();
+        return Promise.resolve();
+    }
+    return idbTransaction(storeName, tx => records.forEach(r => tx.objectStore(storeName).put(r))).catch(storageError);
+}
+
+function putRecord(storeName, record) {
+    return putRecords(storeName, [record]);
+}
+
+function saveSetting(key, value) {
+    storageData[key] = value;
+    if (key === 'caseStudies') invalidateCaseStudyIndex();
+    if (!storageDb) {
+        saveLegacyData();
+        return Promise.resolve();
+    }
+    return idbTransaction('settings', tx => tx.objectStore('settings').put({ key: key, value: value })).catch(storageError);
+}
+
+// Replace everything (clear)
+function replaceAllData(data) {
+    storageData = Object.assign(defaultData(), data);
+    invalidateCaseStudyIndex();
+    if (!storageDb) {
+        saveLegacyData();
+        return Promise.resolve();
+    }
+    const written = writeAllData(storageData, true);
+    storageData.messages = [];
+    storageData.conversations = [];
+    return written.catch(storageError);
+}
+
+function getRecordsByBrand(storeName, brandId) {
+    if (!storageDb) return Promise.resolve(storageData[storeName].filter(r => r.brandId === brandId));
+    return idbRequest(storageDb.transaction(storeName, 'readonly').objectStore(storeName).index('brandId').getAll(brandId));
+}
+'''
+
+patch('storage-layer',
+    '''// ============================================
+// LOCALSTORAGE MANAGER
+// ============================================
+function loadAllData() {
+    try {
+        const raw = localStorage.getItem('cro_reachout_data');
+        if (raw) return JSON.parse(raw);
+    } catch(e) {}
+    // Initialize defaults
+    const defaults = {
+        brands: {},
+        messages: [],
+        conversations: [],
+        caseStudies: JSON.parse(JSON.stringify(DEFAULT_CASE_STUDIES)),
+        clientNames: [...DEFAULT_CLIENT_NAMES]
+    };
+    localStorage.setItem('cro_reachout_data', JSON.stringify(defaults));
+    return defaults;
+}
+
+function saveAllData(data) {
+    localStorage.setItem('cro_reachout_data', JSON.stringify(data));
+}
+''',
+    storage_js
+)
+
+patch('storage-case-studies',
+    '''function getCaseStudies() {
+    try {
+        const data = JSON.parse(localStorage.getItem('cro_reachout_data'));
+        if (data && data.caseStudies && data.caseStudies.length > 0) return data.caseStudies.filter(cs => cs.active);
+    } catch(e) {}
+    return DEFAULT_CASE_STUDIES;
+}
+
+function getClientNames() {
+    try {
+        const data = JSON.parse(localStorage.getItem('cro_reachout_data'));
+        if (data && data.clientNames && data.clientNames.length > 0) return data.clientNames;
+    } catch(e) {}
+    return DEFAULT_CLIENT_NAMES;
+}
+
+function getClientNamesForIndustry(industry) {
+    // Check localStorage override first
+    try {
+        const data = JSON.parse(localStorage.getItem('cro_reachout_data'));
+        if (data && data.clientNames && data.clientNames.length > 0) return data.clientNames;
+    } catch(e) {}
+''',
+    '''function getCaseStudies() {
+    const data = loadAllData();
+    if (data.caseStudies && data.caseStudies.length > 0) return data.caseStudies.filter(cs => cs.active);
+    return DEFAULT_CASE_STUDIES;
+}
+
+function getClientNames() {
+    const data = loadAllData();
+    if (data.clientNames && data.clientNames.length > 0) return data.clientNames;
+    return DEFAULT_CLIENT_NAMES;
+}
+
+function getClientNamesForIndustry(industry) {
+    // Check the saved client names first
+    const data = loadAllData();
+    if (data.clientNames && data.clientNames.length > 0) return data.clientNames;
+'''
+)
+
+patch('storage-follow-up',
+    '''    // Save conversation context
+    allData.conversations.push({''',
+    '''    putRecord('brands', allData.brands[brandId]);
+    // Save conversation context
+    putRecord('conversations', {'''
+)
+
+patch('storage-follow-up-save',
+    '''        nextAction: 'Follow-up sent', addedBy: document.getElementById('fu_senderName').value.trim()
+    });
+    saveAllData(allData);
+''',
+    '''        nextAction: 'Follow-up sent', addedBy: document.getElementById('fu_senderName').value.trim()
+    });
+'''
+)
+
+patch('storage-history-brand',
+    '''        clientType: data.clientType || 'new'
+    };
+
+    // Save initial messages''',
+    '''        clientType: data.clientType || 'new'
+    };
+    putRecord('brands', allData.brands[brandId]);
+
+    // Save initial messages'''
+)
+
+patch('storage-history-messages', "        allData.messages.push({", "        putRecord('messages', {", count=2)
+
+patch('storage-history-save', '    }\n\n    saveAllData(allData);\n', '    }\n\n')
+
+patch('storage-clear',
+    "        localStorage.removeItem('cro_reachout_data');",
+    "        replaceAllData({});"
+)
+
+patch('storage-case-study-save',
+    '''    allData.caseStudies[index].active = row.querySelector('[data-field="active"]').checked;
+    saveAllData(allData);''',
+    '''    allData.caseStudies[index].active = row.querySelector('[data-field="active"]').checked;
+    saveSetting('caseStudies', allData.caseStudies);'''
+)
+
+patch('storage-case-study-delete',
+    '''    allData.caseStudies.splice(index, 1);
+    saveAllData(allData);''',
+    '''    allData.caseStudies.splice(index, 1);
+    saveSetting('caseStudies', allData.caseStudies);'''
+)
+
+patch('storage-case-study-add',
+    '''        triggerIssues: [],
+        active: true
+    });
+    saveAllData(allData);''',
+    '''        triggerIssues: [],
+        active: true
+    });
+    saveSetting('caseStudies', allData.caseStudies);'''
+)
+
+patch('storage-client-name-add',
+    '''        allData.clientNames.push(name);
+        saveAllData(allData);''',
+    '''        allData.clientNames.push(name);
+        saveSetting('clientNames', allData.clientNames);'''
+)
+
+patch('storage-client-name-remove',
+    '''    allData.clientNames.splice(index, 1);
+    saveAllData(allData);''',
+    '''    allData.clientNames.splice(index, 1);
+    saveSetting('clientNames', allData.clientNames);'''
+)
+
+patch('storage-init',
+    '''// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    renderBrandList();
+    renderSettings();
+    populateBrandDatalist();
+});
+
+// Also render immediately if DOM is already loaded
+if (document.readyState !== 'loading') {
+    renderBrandList();
+    renderSettings();
+    populateBrandDatalist();
+}
+''',
+    '''// Initialize on page load, once stored data has been read
+const storageReady = openStorage();
+
+function renderStoredData() {
+    storageReady.then(() => {
+        renderBrandList();
+        renderSettings();
+        populateBrandDatalist();
+    });
+}
+
+document.addEventListener('DOMContentLoaded', renderStoredData);
+
+// Also render immediately if DOM is already loaded
+if (document.readyState !== 'loading') renderStoredData();
+'''
+)
+
+# ===========================
+# 16. WINDOWED BRAND HISTORY LIST
+# ===========================
+# The sidebar only holds DOM rows for brands inside its scroll viewport.
+# Brands are kept in lastUpdated order with per-status and per-phase id
+# sets, so the new filters never walk the brands map and saving one brand
+# patches its row instead of rebuilding the list.
+brand_list_css = '''        .brand-list-meta { font-size: 11px; color: var(--color-text-muted); }
+        .brand-list-filters { display: flex; gap: 8px; margin-bottom: 12px; }
+        .brand-list-filters select {
+            flex: 1; min-width: 0; padding: 6px 8px; border: 1px solid #e5e7eb; border-radius: 8px;
+            font-size: 12px; font-family: var(--font-family); background: var(--color-bg-primary);
+        }
+        .brand-list-window { position: relative; }
+        .brand-list-window .brand-list-item { position: absolute; left: 0; right: 0; height: 62px; margin: 0; }
+        .brand-list-item > div:first-child { min-width: 0; }
+        .brand-list-name, .brand-list-meta { white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+'''
+
+patch('brand-list-css', '        .brand-list-meta { font-size: 11px; color: var(--color-text-muted); }\n', brand_list_css)
+
+patch('brand-list-html',
+    '''                <div id="brandList">
+                    <div class="brand-list-empty" id="brandListEmpty">No brands saved yet. Generate messages to save a brand.</div>
+                </div>''',
+    '''                <div class="brand-list-filters">
+                    <select id="brandStatusFilter" onchange="filterBrandList()" aria-label="Filter by status">
+                        <option value="">All statuses</option>
+                        <option value="active">Active</option>
+                        <option value="won">Won</option>
+                        <option value="lost">Lost</option>
+                        <option value="paused">Paused</option>
+                    </select>
+                    <select id="brandPhaseFilter" onchange="filterBrandList()" aria-label="Filter by phase">
+                        <option value="">All phases</option>
+                        <option value="phase1">Phase 1</option>
+                        <option value="phase2">Phase 2</option>
+                        <option value="phase3">Phase 3</option>
+                        <option value="phase4">Phase 4</option>
+                        <option value="phase5">Phase 5</option>
+                    </select>
+                </div>
+                <div id="brandList">
+                    <div class="brand-list-empty" id="brandListEmpty">No brands saved yet. Generate messages to save a brand.</div>
+                    <div class="brand-list-window" id="brandListWindow"></div>
+                </div>'''
+)
+
+brand_list_js = '''// Render brand list in sidebar
+// Only rows inside the sidebar viewport (plus overscan) are in the DOM. The
+// list keeps brand ids in lastUpdated order plus per-status and per-phase
+// id sets; renderBrandList rebuilds them, updateBrandInList moves one brand.
+// .brand-list-item height + gap
+const BRAND_ROW_PITCH = 70;
+const BRAND_LIST_OVERSCAN = 4;
+const BRAND_LIST_EMPTY = 'No brands saved yet. Generate messages to save a brand.';
+const BRAND_LIST_NO_MATCH = 'No brands match these filters.';
+const brandList = {
+    order: [], byStatus: {}, byPhase: {}, keys: {},
+    visible: [], rows: new Map(), frame: 0, listening: false
+};
+
+function brandStatusKey(brand) {
+    return brand.status || 'active';
+}
+
+function brandPhaseKey(brand) {
+    const m = /^Phase (\\d)/.exec(brand.currentPhase || '');
+    return m ? 'phase' + m[1] : 'other';
+}
+
+function compareBrands(a, b) {
+    return b.lastUpdated.localeCompare(a.lastUpdated);
+}
+
+function indexBrand(brand) {
+    const keys = brandList.keys[brand.id] = { status: brandStatusKey(brand), phase: brandPhaseKey(brand) };
+    (brandList.byStatus[keys.status] = brandList.byStatus[keys.status] || new Set()).add(brand.id);
+    (brandList.byPhase[keys.phase] = brandList.byPhase[keys.phase] || new Set()).add(brand.id);
+}
+
+function unindexBrand(brandId) {
+    const keys = brandList.keys[brandId];
+    if (!keys) return;
+    brandList.byStatus[keys.status].delete(brandId);
+    brandList.byPhase[keys.phase].delete(brandId);
+    delete brandList.keys[brandId];
+    brandList.order.splice(brandList.order.indexOf(brandId), 1);
+}
+
+function renderBrandList() {
+    const brands = Object.values(loadAllData().brands).sort(compareBrands);
+    brandList.order = brands.map(b => b.id);
+    brandList.byStatus = {};
+    brandList.byPhase = {};
+    brandList.keys = {};
+    brands.forEach(indexBrand);
+    brandList.rows.forEach(row => row.remove());
+    brandList.rows.clear();
+    filterBrandList();
+}
+
+// Re-sort, re-index and repaint a single brand after it was saved or imported
+function updateBrandInList(brandId) {
+    const brands = loadAllData().brands;
+    const brand = brands[brandId];
+    unindexBrand(brandId);
+    if (brand) {
+        let lo = 0, hi = brandList.order.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (compareBrands(brands[brandList.order[mid]], brand) <= 0) lo = mid + 1;
+            else hi = mid;
+        }
+        brandList.order.splice(lo, 0, brandId);
+        indexBrand(brand);
+    }
+    const row = brandList.rows.get(brandId);
+    if (row && brand) fillBrandRow(row, brand);
+    filterBrandList();
+}
+
+function filterBrandList() {
+    const status = document.getElementById('brandStatusFilter')?.value;
+    const phase = document.getElementById('brandPhaseFilter')?.value;
+    const sets = [];
+    if (status) sets.push(brandList.byStatus[status] || new Set());
+    if (phase) sets.push(brandList.byPhase[phase] || new Set());
+    brandList.visible = sets.length ? brandList.order.filter(id => sets.every(set => set.has(id))) : brandList.order;
+
+    const empty = document.getElementById('brandListEmpty');
+    empty.textContent = brandList.order.length === 0 ? BRAND_LIST_EMPTY : BRAND_LIST_NO_MATCH;
+    empty.style.display = brandList.visible.length === 0 ? 'block' : 'none';
+    renderBrandWindow();
+}
+
+function scheduleBrandWindow() {
+    if (!brandList.frame) brandList.frame = requestAnimationFrame(renderBrandWindow);
+}
+
+function renderBrandWindow() {
+    brandList.frame = 0;
+    const win = document.getElementById('brandListWindow');
+    if (!win) return;
+    const scroller = win.closest('.brand-sidebar');
+    if (!brandList.listening) {
+        brandList.listening = true;
+        scroller.addEventListener('scroll', scheduleBrandWindow, { passive: true });
+        window.addEventListener('resize', scheduleBrandWindow);
+    }
+    const ids = brandList.visible;
+    win.style.height = ids.length * BRAND_ROW_PITCH + 'px';
+    // Visible band in window coordinates; a hidden sidebar assumes one screenful
+    const viewTop = scroller.getBoundingClientRect().top - win.getBoundingClientRect().top;
+    const viewHeight = scroller.clientHeight || window.innerHeight;
+    const first = Math.max(0, Math.floor(viewTop / BRAND_ROW_PITCH) - BRAND_LIST_OVERSCAN);
+    const last = Math.min(ids.length, Math.ceil((viewTop + viewHeight) / BRAND_ROW_PITCH) + BRAND_LIST_OVERSCAN);
+
+    const wanted = new Set(ids.slice(first, last));
+    brandList.rows.forEach((row, id) => {
+        if (!wanted.has(id)) { row.remove(); brandList.rows.delete(id); }
+    });
+    const brands = loadAllData().brands;
+    for (let i = first; i < last; i++) {
+        let row = brandList.rows.get(ids[i]);
+        if (!row) {
+            row = document.createElement('div');
+            fillBrandRow(row, brands[ids[i]]);
+            brandList.rows.set(ids[i], row);
+            win.appendChild(row);
+        }
+        row.style.top = i * BRAND_ROW_PITCH + 'px';
+    }
+}
+
+function fillBrandRow(item, brand) {
+    const statusClass = 'status-' + (brand.status || 'active');
+    item.className = 'brand-list-item';
+    item.onclick = () => viewBrandDetail(brand.id);
+    item.innerHTML = `
+            <div>
+                <div class="brand-list-name">${escapeHtml(brand.brandName)}</div>
+                <div class="brand-list-meta">${brand.currentPhase || 'Initial'} &bull; ${brand.lastUpdated}</div>
+            </div>
+            <div>
+                <span class="brand-status-badge ${statusClass}">${brand.status || 'active'}</span>
+            </div>
+        `;
+}
+'''
+
+patch('brand-list-js',
+    '''// Render brand list in sidebar
+function renderBrandList() {
+    const allData = loadAllData();
+    const brands = Object.values(allData.brands).sort((a, b) => b.lastUpdated.localeCompare(a.lastUpdated));
+    const container = document.getElementById('brandList');
+    const empty = document.getElementById('brandListEmpty');
+
+    if (brands.length === 0) {
+        container.innerHTML = '';
+        container.appendChild(empty);
+        empty.style.display = 'block';
+        return;
+    }
+
+    empty.style.display = 'none';
+    container.innerHTML = '';
+
+    brands.forEach(brand => {
+        const statusClass = 'status-' + (brand.status || 'active');
+        const item = document.createElement('div');
+        item.className = 'brand-list-item';
+        item.onclick = () => viewBrandDetail(brand.id);
+        item.innerHTML = `
+            <div>
+                <div class="brand-list-name">${escapeHtml(brand.brandName)}</div>
+                <div class="brand-list-meta">${brand.currentPhase || 'Initial'} &bull; ${brand.lastUpdated}</div>
+            </div>
+            <div>
+                <span class="brand-status-badge ${statusClass}">${brand.status || 'active'}</span>
+            </div>
+        `;
+        container.appendChild(item);
+    });
+}
+''',
+    brand_list_js
+)
+
+patch('brand-list-follow-up',
+    "    renderBrandList();\n    showToast('Follow-up saved to history",
+    "    updateBrandInList(brandId);\n    showToast('Follow-up saved to history"
+)
+
+patch('brand-list-history',
+    "    renderBrandList();\n    showToast('Brand \"' + data.brandName",
+    "    updateBrandInList(brandId);\n    showToast('Brand \"' + data.brandName"
+)
+
+patch('brand-list-dashboard',
+    "    document.getElementById('dashboard').classList.add('visible');\n}\n",
+    "    document.getElementById('dashboard').classList.add('visible');\n    scheduleBrandWindow();\n}\n"
+)
+
+# ===========================
+# 17. RENDER MESSAGES FROM A PRECOMPILED TEMPLATE TABLE
+# ===========================
+# Another second-stage patch: the wording of the email, WhatsApp, follow-up
+# sequences and contextual replies lives in cro_templates.MESSAGE_TEMPLATES.
+# The build validates its placeholders, embeds it precompiled, and swaps
+# the page's template-literal generators for lookups plus renderTemplate.
+EMAIL_GENERATOR_HEADER = '''// ============================================
+// EMAIL GENERATOR
+// ============================================
+'''
+
+message_templates_js = '''// ============================================
+// MESSAGE TEMPLATES
+// ============================================
+// Generated by build_v2.py from cro_templates.py; do not edit
+''' + templates_js() + '''
+
+// Compiled templates alternate text and placeholders: [text, name, text, ...];
+// a placeholder is a name, or [name, fallback] used when the value is empty
+function renderTemplate(parts, vars) {
+    let out = parts[0];
+    for (let i = 1; i < parts.length; i += 2) {
+        const p = parts[i];
+        out += (typeof p === 'string' ? vars[p] : vars[p[0]] || p[1]) + parts[i + 1];
+    }
+    return out;
+}
+
+function scoreBand(score) {
+    if (!score) return 'none';
+    if (score.overall < 40) return 'critical';
+    return score.overall < 60 ? 'gaps' : 'wins';
+}
+
+'''
+
+email_generator_js = EMAIL_GENERATOR_HEADER + '''function generateEmail(data) {
+    const t = MESSAGE_TEMPLATES.email;
+    const analysis = getAnalysis(data);
+    const score = data.issues.length > 0 ? analysis.score() : null;
+    const vars = {
+        recipient: data.recipientName,
+        sender: data.senderName,
+        brand: data.brandName,
+        brandType: data.brandName + (data.websiteUrl ? '\\'s Shopify store' : '\\'s store'),
+        bullets: analysis.bullets(false).map(b => '\\u2022 ' + b + '\\n\\n').join('').trim(),
+        clients: getClientNamesForIndustry(data.industry).slice(0, 4).join(', '),
+        revenueClaim: renderTemplate(MESSAGE_TEMPLATES.revenueClaims[scoreBand(score)], {})
+    };
+    vars.opener = renderTemplate(t.openers[scoreBand(score)], vars);
+    return {
+        subject: renderTemplate(t.subject, vars),
+        body: renderTemplate(data.clientType === 'exclient' ? t.exclient : t.new, vars)
+    };
+}
+'''
+
+whatsapp_generator_js = '''function generateWhatsApp(data) {
+    const t = MESSAGE_TEMPLATES.whatsapp;
+    const analysis = getAnalysis(data);
+    const score = data.issues.length > 0 ? analysis.score() : null;
+    return renderTemplate(data.clientType === 'exclient' ? t.exclient : t.new, {
+        recipient: data.recipientName,
+        sender: data.senderName,
+        brand: data.brandName,
+        bullets: analysis.bullets(true).map(b => b + '\\n').join('').trim(),
+        clients: getClientNamesForIndustry(data.industry).slice(0, 3).join(', '),
+        revenueClaim: renderTemplate(MESSAGE_TEMPLATES.revenueClaims[scoreBand(score)], {})
+    });
+}
+'''
+
+follow_up_sequence_js = '''function generateFollowUpSequence(data) {
+    const t = MESSAGE_TEMPLATES.followUps;
+    const vars = {
+        recipient: data.recipientName,
+        sender: data.senderName,
+        brand: data.brandName,
+        industry: data.industry || 'D2C',
+        mobilePS: data.mobilePS
+    };
+    // Pick a specific data point for message 1
+    let dataPoint = t.dataPoints.none;
+    if (data.mobilePS !== null) dataPoint = t.dataPoints.mobilePS;
+    else if (data.issues.includes('no_ga4')) dataPoint = t.dataPoints.no_ga4;
+    else if (data.issues.includes('no_sticky_atc')) dataPoint = t.dataPoints.no_sticky_atc;
+    vars.dataPoint = renderTemplate(dataPoint, vars);
+
+    return t[data.clientType === 'exclient' ? 'exclient' : 'new'].map(step => ({
+        title: renderTemplate(step.title, vars),
+        timing: renderTemplate(step.timing, vars),
+        email: renderTemplate(step.email, vars),
+        whatsapp: renderTemplate(step.whatsapp, vars)
+    }));
+}
+'''
+
+contextual_reply_js = '''function generateContextualReply(brand, recipient, sender, phase, blocker, days, context) {
+    // Select template based on blocker, then on time since last contact
+    const template = MESSAGE_TEMPLATES.replies[blocker] || MESSAGE_TEMPLATES.replies.no_response;
+    const variant = days > 14 ? (template.long || template.short) : template.short;
+    const vars = { brand: brand, recipient: recipient, sender: sender, context: context };
+    return { email: renderTemplate(variant.email, vars), whatsapp: renderTemplate(variant.whatsapp, vars) };
+}
+'''
+
+MESSAGE_GENERATORS = {
+    'generateEmail': message_templates_js + email_generator_js,
+    'generateWhatsApp': whatsapp_generator_js,
+    'generateFollowUpSequence': follow_up_sequence_js,
+    'generateContextualReply': contextual_reply_js,
+}
+
+
+def message_template_patches(html):
+    """Patches replacing the page's message generators with table-driven ones."""
+    errors = validate_templates()
+    if errors:
+        raise PatchError('invalid message templates:\n  ' + '\n  '.join(errors))
+    patches = []
+    for name, replacement in MESSAGE_GENERATORS.items():
+        anchor = page_declaration(html, name)
+        if name == 'generateEmail':
+            anchor = EMAIL_GENERATOR_HEADER + anchor
+        patches.append(Patch('message-templates:' + name, anchor, replacement, 1))
+    return patches
+
+
+# ===========================
+# 18. INDEX CASE STUDIES BY TRIGGER ISSUE
+# ===========================
+# The active case studies are indexed once per change to the saved list:
+# trigger issue -> bitset of the studies it triggers, and per study a bitset
+# of its trigger slots, so relevance is a popcount of two intersected
+# bitsets. Rankings are cached per issue set until the list changes again.
+case_study_index_js = '''// ============================================
+// CASE STUDY MATCHING
+// ============================================
+// getCaseStudyIndex() numbers the active case studies and maps each trigger
+// issue to a bitset of the studies it triggers. Each study also gets a bitset
+// of trigger slots, one slot per (issue, repeat), so that popcount(study &
+// query) counts a trigger listed twice twice, as the per-study filter did.
+// Results are cached per issue set; the storage layer drops the index when
+// the case studies are saved, imported or cleared.
+const CASE_STUDY_CACHE_LIMIT = 256;
+let caseStudyIndex = null;
+
+function invalidateCaseStudyIndex() {
+    caseStudyIndex = null;
+    currentAnalysis = null;   // its case studies came from the old index
+}
+
+function newBitset(size) {
+    return new Uint32Array((size + 31) >>> 5);
+}
+
+function setBit(bits, i) {
+    bits[i >>> 5] |= 1 << (i & 31);
+}
+
+function popcount32(x) {
+    x -= (x >>> 1) & 0x55555555;
+    x = (x & 0x33333333) + ((x >>> 2) & 0x33333333);
+    return Math.imul((x + (x >>> 4)) & 0x0f0f0f0f, 0x01010101) >>> 24;
+}
+
+// Call fn(i) for every set bit, in ascending order
+function forEachBit(bits, fn) {
+    for (let w = 0; w < bits.length; w++) {
+        for (let word = bits[w]; word; word &= word - 1) fn((w << 5) + 31 - Math.clz32(word & -word));
+    }
+}
+
+function getCaseStudyIndex() {
+    if (caseStudyIndex) return caseStudyIndex;
+    const studies = getCaseStudies();
+    const byIssue = new Map();   // issue -> bitset of studies
+    const slots = new Map();     // issue -> trigger slot per repeat
+    let slotCount = 0;
+    const triggerSlots = studies.map((cs, i) => {
+        const repeats = new Map();
+        return cs.triggerIssues.map(issue => {
+            if (!byIssue.has(issue)) {
+                byIssue.set(issue, newBitset(studies.length));
+                slots.set(issue, []);
+            }
+            setBit(byIssue.get(issue), i);
+            const k = repeats.get(issue) || 0;
+            repeats.set(issue, k + 1);
+            const issueSlots = slots.get(issue);
+            if (issueSlots.length === k) issueSlots.push(slotCount++);
+            return issueSlots[k];
+        });
+    });
+    const triggers = triggerSlots.map(ids => {
+        const bits = newBitset(slotCount);
+        ids.forEach(id => setBit(bits, id));
+        return bits;
+    });
+    const withSnippet = newBitset(studies.length);
+    studies.forEach((cs, i) => { if (cs.active && cs.emailSnippet) setBit(withSnippet, i); });
+    caseStudyIndex = { studies, byIssue, slots, slotCount, triggers, withSnippet, matched: new Map(), top: new Map() };
+    return caseStudyIndex;
+}
+
+// Known issues of an issue list, deduplicated and sorted (the cache key)
+function caseStudyIssueKey(index, issues) {
+    return [...new Set(issues)].filter(issue => index.byIssue.has(issue)).sort();
+}
+
+// Studies triggered by any of the issues, and the trigger slots they cover
+function caseStudyQuery(index, issues) {
+    const studies = newBitset(index.studies.length);
+    const slots = newBitset(index.slotCount);
+    issues.forEach(issue => {
+        index.byIssue.get(issue).forEach((word, w) => { studies[w] |= word; });
+        index.slots.get(issue).forEach(slot => setBit(slots, slot));
+    });
+    return { studies, slots };
+}
+
+function cacheCaseStudies(cache, key, studies) {
+    if (cache.size >= CASE_STUDY_CACHE_LIMIT) cache.clear();
+    cache.set(key, studies);
+    return studies;
+}
+
+function matchCaseStudies(issues) {
+    const index = getCaseStudyIndex();
+    const issueKey = caseStudyIssueKey(index, issues);
+    const key = issueKey.join(',');
+    let matched = index.matched.get(key);
+    if (!matched) {
+        matched = [];
+        const usedClients = new Set();
+        forEachBit(caseStudyQuery(index, issueKey).studies, i => {
+            const cs = index.studies[i];
+            if (matched.length < 3 && !usedClients.has(cs.clientName)) {
+                matched.push(cs);
+                usedClients.add(cs.clientName);
+            }
+        });
+        cacheCaseStudies(index.matched, key, matched);
+    }
+    return matched.slice();
+}
+
+// Pick top 3 most relevant case studies based on detected issues (relevance-scored)
+function getTopCaseStudiesForIssues(issues) {
+    const index = getCaseStudyIndex();
+    const issueKey = caseStudyIssueKey(index, issues);
+    const key = issueKey.join(',');
+    let top = index.top.get(key);
+    if (!top) {
+        const query = caseStudyQuery(index, issueKey);
+        const scored = [];
+        forEachBit(query.studies.map((word, w) => word & index.withSnippet[w]), i => {
+            const bits = index.triggers[i];
+            let relevance = 0;
+            for (let w = 0; w < bits.length; w++) relevance += popcount32(bits[w] & query.slots[w]);
+            scored.push({ i: i, relevance: relevance });
+        });
+        scored.sort((a, b) => b.relevance - a.relevance || a.i - b.i);
+        const seen = new Set();
+        top = [];
+        for (const { i, relevance } of scored) {
+            if (top.length >= 3) break;
+            const s = index.studies[i];
+            if (!seen.has(s.clientName)) { seen.add(s.clientName); top.push({ ...s, relevance: relevance }); }
+        }
+        // If fewer than 3 matched, pad with highest-stat studies
+        forEachBit(index.withSnippet, i => {
+            const s = index.studies[i];
+            if (top.length < 3 && !seen.has(s.clientName)) { seen.add(s.clientName); top.push(s); }
+        });
+        cacheCaseStudies(index.top, key, top);
+    }
+    return top.slice();
+}
+'''
+
+patch('case-study-index',
+    '''// ============================================
+// CASE STUDY MATCHING
+// ============================================
+function matchCaseStudies(issues) {
+    const caseStudies = getCaseStudies();
+    const matched = [];
+    const usedClients = new Set();
+
+    for (const cs of caseStudies) {
+        if (matched.length >= 3) break;
+        const hasMatch = cs.triggerIssues.some(ti => issues.includes(ti));
+        if (hasMatch && !usedClients.has(cs.clientName)) {
+            matched.push(cs);
+            usedClients.add(cs.clientName);
+        }
+    }
+
+    return matched;
+}
+
+// Pick top 3 most relevant case studies based on detected issues (relevance-scored)
+function getTopCaseStudiesForIssues(issues) {
+    const studies = getCaseStudies().filter(s => s.active && s.emailSnippet);
+    const scored = studies.map(s => ({
+        ...s,
+        relevance: s.triggerIssues.filter(t => issues.includes(t)).length
+    }));
+    scored.sort((a, b) => b.relevance - a.relevance);
+    const seen = new Set();
+    const top = [];
+    for (const s of scored) {
+        if (top.length >= 3) break;
+        if (s.relevance > 0 && !seen.has(s.clientName)) { seen.add(s.clientName); top.push(s); }
+    }
+    // If fewer than 3 matched, pad with highest-stat studies
+    if (top.length < 3) {
+        for (const s of studies) {
+            if (top.length >= 3) break;
+            if (!seen.has(s.clientName)) { seen.add(s.clientName); top.push(s); }
+        }
+    }
+    return top;
+}
+''',
+    case_study_index_js
+)
+
+# ===========================
+# 19. OPT-IN PERFORMANCE INSTRUMENTATION (--perf)
+# ===========================
+# A third stage applied only by `build_v2.py --perf`, which writes
+# index.perf.html instead of index.html; the default build never contains
+# it. Uploads and generate clicks become runs whose stages (file reads,
+# parsing, extraction, form population, generation, storage writes) are
+# wrapped in performance.mark/measure, listed in a Settings panel and
+# exportable as JSON.
+PERF_OUTPUT_PATH = os.path.join(BASE_DIR, "index.perf.html")
+
+perf_css = '''
+        /* PERF BUILD: INSTRUMENTATION PANEL */
+        .perf-panel summary { cursor: pointer; font-weight: 600; font-size: 14px; }
+        .perf-run { border-top: 1px solid #e5e7eb; padding: 10px 0; font-size: 12px; }
+        .perf-run-head { margin-bottom: 6px; }
+        .perf-stage { display: flex; justify-content: space-between; padding: 2px 0 2px 16px; color: var(--color-text-muted); font-family: monospace; }
+'''
+
+perf_panel_html = '''
+        <!-- Performance (perf builds only) -->
+        <div class="settings-section">
+            <details class="perf-panel">
+                <summary>Performance runs (instrumented build)</summary>
+                <p class="form-hint" style="margin:12px 0;">Stage timings of the last uploads and generations. Heap figures need Chrome.</p>
+                <button class="btn-secondary" onclick="exportPerfRuns()" style="padding:10px 20px;font-size:13px;">Export Runs (JSON)</button>
+                <div id="perfPanelBody"></div>
+            </details>
+        </div>
+'''
+
+perf_js = '''// ============================================
+// PERFORMANCE INSTRUMENTATION (build_v2.py --perf)
+// ============================================
+// Each upload or generate click is a run; the stages it calls are timed
+// with performance.mark/measure (visible in the DevTools timeline) and,
+// where the browser exposes it, the JS heap size. Stages called outside a
+// run (e.g. a storage write from Settings) are recorded as their own run.
+// Extraction in the Flow A worker shows up as one extractInWorker stage.
+const PERF_RUN_LIMIT = 20;
+const PERF_RUNS = ['processUploadedFile', 'generateMessages', 'generateFromFlowA', 'generateFromWorksheet'];
+const PERF_STAGES = [
+    'hashUploadedFile', 'parsePDF', 'parsePPTX', 'extractFindings', 'extractInWorker', 'populateVerifyForm',
+    'generateEmail', 'generateWhatsApp', 'generateFollowUpSequence', 'displayScoreSummary', 'renderFollowupCards',
+    'putRecords', 'saveSetting', 'replaceAllData'
+];
+const PERF_RUN_DETAILS = {
+    processUploadedFile: file => ({ file: file.name, bytes: file.size })
+};
+const perfRuns = [];
+let perfActiveRun = null;
+let perfSeq = 0;
+
+function perfHeap() {
+    return performance.memory ? performance.memory.usedJSHeapSize : null;
+}
+
+// Call fn, then report { stage, ms, heapDelta } once it (or its promise) settles
+function perfTime(name, fn, self, args, report) {
+    const mark = 'cro:' + name + ':' + (++perfSeq);
+    const start = performance.now();
+    const heap = perfHeap();
+    performance.mark(mark);
+    const finish = () => {
+        performance.measure('cro:' + name, mark);
+        performance.clearMarks(mark);
+        const heapEnd = perfHeap();
+        report({ stage: name, ms: performance.now() - start, heapDelta: heap === null || heapEnd === null ? null : heapEnd - heap });
+    };
+    let result;
+    try {
+        result = fn.apply(self, args);
+    } catch (err) {
+        finish();
+        throw err;
+    }
+    if (result && typeof result.then === 'function') return result.finally(finish);
+    finish();
+    return result;
+}
+
+function perfRun(name, fn) {
+    return function() {
+        if (perfActiveRun) return fn.apply(this, arguments);
+        const run = perfActiveRun = {
+            name: name, started: new Date().toISOString(), ms: 0, heapDelta: null,
+            detail: PERF_RUN_DETAILS[name] ? PERF_RUN_DETAILS[name].apply(null, arguments) : null, stages: []
+        };
+        return perfTime(name, fn, this, arguments, total => {
+            run.ms = total.ms;
+            run.heapDelta = total.heapDelta;
+            if (perfActiveRun === run) perfActiveRun = null;
+            perfRuns.unshift(run);
+            if (perfRuns.length > PERF_RUN_LIMIT) perfRuns.pop();
+            renderPerfPanel();
+        });
+    };
+}
+
+function perfStage(name, fn) {
+    const standalone = perfRun(name, fn);
+    return function() {
+        const run = perfActiveRun;
+        if (!run) return standalone.apply(this, arguments);
+        return perfTime(name, fn, this, arguments, stage => run.stages.push(stage));
+    };
+}
+
+function installPerfInstrumentation() {
+    PERF_RUNS.forEach(name => { if (typeof window[name] === 'function') window[name] = perfRun(name, window[name]); });
+    PERF_STAGES.forEach(name => { if (typeof window[name] === 'function') window[name] = perfStage(name, window[name]); });
+    if (typeof Blob !== 'undefined' && Blob.prototype.arrayBuffer) {
+        Blob.prototype.arrayBuffer = perfStage('fileRead', Blob.prototype.arrayBuffer);
+    }
+}
+
+function perfHeapText(delta) {
+    return delta === null ? '' : ' &middot; heap ' + (delta >= 0 ? '+' : '') + (delta / 1048576).toFixed(1) + ' MB';
+}
+
+function renderPerfPanel() {
+    const body = document.getElementById('perfPanelBody');
+    if (!body) return;
+    if (perfRuns.length === 0) {
+        body.innerHTML = '<p class="form-hint">No runs recorded yet.</p>';
+        return;
+    }
+    body.innerHTML = perfRuns.map(run => '<div class="perf-run"><div class="perf-run-head"><strong>' + escapeHtml(run.name) + '</strong> '
+        + (run.detail && run.detail.file ? escapeHtml(run.detail.file) + ' ' : '') + run.started.replace('T', ' ').slice(0, 19)
+        + ' &middot; ' + run.ms.toFixed(1) + ' ms' + perfHeapText(run.heapDelta) + '</div>'
+        + run.stages.map(s => '<div class="perf-stage"><span>' + escapeHtml(s.stage) + '</span><span>' + s.ms.toFixed(1) + ' ms'
+            + perfHeapText(s.heapDelta) + '</span></div>').join('') + '</div>').join('');
+}
+
+function exportPerfRuns() {
+    downloadJSON({
+        exportDate: new Date().toISOString(),
+        userAgent: navigator.userAgent,
+        heapLimit: performance.memory ? performance.memory.jsHeapSizeLimit : null,
+        runs: perfRuns
+    }, 'cro_perf_runs.json');
+}
+
+installPerfInstrumentation();
+
+'''
+
+PERF_PATCHES = [
+    Patch('perf-css', '    </style>', perf_css + '    </style>', 1),
+    Patch('perf-panel',
+          '''            <input type="file" id="importFileInput" accept=".ndjson,.json" style="display:none;" onchange="handleImportFile(event)">
+        </div>
+''',
+          '''            <input type="file" id="importFileInput" accept=".ndjson,.json" style="display:none;" onchange="handleImportFile(event)">
+        </div>
+''' + perf_panel_html, 1),
+    Patch('perf-render-settings',
+          'function renderSettings() {\n    renderCaseStudyTable();\n    renderClientNameTags();\n',
+          'function renderSettings() {\n    renderCaseStudyTable();\n    renderClientNameTags();\n    renderPerfPanel();\n', 1),
+    Patch('perf-runtime',
+          '// Initialize on page load, once stored data has been read\n',
+          perf_js + '// Initialize on page load, once stored data has been read\n', 1),
+]
+
+
+# ===========================
+# 20. STREAM PPTX SLIDE AND NOTES TEXT
+# ===========================
+# parsePPTX no longer loads the whole archive. The ZIP central directory is
+# read from the end of the File, and only the slide, notes and notes-rels
+# entries are sliced out and inflated with DecompressionStream, a few at a
+# time. Their XML is tokenized as it streams in, which also picks up
+# <a:t xml:space=...> runs and speaker notes. Browsers without deflate-raw
+# (and ZIP64 decks) fall back to JSZip with the same tokenizer.
+pptx_text_js = '''// ============================================
+// PPTX TEXT EXTRACTION
+// ============================================
+// Slides and their speaker notes are read straight from the File: only the
+// entries listed below are sliced out of the archive and inflated, up to
+// PPTX_INFLATE_CONCURRENCY at once, and their XML is tokenized chunk by
+// chunk. Progress counts compressed bytes read.
+const PPTX_INFLATE_CONCURRENCY = 4;
+const PPTX_PARTS = {
+    slide: ['ppt/slides/slide', '.xml'],
+    notes: ['ppt/notesSlides/notesSlide', '.xml'],
+    notesRels: ['ppt/notesSlides/_rels/notesSlide', '.xml.rels']
+};
+
+// The number in e.g. ppt/slides/slide12.xml, or 0 when `name` is not that part
+function pptxPartNumber(name, part) {
+    const [prefix, suffix] = PPTX_PARTS[part];
+    if (!name.startsWith(prefix) || !name.endsWith(suffix)) return 0;
+    const digits = name.slice(prefix.length, name.length - suffix.length);
+    const n = parseInt(digits, 10);
+    return n > 0 && String(n) === digits ? n : 0;
+}
+
+function decodeXmlText(text) {
+    let amp = text.indexOf('&');
+    if (amp < 0) return text;
+    let out = '', pos = 0;
+    while (amp >= 0) {
+        const semi = text.indexOf(';', amp);
+        if (semi < 0) break;
+        const name = text.slice(amp + 1, semi);
+        let ch = null;
+        if (name === 'amp') ch = '&';
+        else if (name === 'lt') ch = '<';
+        else if (name === 'gt') ch = '>';
+        else if (name === 'quot') ch = '"';
+        else if (name === 'apos') ch = "'";
+        else if (name[0] === '#') {
+            const code = name[1] === 'x' || name[1] === 'X' ? parseInt(name.slice(2), 16) : parseInt(name.slice(1), 10);
+            if (code >= 0 && code <= 0x10ffff) ch = String.fromCodePoint(code);
+        }
+        if (ch !== null) {
+            out += text.slice(pos, amp) + ch;
+            pos = semi + 1;
+        }
+        amp = text.indexOf('&', ch !== null ? pos : amp + 1);
+    }
+    return out + text.slice(pos);
+}
+
+function xmlTagName(tag) {
+    let end = 0;
+    while (end < tag.length && tag.charCodeAt(end) > 32 && !(tag[end] === '/' && end > 0)) end++;
+    return tag.slice(0, end);
+}
+
+// Single-pass tokenizer over streamed XML chunks: collects the text of
+// <a:t> runs (with or without attributes), skipping slide number fields
+function createPPTXTextCollector() {
+    const runs = [];
+    let tag = null;     // source of a tag split across chunks
+    let run = null;     // raw text of the open <a:t> run
+    let inSlideNumber = false;
+
+    function closeTag(source) {
+        const name = xmlTagName(source);
+        if (name === 'a:t') {
+            if (source[source.length - 1] !== '/') run = '';
+        } else if (name === '/a:t') {
+            if (run && !inSlideNumber) runs.push(decodeXmlText(run));
+            run = null;
+        } else if (name === 'a:fld') {
+            inSlideNumber = source.includes('type="slidenum"');
+        } else if (name === '/a:fld') {
+            inSlideNumber = false;
+        }
+    }
+
+    return {
+        write(chunk) {
+            let pos = 0;
+            while (pos < chunk.length) {
+                if (tag !== null) {
+                    const end = chunk.indexOf('>', pos);
+                    if (end < 0) { tag += chunk.slice(pos); return; }
+                    closeTag(tag + chunk.slice(pos, end));
+                    tag = null;
+                    pos = end + 1;
+                } else {
+                    const lt = chunk.indexOf('<', pos);
+                    if (run !== null) run += chunk.slice(pos, lt < 0 ? chunk.length : lt);
+                    if (lt < 0) return;
+                    tag = '';
+                    pos = lt + 1;
+                }
+            }
+        },
+        text() { return runs.join(' '); }
+    };
+}
+
+function pptxStreamingSupported() {
+    if (typeof DecompressionStream === 'undefined' || typeof TextDecoderStream === 'undefined') return false;
+    try {
+        new DecompressionStream('deflate-raw');
+        return true;
+    } catch (e) {
+        return false;
+    }
+}
+
+// Map of entry name -> { method, compressedSize, offset } from the ZIP
+// central directory, or null for ZIP64 archives
+async function readZipDirectory(blob) {
+    // End of central directory record: 22 bytes, rarely followed by a comment
+    // of up to 64 KB, which is only searched for when the record is not last
+    let tail, eocd = -1;
+    for (const length of [22, 22 + 0xffff]) {
+        tail = new DataView(await blob.slice(Math.max(0, blob.size - length)).arrayBuffer());
+        eocd = tail.byteLength - 22;
+        while (eocd >= 0 && tail.getUint32(eocd, true) !== 0x06054b50) eocd--;
+        if (eocd >= 0) break;
+    }
+    if (eocd < 0) throw new Error('Not a valid PPTX file');
+    const count = tail.getUint16(eocd + 10, true);
+    const size = tail.getUint32(eocd + 12, true);
+    const offset = tail.getUint32(eocd + 16, true);
+    if (count === 0xffff || size === 0xffffffff || offset === 0xffffffff) return null;
+
+    const dir = new DataView(await blob.slice(offset, offset + size).arrayBuffer());
+    const decoder = new TextDecoder();
+    const entries = new Map();
+    for (let p = 0, i = 0; i < count; i++) {
+        if (dir.getUint32(p, true) !== 0x02014b50) throw new Error('Corrupt PPTX file');
+        const nameLength = dir.getUint16(p + 28, true);
+        const skip = nameLength + dir.getUint16(p + 30, true) + dir.getUint16(p + 32, true);
+        entries.set(decoder.decode(new Uint8Array(dir.buffer, p + 46, nameLength)), {
+            method: dir.getUint16(p + 10, true),
+            compressedSize: dir.getUint32(p + 20, true),
+            offset: dir.getUint32(p + 42, true)
+        });
+        p += 46 + skip;
+    }
+    return entries;
+}
+
+// Archive readers list entry names and stream one entry's text into `write`,
+// calling `progress` with the units read (compressed bytes where known)
+async function openPPTXArchive(blob) {
+    const entries = pptxStreamingSupported() ? await readZipDirectory(blob) : null;
+    if (!entries) {
+        const [arrayBuffer] = await Promise.all([blob.arrayBuffer(), loadVendorScript('jszip')]);
+        const zip = await JSZip.loadAsync(arrayBuffer);
+        return {
+            names: Object.keys(zip.files),
+            size: () => 1,
+            read: async (name, write, progress) => { write(await zip.file(name).async('string')); progress(1); }
+        };
+    }
+    return {
+        names: Array.from(entries.keys()),
+        size: name => entries.get(name).compressedSize,
+        read: async (name, write, progress) => {
+            const entry = entries.get(name);
+            const header = new DataView(await blob.slice(entry.offset, entry.offset + 30).arrayBuffer());
+            const start = entry.offset + 30 + header.getUint16(26, true) + header.getUint16(28, true);
+            let stream = blob.slice(start, start + entry.compressedSize).stream().pipeThrough(new TransformStream({
+                transform(chunk, controller) { progress(chunk.byteLength); controller.enqueue(chunk); }
+            }));
+            if (entry.method === 8) stream = stream.pipeThrough(new DecompressionStream('deflate-raw'));
+            else if (entry.method !== 0) throw new Error('Unsupported compression in ' + name);
+            const reader = stream.pipeThrough(new TextDecoderStream()).getReader();
+            for (let chunk = await reader.read(); !chunk.done; chunk = await reader.read()) write(chunk.value);
+        }
+    };
+}
+
+// PPTX Parser: slide text, then that slide's speaker notes
+async function parsePPTX(file) {
+    const blob = typeof Blob !== 'undefined' && file instanceof Blob ? file : new Blob([await file.arrayBuffer()]);
+    const archive = await openPPTXArchive(blob);
+    const slides = new Map(), notes = new Map(), notesRels = new Map();
+    const jobs = [];
+    for (const name of archive.names) {
+        const slide = pptxPartNumber(name, 'slide');
+        const note = pptxPartNumber(name, 'notes');
+        const rels = pptxPartNumber(name, 'notesRels');
+        if (slide || note) {
+            const collector = createPPTXTextCollector();
+            (slide ? slides : notes).set(slide || note, collector);
+            jobs.push([name, collector]);
+        } else if (rels) {
+            notesRels.set(rels, '');
+            jobs.push([name, { write: chunk => notesRels.set(rels, notesRels.get(rels) + chunk) }]);
+        }
+    }
+
+    const total = jobs.reduce((sum, [name]) => sum + archive.size(name), 0) || 1;
+    let read = 0, shown = -1, next = 0;
+    const progress = bytes => {
+        read += bytes;
+        const percent = 20 + Math.round((read / total) * 45);
+        if (percent === shown) return;
+        shown = percent;
+        updateProgress(percent, 'Parsing PPTX (' + slides.size + ' slides, ' +
+            Math.round(read / total * 100) + '% read)...');
+    };
+    updateProgress(20, 'Parsing PPTX (' + slides.size + ' slides)...');
+    async function readEntries() {
+        while (next < jobs.length) {
+            const [name, collector] = jobs[next++];
+            await archive.read(name, chunk => collector.write(chunk), progress);
+        }
+    }
+    await Promise.all(Array.from({ length: Math.min(PPTX_INFLATE_CONCURRENCY, jobs.length) }, readEntries));
+
+    // Notes belong to the slide their relationships point at
+    const slideNotes = new Map();
+    notes.forEach((collector, n) => {
+        const rels = notesRels.get(n) || '';
+        const at = rels.indexOf('slides/slide');
+        slideNotes.set(at < 0 ? n : parseInt(rels.slice(at + 12), 10), collector.text());
+    });
+
+    let fullText = '';
+    let slideNum = 0;
+    for (const n of Array.from(slides.keys()).sort((a, b) => a - b)) {
+        slideNum++;
+        const slideText = [slides.get(n).text(), slideNotes.get(n)].filter(Boolean).join('\\n');
+        if (slideText) fullText += '\\n--- SLIDE ' + slideNum + ' ---\\n' + slideText;
+    }
+    return fullText;
+}
+'''
+
+patch('pptx-text',
+    '''// PPTX Parser using JSZip
+async function parsePPTX(file) {
+    const arrayBuffer = await file.arrayBuffer();
+    const zip = await JSZip.loadAsync(arrayBuffer);
+    let fullText = '';
+    let slideNum = 0;
+
+    // Find all slide XML files
+    const slideFiles = Object.keys(zip.files)
+        .filter(name => name.match(/^ppt\\/slides\\/slide\\d+\\.xml$/))
+        .sort((a, b) => {
+            const numA = parseInt(a.match(/slide(\\d+)/)[1]);
+            const numB = parseInt(b.match(/slide(\\d+)/)[1]);
+            return numA - numB;
+        });
+
+    updateProgress(20, 'Parsing PPTX (' + slideFiles.length + ' slides)...');
+
+    for (const slidePath of slideFiles) {
+        slideNum++;
+        const xml = await zip.file(slidePath).async('string');
+        // Extract text from <a:t> elements
+        const textMatches = xml.match(/<a:t>([^<]*)<\\/a:t>/g);
+        if (textMatches) {
+            const slideText = textMatches.map(m => m.replace(/<\\/?a:t>/g, '')).join(' ');
+            fullText += '\\n--- SLIDE ' + slideNum + ' ---\\n' + slideText;
+        }
+        updateProgress(20 + Math.round((slideNum / slideFiles.length) * 45), 'Parsing slide ' + slideNum + ' of ' + slideFiles.length + '...');
+    }
+
+    return fullText;
+}
+''',
+    pptx_text_js
+)
+
+
+# ===========================
+# 21. CACHE FLOW A EXTRACTIONS BY CONTENT HASH
+# ===========================
+# processUploadedFile (via extractUploadedFile, see section 13) hashes the
+# deck with SubtleCrypto and looks it up in an LRU 'extractions' store
+# before parsing. EXTRACTOR_VERSION is stamped in by a second-stage patch
+# with a digest of the extraction code the worker runs (TITLE_ISSUE_MAP,
+# extractor, parsers), so any rebuild that changes them misses the cache.
+EXTRACTOR_VERSION_STUB = "const EXTRACTOR_VERSION = 'unversioned';"
+
+extraction_cache_js = '''// ============================================
+// FLOW A EXTRACTION CACHE
+// ============================================
+// Findings are kept in IndexedDB under the SHA-256 of the uploaded file, so
+// re-uploading a deck skips parsing entirely. Entries are stamped with the
+// build's EXTRACTOR_VERSION and file name (extraction falls back to it for
+// the brand); anything else is a miss. Saving also drops entries from other
+// builds and the least recently used ones beyond EXTRACTION_CACHE_LIMIT.
+// Generated by build_v2.py from the extraction code; do not edit
+''' + EXTRACTOR_VERSION_STUB + '''
+const EXTRACTION_CACHE_LIMIT = 50;
+const EXTRACTION_HASH_CHUNK = 4 * 1024 * 1024;
+
+// Hex SHA-256 over the digests of 4 MB slices and the file size, so a large
+// deck is never read into memory whole
+async function hashUploadedFile(file) {
+    if (typeof crypto === 'undefined' || !crypto.subtle) return null;
+    const chunks = Math.ceil(file.size / EXTRACTION_HASH_CHUNK);
+    const joined = new Uint8Array(chunks * 32 + 8);
+    for (let i = 0; i < chunks; i++) {
+        const slice = await file.slice(i * EXTRACTION_HASH_CHUNK, (i + 1) * EXTRACTION_HASH_CHUNK).arrayBuffer();
+        joined.set(new Uint8Array(await crypto.subtle.digest('SHA-256', slice)), i * 32);
+    }
+    new DataView(joined.buffer).setFloat64(chunks * 32, file.size);
+    const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', joined));
+    return Array.from(digest, b => b.toString(16).padStart(2, '0')).join('');
+}
+
+function getCachedExtraction(hash, name) {
+    if (!storageDb || !hash) return Promise.resolve(null);
+    return idbRequest(storageDb.transaction('extractions', 'readonly').objectStore('extractions').get(hash))
+        .then(entry => {
+            if (!entry || entry.version !== EXTRACTOR_VERSION || entry.name !== name) return null;
+            entry.usedAt = Date.now();
+            idbTransaction('extractions', tx => tx.objectStore('extractions').put(entry)).catch(() => {});
+            return entry.findings;
+        })
+        .catch(() => null);
+}
+
+function cacheExtraction(hash, name, findings) {
+    if (!storageDb || !hash) return Promise.resolve();
+    return idbTransaction('extractions', tx => {
+        const store = tx.objectStore('extractions');
+        store.put({ hash: hash, version: EXTRACTOR_VERSION, name: name, findings: findings, usedAt: Date.now() });
+        idbRequest(store.count()).then(count => {
+            let excess = count - EXTRACTION_CACHE_LIMIT;
+            const cursors = store.index('usedAt').openCursor();
+            cursors.onsuccess = () => {
+                const cursor = cursors.result;
+                if (!cursor) return;
+                if (excess > 0 || cursor.value.version !== EXTRACTOR_VERSION) {
+                    cursor.delete();
+                    excess--;
+                }
+                cursor.continue();
+            };
+        });
+    }).catch(err => console.warn('Extraction cache not updated:', err));
+}
+
+// Findings for an uploaded deck: cached when this build has seen its bytes,
+// otherwise extracted off the main thread when possible
+async function extractUploadedFile(file, ext) {
+    const hash = await hashUploadedFile(file).catch(() => null);
+    const cached = await getCachedExtraction(hash, file.name);
+    if (cached) {
+        updateProgress(80, 'Loaded the saved extraction for this file...');
+        return cached;
+    }
+    const findings = flowAWorkerAvailable() ? await extractInWorker(file, ext) : await extractFlowAFindings(file, ext);
+    cacheExtraction(hash, file.name, findings);
+    return findings;
+}
+
+async function processUploadedFile(file) {'''
+
+patch('extraction-cache', 'async function processUploadedFile(file) {', extraction_cache_js)
+
+
+def extractor_version(html):
+    """Digest of the extraction code and TITLE_ISSUE_MAP the page's worker runs.
+
+    TITLE_ISSUE_MATCHER is not in the page yet; the compiler that builds it
+    stands in for it.
+    """
+    sources = [page_declaration(html, name) for name in WORKER_DECLARATIONS if name != 'TITLE_ISSUE_MATCHER']
+    return digest(inspect.getsource(compile_title_matcher) + ''.join(sources))[:16]
+
+
+def extractor_version_patch(html):
+    """Patch stamping EXTRACTOR_VERSION into the page."""
+    return Patch('extractor-version', EXTRACTOR_VERSION_STUB,
+                 f"const EXTRACTOR_VERSION = '{extractor_version(html)}';", 1)
+
+
+# ===========================
+# 22. WORK OVER ONE DECK TEXT WITH PAGE OFFSET RANGES
+# ===========================
+# finishFindings no longer lowercases the whole deck or keeps per-page text
+# copies (section 12 gives pages start/end offsets instead): perf/intro text
+# is sliced from the ranges, the industry and competitor checks lowercase a
+# page at a time and stop early, and brand words are counted as matched.
+patch('brand-word-counts',
+    '''        var words = text.match(/[A-Z][a-zA-Z']+(?:\\s+[A-Z][a-zA-Z']+)*/g) || [];
+        var freq = {};
+        for (var wi = 0; wi < words.length; wi++) {
+            var wl = words[wi].toLowerCase();
+            if (wl.length > 2 && !stopWords.has(wl) && !/growisto/i.test(words[wi])) {
+                freq[words[wi]] = (freq[words[wi]] || 0) + 1;
+            }
+        }
+''',
+    '''        // Capitalized phrases are counted as they match rather than collected first
+        var wordPattern = /[A-Z][a-zA-Z']+(?:\\s+[A-Z][a-zA-Z']+)*/g;
+        var freq = {};
+        for (var wm = wordPattern.exec(text); wm; wm = wordPattern.exec(text)) {
+            var word = wm[0], wl = word.toLowerCase();
+            if (wl.length > 2 && !stopWords.has(wl) && !/growisto/i.test(word)) {
+                freq[word] = (freq[word] || 0) + 1;
+            }
+        }
+'''
+)
+
+patch('perf-page-ranges',
+    "        if (pages[psi].section === 'PERFORMANCE') perfText += '\\n' + pages[psi].text;\n",
+    "        if (pages[psi].section === 'PERFORMANCE') perfText += '\\n' + text.slice(pages[psi].start, pages[psi].end);\n"
+)
+
+patch('intro-page-ranges',
+    "        if (pages[ini].section === 'INTRO') introText += '\\n' + pages[ini].text;\n",
+    "        if (pages[ini].section === 'INTRO') introText += '\\n' + text.slice(pages[ini].start, pages[ini].end);\n"
+)
+
+patch('industry-terms',
+    '''    // ---- STEP 6: Industry detection (full text) ----
+    if (t.includes('skincare') || t.includes('beauty') || t.includes('cosmetic') || t.includes('skin care')) findings.industry = 'skincare';
+    else if (t.includes('fashion') || t.includes('apparel') || t.includes('clothing')) findings.industry = 'fashion';
+    else if (t.includes('electronics') || t.includes('gadget') || t.includes('earbuds') || t.includes('headphone') || t.includes('speaker')) findings.industry = 'electronics';
+    else if (t.includes('health') || t.includes('wellness') || t.includes('supplement') || t.includes('ayurved') || t.includes('pharma')) findings.industry = 'health';
+    else if (t.includes('food') || t.includes('beverage') || t.includes('coffee') || t.includes('tea') || t.includes('chai')) findings.industry = 'food';
+    else if (t.includes('jewel') || t.includes('accessor')) findings.industry = 'jewelry';
+    else if (t.includes('water') || t.includes('filter') || t.includes('purif')) findings.industry = 'home';
+    else if (t.includes('motorcycle') || t.includes('auto') || t.includes('bike')) findings.industry = 'automotive';
+''',
+    '''    // ---- STEP 6: Industry detection (full text, lowercased a page at a time) ----
+    var industry = findLowercaseTerms(text, pages, ['skincare', 'beauty', 'cosmetic', 'skin care', 'fashion',
+        'apparel', 'clothing', 'electronics', 'gadget', 'earbuds', 'headphone', 'speaker', 'health', 'wellness',
+        'supplement', 'ayurved', 'pharma', 'food', 'beverage', 'coffee', 'tea', 'chai', 'jewel', 'accessor', 'water',
+        'filter', 'purif', 'motorcycle', 'auto', 'bike']);
+    var has = function(term) { return industry.has(term); };
+    if (has('skincare') || has('beauty') || has('cosmetic') || has('skin care')) findings.industry = 'skincare';
+    else if (has('fashion') || has('apparel') || has('clothing')) findings.industry = 'fashion';
+    else if (has('electronics') || has('gadget') || has('earbuds') || has('headphone') || has('speaker')) findings.industry = 'electronics';
+    else if (has('health') || has('wellness') || has('supplement') || has('ayurved') || has('pharma')) findings.industry = 'health';
+    else if (has('food') || has('beverage') || has('coffee') || has('tea') || has('chai')) findings.industry = 'food';
+    else if (has('jewel') || has('accessor')) findings.industry = 'jewelry';
+    else if (has('water') || has('filter') || has('purif')) findings.industry = 'home';
+    else if (has('motorcycle') || has('auto') || has('bike')) findings.industry = 'automotive';
+'''
+)
+
+patch('competitor-terms',
+    '''    for (var bi = 0; bi < knownBrands.length; bi++) {
+        if (t.includes(knownBrands[bi].toLowerCase()) && findings.brandName.toLowerCase() !== knownBrands[bi].toLowerCase()) {
+''',
+    '''    var mentioned = findLowercaseTerms(text, pages, knownBrands.map(function(b) { return b.toLowerCase(); }));
+    for (var bi = 0; bi < knownBrands.length; bi++) {
+        if (mentioned.has(knownBrands[bi].toLowerCase()) && findings.brandName.toLowerCase() !== knownBrands[bi].toLowerCase()) {
+'''
+)
+
+
+# ===========================
+# 23. STREAM HISTORY EXPORT/IMPORT AS NDJSON
+# ===========================
+# Exports are versioned NDJSON written batch by batch into Blob parts, and
+# imports read the file in slices, parse it line by line and merge each
+# batch by record id (last writer wins on lastUpdated) instead of replacing
+# or appending, yielding to the page between batches. Version 1 JSON
+# exports are still accepted and merged the same way.
+history_transfer_js = '''// Export/Import
+// An export is NDJSON: a header line, then one { store, record } line per
+// record. Records are read TRANSFER_BATCH at a time and gathered into Blob
+// parts, so no copy of the whole dataset is built as one string. Imports
+// read the file IMPORT_CHUNK_BYTES at a time and merge each batch of lines
+// by record id; an incoming record replaces a stored one unless that was
+// updated later, so importing the same file twice changes nothing.
+const EXPORT_FORMAT = 'cro-reachout';
+const EXPORT_VERSION = 2;
+const TRANSFER_BATCH = 500;
+const IMPORT_CHUNK_BYTES = 1024 * 1024;
+const SETTING_KEYS = ['caseStudies', 'clientNames'];
+
+function yieldToPage() {
+    return new Promise(resolve => setTimeout(resolve));
+}
+
+function createExportWriter(kind) {
+    const parts = [];
+    let lines = [JSON.stringify({ format: EXPORT_FORMAT, exportVersion: EXPORT_VERSION, kind: kind, exportDate: new Date().toISOString() })];
+    const flush = () => {
+        if (lines.length) parts.push(new Blob([lines.join('\\n') + '\\n']));
+        lines = [];
+    };
+    return {
+        write(store, record) {
+            lines.push(JSON.stringify({ store: store, record: record }));
+            if (lines.length >= TRANSFER_BATCH) flush();
+        },
+        blob() {
+            flush();
+            return new Blob(parts, { type: 'application/x-ndjson' });
+        }
+    };
+}
+
+// Every record of a store, TRANSFER_BATCH at a time, each batch read in its
+// own transaction so the page gets a turn in between
+async function forEachStoredBatch(storeName, onBatch) {
+    if (!storageDb) {
+        const list = storageData[storeName];
+        for (let i = 0; i < list.length; i += TRANSFER_BATCH) onBatch(list.slice(i, i + TRANSFER_BATCH));
+        return;
+    }
+    let range = null;
+    for (;;) {
+        const store = storageDb.transaction(storeName, 'readonly').objectStore(storeName);
+        const batch = await idbRequest(store.getAll(range, TRANSFER_BATCH));
+        onBatch(batch);
+        if (batch.length < TRANSFER_BATCH) return;
+        range = IDBKeyRange.lowerBound(batch[batch.length - 1].id, true);
+        await yieldToPage();
+    }
+}
+
+function writeSettings(out) {
+    SETTING_KEYS.forEach(key => out.write('settings', { key: key, value: storageData[key] }));
+}
+
+async function exportBrandJSON(brandId) {
+    const brand = loadAllData().brands[brandId];
+    if (!brand) return;
+    const out = createExportWriter('brand');
+    out.write('brands', brand);
+    for (const storeName of ['messages', 'conversations']) {
+        (await getRecordsByBrand(storeName, brandId)).forEach(record => out.write(storeName, record));
+    }
+    downloadBlob(out.blob(), brand.brandName.toLowerCase().replace(/\\s+/g, '_') + '_context.ndjson');
+}
+
+async function exportAllData() {
+    const out = createExportWriter('full');
+    Object.entries(loadAllData().brands).forEach(([id, brand]) => out.write('brands', Object.assign({ id: id }, brand)));
+    for (const storeName of ['messages', 'conversations']) {
+        await forEachStoredBatch(storeName, batch => batch.forEach(record => out.write(storeName, record)));
+    }
+    writeSettings(out);
+    downloadBlob(out.blob(), 'cro_reachout_full_export.ndjson');
+    showToast('Full data exported!');
+}
+
+function downloadJSON(obj, filename) {
+    downloadBlob(new Blob([JSON.stringify(obj, null, 2)], { type: 'application/json' }), filename);
+}
+
+function downloadBlob(blob, filename) {
+    const url = URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url; a.download = filename;
+    document.body.appendChild(a); a.click();
+    document.body.removeChild(a); URL.revokeObjectURL(url);
+}
+
+function parseExportHeader(line) {
+    let header = null;
+    try { header = JSON.parse(line); } catch(e) {}
+    if (!header || header.format !== EXPORT_FORMAT) return null;
+    if (header.exportVersion > EXPORT_VERSION) throw new Error('this export is from a newer version of the tool');
+    return header;
+}
+
+// Feed an export file's { store, record } lines to onBatch, TRANSFER_BATCH
+// at a time, and return its header (null if it is not an export)
+async function readExportFile(file, onBatch) {
+    const decoder = new TextDecoder();
+    const readChunk = async pos => decoder.decode(new Uint8Array(await file.slice(pos, pos + IMPORT_CHUNK_BYTES).arrayBuffer()),
+        { stream: pos + IMPORT_CHUNK_BYTES < file.size });
+    let pending = await readChunk(0);
+    const headerEnd = pending.indexOf('\\n');
+    const header = parseExportHeader(headerEnd === -1 ? pending : pending.slice(0, headerEnd));
+    if (!header) return readLegacyExport(file, onBatch);
+
+    pending = headerEnd === -1 ? '' : pending.slice(headerEnd + 1);
+    let batch = [], lineNum = 1;
+    for (let pos = IMPORT_CHUNK_BYTES; ; pos += IMPORT_CHUNK_BYTES) {
+        const done = pos >= file.size;
+        const lines = pending.split('\\n');
+        pending = done ? '' : lines.pop();
+        for (const line of lines) {
+            lineNum++;
+            if (!line.trim()) continue;
+            try { batch.push(JSON.parse(line)); }
+            catch(err) { throw new Error('line ' + lineNum + ': ' + err.message); }
+            if (batch.length >= TRANSFER_BATCH) {
+                await onBatch(batch);
+                batch = [];
+            }
+        }
+        if (done) break;
+        pending += await readChunk(pos);
+    }
+    if (batch.length) await onBatch(batch);
+    return header;
+}
+
+// Version 1 exports: one JSON document holding the whole dataset or one brand
+async function readLegacyExport(file, onBatch) {
+    const imported = JSON.parse(await file.text());
+    const lines = [];
+    const add = (store, records) => (records || []).forEach(record => lines.push({ store: store, record: record }));
+    if (imported.brand) add('brands', [imported.brand]);
+    else if (imported.brands && imported.messages) add('brands', Object.entries(imported.brands).map(([id, brand]) => Object.assign({ id: id }, brand)));
+    else return null;
+    add('messages', imported.messages);
+    add('conversations', imported.conversations);
+    add('settings', SETTING_KEYS.filter(key => imported[key]).map(key => ({ key: key, value: imported[key] })));
+    for (let i = 0; i < lines.length; i += TRANSFER_BATCH) await onBatch(lines.slice(i, i + TRANSFER_BATCH));
+    return { format: EXPORT_FORMAT, exportVersion: 1, kind: imported.brand ? 'brand' : 'full' };
+}
+
+// Last writer wins; records without lastUpdated (messages, conversations) are
+// simply replaced, which is what makes a repeated import a no-op
+function isNewerRecord(incoming, stored) {
+    return !stored || (incoming.lastUpdated || '') >= (stored.lastUpdated || '');
+}
+
+// Merge one batch of { store, record } lines. Brands and settings are decided
+// against the in-memory view; messages and conversations against their store
+function mergeRecords(lines, stats) {
+    const writes = [];
+    const listed = new Map();
+    lines.forEach(line => {
+        const record = line && line.record;
+        if (!record || typeof record !== 'object' || STORES.indexOf(line.store) === -1) {
+            stats.skipped++;
+        } else if (line.store === 'settings') {
+            if (SETTING_KEYS.indexOf(record.key) === -1) { stats.skipped++; return; }
+            storageData[record.key] = record.value;
+            if (record.key === 'caseStudies') invalidateCaseStudyIndex();
+            stats.settings = true;
+            stats.updated++;
+            writes.push(line);
+        } else if (line.store === 'brands') {
+            if (!record.id) { stats.skipped++; return; }
+            const stored = storageData.brands[record.id];
+            if (!isNewerRecord(record, stored)) { stats.kept++; return; }
+            stats[stored ? 'updated' : 'added']++;
+            storageData.brands[record.id] = record;
+            writes.push(line);
+        } else if (!storageDb) {
+            mergeIntoList(line.store, withId(record), stats);
+        } else {
+            // Repeats within the batch are settled here, before the store is read
+            const key = line.store + ' ' + withId(record).id;
+            const earlier = listed.get(key);
+            if (earlier && !isNewerRecord(record, earlier.record)) return;
+            listed.set(key, line);
+        }
+    });
+    if (!storageDb) return Promise.resolve();
+    return idbTransaction(STORES, tx => {
+        writes.forEach(({ store, record }) => tx.objectStore(store).put(record));
+        listed.forEach(({ store, record }) => {
+            const objectStore = tx.objectStore(store);
+            const request = objectStore.get(record.id);
+            request.onsuccess = () => {
+                if (!isNewerRecord(record, request.result)) { stats.kept++; return; }
+                stats[request.result ? 'updated' : 'added']++;
+                objectStore.put(record);
+            };
+        });
+    });
+}
+
+// Without IndexedDB messages and conversations live in storageData arrays
+function mergeIntoList(storeName, record, stats) {
+    const list = storageData[storeName];
+    const positions = stats.positions[storeName] || (stats.positions[storeName] = new Map(list.map((r, i) => [r.id, i])));
+    const at = positions.get(record.id);
+    if (at === undefined) {
+        positions.set(record.id, list.length);
+        list.push(record);
+        stats.added++;
+    } else if (isNewerRecord(record, list[at])) {
+        list[at] = record;
+        stats.updated++;
+    } else {
+        stats.kept++;
+    }
+}
+
+async function importExportFile(file) {
+    const stats = { added: 0, updated: 0, kept: 0, skipped: 0, settings: false, positions: {} };
+    let read = 0;
+    const header = await readExportFile(file, async batch => {
+        await mergeRecords(batch, stats);
+        read += batch.length;
+        showToast('Importing... ' + read + ' records');
+        await yieldToPage();
+    });
+    if (!header) {
+        showToast('Invalid import file format.');
+        return;
+    }
+    if (!storageDb) saveLegacyData();
+    renderBrandList();
+    if (stats.settings) renderSettings();
+    showToast('Imported: ' + stats.added + ' new, ' + stats.updated + ' updated' +
+        (stats.kept ? ', ' + stats.kept + ' older copies skipped' : '') + '.');
+}
+
+function importBrandJSON() {
+    const input = document.createElement('input');
+    input.type = 'file'; input.accept = '.ndjson,.json';
+    input.onchange = async (e) => {
+        const file = e.target.files[0];
+        if (!file) return;
+        try {
+            await importExportFile(file);
+        } catch (err) {
+            showToast('Error importing: ' + err.message);
+        }
+    };
+    input.click();
+}
+
+function importAllData() {
+    document.getElementById('importFileInput').click();
+}
+
+async function handleImportFile(event) {
+    const file = event.target.files[0];
+    if (!file) return;
+    event.target.value = '';
+    try {
+        await importExportFile(file);
+    } catch(err) {
+        showToast('Error importing: ' + err.message);
+    }
+}
+
+'''
+
+patch('history-transfer',
+    '''// Export/Import
+function exportBrandJSON(brandId) {
+    const allData = loadAllData();
+    const brand = allData.brands[brandId];
+    if (!brand) return;
+    const exportObj = {
+        exportVersion: 1,
+        exportDate: new Date().toISOString().split('T')[0],
+        brand: brand,
+        messages: allData.messages.filter(m => m.brandId === brandId),
+        conversations: allData.conversations.filter(c => c.brandId === brandId)
+    };
+    downloadJSON(exportObj, brand.brandName.toLowerCase().replace(/\\s+/g, '_') + '_context.json');
+}
+
+function exportAllData() {
+    const allData = loadAllData();
+    downloadJSON(allData, 'cro_reachout_full_export.json');
+    showToast('Full data exported!');
+}
+
+function downloadJSON(obj, filename) {
+    const blob = new Blob([JSON.stringify(obj, null, 2)], { type: 'application/json' });
+    const url = URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url; a.download = filename;
+    document.body.appendChild(a); a.click();
+    document.body.removeChild(a); URL.revokeObjectURL(url);
+}
+
+function importBrandJSON() {
+    const input = document.createElement('input');
+    input.type = 'file'; input.accept = '.json';
+    input.onchange = async (e) => {
+        const file = e.target.files[0];
+        if (!file) return;
+        try {
+            const text = await file.text();
+            const imported = JSON.parse(text);
+            const allData = loadAllData();
+
+            if (imported.brand) {
+                // Single brand import
+                allData.brands[imported.brand.id] = imported.brand;
+                if (imported.messages) allData.messages.push(...imported.messages);
+                if (imported.conversations) allData.conversations.push(...imported.conversations);
+                saveAllData(allData);
+                renderBrandList();
+                showToast('Brand "' + imported.brand.brandName + '" imported!');
+            } else {
+                showToast('Invalid import file format.');
+            }
+        } catch (err) {
+            showToast('Error importing: ' + err.message);
+        }
+    };
+    input.click();
+}
+
+function importAllData() {
+    document.getElementById('importFileInput').click();
+}
+
+function handleImportFile(event) {
+    const file = event.target.files[0];
+    if (!file) return;
+    const reader = new FileReader();
+    reader.onload = function(e) {
+        try {
+            const imported = JSON.parse(e.target.result);
+            if (imported.brands && imported.messages) {
+                saveAllData(imported);
+                renderBrandList();
+                renderSettings();
+                showToast('All data imported successfully!');
+            } else {
+                showToast('Invalid import format. Expected full export file.');
+            }
+        } catch(err) {
+            showToast('Error importing: ' + err.message);
+        }
+    };
+    reader.readAsText(file);
+    event.target.value = '';
+}
+
+''',
+    history_transfer_js
+)
+
+patch('history-import-accept',
+    '<input type="file" id="importFileInput" accept=".json"',
+    '<input type="file" id="importFileInput" accept=".ndjson,.json"'
+)
+
+
+# ===========================
+# BUILD CACHE
+# ===========================
+# Fragments whose hashes are tracked individually for the --stats report.
+# The output key is the template plus the Python sources that build the
+# page: every fragment and patch, and the code that runs the second stage.
+BUILD_SOURCES = tuple(os.path.join(BASE_DIR, name) for name in ('build_v2.py', 'cro_templates.py', 'cro_scoring.py'))
+CACHED_FRAGMENTS = {
+    'new_css': new_css,
+    'path2_html': path2_html,
+    'score_card_html': score_card_html,
+    'scoring_engine_js': scoring_engine_js,
+    'vendor_loader_js': vendor_loader_js,
+    'incremental_extractor_js': incremental_extractor_js,
+    'streaming_pdf_js': streaming_pdf_js,
+    'flowa_worker_client_js': flowa_worker_client_js,
+    'storage_js': storage_js,
+    'brand_list_js': brand_list_js,
+    'message_generators_js': ''.join(MESSAGE_GENERATORS.values()),
+    'case_study_index_js': case_study_index_js,
+    'pptx_text_js': pptx_text_js,
+    'extraction_cache_js': extraction_cache_js,
+    'history_transfer_js': history_transfer_js,
+}
+
+
+def digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def sources_digest(paths=None):
+    h = hashlib.sha256()
+    for path in paths or BUILD_SOURCES:
+        with open(path, 'rb') as f:
+            h.update(f.read())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def patch_set_digest(patches):
+    h = hashlib.sha256()
+    for p in patches:
+        for part in (p.name, p.anchor, p.replacement, str(p.count)):
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+    return h.hexdigest()
+
+
+class BuildCache:
+    """Content-addressed store of built pages under .build_cache/.
+
+    manifest.json records the template, fragment, source and output hashes
+    of the last build; objects/<key>.html holds the current output of each
+    mode (default and --perf), keyed by the template and source hashes.
+    Superseded outputs are removed.
+    """
+
+    def __init__(self, root=None):
+        root = root or CACHE_DIR
+        self.root = root
+        self.objects = os.path.join(root, 'objects')
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.stats = {'hits': [], 'misses': []}
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    def record(self, name, hit):
+        self.stats['hits' if hit else 'misses'].append(name)
+
+    def get(self, key):
+        try:
+            with open(os.path.join(self.objects, key + '.html'), 'r') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key, html):
+        os.makedirs(self.objects, exist_ok=True)
+        with open(os.path.join(self.objects, key + '.html'), 'w') as f:
+            f.write(html)
+
+    def prune(self, keep):
+        """Remove every stored output whose key is not in `keep`."""
+        try:
+            names = os.listdir(self.objects)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith('.html') and name[:-len('.html')] not in keep:
+                os.remove(os.path.join(self.objects, name))
+
+
+def write_if_changed(path, text):
+    """Write `text` to `path` unless the file already holds the same bytes."""
+    data = text.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def build(template, perf=False):
+    """Return the v2 page for a v1 template (instrumented when `perf` is set)."""
+    html = apply_patches(template, PATCHES)
+    # Second stage: patches computed from the patched page itself
+    html = apply_patches(html, [title_matcher_patch(html), extractor_version_patch(html)] + message_template_patches(html))
+    # Third stage, --perf builds only
+    return apply_patches(html, PERF_PATCHES) if perf else html
+
+
+def cached_build(template, cache, force=False, perf=False):
+    """Return the v2 page, reusing a cached build when the inputs are unchanged."""
+    previous = cache.load_manifest()
+    template_hash = digest(template)
+    fragments = {name: digest(text) for name, text in CACHED_FRAGMENTS.items()}
+    patches_hash = patch_set_digest(PATCHES)
+    sources_hash = sources_digest()
+
+    cache.record('template', previous.get('template') == template_hash)
+    for name, h in fragments.items():
+        cache.record(name, previous.get('fragments', {}).get(name) == h)
+    cache.record('sources', previous.get('sources') == sources_hash)
+
+    mode = 'perf' if perf else 'default'
+    key = digest(template_hash + sources_hash + mode)
+    html = None if force else cache.get(key)
+    cache.record('output', html is not None)
+    if html is None:
+        html = build(template, perf)
+        cache.put(key, html)
+    outputs = dict(previous.get('outputs', {}), **{mode: key})
+    cache.prune(set(outputs.values()))
+
+    cache.save_manifest({
+        'template': template_hash,
+        'fragments': fragments,
+        'patches': patches_hash,
+        'sources': sources_hash,
+        'outputs': outputs,
+        'output': digest(html),
+    })
+    return html
+
+
+# ===========================
+# BATCH VARIANTS
+# ===========================
+# A manifest (JSON or TOML) lists branded variants of the v2 page, e.g.
+#
+#   {"variants": [{"name": "pod-north", "output": "dist/north/index.html",
+#                  "title": "CRO Reach-Out Generator | North Pod",
+#                  "caseStudies": [...], "clientNames": ["Atomberg", ...],
+#                  "scoringWeights": {"no_ga4": {"impactScore": 9}}}]}
+#
+# Output paths are relative to the manifest. The v1 template is read and
+# patched once; workers only apply the per-variant patches on top. Each
+# variant gets its own flowa-worker.js, which the page loads from its own
+# directory.
+V2_TITLE = '<title>CRO Reach-Out Generator v2 | Growisto</title>'
+WEIGHT_FIELDS = ('impactScore', 'pointsAtStake')
+
+
+def load_manifest(path):
+    if path.endswith('.toml'):
+        import tomllib
+        with open(path, 'rb') as f:
+            manifest = tomllib.load(f)
+    else:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    variants = manifest.get('variants') or []
+    if not variants:
+        raise ValueError(f"{path}: manifest lists no variants")
+    base = os.path.dirname(os.path.abspath(path))
+    for v in variants:
+        if 'name' not in v or 'output' not in v:
+            raise ValueError(f"{path}: every variant needs a 'name' and an 'output'")
+        v['output'] = os.path.join(base, v['output'])
+    return variants
+
+
+def js_const_literal(html, name):
+    """Return the full `const NAME = [...];` statement declared in the page."""
+    m = re.search(r'^const ' + name + r' = \[.*?\];$', html, re.M | re.S)
+    if not m:
+        raise PatchError(f"const {name} not found in the v2 page")
+    return m.group()
+
+
+def variant_patches(html, variant):
+    name = variant['name']
+    patches = []
+    if 'title' in variant:
+        patches.append(Patch('title', V2_TITLE, '<title>' + variant['title'] + '</title>', 1))
+    if 'caseStudies' in variant:
+        patches.append(Patch('case-studies', js_const_literal(html, 'DEFAULT_CASE_STUDIES'),
+                             'const DEFAULT_CASE_STUDIES = ' + json.dumps(variant['caseStudies'], indent=4, ensure_ascii=False) + ';', 1))
+    if 'clientNames' in variant:
+        patches.append(Patch('client-names', js_const_literal(html, 'DEFAULT_CLIENT_NAMES'),
+                             'const DEFAULT_CLIENT_NAMES = ' + json.dumps(variant['clientNames'], ensure_ascii=False) + ';', 1))
+    for key, weights in variant.get('scoringWeights', {}).items():
+        m = re.search(r'^    ' + re.escape(key) + r':\s*\{.*$', html, re.M)
+        if not m:
+            raise ValueError(f"variant '{name}': unknown finding '{key}' in scoringWeights")
+        line = m.group()
+        for field, value in weights.items():
+            if field not in WEIGHT_FIELDS:
+                raise ValueError(f"variant '{name}': cannot override '{field}' of '{key}'")
+            line = re.sub(field + r': -?\d+', f'{field}: {int(value)}', line, count=1)
+        patches.append(Patch('weights:' + key, m.group(), line, 1))
+    return patches
+
+
+def build_variant(base_html, variant):
+    """Return a branded variant of an already built v2 page."""
+    return apply_patches(base_html, variant_patches(base_html, variant))
+
+
+_worker_base_html = None
+
+
+def _init_variant_worker(base_html):
+    # Runs once per worker process, so the base page is shipped once per worker
+    global _worker_base_html
+    _worker_base_html = base_html
+
+
+def _build_variant_job(variant):
+    start = time.perf_counter()
+    html = build_variant(_worker_base_html, variant)
+    out_dir = os.path.dirname(variant['output'])
+    os.makedirs(out_dir, exist_ok=True)
+    written = write_if_changed(variant['output'], html)
+    written |= write_if_changed(os.path.join(out_dir, os.path.basename(WORKER_PATH)), flowa_worker_js(html))
+    return variant['name'], variant['output'], time.perf_counter() - start, len(html.encode('utf-8')), written
+
+
+def build_variants(base_html, variants, workers=None):
+    """Build every variant in a process pool and yield per-variant results in manifest order."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_variant_worker,
+                             initargs=(base_html,)) as pool:
+        yield from pool.map(_build_variant_job, variants)
+
+
+# ===========================
+# FLOW A WORKER
+# ===========================
+WORKER_PATH = os.path.join(BASE_DIR, "flowa-worker.js")
+
+# Top-level page declarations the worker runs, copied verbatim from the built page
+WORKER_DECLARATIONS = (
+    'TITLE_ISSUE_MAP', 'TITLE_ISSUE_MATCHER', 'SECTION_DIVIDERS', 'OBSERVATION_SECTIONS',
+    'EVIDENCE_CHARS', 'titleIssueTable', 'titleIssueMatcherTable', 'matchIssueEntries', 'matchIssuesFromText',
+    'matchIssueSpans', 'matchPageIssues', 'evidenceSnippet', 'createIssueRecord', 'forEachPageRange',
+    'findLowercaseTerms', 'createFindingsExtractor', 'extractFindings', 'finishFindings',
+    'parsePDF', 'PPTX_INFLATE_CONCURRENCY', 'PPTX_PARTS', 'pptxPartNumber', 'decodeXmlText', 'xmlTagName',
+    'createPPTXTextCollector', 'pptxStreamingSupported', 'readZipDirectory', 'openPPTXArchive', 'parsePPTX',
+    'extractFlowAFindings',
+)
+
+flowa_worker_runtime_js = '''// Flow A extraction worker. Generated by build_v2.py from index.html; do not edit.
+// Receives { name, ext, buffer or file, vendorScripts } and posts progress, then done or error.
+var VENDOR_SCRIPTS = {};
+var vendorLoads = {};
+
+function updateProgress(percent, status) {
+    self.postMessage({ type: 'progress', percent: percent, status: status });
+}
+
+async function loadVendorScript(name) {
+    var lib = VENDOR_SCRIPTS[name];
+    if (!vendorLoads[name]) {
+        try {
+            importScripts(lib.src);
+            vendorLoads[name] = lib.src;
+        } catch (err) {
+            if (!lib.cdn) throw err;
+            importScripts(lib.cdn);
+            vendorLoads[name] = lib.cdn;
+        }
+    }
+    return vendorLoads[name];
+}
+
+self.onmessage = async function(e) {
+    var msg = e.data;
+    VENDOR_SCRIPTS = msg.vendorScripts;
+    var file = msg.file || { name: msg.name, arrayBuffer: async function() { return msg.buffer; } };
+    try {
+        self.postMessage({ type: 'done', findings: await extractFlowAFindings(file, msg.ext) });
+    } catch (err) {
+        self.postMessage({ type: 'error', message: err.message });
+    }
+};
+'''
+
+
+def page_declaration(html, name):
+    """Return the source of a top-level var/const/function declared in the page."""
+    m = re.search(r'^(?:var |const |let |function |async function )' + re.escape(name) + r'\b.*$', html, re.M)
+    if not m:
+        raise PatchError(f"{name} not found in the v2 page")
+    if m.group().endswith(';'):
+        return m.group() + '\n'
+    end = re.compile(r'^[}\]];?\n', re.M).search(html, m.end())
+    return html[m.start():end.end()]
+
+
+def flowa_worker_js(html):
+    """Return the Flow A worker script for a built page."""
+    return '\n'.join([flowa_worker_runtime_js] + [page_declaration(html, name) for name in WORKER_DECLARATIONS])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the v2 CRO Reach-Out Generator page from the v1 template.')
+    parser.add_argument('--force', action='store_true', help='ignore the build cache and rebuild')
+    parser.add_argument('--stats', action='store_true', help='report build cache hits and misses')
+    parser.add_argument('--manifest', help='JSON/TOML manifest of branded variants to build instead of index.html')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes for --manifest (default: CPU count)')
+    parser.add_argument('--release', metavar='DIR',
+                        help='also write a minified, dead-code-free, precompressed release build with a precaching service worker to DIR')
+    parser.add_argument('--perf', action='store_true',
+                        help='write an instrumented build with a performance panel to index.perf.html (never ship it)')
+    args = parser.parse_args(argv)
+    if args.perf and (args.manifest or args.release):
+        parser.error('--perf cannot be combined with --manifest or --release')
+
+    with open(V1_PATH, 'r') as f:
+        template = f.read()
+
+    cache = BuildCache()
+    try:
+        html = cached_build(template, cache, force=args.force, perf=args.perf)
+    except PatchError as e:
+        raise SystemExit(f"Build failed, v1 template does not match the patch set:\n{e}")
+
+    if args.manifest:
+        try:
+            variants = load_manifest(args.manifest)
+            start = time.perf_counter()
+            for name, path, seconds, size, written in build_variants(html, variants, args.workers):
+                state = 'written' if written else 'unchanged'
+                print(f"  {name}: {size / 1024:.1f} KB in {seconds * 1000:.0f} ms ({state}) -> {path}")
+        except (ValueError, PatchError) as e:
+            raise SystemExit(f"Variant build failed: {e}")
+        print(f"{len(variants)} variants built in {time.perf_counter() - start:.2f}s")
+    else:
+        # Write the final file, leaving it untouched (and its mtime stable) when identical
+        output_path = PERF_OUTPUT_PATH if args.perf else OUTPUT_PATH
+        written = write_if_changed(output_path, html)
+        try:
+            write_if_changed(WORKER_PATH, flowa_worker_js(html))
+        except PatchError as e:
+            raise SystemExit(f"Build failed, cannot assemble the Flow A worker: {e}")
+
+        # Count lines
+        line_count = html.count('\n') + 1
+        if written:
+            print(f"V2 file written: {len(html)} chars, ~{line_count} lines")
+        else:
+            print(f"V2 file unchanged: {len(html)} chars, ~{line_count} lines")
+        print(f"Output: {output_path}")
+        print(f"Worker: {WORKER_PATH}")
+
+        if args.release:
+            try:
+                shipped, pruned = prune_page(html)
+                print_prune_report(pruned)
+                report = release_page(shipped, args.release)
+            except ValueError as e:
+                raise SystemExit(f"Release failed: {e}")
+            print(f"Release written to {args.release}:")
+            print_report(report)
+
+    if args.stats:
+        print(f"Cache hits ({len(cache.stats['hits'])}): {', '.join(cache.stats['hits']) or '-'}")
+        print(f"Cache misses ({len(cache.stats['misses'])}): {', '.join(cache.stats['misses']) or '-'}")
+
 
-# Count lines
-line_count = html.count('\n') + 1
-print(f"V2 file written: {len(html)} chars, ~{line_count} lines")
-print(f"Output: {OUTPUT_PATH}")
+if __name__ == '__main__':
+    main()
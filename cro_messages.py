@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Headless outreach message generation.
+
+Ports of the page's generateSmartBullets, generateEmail, generateWhatsApp,
+generateFollowUpSequence, generateContextualReply and
+getTopCaseStudiesForIssues, giving identical messages. Wording comes from
+cro_templates.py, findings and scores from cro_scoring.py; case studies and
+client names are read from a built page (DEFAULT_CASE_STUDIES and
+DEFAULT_CLIENT_NAMES, so branded variants work too), optionally overridden
+by a full data export from the page's Settings: the NDJSON file written by
+Export All (a header line, then one {"store", "record"} line per record,
+of which only the "settings" lines are read) or a version 1 JSON export.
+
+Prospects are streamed: rows are read, generated and written a chunk at a
+time, so memory stays flat however long the input is. --workers spreads
+the chunks over a process pool and keeps the input order.
+
+Usage:
+    python cro_messages.py prospects.csv -o messages.csv
+    python cro_messages.py prospects.ndjson --format ndjson --workers 4 > messages.ndjson
+    python cro_messages.py prospects.csv --page dist/north/index.html --settings cro_reachout_full_export.ndjson
+
+Input rows use the page's form fields: brandName, websiteUrl, recipientName,
+senderName, mobilePS, desktopPS, industry, clientType ('new' or 'exclient')
+and issues (as for cro_scoring.py). brand, url, recipient and sender are
+accepted as aliases. Other fields are passed through to the output.
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from cro_scoring import (FINDING_REGISTRY, SPEED_ISSUES, _parse_issues, _parse_ps,
+                         calculate_estimated_cro_score, read_records, write_records)
+from cro_templates import COMPILED_TEMPLATES as TEMPLATES, render
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PAGE = os.path.join(BASE_DIR, 'index.html')
+
+# Header of the page's history export (see build_v2.py section 23)
+EXPORT_FORMAT = 'cro-reachout'
+EXPORT_VERSION = 2
+
+FIELD_ALIASES = {'brandName': 'brand', 'websiteUrl': 'url', 'recipientName': 'recipient', 'senderName': 'sender'}
+FOLLOW_UPS = 4
+MESSAGE_FIELDS = (['emailSubject', 'emailBody', 'whatsapp']
+                  + [f'followUp{n}{channel}' for n in range(1, FOLLOW_UPS + 1) for channel in ('Email', 'WhatsApp')]
+                  + ['caseStudies'])
+
+# Industry-specific brand pools, used when no client names are configured
+INDUSTRY_CLIENT_POOLS = {
+    'skincare': ['Pilgrim', 'Kaya Clinic', 'Kama Ayurveda', 'OZiva', 'Ubeauty'],
+    'fashion': ['Bewakoof', 'Nobero', 'Freakins', 'Powerlook', 'PUMA India'],
+    'electronics': ['Atomberg', 'Boat', 'TyresNmore'],
+    'health': ['Kaya Clinic', 'Kama Ayurveda', 'OZiva', 'Pathkind Labs'],
+    'food': ['Monsoon Harvest', 'OZiva', 'Atomberg'],
+    'jewelry': ['Pilgrim', 'Kama Ayurveda', 'Kaya Clinic'],
+    'home': ['Atomberg', 'TyresNmore', 'Powerlook'],
+    'automotive': ['TyresNmore', 'Atomberg'],
+}
+
+ATOMBERG_SPEED_CASE = "We took Atomberg's page speed scores up by 100% and saw a 167% conversion rate jump as part of a broader CRO program."
+
+
+# ===========================
+# PAGE SETTINGS
+# ===========================
+JS_TOKEN = re.compile(r'''\s*(?:(?P<str>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")|(?P<num>-?\d+(?:\.\d+)?)'''
+                      r'''|(?P<word>[A-Za-z_$][\w$]*)|(?P<punct>[\[\]{}:,]))''', re.S)
+JS_ESCAPE = re.compile(r'\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)', re.S)
+JS_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+JS_WORDS = {'true': True, 'false': False, 'null': None}
+
+
+def _js_unquote(token):
+    def unescape(m):
+        seq = m.group(1)
+        if len(seq) > 1:
+            return chr(int(seq[1:], 16))
+        return JS_ESCAPES.get(seq, seq)
+    text = JS_ESCAPE.sub(unescape, token[1:-1])
+    # \uXXXX pairs decode to surrogates; recombine them
+    return text.encode('utf-16', 'surrogatepass').decode('utf-16')
+
+
+def parse_js_literal(source):
+    """Parse a JavaScript array/object literal of plain data (strings, numbers, booleans, null)."""
+    tokens = []
+    pos = 0
+    while source[pos:].strip():
+        m = JS_TOKEN.match(source, pos)
+        if not m:
+            raise ValueError(f'unexpected JavaScript at offset {pos}: {source[pos:pos + 30]!r}')
+        tokens.append((m.lastgroup, m.group(m.lastgroup)))
+        pos = m.end()
+    tokens.append(('end', None))
+    pos = 0
+
+    def value():
+        nonlocal pos
+        kind, text = tokens[pos]
+        pos += 1
+        if kind == 'str':
+            return _js_unquote(text)
+        if kind == 'num':
+            return float(text) if '.' in text else int(text)
+        if kind == 'word' and text in JS_WORDS:
+            return JS_WORDS[text]
+        if text in ('[', '{'):
+            close = ']' if text == '[' else '}'
+            items = [] if text == '[' else {}
+            while tokens[pos][1] != close:
+                if text == '[':
+                    items.append(value())
+                else:
+                    key_kind, key = tokens[pos]
+                    if tokens[pos + 1][1] != ':':
+                        raise ValueError(f'expected ":" after key {key!r}')
+                    pos += 2
+                    items[_js_unquote(key) if key_kind == 'str' else key] = value()
+                if tokens[pos][1] == ',':
+                    pos += 1
+                elif tokens[pos][1] != close:
+                    raise ValueError(f'expected "," or "{close}", got {tokens[pos][1]!r}')
+            pos += 1
+            return items
+        raise ValueError(f'unexpected token {text!r}')
+
+    result = value()
+    if tokens[pos][0] != 'end':
+        raise ValueError(f'trailing JavaScript after literal: {tokens[pos][1]!r}')
+    return result
+
+
+def page_const(html, name):
+    """Return the value of a top-level `const NAME = [...];` data literal in the page."""
+    m = re.search(r'^const ' + name + r' = (\[.*?\]);$', html, re.M | re.S)
+    if not m:
+        raise ValueError(f'const {name} not found in the page')
+    return parse_js_literal(m.group(1))
+
+
+def read_export_settings(path):
+    """Saved settings ({key: value}) from a data export of the page.
+
+    A version 2 export is NDJSON and is read a line at a time, keeping only
+    the "settings" records; anything else is read as a version 1 JSON export.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get('format') != EXPORT_FORMAT:
+            f.seek(0)
+            return json.load(f)
+        if header.get('exportVersion', 0) > EXPORT_VERSION:
+            raise ValueError(f'{path} is from a newer version of the tool')
+        saved = {}
+        for num, line in enumerate(f, 2):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as err:
+                raise ValueError(f'{path}: line {num}: {err}')
+            if entry.get('store') == 'settings':
+                saved[entry['record']['key']] = entry['record'].get('value')
+        return saved
+
+
+def load_settings(page=DEFAULT_PAGE, export=None):
+    """Case studies and client names as the page uses them.
+
+    `export` is a full data export from the page; its saved case studies
+    and client names replace the page defaults, as they do in the browser.
+    """
+    with open(page, 'r') as f:
+        html = f.read()
+    settings = {'caseStudies': page_const(html, 'DEFAULT_CASE_STUDIES'),
+                'clientNames': page_const(html, 'DEFAULT_CLIENT_NAMES')}
+    if export:
+        saved = read_export_settings(export)
+        settings.update({key: saved[key] for key in settings if saved.get(key)})
+    return settings
+
+
+def case_studies(settings):
+    """Port of getCaseStudies."""
+    return [cs for cs in settings['caseStudies'] if cs.get('active')]
+
+
+def client_names_for_industry(industry, settings):
+    """Port of getClientNamesForIndustry."""
+    if settings['clientNames']:
+        return settings['clientNames']
+    return INDUSTRY_CLIENT_POOLS.get(industry, settings['clientNames'])
+
+
+def top_case_studies(issues, settings):
+    """Port of getTopCaseStudiesForIssues: up to 3 studies, most relevant first."""
+    studies = [s for s in case_studies(settings) if s.get('emailSnippet')]
+    present = set(issues)
+    relevance = {id(s): sum(1 for t in s['triggerIssues'] if t in present) for s in studies}
+    scored = sorted(studies, key=lambda s: -relevance[id(s)])
+    seen = set()
+    top = []
+    for s in scored:
+        if len(top) >= 3:
+            break
+        if relevance[id(s)] > 0 and s['clientName'] not in seen:
+            seen.add(s['clientName'])
+            top.append(s)
+    # If fewer than 3 matched, pad in configured order
+    for s in studies:
+        if len(top) >= 3:
+            break
+        if s['clientName'] not in seen:
+            seen.add(s['clientName'])
+            top.append(s)
+    return top
+
+
+# ===========================
+# MESSAGE GENERATORS (ports of the page JS)
+# ===========================
+def _field(record, name):
+    value = record.get(name)
+    if value in (None, '') and name in FIELD_ALIASES:
+        value = record.get(FIELD_ALIASES[name])
+    return str(value or '').strip()
+
+
+def prospect_data(record):
+    """Port of collectFormData for one input row, including the speed auto-detection."""
+    data = {
+        'brandName': _field(record, 'brandName') or '[Brand Name]',
+        'websiteUrl': _field(record, 'websiteUrl'),
+        'recipientName': _field(record, 'recipientName') or '[Name]',
+        'senderName': _field(record, 'senderName') or '[Your Name]',
+        'mobilePS': _parse_ps(record.get('mobilePS')),
+        'desktopPS': _parse_ps(record.get('desktopPS')),
+        'industry': _field(record, 'industry'),
+        'clientType': _field(record, 'clientType') or 'new',
+        'issues': list(_parse_issues(record.get('issues'))),
+    }
+    mps = data['mobilePS']
+    for issue, threshold in (('slow_mobile', 50), ('very_slow_mobile', 30)):
+        if mps is not None and mps < threshold and issue not in data['issues']:
+            data['issues'].append(issue)
+    return data
+
+
+def generate_smart_bullets(data, for_whatsapp):
+    """Port of generateSmartBullets: one bullet per selected issue, in order."""
+    mps = data['mobilePS']
+    bullets = []
+    limit = 4 if for_whatsapp else 5
+    for key in data['issues']:
+        if len(bullets) >= limit:
+            break
+        if key in SPEED_ISSUES and mps is not None and mps < 70:
+            if for_whatsapp:
+                bullets.append(f'\U0001f4f1 Mobile speed score is {mps} — '
+                               + ('critically low, fixing this can lift conversions 8-10%' if mps < 40
+                                  else 'room to improve, typically lifts conversions 5-8%'))
+            else:
+                bullets.append(f'Mobile page speed is at {mps} — getting this to 60-70 typically lifts conversions 8-10%.'
+                               + (' ' + ATOMBERG_SPEED_CASE if mps < 50 else ''))
+            continue
+        reg = FINDING_REGISTRY.get(key)
+        if not reg:
+            continue
+        text = reg['whatsappBullet'] if for_whatsapp else reg['emailBullet']
+        if text:
+            bullets.append(text)
+        elif for_whatsapp:
+            bullets.append('⚠️ ' + reg['label'] + ' — addressing this can meaningfully improve conversions')
+        else:
+            bullets.append(reg['label'] + ' — this is a common conversion blocker that we typically address early in our CRO programs.')
+    return bullets
+
+
+def score_band(score):
+    """Port of scoreBand."""
+    if not score:
+        return 'none'
+    if score['overall'] < 40:
+        return 'critical'
+    return 'gaps' if score['overall'] < 60 else 'wins'
+
+
+def _score(data):
+    # Email and WhatsApp share the score; compute it once per prospect
+    if 'score' not in data:
+        data['score'] = calculate_estimated_cro_score(data['issues'], data) if data['issues'] else None
+    return data['score']
+
+
+def generate_email(data, settings):
+    """Port of generateEmail. Returns {'subject', 'body'}."""
+    t = TEMPLATES['email']
+    band = score_band(_score(data))
+    values = {
+        'recipient': data['recipientName'],
+        'sender': data['senderName'],
+        'brand': data['brandName'],
+        'brandType': data['brandName'] + ("'s Shopify store" if data['websiteUrl'] else "'s store"),
+        'bullets': ''.join('• ' + b + '\n\n' for b in generate_smart_bullets(data, False)).strip(),
+        'clients': ', '.join(client_names_for_industry(data['industry'], settings)[:4]),
+        'revenueClaim': render(TEMPLATES['revenueClaims'][band], {}),
+    }
+    values['opener'] = render(t['openers'][band], values)
+    return {'subject': render(t['subject'], values),
+            'body': render(t['exclient'] if data['clientType'] == 'exclient' else t['new'], values)}
+
+
+def generate_whatsapp(data, settings):
+    """Port of generateWhatsApp."""
+    t = TEMPLATES['whatsapp']
+    return render(t['exclient'] if data['clientType'] == 'exclient' else t['new'], {
+        'recipient': data['recipientName'],
+        'sender': data['senderName'],
+        'brand': data['brandName'],
+        'bullets': ''.join(b + '\n' for b in generate_smart_bullets(data, True)).strip(),
+        'clients': ', '.join(client_names_for_industry(data['industry'], settings)[:3]),
+        'revenueClaim': render(TEMPLATES['revenueClaims'][score_band(_score(data))], {}),
+    })
+
+
+def generate_follow_up_sequence(data):
+    """Port of generateFollowUpSequence: four {'title', 'timing', 'email', 'whatsapp'} steps."""
+    t = TEMPLATES['followUps']
+    values = {
+        'recipient': data['recipientName'],
+        'sender': data['senderName'],
+        'brand': data['brandName'],
+        'industry': data['industry'] or 'D2C',
+        'mobilePS': data['mobilePS'],
+    }
+    if data['mobilePS'] is not None:
+        data_point = t['dataPoints']['mobilePS']
+    elif 'no_ga4' in data['issues']:
+        data_point = t['dataPoints']['no_ga4']
+    elif 'no_sticky_atc' in data['issues']:
+        data_point = t['dataPoints']['no_sticky_atc']
+    else:
+        data_point = t['dataPoints']['none']
+    values['dataPoint'] = render(data_point, values)
+    steps = t['exclient' if data['clientType'] == 'exclient' else 'new']
+    return [{field: render(step[field], values) for field in ('title', 'timing', 'email', 'whatsapp')} for step in steps]
+
+
+def generate_contextual_reply(brand, recipient, sender, blocker, days, context=''):
+    """Port of generateContextualReply (its unused phase argument is dropped)."""
+    template = TEMPLATES['replies'].get(blocker) or TEMPLATES['replies']['no_response']
+    variant = template.get('long', template['short']) if days > 14 else template['short']
+    values = {'brand': brand, 'recipient': recipient, 'sender': sender, 'context': context}
+    return {'email': render(variant['email'], values), 'whatsapp': render(variant['whatsapp'], values)}
+
+
+def generate_messages(record, settings):
+    """Return `record` with its email, WhatsApp, follow-ups and matched case studies added."""
+    data = prospect_data(record)
+    email = generate_email(data, settings)
+    out = dict(record)
+    out['emailSubject'] = email['subject']
+    out['emailBody'] = email['body']
+    out['whatsapp'] = generate_whatsapp(data, settings)
+    for n, step in enumerate(generate_follow_up_sequence(data), 1):
+        out[f'followUp{n}Email'] = step['email']
+        out[f'followUp{n}WhatsApp'] = step['whatsapp']
+    out['caseStudies'] = [cs['clientName'] for cs in top_case_studies(data['issues'], settings)]
+    return out
+
+
+# ===========================
+# STREAMING
+# ===========================
+_worker_settings = None
+
+
+def _init_worker(settings):
+    global _worker_settings
+    _worker_settings = settings
+
+
+def _generate_chunk(chunk):
+    return [generate_messages(record, _worker_settings) for record in chunk]
+
+
+def generate_records(records, settings, chunk_size=1000, workers=None):
+    """Yield each record with its messages added, in input order.
+
+    At most 2 * `workers` + 1 chunks are in flight, so memory does not grow
+    with the input.
+    """
+    records = iter(records)
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    if not workers or workers < 2:
+        for chunk in chunks:
+            yield from (generate_messages(record, settings) for record in chunk)
+        return
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(settings,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_generate_chunk, chunk))
+            if len(pending) > 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate outreach messages for a file of prospects.')
+    parser.add_argument('input', help="CSV or NDJSON file of prospects ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help='input/output format (default: from the input extension)')
+    parser.add_argument('--page', default=DEFAULT_PAGE, help='built page to read case studies and client names from')
+    parser.add_argument('--settings', help="full data export from the page's Settings, overriding the page defaults")
+    parser.add_argument('--chunk-size', type=int, default=1000, help='rows handed to a worker at a time')
+    parser.add_argument('--workers', type=int, help='generate in a process pool of N workers')
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('ndjson' if args.input.endswith(('.ndjson', '.jsonl')) else 'csv')
+    try:
+        settings = load_settings(args.page, args.settings)
+    except (OSError, ValueError) as err:
+        parser.error(str(err))
+    records = generate_records(read_records(args.input, fmt), settings, args.chunk_size, args.workers)
+    write_records(records, args.output, fmt, MESSAGE_FIELDS)
+
+
+if __name__ == '__main__':
+    main()
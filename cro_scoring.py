@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+CRO finding registry and scoring engine.
+
+FINDING_REGISTRY is the single source of truth for findings: build_v2.py
+emits it into the page as the JavaScript FINDING_REGISTRY, and the scoring
+functions below are ports of scoreFindingsByImpact and
+calculateEstimatedCROScore from the page, giving identical results.
+
+score_bulk() scores many prospects at once with NumPy: issues become an
+issue-count matrix that is multiplied against per-finding vectors built
+from the registry.
+
+Usage:
+    python cro_scoring.py prospects.csv -o scores.csv
+    python cro_scoring.py prospects.ndjson --format ndjson > scores.ndjson
+
+Input rows need an `issues` field (a list in NDJSON, or keys separated by
+`|`, `,` or spaces in CSV) and optional `mobilePS` / `desktopPS`. Any
+other fields, such as brand or URL, are passed through to the output.
+"""
+
+import argparse
+import csv
+import json
+import math
+import re
+import sys
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # only score_bulk needs NumPy
+    np = None
+
+# ===========================
+# FINDING REGISTRY
+# ===========================
+FINDING_REGISTRY = {
+    'no_ga4': {'category': 'Analytics', 'impactScore': 10, 'pointsAtStake': 5, 'criticalRule': 'caps_at_50', 'label': 'GA4 not installed',
+        'emailBullet': 'GA4 is not installed \u2014 you have zero visibility into user behavior or conversion funnel performance. This is the single most critical gap.',
+        'whatsappBullet': '\U0001f4ca GA4 not installed \u2014 zero visibility into your conversion funnel'},
+    'no_ecom_events': {'category': 'Analytics', 'impactScore': 10, 'pointsAtStake': 20, 'criticalRule': 'caps_at_50', 'label': 'GA4 ecommerce events not firing',
+        'emailBullet': "GA4 ecommerce tracking is not set up \u2014 you're flying blind on where users drop off. Without this, every marketing rupee is a guess.",
+        'whatsappBullet': '\U0001f4ca GA4 ecommerce tracking not set up \u2014 flying blind on funnel drop-offs'},
+    'no_gtm': {'category': 'Analytics', 'impactScore': 7, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'GTM not found', 'emailBullet': None, 'whatsappBullet': None},
+    'no_view_item_list': {'category': 'Analytics', 'impactScore': 5, 'pointsAtStake': 4, 'criticalRule': None, 'label': 'view_item_list not firing', 'emailBullet': None, 'whatsappBullet': None},
+    'no_view_item': {'category': 'Analytics', 'impactScore': 5, 'pointsAtStake': 4, 'criticalRule': None, 'label': 'view_item not firing', 'emailBullet': None, 'whatsappBullet': None},
+    'no_add_to_cart_event': {'category': 'Analytics', 'impactScore': 6, 'pointsAtStake': 4, 'criticalRule': None, 'label': 'add_to_cart not firing', 'emailBullet': None, 'whatsappBullet': None},
+    'no_begin_checkout': {'category': 'Analytics', 'impactScore': 6, 'pointsAtStake': 4, 'criticalRule': None, 'label': 'begin_checkout not firing', 'emailBullet': None, 'whatsappBullet': None},
+    'no_purchase_event': {'category': 'Analytics', 'impactScore': 6, 'pointsAtStake': 4, 'criticalRule': None, 'label': 'purchase event not verified', 'emailBullet': None, 'whatsappBullet': None},
+    'no_fb_pixel': {'category': 'Analytics', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Facebook Pixel missing', 'emailBullet': None, 'whatsappBullet': None},
+    'no_fb_capi': {'category': 'Analytics', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Facebook CAPI missing', 'emailBullet': None, 'whatsappBullet': None},
+    'no_clarity': {'category': 'Analytics', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Microsoft Clarity missing', 'emailBullet': None, 'whatsappBullet': None},
+    'no_hotjar': {'category': 'Analytics', 'impactScore': 2, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Hotjar missing', 'emailBullet': None, 'whatsappBullet': None},
+    'no_gads': {'category': 'Analytics', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Google Ads conversion missing', 'emailBullet': None, 'whatsappBullet': None},
+    'no_email_platform': {'category': 'Analytics', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No email platform', 'emailBullet': None, 'whatsappBullet': None},
+    'slow_mobile': {'category': 'Performance', 'impactScore': 9, 'pointsAtStake': 10, 'criticalRule': 'deduct_15', 'label': 'Poor mobile PageSpeed', 'emailBullet': None, 'whatsappBullet': None},
+    'very_slow_mobile': {'category': 'Performance', 'impactScore': 10, 'pointsAtStake': 10, 'criticalRule': 'deduct_15', 'label': 'Critical mobile PageSpeed', 'emailBullet': None, 'whatsappBullet': None},
+    'poor_cwv': {'category': 'Performance', 'impactScore': 7, 'pointsAtStake': 5, 'criticalRule': None, 'label': 'Poor Core Web Vitals',
+        'emailBullet': 'Core Web Vitals are failing \u2014 this directly impacts Google rankings and user experience, especially on mobile.',
+        'whatsappBullet': '\u26a1 Core Web Vitals failing \u2014 hurts Google rankings and mobile UX'},
+    'poor_mobile': {'category': 'Performance', 'impactScore': 6, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Poor mobile responsiveness', 'emailBullet': None, 'whatsappBullet': None},
+    'multiple_h1': {'category': 'SEO', 'impactScore': 8, 'pointsAtStake': 3, 'criticalRule': 'deduct_10_seo', 'label': 'Multiple H1 tags',
+        'emailBullet': 'Multiple H1 tags detected \u2014 this confuses search engines about page hierarchy and can hurt organic rankings.',
+        'whatsappBullet': '\U0001f50d Multiple H1 tags \u2014 hurting SEO rankings'},
+    'no_meta_desc': {'category': 'SEO', 'impactScore': 5, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'Missing meta descriptions', 'emailBullet': None, 'whatsappBullet': None},
+    'no_product_schema': {'category': 'SEO', 'impactScore': 7, 'pointsAtStake': 3, 'criticalRule': None, 'label': 'No Product schema',
+        'emailBullet': "No Product schema (JSON-LD) \u2014 you're missing rich snippets in Google results (star ratings, price), which significantly impacts click-through rates.",
+        'whatsappBullet': '\U0001f50d No Product schema \u2014 missing rich snippets in Google results'},
+    'no_breadcrumb_schema': {'category': 'SEO', 'impactScore': 4, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'No Breadcrumb schema', 'emailBullet': None, 'whatsappBullet': None},
+    'no_og_tags': {'category': 'SEO', 'impactScore': 3, 'pointsAtStake': 1, 'criticalRule': None, 'label': 'Missing OG tags', 'emailBullet': None, 'whatsappBullet': None},
+    'no_canonical': {'category': 'SEO', 'impactScore': 5, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'Missing canonical URL', 'emailBullet': None, 'whatsappBullet': None},
+    'no_alt_tags': {'category': 'SEO', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Missing alt tags', 'emailBullet': None, 'whatsappBullet': None},
+    'no_sitemap': {'category': 'SEO', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Missing sitemap', 'emailBullet': None, 'whatsappBullet': None},
+    'no_structured_data': {'category': 'SEO', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No structured data', 'emailBullet': None, 'whatsappBullet': None},
+    'no_value_prop': {'category': 'Conversion', 'impactScore': 7, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'No value proposition',
+        'emailBullet': "No clear value proposition on the homepage \u2014 first-time visitors can't immediately understand why to buy from you vs competitors.",
+        'whatsappBullet': "\U0001f3e0 No clear value proposition \u2014 visitors don't know why to choose you"},
+    'no_hero_cta': {'category': 'Conversion', 'impactScore': 5, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Hero missing CTA', 'emailBullet': None, 'whatsappBullet': None},
+    'no_trust_badges': {'category': 'Conversion', 'impactScore': 7, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'No trust badges',
+        'emailBullet': 'No trust badges visible \u2014 this directly impacts purchase confidence, especially for first-time visitors.',
+        'whatsappBullet': '\U0001f6e1\ufe0f No trust badges \u2014 impacts purchase confidence'},
+    'no_social_proof': {'category': 'Conversion', 'impactScore': 7, 'pointsAtStake': 3, 'criticalRule': None, 'label': 'No social proof',
+        'emailBullet': 'No social proof visible (reviews, logos, testimonials) \u2014 brands with visible social proof see 15-20% higher conversion rates.',
+        'whatsappBullet': '\u2b50 No social proof visible \u2014 15-20% conversion impact'},
+    'no_category_nav': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Poor category nav', 'emailBullet': None, 'whatsappBullet': None},
+    'no_search': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Weak search', 'emailBullet': None, 'whatsappBullet': None},
+    'no_announcement_bar': {'category': 'UX', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No announcement bar', 'emailBullet': None, 'whatsappBullet': None},
+    'no_email_capture': {'category': 'Conversion', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No email capture', 'emailBullet': None, 'whatsappBullet': None},
+    'no_urgency_hp': {'category': 'Conversion', 'impactScore': 5, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'No urgency elements', 'emailBullet': None, 'whatsappBullet': None},
+    'no_sticky_nav': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No sticky nav', 'emailBullet': None, 'whatsappBullet': None},
+    'no_press_mentions': {'category': 'Conversion', 'impactScore': 2, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No press mentions', 'emailBullet': None, 'whatsappBullet': None},
+    'no_sticky_atc': {'category': 'Conversion', 'impactScore': 9, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No sticky ATC on mobile',
+        'emailBullet': 'No sticky Add to Cart on mobile PDPs \u2014 this one change alone usually improves conversions by 5-7%.',
+        'whatsappBullet': '\U0001f6d2 No sticky Add to Cart on mobile \u2014 usually a 5-7% conversion boost'},
+    'no_buy_now': {'category': 'Conversion', 'impactScore': 6, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No Buy Now CTA',
+        'emailBullet': "No 'Buy Now' CTA on the PDP \u2014 this forces high-intent users through extra steps, reducing impulse purchases.",
+        'whatsappBullet': '\u26a1 No Buy Now CTA \u2014 extra steps for high-intent buyers'},
+    'no_size_chart': {'category': 'UX', 'impactScore': 5, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No size chart', 'emailBullet': None, 'whatsappBullet': None},
+    'no_reviews_pdp': {'category': 'Conversion', 'impactScore': 7, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No reviews on PDP',
+        'emailBullet': 'No customer reviews on product pages \u2014 reviews are the #1 trust signal for online purchases.',
+        'whatsappBullet': '\u2b50 No customer reviews on PDPs \u2014 #1 trust signal missing'},
+    'no_image_zoom': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No image zoom', 'emailBullet': None, 'whatsappBullet': None},
+    'no_product_video': {'category': 'UX', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No product video', 'emailBullet': None, 'whatsappBullet': None},
+    'no_wishlist': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No wishlist', 'emailBullet': None, 'whatsappBullet': None},
+    'no_recently_viewed': {'category': 'UX', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No Recently Viewed', 'emailBullet': None, 'whatsappBullet': None},
+    'no_product_badges': {'category': 'UX', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No product badges', 'emailBullet': None, 'whatsappBullet': None},
+    'no_notify_me': {'category': 'UX', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No Notify Me', 'emailBullet': None, 'whatsappBullet': None},
+    'no_emi_bnpl': {'category': 'Conversion', 'impactScore': 5, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No EMI/BNPL', 'emailBullet': None, 'whatsappBullet': None},
+    'no_shipping_info': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No shipping info', 'emailBullet': None, 'whatsappBullet': None},
+    'no_return_policy': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No returns policy', 'emailBullet': None, 'whatsappBullet': None},
+    'no_stock_indicator': {'category': 'Conversion', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No stock indicator', 'emailBullet': None, 'whatsappBullet': None},
+    'no_urgency_pdp': {'category': 'Conversion', 'impactScore': 5, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No urgency on PDP', 'emailBullet': None, 'whatsappBullet': None},
+    'no_cross_sell_pdp': {'category': 'Conversion', 'impactScore': 6, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'No cross-sell on PDP', 'emailBullet': None, 'whatsappBullet': None},
+    'no_quick_add': {'category': 'Conversion', 'impactScore': 7, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No quick-add',
+        'emailBullet': "No quick-add on collection pages \u2014 we've seen this boost add-to-cart rates significantly. For TyresNmore, our funnel optimizations drove a 120% increase in user-to-add-to-cart rate.",
+        'whatsappBullet': '\U0001f6d2 No quick-add on collections \u2014 can boost add-to-cart rates significantly'},
+    'no_cross_sell': {'category': 'Conversion', 'impactScore': 7, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'No cross-sell on cart',
+        'emailBullet': 'No product recommendations on the cart page \u2014 a simple cross-sell setup can lift AOV by 5-10%. We helped a premium Ayurvedic brand increase AOV by 12%.',
+        'whatsappBullet': '\U0001f4e6 No cross-sell on cart \u2014 easy AOV lift of 5-10%'},
+    'no_shipping_bar': {'category': 'Conversion', 'impactScore': 6, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No shipping progress bar',
+        'emailBullet': 'No free shipping progress bar in cart \u2014 this simple addition consistently drives higher AOV.',
+        'whatsappBullet': '\U0001f69a No free shipping progress bar \u2014 easy AOV driver'},
+    'no_trust_cart': {'category': 'Conversion', 'impactScore': 5, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No trust in cart', 'emailBullet': None, 'whatsappBullet': None},
+    'no_cart_drawer': {'category': 'UX', 'impactScore': 5, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No cart drawer', 'emailBullet': None, 'whatsappBullet': None},
+    'no_discount_field': {'category': 'UX', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No discount field', 'emailBullet': None, 'whatsappBullet': None},
+    'checkout_friction': {'category': 'Conversion', 'impactScore': 8, 'pointsAtStake': 3, 'criticalRule': None, 'label': 'Checkout friction',
+        'emailBullet': "Checkout flow has friction that's likely increasing cart abandonment. 46% peak conversion rate growth for TyresNmore came from systematic CRO including checkout optimization.",
+        'whatsappBullet': '\U0001f504 Checkout friction \u2014 streamlining can reduce abandonment significantly'},
+    'no_guest_checkout': {'category': 'UX', 'impactScore': 6, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No guest checkout',
+        'emailBullet': 'No guest checkout option \u2014 forcing account creation is one of the top reasons for cart abandonment.',
+        'whatsappBullet': '\U0001f6aa No guest checkout \u2014 top cart abandonment reason'},
+    'no_payment_options': {'category': 'UX', 'impactScore': 5, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Limited payments', 'emailBullet': None, 'whatsappBullet': None},
+    'no_order_summary': {'category': 'UX', 'impactScore': 3, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No order summary', 'emailBullet': None, 'whatsappBullet': None},
+    'no_estimated_delivery': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No delivery date', 'emailBullet': None, 'whatsappBullet': None},
+    'no_cart_abandonment': {'category': 'Conversion', 'impactScore': 5, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'No cart recovery', 'emailBullet': None, 'whatsappBullet': None},
+    'no_tracking': {'category': 'Analytics', 'impactScore': 8, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No tracking', 'emailBullet': None, 'whatsappBullet': None},
+    'poor_plp_design': {'category': 'UX', 'impactScore': 6, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'PLP layout needs optimization',
+        'emailBullet': 'Product listing page layout lacks proper organization \u2014 making it harder for users to discover and compare products, which directly impacts add-to-cart rates.',
+        'whatsappBullet': '\U0001f4f1 PLP design needs optimization \u2014 impacting product discovery and add-to-cart rates'},
+    'no_qty_selector': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'No quantity selector on cart',
+        'emailBullet': 'Cart page lacks a quantity selector \u2014 forcing users to remove and re-add items creates friction that can lead to abandonment.',
+        'whatsappBullet': '\U0001f6d2 No quantity selector on cart \u2014 adds unnecessary friction'},
+    'poor_cart_summary': {'category': 'UX', 'impactScore': 4, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Unclear cart price summary',
+        'emailBullet': "Cart price summary is unclear \u2014 when users can't easily see total cost, taxes, and savings, it erodes purchase confidence.",
+        'whatsappBullet': '\U0001f4b0 Unclear price summary on cart \u2014 erodes purchase confidence'},
+    'weak_value_prop': {'category': 'Conversion', 'impactScore': 7, 'pointsAtStake': 2, 'criticalRule': None, 'label': 'Weak value proposition',
+        'emailBullet': "Value proposition is unclear or missing \u2014 first-time visitors can't immediately understand why they should buy from you. This is often the single biggest homepage conversion blocker.",
+        'whatsappBullet': "\U0001f3e0 Weak value proposition \u2014 visitors don't know why to choose you"},
+    'weak_hero': {'category': 'Conversion', 'impactScore': 5, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Hero banner not optimized',
+        'emailBullet': 'Hero banner is not optimized for conversions \u2014 the first thing users see needs a clear CTA and benefit-driven messaging.',
+        'whatsappBullet': '\U0001f3a8 Hero banner not optimized \u2014 first impression matters for conversions'},
+    'no_filters': {'category': 'UX', 'impactScore': 5, 'pointsAtStake': 0, 'criticalRule': None, 'label': 'Missing product filters/sort',
+        'emailBullet': "Product filters and sorting options are missing or inadequate \u2014 users who can't narrow their search leave faster.",
+        'whatsappBullet': "\U0001f50d Missing product filters \u2014 users can't find what they want quickly"},
+}
+
+ANALYTICS_EVENTS = ['no_view_item_list', 'no_view_item', 'no_add_to_cart_event', 'no_begin_checkout', 'no_purchase_event']
+SEO_DEDUCTIONS = {'multiple_h1': 3, 'no_meta_desc': 2, 'no_canonical': 2, 'no_product_schema': 3, 'no_breadcrumb_schema': 2, 'no_og_tags': 1}
+SPEED_ISSUES = ('slow_mobile', 'very_slow_mobile')
+
+ALERT_ECOM_GAP = {'type': 'danger', 'text': 'GA4 ecommerce tracking missing \u2014 overall score capped at 50'}
+ALERT_SLOW_MOBILE = {'type': 'danger', 'text': 'Mobile PageSpeed below 40 \u2014 15 point deduction applied'}
+ALERT_MULTIPLE_H1 = {'type': 'warning', 'text': 'Multiple H1 tags \u2014 SEO penalty applied'}
+
+
+# ===========================
+# JS EMITTER
+# ===========================
+def _js_string(value, quote):
+    if value is None:
+        return 'null'
+    if quote == '"':
+        # json.dumps escapes non-ASCII as UTF-16 \uXXXX pairs, like the page source
+        return json.dumps(value)
+    out = []
+    for ch in value:
+        code = ord(ch)
+        if ch in "\\'":
+            out.append('\\' + ch)
+        elif code < 0x20 or code > 0x7e:
+            out.append(json.dumps(ch)[1:-1])
+        else:
+            out.append(ch)
+    return "'" + ''.join(out) + "'"
+
+
+def registry_js(registry=None):
+    """Return the `const FINDING_REGISTRY = {...};` statement embedded in the page."""
+    registry = FINDING_REGISTRY if registry is None else registry
+    lines = []
+    for key, f in registry.items():
+        lines.append(
+            f"    {(key + ':').ljust(21)}{{ category: {_js_string(f['category'], chr(39))}, "
+            f"impactScore: {f['impactScore']}, pointsAtStake: {f['pointsAtStake']}, "
+            f"criticalRule: {_js_string(f['criticalRule'], chr(39))}, label: {_js_string(f['label'], chr(39))}, "
+            f"emailBullet: {_js_string(f['emailBullet'], chr(34))}, whatsappBullet: {_js_string(f['whatsappBullet'], chr(34))} }}"
+        )
+    return 'const FINDING_REGISTRY = {\n' + ',\n'.join(lines) + '\n};'
+
+
+# ===========================
+# SCORING (port of the page JS)
+# ===========================
+def js_round(x):
+    """Math.round: halves round towards +infinity."""
+    return math.floor(x + 0.5)
+
+
+def priority_for(impact_score):
+    if impact_score >= 8:
+        return 'HIGH'
+    if impact_score >= 5:
+        return 'MEDIUM'
+    return 'LOW'
+
+
+def score_findings_by_impact(issues, data):
+    """Port of scoreFindingsByImpact: active findings ranked by impactScore (stable)."""
+    mps = data.get('mobilePS')
+    active = [i for i in issues
+              if not (i in SPEED_ISSUES and mps is not None and mps >= 70) and i in FINDING_REGISTRY]
+    active.sort(key=lambda i: -FINDING_REGISTRY[i]['impactScore'])
+    return [dict(issue=i, **FINDING_REGISTRY[i], priority=priority_for(FINDING_REGISTRY[i]['impactScore']))
+            for i in active]
+
+
+def _category(issue):
+    return FINDING_REGISTRY.get(issue, {}).get('category')
+
+
+def calculate_estimated_cro_score(issues, data):
+    """Port of calculateEstimatedCROScore. `issues` may contain duplicates, as in the page."""
+    mps = data.get('mobilePS')
+    dps = data.get('desktopPS')
+    present = set(issues)
+    analytics_audited = any(_category(i) == 'Analytics' for i in issues)
+    seo_audited = any(_category(i) == 'SEO' for i in issues)
+
+    analytics = 25
+    if analytics_audited:
+        if 'no_ga4' in present:
+            analytics -= 5
+        if 'no_ecom_events' in present:
+            analytics -= 20
+        else:
+            analytics -= 4 * sum(1 for e in ANALYTICS_EVENTS if e in present)
+        analytics = max(0, analytics)
+
+    performance = 15
+    if mps is not None:
+        performance = min(10, js_round(mps / 10))
+        performance += min(5, js_round(dps / 20)) if dps is not None else 3
+        if 'poor_cwv' not in present:
+            performance += 3
+        performance = min(20, performance)
+    elif 'poor_cwv' in present or 'poor_mobile' in present:
+        performance = 8
+
+    seo = 15
+    if seo_audited:
+        seo -= sum(points for key, points in SEO_DEDUCTIONS.items() if key in present)
+        seo = max(0, seo)
+
+    ux = 20 - min(14, 2 * sum(1 for i in issues if _category(i) == 'UX'))
+    ux = max(4, ux)
+
+    conversion = 20
+    for i in issues:
+        if _category(i) == 'Conversion':
+            points = FINDING_REGISTRY[i]['pointsAtStake']
+            conversion -= points if points > 0 else 1
+    conversion = max(0, min(20, conversion))
+
+    total = analytics + performance + seo + ux + conversion
+    has_ecom_gap = analytics_audited and ('no_ecom_events' in present or 'no_ga4' in present)
+    if has_ecom_gap:
+        total = min(total, 50)
+    if mps is not None and mps < 40:
+        total -= 15
+    total = max(0, min(100, total))
+
+    alerts = []
+    if has_ecom_gap:
+        alerts.append(dict(ALERT_ECOM_GAP))
+    if mps is not None and mps < 40:
+        alerts.append(dict(ALERT_SLOW_MOBILE))
+    if seo_audited and 'multiple_h1' in present:
+        alerts.append(dict(ALERT_MULTIPLE_H1))
+    return {'overall': total, 'analytics': analytics, 'performance': performance,
+            'seo': seo, 'ux': ux, 'conversion': conversion, 'alerts': alerts}
+
+
+# ===========================
+# VECTORIZED BULK SCORING
+# ===========================
+KEYS = list(FINDING_REGISTRY)
+KEY_INDEX = {key: n for n, key in enumerate(KEYS)}
+
+
+def _registry_vectors():
+    cat = np.array([FINDING_REGISTRY[k]['category'] for k in KEYS])
+    points = np.array([FINDING_REGISTRY[k]['pointsAtStake'] for k in KEYS])
+    impact = np.array([FINDING_REGISTRY[k]['impactScore'] for k in KEYS])
+    seo = np.zeros(len(KEYS), dtype=np.int64)
+    for key, value in SEO_DEDUCTIONS.items():
+        seo[KEY_INDEX[key]] = value
+    events = np.zeros(len(KEYS), dtype=np.int64)
+    events[[KEY_INDEX[e] for e in ANALYTICS_EVENTS]] = 1
+    speed = np.zeros(len(KEYS), dtype=bool)
+    speed[[KEY_INDEX[k] for k in SPEED_ISSUES]] = True
+    return {
+        'analytics': (cat == 'Analytics').astype(np.int64),
+        'seo_cat': (cat == 'SEO').astype(np.int64),
+        'ux': (cat == 'UX').astype(np.int64),
+        # Conversion findings cost their pointsAtStake, or 1 when they have none
+        'conversion_cost': np.where(cat == 'Conversion', np.where(points > 0, points, 1), 0),
+        'seo_deduction': seo,
+        'events': events,
+        'high': (impact >= 8).astype(np.int64),
+        'medium': ((impact >= 5) & (impact < 8)).astype(np.int64),
+        'low': (impact < 5).astype(np.int64),
+        'speed': speed,
+    }
+
+
+def issue_matrix(issue_lists):
+    """Return an (n_prospects x n_findings) count matrix; unknown keys are ignored."""
+    counts = np.zeros((len(issue_lists), len(KEYS)), dtype=np.int64)
+    for row, issues in enumerate(issue_lists):
+        for issue in issues:
+            col = KEY_INDEX.get(issue)
+            if col is not None:
+                counts[row, col] += 1
+    return counts
+
+
+def _ps_array(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def score_bulk(issue_lists, mobile_ps, desktop_ps):
+    """Score many prospects at once. Returns a dict of equal-length NumPy arrays.
+
+    Component scores and alert flags match calculate_estimated_cro_score row
+    by row; `high`/`medium`/`low` count the ranked findings per priority.
+    """
+    if np is None:
+        raise RuntimeError('score_bulk requires NumPy (pip install numpy)')
+    v = _registry_vectors()
+    counts = issue_matrix(issue_lists)
+    present = (counts > 0).astype(np.int64)
+    col = lambda key: present[:, KEY_INDEX[key]].astype(bool)
+    mps = _ps_array(mobile_ps)
+    dps = _ps_array(desktop_ps)
+    has_mps = ~np.isnan(mps)
+    has_dps = ~np.isnan(dps)
+
+    analytics_audited = (counts @ v['analytics']) > 0
+    analytics_loss = 5 * col('no_ga4') + np.where(col('no_ecom_events'), 20, 4 * (present @ v['events']))
+    analytics = np.where(analytics_audited, np.maximum(0, 25 - analytics_loss), 25)
+
+    mps0 = np.nan_to_num(mps)
+    dps0 = np.nan_to_num(dps)
+    measured = (np.minimum(10, np.floor(mps0 / 10 + 0.5))
+                + np.where(has_dps, np.minimum(5, np.floor(dps0 / 20 + 0.5)), 3)
+                + np.where(col('poor_cwv'), 0, 3))
+    unmeasured = np.where(col('poor_cwv') | col('poor_mobile'), 8, 15)
+    performance = np.where(has_mps, np.minimum(20, measured), unmeasured).astype(np.int64)
+
+    seo_audited = (counts @ v['seo_cat']) > 0
+    seo = np.where(seo_audited, np.maximum(0, 15 - present @ v['seo_deduction']), 15)
+
+    ux = np.maximum(4, 20 - np.minimum(14, 2 * (counts @ v['ux'])))
+    conversion = np.clip(20 - counts @ v['conversion_cost'], 0, 20)
+
+    total = analytics + performance + seo + ux + conversion
+    ecom_gap = analytics_audited & (col('no_ecom_events') | col('no_ga4'))
+    total = np.where(ecom_gap, np.minimum(total, 50), total)
+    slow_mobile = has_mps & (mps0 < 40)
+    total = np.clip(total - 15 * slow_mobile, 0, 100)
+
+    # Speed findings drop out of the ranking once mobile PageSpeed reaches 70
+    ranked = counts * ~(v['speed'] & (has_mps & (mps0 >= 70))[:, None])
+    return {
+        'overall': total, 'analytics': analytics, 'performance': performance,
+        'seo': seo, 'ux': ux, 'conversion': conversion,
+        'alert_ecom_gap': ecom_gap, 'alert_slow_mobile': slow_mobile,
+        'alert_multiple_h1': seo_audited & col('multiple_h1'),
+        'high': ranked @ v['high'], 'medium': ranked @ v['medium'], 'low': ranked @ v['low'],
+    }
+
+
+# ===========================
+# CLI
+# ===========================
+SCORE_FIELDS = ['overall', 'analytics', 'performance', 'seo', 'ux', 'conversion', 'alerts', 'high', 'medium', 'low', 'topFindings']
+ALERT_COLUMNS = [('alert_ecom_gap', ALERT_ECOM_GAP), ('alert_slow_mobile', ALERT_SLOW_MOBILE), ('alert_multiple_h1', ALERT_MULTIPLE_H1)]
+
+
+def _parse_ps(value):
+    if value in (None, ''):
+        return None
+    # parseInt(...) || null, as in the page's form readers
+    m = re.match(r'\s*([+-]?\d+)', str(value))
+    if not m:
+        return None
+    return int(m.group(1)) or None
+
+
+def _parse_issues(value):
+    if isinstance(value, list):
+        return value
+    return [i for i in re.split(r'[|,\s]+', value or '') if i]
+
+
+def read_records(path, fmt):
+    f = sys.stdin if path == '-' else open(path, 'r', newline='')
+    with f:
+        if fmt == 'ndjson':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def score_records(records, chunk_size=10000):
+    """Yield each record with its scores added, scoring `chunk_size` rows at a time."""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        issues = [_parse_issues(r.get('issues')) for r in chunk]
+        mps = [_parse_ps(r.get('mobilePS')) for r in chunk]
+        scores = score_bulk(issues, mps, [_parse_ps(r.get('desktopPS')) for r in chunk])
+        for n, record in enumerate(chunk):
+            out = dict(record)
+            for field in ('overall', 'analytics', 'performance', 'seo', 'ux', 'conversion', 'high', 'medium', 'low'):
+                out[field] = int(scores[field][n])
+            out['alerts'] = [alert['text'] for column, alert in ALERT_COLUMNS if scores[column][n]]
+            ranked = score_findings_by_impact(issues[n], {'mobilePS': mps[n]})
+            out['topFindings'] = [f['issue'] for f in ranked[:5]]
+            yield out
+
+
+def write_records(records, path, fmt, result_fields=SCORE_FIELDS):
+    """Write records as NDJSON or CSV; CSV columns are the input fields, then `result_fields`."""
+    f = sys.stdout if path == '-' else open(path, 'w', newline='')
+    with f:
+        if fmt == 'ndjson':
+            for r in records:
+                f.write(json.dumps(r, ensure_ascii=False) + '\n')
+            return
+        writer = None
+        for r in records:
+            row = {k: ('|'.join(v) if isinstance(v, list) else v) for k, v in r.items()}
+            if writer is None:
+                fields = [k for k in row if k not in result_fields] + result_fields
+                writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+                writer.writeheader()
+            writer.writerow(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk-score prospects with the CRO finding registry.')
+    parser.add_argument('input', help="CSV or NDJSON file of prospects ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help='input/output format (default: from the input extension)')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='rows scored per NumPy batch')
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('ndjson' if args.input.endswith(('.ndjson', '.jsonl')) else 'csv')
+    write_records(score_records(read_records(args.input, fmt), args.chunk_size), args.output, fmt)
+
+
+if __name__ == '__main__':
+    main()
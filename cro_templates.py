@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""
+Outreach message templates.
+
+MESSAGE_TEMPLATES is the single source of truth for the wording of the
+initial email and WhatsApp, the follow-up sequences and the contextual
+follow-up replies. build_v2.py validates the placeholders, precompiles
+every template and emits the table into the page as MESSAGE_TEMPLATES
+along with renderTemplate(); cro_messages.py renders the same table.
+
+Placeholders are written {name}, or {name|fallback} for text used when
+the value is empty. Each section accepts only the names in TEMPLATE_VARS.
+A compiled template alternates literal text and placeholders:
+[text, name, text, ..., text], where a placeholder with a fallback is
+[name, fallback].
+"""
+
+import json
+import re
+
+# ===========================
+# TEMPLATE TABLE
+# ===========================
+MESSAGE_TEMPLATES = {
+    # By score band: no score yet, below 40, below 60, 60 and above
+    'revenueClaims': {'none': '50-70%', 'critical': '50-70%', 'gaps': '30-50%', 'wins': '15-25%'},
+    # generateEmail: the opener is rendered first and passed in as {opener}
+    'email': {
+        'subject': "Quick CRO wins I spotted on {brand}'s store",
+        'openers': {
+            'none': 'I took a quick look at {brandType} and spotted a few things that could improve your conversion numbers:',
+            'critical': 'I took a quick look at {brandType} and spotted some critical gaps that are likely costing significant revenue:',
+            'gaps': 'I took a quick look at {brandType} and spotted a few high-impact opportunities that could meaningfully move your conversion numbers:',
+            'wins': 'I took a quick look at {brandType} and spotted some quick wins that could push your results even further:',
+        },
+        'exclient': '''Hi {recipient},
+
+How are you? It has been a long time since we last connected. I hope you are well.
+
+I took a quick look at {brandType} and spotted a few high-impact opportunities that could meaningfully move your conversion numbers:
+
+{bullets}
+
+It has been some time since we last worked to revamp the website to make it conversion-friendly, and as time has passed, further upgrades are necessary. Our team has looked into your website and identified key areas of action that we should be working on to increase the conversion rate & revenue by {revenueClaim} with no ad spend growth.
+
+Let's jump on a quick 30-minute call to walk through these observations and our approach.
+
+Let me know what works. Happy to adjust as per your schedule.
+
+Best,
+{sender}''',
+        'new': '''Hi {recipient},
+
+{opener}
+
+{bullets}
+
+At Growisto, our team of conversion specialists has helped brands such as {clients}, and others grow their website conversions & revenue through a systematic conversion-led development methodology. We dig into your GA4 data, identify exactly where users are dropping off, and then build and ship the fixes — speed, UX, checkout flows, mobile experience.
+
+These insights and more can help you increase revenue by {revenueClaim} with no ad spend growth. Let's jump on a quick 30-minute call to walk through these observations and our approach.
+
+Let me know what works — I've also attached the findings in a deck with more on our approach and results.
+
+Best,
+{sender}''',
+    },
+    'whatsapp': {
+        'exclient': '''Hi {recipient} 👋
+
+Long time! Hope you're doing well.
+
+I was looking at {brand}'s store and noticed a few things that could meaningfully move your conversion numbers:
+
+{bullets}
+
+Since we last worked together on the website, there are some new areas worth addressing. These can help increase revenue by {revenueClaim} with no ad spend growth.
+
+Happy to do a quick 30-min walkthrough. Let me know what works 🙂
+
+— {sender}''',
+        'new': '''Hi {recipient} 👋
+
+I was looking at {brand}'s store and noticed a few quick wins that could meaningfully move your conversion numbers:
+
+{bullets}
+
+At Growisto, we've helped brands like {clients} grow conversions & revenue through systematic CRO.
+
+These insights can help increase revenue by {revenueClaim} with no ad spend growth. Happy to do a quick 30-min walkthrough of what we found.
+
+Would that be useful? 🙂
+
+— {sender}''',
+    },
+    # generateFollowUpSequence: four steps per client type
+    'followUps': {
+        # Message 1 leads with the first of these that applies
+        'dataPoints': {
+            'mobilePS': 'a mobile PageSpeed of {mobilePS}',
+            'no_ga4': 'no GA4 ecommerce tracking in place',
+            'no_sticky_atc': 'no sticky Add to Cart on mobile',
+            'none': 'several conversion optimization opportunities',
+        },
+        'exclient': [
+            {
+                'title': 'Message 1: Warm Re-engagement',
+                'timing': 'Day 0 (Initial)',
+                'email': '''Hi {recipient},
+
+How are you? It has been a long time since we last connected. I hope you are well.
+
+I took a quick look at {brand}'s store and spotted a few high-impact opportunities that could meaningfully move your conversion numbers.
+
+It has been some time since we last worked together, and as time has passed, further upgrades are necessary. Our team has identified key areas that could help increase conversion rates & revenue with no ad spend growth.
+
+Let's jump on a quick 30-minute call to walk through these observations and our approach.
+
+Let me know what works. Happy to adjust as per your schedule.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Long time! Hope you're doing well.
+
+Had a look at {brand}'s store — noticed a few high-impact opportunities since we last worked together. Some good areas to push conversions further.
+
+Free for a quick 30-min chat? Let me know what works 🙂
+
+— {sender}''',
+            },
+            {
+                'title': 'Message 2: Findings Deck Follow-Up',
+                'timing': 'Day 3-5',
+                'email': '''Hi {recipient},
+
+Just circling back on my last note. I've put together a short deck with the specific findings from {brand}'s store — the areas where we see the most room to move the needle.
+
+Given our past work together, I think you'll find the recommendations quite actionable. Happy to walk through it whenever convenient.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Following up on my last message. I've put together a quick deck with the findings from {brand}'s store.
+
+Given our past work together, I think you'll find it useful. Want me to send it over? 🙂
+
+— {sender}''',
+            },
+            {
+                'title': 'Message 3: Testimonial / Recent Results',
+                'timing': 'Day 7-10',
+                'email': '''Hi {recipient},
+
+Wanted to share a quick update from our side — we recently helped [Client Name] achieve [specific result, e.g., "a 46% conversion rate lift"] through a focused CRO sprint similar to what we'd recommend for {brand}.
+
+The approach was straightforward: identify the top 5 conversion blockers, prioritize by impact, and ship fixes fast. The kind of work we know well from our time together.
+
+If this sounds relevant, happy to compare notes.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Quick update — we recently helped [Client Name] hit [specific result] with a focused CRO sprint.
+
+Same approach we know from working together — find the top blockers, fix them fast.
+
+Thought {brand} could benefit similarly. Worth a chat? 🙂
+
+— {sender}''',
+            },
+            {
+                'title': 'Message 4: Gentle Close',
+                'timing': 'Day 14-21',
+                'email': '''Hi {recipient},
+
+I realize the timing might not be right, so I don't want to keep following up if this isn't a priority right now.
+
+If improving {brand}'s conversion rates is something you'd like to revisit later, I'm always happy to pick the conversation back up. You know where to find us.
+
+Wishing you all the best!
+
+Warm regards,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Totally understand if the timing isn't right. Just wanted to let you know — whenever {brand}'s conversion optimization becomes a priority again, happy to pick this up.
+
+All the best! 🙏
+
+— {sender}''',
+            },
+        ],
+        'new': [
+            {
+                'title': 'Message 1: Data Point Lead',
+                'timing': 'Day 0 (Initial)',
+                'email': '''Hi {recipient},
+
+We did a quick CRO analysis on {brand}. With {dataPoint}, there's meaningful room to improve conversion rates.
+
+Is site performance and conversion optimization an area you're actively monitoring?
+
+Happy to share the full picture if that's useful.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Did a quick look at {brand} — noticed {dataPoint}. Usually signals there's room to move the needle on conversions.
+
+Is this something you're actively looking at? Happy to share what we found.
+
+— {sender}''',
+            },
+            {
+                'title': 'Message 2: Industry Pattern',
+                'timing': 'Day 3-5',
+                'email': '''Hi {recipient},
+
+One pattern we keep seeing with {industry} brands is that mobile experience gaps (especially on PDP and checkout) are often the biggest hidden conversion blockers.
+
+{brand} fits that profile — strong brand, solid product range, but the mobile funnel might be leaving conversions on the table.
+
+Does this match what you're seeing on your end?
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+One thing we keep seeing across {industry} brands — mobile funnel gaps (PDP, checkout) are usually the #1 hidden conversion blocker.
+
+{brand} seems to fit that pattern. Is mobile conversion something you've been tracking?
+
+— {sender}''',
+            },
+            {
+                'title': 'Message 3: Social Proof',
+                'timing': 'Day 7-10',
+                'email': '''Hi {recipient},
+
+This came up during our last CRO roundtable with {industry} teams — the brands seeing the biggest conversion lifts are the ones investing in mobile-first UX fixes before scaling ad spend.
+
+{brand} came to mind given what we'd noticed. Happy to share what the group debated if that's useful.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Interesting discussion came up in our last CRO roundtable with {industry} brands — the biggest conversion wins are coming from mobile UX fixes, not more ad spend.
+
+{brand} came to mind. Happy to share what we discussed if useful 🙂
+
+— {sender}''',
+            },
+            {
+                'title': 'Message 4: Trust Story',
+                'timing': 'Day 14-21',
+                'email': '''Hi {recipient},
+
+Quick context from our side — with Powerlook, we actually advised them *against* a full site rebuild initially, and instead focused on fixing the 5-6 conversion bottlenecks that were costing them ₹1 Cr/month. That honest call is what built the relationship.
+
+We think about CRO the same way for every brand we talk to — what are the 3-5 highest-impact fixes, and how fast can we ship them.
+
+If you ever want to talk through how we think about these calls, happy to exchange notes. No pitch, just perspective.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Quick story — with Powerlook, we actually told them *not* to rebuild their entire site. Instead, we fixed 5-6 conversion bottlenecks that were costing ₹1 Cr/month. That honest approach is what built the relationship.
+
+We think about every brand the same way — what are the highest-impact fixes, shipped fast.
+
+Happy to exchange notes if that's ever useful. No pitch 🙂
+
+— {sender}''',
+            },
+        ],
+    },
+    # generateContextualReply: by blocker, then 'short' or (after 14 days) 'long'
+    'replies': {
+        'no_response': {
+            'short': {
+                'email': '''Hi {recipient},
+
+Just checking in on my previous note about {brand}. I know things get busy — happy to find a time that works better.
+
+In the meantime, I came across some interesting data on how {brand}'s category is evolving in terms of mobile conversion rates. Would love to share if that's useful.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Just following up on my earlier note about {brand}. No rush at all — happy to share some category-level insights we've been seeing if that's useful.
+
+— {sender}''',
+            },
+            'long': {
+                'email': '''Hi {recipient},
+
+Hope all is well on your end. I shared some observations about {brand}'s store a little while back — thought I'd circle back with a fresh perspective.
+
+One thing we've been noticing across D2C brands lately is that even small mobile UX fixes (sticky CTAs, streamlined checkout) are driving outsized conversion gains. The brands acting on this early are seeing real separation from competitors.
+
+If there's ever a good time for a 15-minute walkthrough, I'd be happy to share what we've been seeing across the category. No pitch — just observations.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Circling back on {brand} — no pressure at all. We've been seeing some interesting mobile CRO trends across the category lately.
+
+Happy to share a quick 15-min perspective whenever timing works 🙂
+
+— {sender}''',
+            },
+        },
+        'internal_team': {
+            'short': {
+                'email': '''Hi {recipient},
+
+Completely understand that {brand} has an in-house team handling this. We've actually found that our best partnerships are with brands that already have strong internal teams — we bring a specialized CRO lens and execution speed that complements what they're already doing.
+
+For context, our work with Atomberg started as a "second opinion" audit alongside their internal team, and it led to a 167% conversion growth partnership.
+
+Would it be useful to have a quick conversation about where we might add complementary value?
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Totally get it on the internal team. Our best work is actually *alongside* existing teams — we bring specialized CRO execution speed that complements in-house.
+
+Our Atomberg partnership started as a second opinion and grew to 167% conversion growth 🙂
+
+Worth a quick chat to see if there's a complementary angle?
+
+— {sender}''',
+            },
+        },
+        'busy_sale': {
+            'short': {
+                'email': '''Hi {recipient},
+
+Totally understand — {context|sounds like a busy period}. Happy to reconnect when the timing is better.
+
+One thought to leave with you: post-sale periods are often the best time to audit what worked and what didn't in the funnel. When things calm down, we could run a quick analysis to see where conversions can be improved for the next push.
+
+No rush — just wanted to plant the seed. Wishing you a great sale season!
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Totally understand the busy period! Wishing you a great sale season 🎉
+
+Quick thought — post-sale is actually the best time to audit what worked in the funnel. Happy to reconnect when things calm down.
+
+— {sender}''',
+            },
+        },
+        'rescheduled': {
+            'short': {
+                'email': '''Hi {recipient},
+
+No worries at all on the reschedule — I know how packed things can get. I'm flexible with timing.
+
+Would any of these work for a quick 15-minute chat?
+- [Suggest 2-3 time slots]
+
+Alternatively, if it's easier, I'm happy to share a short Loom walkthrough of our observations on {brand}'s store that you can watch whenever is convenient.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Totally understand! Happy to work around your schedule.
+
+Would [time slot options] work? Or if easier, I can send a quick Loom walkthrough you can watch anytime 🙂
+
+— {sender}''',
+            },
+        },
+        'waiting_access': {
+            'short': {
+                'email': '''Hi {recipient},
+
+Just wanted to gently follow up on the GA4 access we discussed. In the meantime, there's actually quite a bit we can do with just the publicly visible data — PageSpeed analysis, UX audit, competitive benchmarking.
+
+If the access is still in process, we could start with these external checks and layer in the analytics deep-dive once access is sorted.
+
+Would that approach work?
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Quick check on the GA4 access — meanwhile, there's a lot we can audit from the outside (PageSpeed, UX, competitors).
+
+Want us to start with those while access gets sorted? 🙂
+
+— {sender}''',
+            },
+        },
+        'check_founder': {
+            'short': {
+                'email': '''Hi {recipient},
+
+Completely understand — these decisions often need buy-in from the top. To make it easier, I've put together a quick summary you can share:
+
+- We found {brand} has significant mobile UX and conversion gaps vs competitors
+- Similar fixes for brands like TyresNmore drove 46% conversion growth
+- We're suggesting a quick 15-minute walkthrough — no commitment, just observations
+
+Happy to also join a call directly with the team if that would be more helpful.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Totally understand! Here's a quick summary you can share:
+
+📊 {brand} has clear mobile UX gaps vs competitors
+📈 Similar fixes drove 46% CR growth for TyresNmore
+🕐 We're offering a free 15-min walkthrough
+
+Happy to join a call directly with the team too!
+
+— {sender}''',
+            },
+        },
+        'price_concern': {
+            'short': {
+                'email': '''Hi {recipient},
+
+Appreciate the transparency on budget considerations. A few things that might be helpful to know:
+
+1. We typically start with a focused sprint on the 3-5 highest-impact fixes — not a massive overhaul
+2. For context, Powerlook's initial engagement focused on just the critical bottlenecks, and it saved them ₹1 Cr/month
+3. We're happy to start small and expand based on results
+
+Would a conversation about scoping a focused first phase be useful?
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Totally understand on the budget front. We usually start with just the 3-5 highest-impact fixes — not a big overhaul.
+
+For Powerlook, that focused approach saved ₹1 Cr/month. Happy to scope something similar for {brand}.
+
+Worth a quick chat? 🙂
+
+— {sender}''',
+            },
+        },
+        'gone_cold': {
+            'short': {
+                'email': '''Hi {recipient},
+
+It's been a while — hope all is going well at {brand}! I'm reaching out with something fresh rather than a follow-up.
+
+We recently completed a CRO roundtable with D2C brands in your category, and one insight stood out: brands that invested in mobile checkout optimization this quarter saw 20-30% higher conversion rates during peak sale periods.
+
+{brand} came to mind given what we'd observed earlier. If you're planning for the next sale season, happy to share what we discussed — no strings attached.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Been a while — hope things are going well! Not following up, just sharing something fresh:
+
+Our recent D2C roundtable revealed brands investing in mobile checkout optimization are seeing 20-30% higher conversion rates during sales.
+
+{brand} came to mind. Happy to share the insights if useful 🙂
+
+— {sender}''',
+            },
+        },
+        'post_call': {
+            'short': {
+                'email': '''Hi {recipient},
+
+Thanks for taking the time to chat about {brand} — really enjoyed the conversation.
+
+Here's a quick recap of what we discussed:
+- [Key finding 1 from the audit]
+- [Key finding 2]
+- [Key finding 3]
+
+As next steps, we'd suggest:
+1. A focused CRO sprint on the top 3-5 quick wins we identified
+2. Setting up proper GA4 ecommerce tracking to measure impact
+3. A 30-day check-in to review results and plan phase 2
+
+I'll send over a brief proposal by [date]. In the meantime, happy to answer any questions.
+
+Best,
+{sender}''',
+                'whatsapp': '''Hi {recipient} 👋
+
+Great chatting today about {brand}! Quick recap:
+
+📋 Key findings: [Top 2-3 issues]
+🎯 Next step: Focused CRO sprint on quick wins
+
+I'll send a brief proposal by [date]. Let me know if any questions come up!
+
+— {sender}''',
+            },
+        },
+    },
+}
+
+TEMPLATE_VARS = {
+    'revenueClaims': set(),
+    'email': {'recipient', 'sender', 'brand', 'brandType', 'opener', 'bullets', 'clients', 'revenueClaim'},
+    'whatsapp': {'recipient', 'sender', 'brand', 'bullets', 'clients', 'revenueClaim'},
+    'followUps': {'recipient', 'sender', 'brand', 'industry', 'dataPoint', 'mobilePS'},
+    'replies': {'recipient', 'sender', 'brand', 'context'},
+}
+
+PLACEHOLDER = re.compile(r'\{(\w+)(?:\|([^{}]*))?\}')
+
+
+# ===========================
+# COMPILER
+# ===========================
+def _strings(node, path=()):
+    """Yield (path, text) for every template string in a table section."""
+    if isinstance(node, str):
+        yield path, node
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            yield from _strings(value, path + (key,))
+    else:
+        for n, value in enumerate(node):
+            yield from _strings(value, path + (n,))
+
+
+def validate_templates(table=None):
+    """Return a list of problems: unknown sections, unknown placeholders, stray braces."""
+    table = MESSAGE_TEMPLATES if table is None else table
+    errors = []
+    for section, node in table.items():
+        allowed = TEMPLATE_VARS.get(section)
+        if allowed is None:
+            errors.append(f"unknown template section '{section}'")
+            continue
+        for path, text in _strings(node, (section,)):
+            where = '.'.join(map(str, path))
+            for m in PLACEHOLDER.finditer(text):
+                if m.group(1) not in allowed:
+                    errors.append(f"{where}: unknown placeholder {{{m.group(1)}}}")
+            if re.search(r'[{}]', PLACEHOLDER.sub('', text)):
+                errors.append(f'{where}: unmatched brace')
+    return errors
+
+
+def compile_template(text):
+    parts = []
+    pos = 0
+    for m in PLACEHOLDER.finditer(text):
+        parts.append(text[pos:m.start()])
+        parts.append(m.group(1) if m.group(2) is None else [m.group(1), m.group(2)])
+        pos = m.end()
+    parts.append(text[pos:])
+    return parts
+
+
+def compile_templates(node):
+    """Return the table with every template string replaced by its compiled parts."""
+    if isinstance(node, str):
+        return compile_template(node)
+    if isinstance(node, dict):
+        return {key: compile_templates(value) for key, value in node.items()}
+    return [compile_templates(value) for value in node]
+
+
+def render(parts, values):
+    """Port of renderTemplate."""
+    out = [parts[0]]
+    for n in range(1, len(parts), 2):
+        p = parts[n]
+        out.append(str(values[p]) if isinstance(p, str) else values[p[0]] or p[1])
+        out.append(parts[n + 1])
+    return ''.join(out)
+
+
+COMPILED_TEMPLATES = compile_templates(MESSAGE_TEMPLATES)
+
+
+# ===========================
+# JS EMITTER
+# ===========================
+def templates_js():
+    """Return the `const MESSAGE_TEMPLATES = {...};` statement for the page."""
+    return 'const MESSAGE_TEMPLATES = ' + json.dumps(COMPILED_TEMPLATES, ensure_ascii=False, separators=(',', ':')) + ';'
@@ -0,0 +1,825 @@
+// Flow A extraction worker. Generated by build_v2.py from index.html; do not edit.
+// Receives { name, ext, buffer or file, vendorScripts } and posts progress, then done or error.
+var VENDOR_SCRIPTS = {};
+var vendorLoads = {};
+
+function updateProgress(percent, status) {
+    self.postMessage({ type: 'progress', percent: percent, status: status });
+}
+
+async function loadVendorScript(name) {
+    var lib = VENDOR_SCRIPTS[name];
+    if (!vendorLoads[name]) {
+        try {
+            importScripts(lib.src);
+            vendorLoads[name] = lib.src;
+        } catch (err) {
+            if (!lib.cdn) throw err;
+            importScripts(lib.cdn);
+            vendorLoads[name] = lib.cdn;
+        }
+    }
+    return vendorLoads[name];
+}
+
+self.onmessage = async function(e) {
+    var msg = e.data;
+    VENDOR_SCRIPTS = msg.vendorScripts;
+    var file = msg.file || { name: msg.name, arrayBuffer: async function() { return msg.buffer; } };
+    try {
+        self.postMessage({ type: 'done', findings: await extractFlowAFindings(file, msg.ext) });
+    } catch (err) {
+        self.postMessage({ type: 'error', message: err.message });
+    }
+};
+
+var TITLE_ISSUE_MAP = [
+    // PDP issues
+    { keywords: ['sticky', 'add to cart'], issue: 'no_sticky_atc' },
+    { keywords: ['sticky', 'atc'], issue: 'no_sticky_atc' },
+    { keywords: ['buy now'], issue: 'no_buy_now' },
+    { keywords: ['wishlist'], issue: 'no_wishlist' },
+    { keywords: ['recently viewed'], issue: 'no_recently_viewed' },
+    { keywords: ['scarcity'], issue: 'no_urgency_pdp' },
+    { keywords: ['urgency'], issue: 'no_urgency_pdp' },
+    { keywords: ['countdown'], issue: 'no_urgency_pdp' },
+    { keywords: ['low stock'], issue: 'no_urgency_pdp' },
+    { keywords: ['limited time'], issue: 'no_urgency_pdp' },
+    { keywords: ['size chart'], issue: 'no_size_chart' },
+    { keywords: ['size guide'], issue: 'no_size_chart' },
+    { keywords: ['image zoom'], issue: 'no_image_zoom' },
+    { keywords: ['pinch', 'zoom'], issue: 'no_image_zoom' },
+    { keywords: ['product video'], issue: 'no_product_video' },
+    { keywords: ['video', 'pdp'], issue: 'no_product_video' },
+    { keywords: ['notify me'], issue: 'no_notify_me' },
+    { keywords: ['back in stock'], issue: 'no_notify_me' },
+    { keywords: ['product badge'], issue: 'no_product_badges' },
+    { keywords: ['review'], issue: 'no_reviews_pdp' },
+    { keywords: ['rating'], issue: 'no_reviews_pdp' },
+    { keywords: ['delivery', 'estimat'], issue: 'no_estimated_delivery' },
+    { keywords: ['delivery', 'date'], issue: 'no_estimated_delivery' },
+    { keywords: ['pincode', 'check'], issue: 'no_estimated_delivery' },
+    { keywords: ['emi'], issue: 'no_emi_bnpl' },
+    { keywords: ['bnpl'], issue: 'no_emi_bnpl' },
+    { keywords: ['buy now pay later'], issue: 'no_emi_bnpl' },
+    { keywords: ['installment'], issue: 'no_emi_bnpl' },
+    // Collection/Category page issues
+    { keywords: ['quick add'], issue: 'no_quick_add' },
+    { keywords: ['quick-add'], issue: 'no_quick_add' },
+    { keywords: ['plp'], issue: 'poor_plp_design' },
+    { keywords: ['product listing'], issue: 'poor_plp_design' },
+    { keywords: ['collection', 'layout'], issue: 'poor_plp_design' },
+    { keywords: ['collection', 'design'], issue: 'poor_plp_design' },
+    { keywords: ['category', 'page', 'design'], issue: 'poor_plp_design' },
+    { keywords: ['filter'], issue: 'no_filters' },
+    { keywords: ['sort'], issue: 'no_filters' },
+    // Cart page issues
+    { keywords: ['cross-sell'], issue: 'no_cross_sell' },
+    { keywords: ['cross sell'], issue: 'no_cross_sell' },
+    { keywords: ['upsell'], issue: 'no_cross_sell' },
+    { keywords: ['up-sell'], issue: 'no_cross_sell' },
+    { keywords: ['you may also like'], issue: 'no_cross_sell' },
+    { keywords: ['frequently bought'], issue: 'no_cross_sell' },
+    { keywords: ['recommendation', 'cart'], issue: 'no_cross_sell' },
+    { keywords: ['recommend', 'cart'], issue: 'no_cross_sell' },
+    { keywords: ['progress bar'], issue: 'no_shipping_bar' },
+    { keywords: ['shipping', 'bar'], issue: 'no_shipping_bar' },
+    { keywords: ['free shipping', 'threshold'], issue: 'no_shipping_bar' },
+    { keywords: ['trust badge'], issue: 'no_trust_badges' },
+    { keywords: ['secure payment'], issue: 'no_trust_badges' },
+    { keywords: ['payment trust'], issue: 'no_trust_badges' },
+    { keywords: ['payment', 'badge'], issue: 'no_trust_badges' },
+    { keywords: ['quantity selector'], issue: 'no_qty_selector' },
+    { keywords: ['quantity', 'increment'], issue: 'no_qty_selector' },
+    { keywords: ['quantity', 'cart'], issue: 'no_qty_selector' },
+    { keywords: ['price summary'], issue: 'poor_cart_summary' },
+    { keywords: ['order summary'], issue: 'poor_cart_summary' },
+    { keywords: ['cart', 'summary', 'clarif'], issue: 'poor_cart_summary' },
+    // Checkout issues
+    { keywords: ['checkout', 'friction'], issue: 'checkout_friction' },
+    { keywords: ['checkout', 'simplif'], issue: 'checkout_friction' },
+    { keywords: ['checkout', 'streamline'], issue: 'checkout_friction' },
+    { keywords: ['guest checkout'], issue: 'no_guest_checkout' },
+    // Homepage issues
+    { keywords: ['social proof'], issue: 'no_social_proof' },
+    { keywords: ['testimonial'], issue: 'no_social_proof' },
+    { keywords: ['value proposition'], issue: 'weak_value_prop' },
+    { keywords: ['hero banner'], issue: 'weak_hero' },
+    { keywords: ['hero', 'cta'], issue: 'weak_hero' },
+    { keywords: ['navigation', 'sticky'], issue: 'no_sticky_nav' },
+    { keywords: ['sticky nav'], issue: 'no_sticky_nav' },
+    { keywords: ['sticky header'], issue: 'no_sticky_nav' },
+    { keywords: ['search bar'], issue: 'no_search' },
+    { keywords: ['search', 'autocomplete'], issue: 'no_search' },
+    { keywords: ['search', 'predictive'], issue: 'no_search' },
+    { keywords: ['announcement bar'], issue: 'no_announcement_bar' },
+    { keywords: ['email capture'], issue: 'no_email_capture' },
+    { keywords: ['newsletter'], issue: 'no_email_capture' },
+    { keywords: ['email subscription'], issue: 'no_email_capture' },
+    // Performance issues (from performance observation slides)
+    { keywords: ['main-thread'], issue: 'slow_mobile' },
+    { keywords: ['main thread', 'work'], issue: 'slow_mobile' },
+    { keywords: ['minimize main'], issue: 'slow_mobile' },
+    { keywords: ['render-blocking'], issue: 'slow_mobile' },
+    { keywords: ['render blocking'], issue: 'slow_mobile' },
+    { keywords: ['code-splitting'], issue: 'slow_mobile' },
+    { keywords: ['code splitting'], issue: 'slow_mobile' },
+    { keywords: ['javascript', 'optimiz'], issue: 'slow_mobile' },
+    { keywords: ['image', 'optimiz'], issue: 'slow_mobile' },
+    { keywords: ['lazy load'], issue: 'slow_mobile' },
+    { keywords: ['offscreen image'], issue: 'slow_mobile' },
+    { keywords: ['unused', 'css'], issue: 'slow_mobile' },
+    { keywords: ['unused', 'javascript'], issue: 'slow_mobile' },
+    { keywords: ['dom size'], issue: 'slow_mobile' },
+    { keywords: ['cache polic'], issue: 'slow_mobile' }
+];
+
+var TITLE_ISSUE_MATCHER = {"alphabet":" -abcdefghijklmnopqrstuvwyz","parent":[0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,1,2,2,2,3,3,3,3,3,3,3,4,4,4,5,5,6,6,7,8,9,9,10,11,11,11,12,12,13,13,13,14,14,14,15,15,15,15,15,16,17,17,18,18,18,18,18,18,18,19,19,19,20,20,20,21,21,22,22,23,24,25,26,27,28,29,29,29,30,31,32,32,32,33,34,35,35,35,36,37,38,39,40,40,41,42,42,43,44,45,45,46,47,48,49,49,50,51,51,52,53,54,55,56,57,58,59,60,61,62,62,63,64,65,66,66,66,67,67,68,69,69,69,70,71,71,72,73,73,74,74,75,75,76,77,78,79,80,81,81,82,83,84,85,86,87,88,89,90,92,93,94,96,97,98,99,100,101,102,103,104,105,106,109,110,111,112,113,115,116,117,117,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,142,143,144,144,145,146,147,148,148,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,165,166,167,168,169,170,171,172,173,174,175,176,177,178,179,181,182,184,185,186,187,187,188,189,190,192,193,194,195,196,197,198,199,200,201,202,203,204,205,206,207,208,209,210,211,211,212,213,214,215,216,217,218,220,221,221,222,223,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,241,242,243,244,245,246,247,248,249,250,251,252,253,255,257,258,259,260,262,263,264,265,266,267,268,269,270,271,271,272,273,274,275,276,277,278,279,280,281,282,283,284,285,286,287,288,289,290,291,292,293,294,295,296,297,298,299,300,302,303,304,305,306,307,308,308,309,310,311,312,313,314,315,316,317,318,319,319,320,321,322,323,324,325,326,327,328,329,330,331,333,334,335,336,337,338,339,340,341,342,344,345,346,347,348,349,350,352,353,353,354,356,357,358,359,360,361,362,363,364,366,367,368,369,370,371,372,373,374,375,376,377,378,379,380,381,382,383,384,385,386,388,389,390,390,392,393,394,395,396,397,398,399,400,401,402,403,404,405,407,409,410,411,412,413,414,415,416,417,418,419,420,421,422,423,424,425,426,427,428,429,430,432,433,434,435,436,437,438,439,440,441,442,443,444,445,446,447,448,449,450,452,453,455,456,457,458,459,460,461,462,463,464,465,466,467,468,469,471,472,473,474,474,475,477,478,479,482,483,484,485,486,487,488,489,490,493,494,495,496,497,498,501,502,503,504,506,507,508,509,510,511,512,513,514,515,516,517,518,519,520,521,522,523,524,525,526,526,526,527,528,529,530,531,532,533,534,536,537,539,540,541,542,543,544,545,546,547,548,550,551,552,553,554,555,556,557,558,559,561,562,563,564,565,566,567,568,569,571,572,574,576,577,578,579,580,582,583,584,585,586,587,588,589,590,591,594,595,596,597,598,599,600,601,602,603,604,605,606,608,609,610,611,612,613,614,615,616,617,618,622,623,624,625,626,627,629,631,632,633,634,637,638,639,641,642,643,644,645,646,647,648,649,650,652,655,656,659,660,661,662,664,665,666,667,669,670,671,672,673,674,675,678,681,682,683,684,685,686,687,688,689,690,691,692,693,694,695,696,697,700,701,702,704,705,706,707,708,709,710,711,712,714,715,716,717,718,719,720,721,723,724,725,726,727,728,730,731,732,733,735,736,737,739,741,742,744,749,751,752,753,754,755,756,758,759,760,761,764,765,767,768,769,770,772,773,775,776,777,778,779,780,783,787,788,790,791,792,793,794,795,797],"label":" abcdefghijlmnopqrstuvwyzdntuanuahlorstaeomsiruemnaaioaiaeofpradilruaecehiotuehrnpraiiooodnctcdrpycrteadluosatlsmaitleieracsvyzmwinvwtftdgypnpeioaitcnvaacimzcrirmsruu-sgldsruo ookgl htecrelnseii iiteqcsogrtaoyi niisisieemcdcdgncieodirruppeitcemtessseeuehk mtuc enegki -etsvgslme utt eeasu ts -mglfcmrehoieurtknnmeeccrpl akaaisteelneolmonoio oofsscd -eni arsei b mlctletttiaeyri ndc cei -gtmrwiheiicglymrmh dllc ia cmnwprupptossrzcsthnocazelrodohhztt ezstetststaale -t  nfhu  lyooblypsycep  oytlliweeyeauitnhnonmia crreitmeu iu syddynbbybpgaiphninlart amlspliionllpbplenotepdtkee oeenmtvmblv  dd dllaardreaniddoareetaittnlltspycemntiaamnr mremaiibsvaooryteoaveagpltntoycttuci krtmddaiauadsdaeitccmodleostec iirrnboeimrsrgterleikkefeso klnneigounaytyeioewoiinri baggputgncennnttlattgegtdggiireihookrotrnen","fail":[0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,4,13,19,20,1,13,20,1,8,11,14,17,18,19,1,5,14,12,18,9,17,20,5,12,13,1,1,9,14,1,9,1,5,14,6,15,17,1,4,9,11,17,20,1,5,3,5,8,9,14,19,20,5,8,17,13,15,17,1,9,9,14,14,14,4,13,3,19,3,25,17,15,23,3,17,27,47,51,4,11,20,14,18,1,27,11,43,12,54,55,75,11,69,9,5,17,54,3,18,21,23,24,48,22,9,49,21,22,19,6,19,4,7,23,15,49,15,69,9,14,1,9,27,3,13,21,32,1,3,9,48,24,3,61,9,79,12,43,17,20,20,0,18,7,11,4,18,61,20,14,0,58,14,0,7,65,0,33,19,77,3,17,40,11,80,18,77,52,73,0,129,159,19,5,16,3,43,14,7,36,75,83,87,23,55,0,49,9,84,18,9,18,9,40,5,12,122,4,3,4,7,26,3,9,5,35,4,84,99,17,20,15,15,5,9,19,3,69,12,115,69,18,18,18,71,5,20,40,72,0,0,12,19,20,3,0,5,13,101,7,0,9,0,0,5,19,18,21,7,18,11,48,77,0,67,38,115,0,5,69,1,18,173,0,19,18,0,0,48,7,11,6,70,48,17,5,33,35,9,5,20,17,19,0,49,13,12,40,5,3,3,82,15,65,0,1,0,1,54,196,43,75,71,71,11,13,5,14,11,12,14,80,35,9,58,0,14,14,6,18,18,3,4,0,0,5,13,73,0,121,17,18,5,9,0,2,0,42,11,70,19,11,77,75,19,19,55,1,5,23,36,55,0,13,103,3,0,3,69,9,0,0,7,19,12,17,22,9,33,69,64,52,3,7,11,23,12,17,276,72,0,4,11,11,3,0,52,54,0,3,12,49,22,15,61,20,15,15,38,41,18,18,17,156,3,18,27,72,13,14,3,29,24,5,11,36,53,4,14,78,78,24,27,19,0,69,24,18,19,187,38,18,38,43,19,1,1,11,5,0,0,19,0,0,140,6,33,46,0,0,11,23,14,14,2,11,23,15,18,23,3,5,15,0,0,14,23,19,65,65,9,22,71,71,23,238,32,76,154,19,13,33,26,88,13,12,9,1,0,3,163,163,5,9,19,12,5,76,0,9,76,0,18,23,25,25,23,13,2,2,23,2,15,7,1,9,15,8,13,52,13,11,29,66,75,0,32,42,65,18,15,11,52,52,14,13,11,11,15,2,236,11,101,90,174,19,5,15,25,19,0,245,245,0,14,77,5,13,161,19,21,161,2,11,21,0,0,89,89,0,4,11,11,29,62,17,4,66,47,56,49,9,4,94,144,1,99,5,5,75,62,52,19,19,13,11,11,19,18,317,23,185,57,256,13,19,9,1,1,12,13,17,0,243,79,5,243,29,52,84,2,18,21,39,53,53,95,138,19,40,144,1,131,57,1,179,60,11,183,13,19,14,138,3,19,19,20,70,395,0,265,17,19,48,25,25,54,9,323,164,323,94,18,170,29,71,84,109,3,3,220,14,25,11,261,14,18,19,77,3,0,9,9,82,36,469,2,342,5,129,48,402,246,402,179,75,252,95,11,5,9,0,0,300,59,40,18,74,0,0,11,49,49,69,9,538,14,420,211,121,476,326,476,261,159,332,5,22,14,9,9,378,17,73,0,2,51,7,7,15,20,492,203,49,3,5,13,49,49,453,19,11,29,27,19,7,283,7,38,4,7,7,9,52,95,77,9,8,14,14,0,17,14,19,61,13,5,13],"out":{"91":[2],"95":[55],"107":[106],"108":[80],"114":[29],"139":[18],"141":[35],"180":[30],"183":[51],"191":[26],"202":[79],"219":[41],"240":[43],"254":[94],"256":[15],"261":[62],"265":[28],"283":[102],"301":[14],"332":[17],"343":[69],"351":[39],"355":[42],"365":[38],"387":[23],"391":[22],"393":[85],"400":[0],"406":[105],"408":[46],"417":[3],"431":[25],"451":[101],"453":[61],"454":[27],"470":[72],"476":[68],"480":[47],"481":[7],"491":[40],"492":[70],"499":[24],"500":[107],"505":[71],"528":[64],"535":[6],"538":[54],"549":[4],"560":[8],"570":[65],"573":[103],"575":[9],"581":[19],"592":[33],"593":[34],"595":[52],"607":[57],"619":[37],"620":[45],"621":[44],"628":[13,15],"630":[100],"635":[81],"636":[90],"640":[87],"651":[84,55],"653":[11],"654":[12],"657":[82],"658":[73],"663":[1,51],"668":[108],"675":[28],"676":[78],"677":[32],"679":[93],"680":[92],"698":[76],"699":[58,62],"703":[86],"713":[10],"722":[53,55],"729":[75],"734":[20],"738":[89],"740":[56,54],"743":[95],"745":[67,68],"746":[60],"747":[66,68],"748":[21,62],"750":[16,17],"757":[83],"762":[99],"763":[98],"766":[74,70],"771":[50],"774":[59,61],"781":[104,102],"782":[36],"784":[5],"785":[97],"786":[96],"789":[88,55],"796":[31],"798":[49],"799":[63],"800":[77],"801":[48],"802":[91]},"entries":[[0,1,67],[0],[1],[2],[3],[4],[5],[6],[7],[8],[9],[10],[11],[12],[13],[13],[14],[15],[15],[16],[17],[18],[19],[20],[21,22],[21],[22],[23],[23],[24],[25],[26],[27],[28],[29],[30],[31],[32,33],[32],[33,34],[34],[34],[35],[36],[37],[38],[39],[40],[41],[42],[43],[43,44,54,57],[44],[45],[46],[46],[47],[47],[48],[49],[50],[51],[51],[52],[53,54],[53],[55],[56],[57],[57],[58,59,60],[58],[59],[60],[61],[62],[63],[64],[65],[66],[66],[67],[68],[69],[70],[71,72],[71],[72],[73],[74],[75],[76],[77],[78],[78],[79],[80],[81],[82],[83],[84,89],[84,85],[85],[86],[87],[88,89],[88],[90],[91]],"need":[2,2,1,1,1,1,1,1,1,1,1,1,1,2,1,2,1,1,1,1,1,2,2,2,1,1,1,1,1,1,1,1,2,2,3,1,1,1,1,1,1,1,1,2,2,1,2,2,1,1,1,2,1,2,2,1,1,3,2,2,2,1,1,1,1,1,2,2,1,1,1,2,2,1,1,1,1,1,2,1,1,1,1,1,2,2,1,1,2,2,1,1]};
+
+var SECTION_DIVIDERS = [
+    { pattern: /analytics\s+insights/i, section: 'ANALYTICS' },
+    { pattern: /performance\s+insights/i, section: 'PERFORMANCE' },
+    { pattern: /ux\s+insights/i, section: 'UX_OBS' },
+    { pattern: /theme\s+architecture/i, section: 'THEME_OBS' },
+    { pattern: /heuristics?\s+(?:insights?|review)/i, section: 'HEURISTICS_OBS' },
+    { pattern: /proven\s+results/i, section: 'CASE_STUDIES' },
+    { pattern: /we\s+have\s+worked/i, section: 'COMPANY_INFO' },
+    { pattern: /they\s+trust\s+us/i, section: 'COMPANY_INFO' },
+    { pattern: /our\s+leadership/i, section: 'COMPANY_INFO' },
+    { pattern: /our\s+partners/i, section: 'COMPANY_INFO' },
+    { pattern: /we\s+leverage/i, section: 'COMPANY_INFO' },
+    { pattern: /we\s+continue\s+to\s+expand/i, section: 'COMPANY_INFO' },
+    { pattern: /we\s+provide\s+array/i, section: 'COMPANY_INFO' }
+];
+
+var OBSERVATION_SECTIONS = ['UX_OBS', 'THEME_OBS', 'HEURISTICS_OBS', 'PERFORMANCE'];
+
+var EVIDENCE_CHARS = 120;
+
+var titleIssueTable = null;
+
+function titleIssueMatcherTable() {
+    if (titleIssueTable) return titleIssueTable;
+    var m = TITLE_ISSUE_MATCHER;
+    var width = m.alphabet.length + 1;   // column 0: characters in no keyword
+    var classes = new Uint8Array(128);
+    for (var ai = 0; ai < m.alphabet.length; ai++) classes[m.alphabet.charCodeAt(ai)] = ai + 1;
+    var states = m.fail.length;
+    var delta = new Int32Array(states * width);
+    for (var s = 1; s < states; s++) delta[m.parent[s] * width + classes[m.label.charCodeAt(s)]] = s;
+    // States are numbered breadth-first, so each failure target's row is already complete
+    for (var st = 1; st < states; st++) {
+        for (var c = 0; c < width; c++) {
+            if (!delta[st * width + c]) delta[st * width + c] = delta[m.fail[st] * width + c];
+        }
+    }
+    var out = [];
+    for (var key in m.out) out[key] = m.out[key];
+    titleIssueTable = { width: width, classes: classes, delta: delta, out: out };
+    return titleIssueTable;
+}
+
+function matchIssueEntries(txt, start, end) {
+    var table = titleIssueMatcherTable();
+    var seen = [], hits = [], matched = [], ends = [];
+    var state = 0;
+    for (var i = start; i < end; i++) {
+        var code = txt.charCodeAt(i);
+        // ASCII lowercases in place; anything else as toLowerCase() would (it may grow)
+        var lower = code < 128 ? null : txt.charAt(i).toLowerCase();
+        var units = lower === null ? 1 : lower.length;
+        for (var u = 0; u < units; u++) {
+            var c = lower === null ? (code >= 65 && code <= 90 ? code + 32 : code) : lower.charCodeAt(u);
+            state = table.delta[state * table.width + (c < 128 ? table.classes[c] : 0)];
+            var found = table.out[state];
+            if (!found) continue;
+            for (var fi = 0; fi < found.length; fi++) {
+                var k = found[fi];
+                if (seen[k]) continue;
+                seen[k] = true;
+                var entries = TITLE_ISSUE_MATCHER.entries[k];
+                for (var ei = 0; ei < entries.length; ei++) {
+                    var e = entries[ei];
+                    hits[e] = (hits[e] || 0) + 1;
+                    if (hits[e] === TITLE_ISSUE_MATCHER.need[e]) {
+                        matched.push(e);
+                        ends[e] = i + 1;
+                    }
+                }
+            }
+        }
+    }
+    matched.sort(function(a, b) { return a - b; });
+    return matched.map(function(e) { return { issue: TITLE_ISSUE_MAP[e].issue, end: ends[e] }; });
+}
+
+function matchIssuesFromText(txt) {
+    return matchIssueEntries(txt, 0, txt.length).map(function(m) { return m.issue; });
+}
+
+function matchIssueSpans(text, start, end) {
+    return matchIssueEntries(text, start, end).map(function(m) {
+        return { issue: m.issue, start: Math.max(start, m.end - EVIDENCE_CHARS), end: m.end };
+    });
+}
+
+function matchPageIssues(text) {
+    // Extract "title" — first significant line (> 15 chars trimmed), found in place
+    var titleStart = 0, titleEnd = 0;
+    for (var ls = 0; ls <= text.length; ) {
+        var le = text.indexOf('\n', ls);
+        if (le === -1) le = text.length;
+        var line = text.slice(ls, le), trimmed = line.trim();
+        if (trimmed.length > 15) {
+            titleStart = ls + line.indexOf(trimmed);
+            titleEnd = titleStart + trimmed.length;
+            break;
+        }
+        ls = le + 1;
+    }
+
+    // Pass 1: Match title
+    var titleMatches = matchIssueSpans(text, titleStart, titleEnd);
+    if (titleMatches.length > 0) return titleMatches;
+
+    // Pass 2: Title didn't match, scan observation text
+    var matched = [];
+    // Extract text between "Observation" and "Recommendation" headers
+    var obsMatch = text.match(/observations?[\s\S]*?(?=recommendations?|recommendation\/hypothesis|$)/i);
+    var obsStart = obsMatch ? obsMatch.index : 0, obsLength = obsMatch ? obsMatch[0].length : 0;
+    // Also try the "(Issue/observation)" format from performance slides
+    if (obsLength < 30) {
+        var issueObsMatch = text.match(/\(issue\/observation\)[\s\S]*?(?=recommendation|$)/i);
+        if (issueObsMatch) {
+            obsStart = issueObsMatch.index;
+            obsLength = issueObsMatch[0].length;
+        }
+    }
+    if (obsLength > 20) {
+        matched = matched.concat(matchIssueSpans(text, obsStart, obsStart + obsLength));
+    }
+    // Pass 3: Also try full page text for shorter pages (Theme Architecture detail slides)
+    if (obsLength < 30 && text.length < 500) {
+        matched = matched.concat(matchIssueSpans(text, 0, text.length));
+    }
+    return matched;
+}
+
+function evidenceSnippet(text, start, end) {
+    var out = '', space = false;
+    for (var i = start; i < end; i++) {
+        var ch = text.charAt(i);
+        if (/\s/.test(ch)) {
+            space = out.length > 0;
+        } else {
+            if (space) out += ' ';
+            out += ch;
+            space = false;
+        }
+    }
+    return out;
+}
+
+function createIssueRecord() {
+    var record = { issues: new Set(), evidence: [] };
+    record.add = function(issue, page, text, start, end) {
+        if (record.issues.has(issue)) return;
+        record.issues.add(issue);
+        record.evidence.push({ issue: issue, page: page, start: start, end: end, text: evidenceSnippet(text, start, end) });
+    };
+    return record;
+}
+
+function forEachPageRange(text, fn) {
+    var marker = /---\s*(?:PAGE|SLIDE)\s*\d+\s*---/gi;
+    var m = marker.exec(text);
+    while (m) {
+        var start = m.index + m[0].length;
+        var next = marker.exec(text);
+        fn(start, next ? next.index : text.length);
+        m = next;
+    }
+}
+
+function findLowercaseTerms(text, pages, terms) {
+    var found = new Set();
+    var cuts = [0];
+    for (var pi = 0; pi < pages.length; pi++) {
+        if (pages[pi].start > cuts[cuts.length - 1]) cuts.push(pages[pi].start);
+    }
+    cuts.push(text.length);
+    for (var ci = 0; ci + 1 < cuts.length && found.size < terms.length; ci++) {
+        // Page starts follow a marker, so no term spans a cut
+        var lower = text.slice(cuts[ci], cuts[ci + 1]).toLowerCase();
+        for (var ti = 0; ti < terms.length; ti++) {
+            if (!found.has(terms[ti]) && lower.includes(terms[ti])) found.add(terms[ti]);
+        }
+    }
+    return found;
+}
+
+function createFindingsExtractor() {
+    var pages = [];
+    var found = createIssueRecord();
+    var currentSection = 'INTRO';
+
+    // Pages keep no text; finishFindings gives each its range in the deck text
+    function addPage(text) {
+        // Check if this page is a section divider
+        var pageText = text.trim();
+        var isDivider = false;
+        for (var si = 0; si < SECTION_DIVIDERS.length; si++) {
+            if (SECTION_DIVIDERS[si].pattern.test(pageText)) {
+                currentSection = SECTION_DIVIDERS[si].section;
+                isDivider = true;
+                break;
+            }
+        }
+        var pg = { num: pages.length + 1, section: currentSection, isDivider: isDivider };
+        pages.push(pg);
+        // Section-aware: only observation section pages carry issues
+        if (!isDivider && OBSERVATION_SECTIONS.indexOf(pg.section) !== -1) {
+            matchPageIssues(text).forEach(function(m) { found.add(m.issue, pg.num, text, m.start, m.end); });
+        }
+        return pg;
+    }
+
+    return {
+        addPage: addPage,
+        issueCount: function() { return found.issues.size; },
+        finish: function(text, fileName) {
+            // No pages fed — treat entire text as one page
+            var hasMarkers = pages.length > 0;
+            if (!hasMarkers) addPage(text);
+            return finishFindings(text, fileName, pages, hasMarkers, found);
+        }
+    };
+}
+
+function extractFindings(text, fileName) {
+    var extractor = createFindingsExtractor();
+    // ---- STEP 1: Feed each page/slide between markers ----
+    forEachPageRange(text, function(start, end) {
+        extractor.addPage(text.slice(start, end));
+    });
+    return extractor.finish(text, fileName);
+}
+
+function finishFindings(text, fileName, pages, hasMarkers, found) {
+    var issueSet = found.issues;
+    // Each page's offset range in the deck text; later steps slice what they need
+    if (hasMarkers) {
+        var pn = 0;
+        forEachPageRange(text, function(start, end) {
+            if (pn < pages.length) {
+                pages[pn].start = start;
+                pages[pn].end = end;
+            }
+            pn++;
+        });
+    } else {
+        pages[0].start = 0;
+        pages[0].end = text.length;
+    }
+    var findings = {
+        brandName: '',
+        websiteUrl: '',
+        mobilePS: null,
+        desktopPS: null,
+        industry: '',
+        issues: [],
+        competitors: [],
+        auditedSections: [],
+        evidence: found.evidence
+    };
+
+    // Track which sections were found
+    var foundSections = new Set();
+    for (var fi = 0; fi < pages.length; fi++) {
+        foundSections.add(pages[fi].section);
+    }
+    if (foundSections.has('PERFORMANCE')) findings.auditedSections.push('performance');
+    if (foundSections.has('UX_OBS')) findings.auditedSections.push('ux');
+    if (foundSections.has('THEME_OBS')) findings.auditedSections.push('theme');
+    if (foundSections.has('HEURISTICS_OBS')) findings.auditedSections.push('heuristics');
+    if (foundSections.has('ANALYTICS')) findings.auditedSections.push('analytics_info');
+
+    // ---- STEP 3: Brand name extraction (unchanged — reliable) ----
+    if (fileName) {
+        var fn = fileName.replace(/\.(pdf|pptx|ppt)$/i, '');
+        var fnPatterns = [
+            /^(.+?)\s*[-–—]\s*(?:cro|audit|website|conversion|technical)/i,
+            /(?:cro|audit|website|conversion|technical).+?[-–—]\s*(.+?)$/i,
+            /^(.+?)\s*[-–—]/
+        ];
+        for (var fp = 0; fp < fnPatterns.length; fp++) {
+            var m = fn.match(fnPatterns[fp]);
+            if (m) {
+                var candidate = m[1].trim();
+                if (!/growisto/i.test(candidate) && candidate.length > 1 && candidate.length < 50) {
+                    findings.brandName = candidate;
+                    break;
+                }
+            }
+        }
+    }
+    if (!findings.brandName) {
+        var brandPatterns = [
+            /(?:cro\s+audit|audit\s+report|analysis)\s+(?:for\s+|[-–—]\s*)([A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-]+)?)/i,
+            /^---\s*(?:PAGE|SLIDE)\s*1\s*---\s*(?:.*?[\u00d7×]\s*)?([A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-]+)?)/m,
+            /GROWISTO\s*[\u00d7×]\s*([A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-]+)?)/
+        ];
+        for (var bp = 0; bp < brandPatterns.length; bp++) {
+            var bm = text.match(brandPatterns[bp]);
+            if (bm) {
+                var bc = bm[1].trim();
+                if (!/^growisto$/i.test(bc)) { findings.brandName = bc; break; }
+            }
+        }
+    }
+    if (!findings.brandName) {
+        var stopWords = new Set(['the','and','for','are','but','not','you','all','can','had','her','was','one','our','out','has','its','this','that','with','will','from','they','been','have','many','some','them','than','each','make','like','long','look','very','after','into','more','also','most','want','what','your','when','just','make','know','back','only','come','could','same','over','take','other','about','should','would','which','there','their','these','those','being','through','where','before','between','under','again','page','slide','audit','cro','shopify','website','mobile','desktop','google','analytics','speed','score','above','below','using','present','missing','recommended','add','implement','ensure','improve','update','current','status','data','growisto','observation','recommendation','conversion','strategy','roadmap','implementation','growth','technical']);
+        // Capitalized phrases are counted as they match rather than collected first
+        var wordPattern = /[A-Z][a-zA-Z']+(?:\s+[A-Z][a-zA-Z']+)*/g;
+        var freq = {};
+        for (var wm = wordPattern.exec(text); wm; wm = wordPattern.exec(text)) {
+            var word = wm[0], wl = word.toLowerCase();
+            if (wl.length > 2 && !stopWords.has(wl) && !/growisto/i.test(word)) {
+                freq[word] = (freq[word] || 0) + 1;
+            }
+        }
+        var bestWord = '', bestCount = 0;
+        for (var fw in freq) {
+            if (freq[fw] > bestCount && freq[fw] >= 3) { bestWord = fw; bestCount = freq[fw]; }
+        }
+        if (bestWord) findings.brandName = bestWord;
+    }
+    if (findings.brandName && /^growisto$/i.test(findings.brandName.trim())) {
+        findings.brandName = '';
+    }
+
+    // ---- STEP 4: PageSpeed extraction (PERFORMANCE section only) ----
+    var perfText = '';
+    for (var psi = 0; psi < pages.length; psi++) {
+        if (pages[psi].section === 'PERFORMANCE') perfText += '\n' + text.slice(pages[psi].start, pages[psi].end);
+    }
+    // Also include INTRO pages for cases where performance data is on early pages
+    var introText = '';
+    for (var ini = 0; ini < pages.length; ini++) {
+        if (pages[ini].section === 'INTRO') introText += '\n' + text.slice(pages[ini].start, pages[ini].end);
+    }
+    var psSearchText = hasMarkers ? perfText : text;
+    if (psSearchText) {
+        // Specific "Score: XX/100" format from PDF performance boxes
+        var mpsMatch = psSearchText.match(/mobile\s+performance[\s\S]{0,200}?score[:\s]*(\d{1,2})\/100/i);
+        if (!mpsMatch) mpsMatch = psSearchText.match(/score[:\s]*(\d{1,2})\/100[\s\S]{0,50}?mobile/i);
+        if (!mpsMatch) mpsMatch = psSearchText.match(/mobile\s*(?:page\s*speed|pagespeed|psi|speed\s*score)[:\s]*(\d{1,3})/i);
+        if (!mpsMatch) mpsMatch = psSearchText.match(/(\d{1,2})\/100[\s\S]{0,100}?mobile/i);
+        if (mpsMatch) {
+            var mpsVal = parseInt(mpsMatch[1]);
+            if (mpsVal > 0 && mpsVal < 100) findings.mobilePS = mpsVal;
+        }
+        var dpsMatch = psSearchText.match(/desktop\s+performance[\s\S]{0,200}?score[:\s]*(\d{1,2})\/100/i);
+        if (!dpsMatch) dpsMatch = psSearchText.match(/score[:\s]*(\d{1,2})\/100[\s\S]{0,50}?desktop/i);
+        if (!dpsMatch) dpsMatch = psSearchText.match(/desktop\s*(?:page\s*speed|pagespeed|psi|speed\s*score)[:\s]*(\d{1,3})/i);
+        if (!dpsMatch) dpsMatch = psSearchText.match(/(\d{1,2})\/100[\s\S]{0,100}?desktop/i);
+        if (dpsMatch) {
+            var dpsVal = parseInt(dpsMatch[1]);
+            if (dpsVal > 0 && dpsVal < 100) findings.desktopPS = dpsVal;
+        }
+        // Also try competition table: brand name row with mobile page speed score
+        if (!findings.mobilePS && findings.brandName) {
+            var brandLc = findings.brandName.toLowerCase();
+            var compTableMatch = psSearchText.match(new RegExp(brandLc.replace(/[.*+?^${}()|[\]\\]/g, '\\$&') + '[\\s\\S]{0,100}?(\\d{1,2})(?:\\s|$)', 'i'));
+            if (compTableMatch) {
+                var ctVal = parseInt(compTableMatch[1]);
+                if (ctVal > 0 && ctVal < 100) findings.mobilePS = ctVal;
+            }
+        }
+    }
+
+    // ---- STEP 5: URL extraction (INTRO + PERFORMANCE sections only) ----
+    var urlSearchText = hasMarkers ? (introText + '\n' + perfText) : text;
+    // Prefer URL that matches brand name
+    var brandSlug = findings.brandName ? findings.brandName.toLowerCase().replace(/[^a-z0-9]/g, '') : '';
+    var allUrls = urlSearchText.match(/(?:https?:\/\/)?(?:www\.)?([a-zA-Z0-9-]+\.(?:com|in|co\.in|io|net|org|co)(?:\/[^\s]*)?)/gi) || [];
+    var brandUrl = null;
+    var firstNonGrowistoUrl = null;
+    for (var ui = 0; ui < allUrls.length; ui++) {
+        var cleanUrl = allUrls[ui].replace(/^https?:\/\//i, '').replace(/^www\./i, '').replace(/\/+$/, '');
+        if (/growisto/i.test(cleanUrl)) continue;
+        if (!firstNonGrowistoUrl) firstNonGrowistoUrl = cleanUrl;
+        if (brandSlug && cleanUrl.toLowerCase().replace(/[^a-z0-9]/g, '').includes(brandSlug)) {
+            brandUrl = cleanUrl;
+            break;
+        }
+    }
+    findings.websiteUrl = brandUrl || firstNonGrowistoUrl || '';
+
+    // ---- STEP 6: Industry detection (full text, lowercased a page at a time) ----
+    var industry = findLowercaseTerms(text, pages, ['skincare', 'beauty', 'cosmetic', 'skin care', 'fashion',
+        'apparel', 'clothing', 'electronics', 'gadget', 'earbuds', 'headphone', 'speaker', 'health', 'wellness',
+        'supplement', 'ayurved', 'pharma', 'food', 'beverage', 'coffee', 'tea', 'chai', 'jewel', 'accessor', 'water',
+        'filter', 'purif', 'motorcycle', 'auto', 'bike']);
+    var has = function(term) { return industry.has(term); };
+    if (has('skincare') || has('beauty') || has('cosmetic') || has('skin care')) findings.industry = 'skincare';
+    else if (has('fashion') || has('apparel') || has('clothing')) findings.industry = 'fashion';
+    else if (has('electronics') || has('gadget') || has('earbuds') || has('headphone') || has('speaker')) findings.industry = 'electronics';
+    else if (has('health') || has('wellness') || has('supplement') || has('ayurved') || has('pharma')) findings.industry = 'health';
+    else if (has('food') || has('beverage') || has('coffee') || has('tea') || has('chai')) findings.industry = 'food';
+    else if (has('jewel') || has('accessor')) findings.industry = 'jewelry';
+    else if (has('water') || has('filter') || has('purif')) findings.industry = 'home';
+    else if (has('motorcycle') || has('auto') || has('bike')) findings.industry = 'automotive';
+
+    // ---- STEP 7: Issue detection ----
+    // Observation pages were matched as they were added
+    if (!hasMarkers) {
+        // No markers — fallback: scan full text with keyword matching (minus GA4/SEO)
+        var fallbackMatches = matchIssueSpans(text, 0, text.length);
+        for (var fbi = 0; fbi < fallbackMatches.length; fbi++) {
+            found.add(fallbackMatches[fbi].issue, 1, text, fallbackMatches[fbi].start, fallbackMatches[fbi].end);
+        }
+    }
+
+    // Convert Set to array
+    findings.issues = Array.from(issueSet);
+
+    // ---- STEP 8: Competitor extraction ----
+    var knownBrands = ['Nykaaman', 'Nykaa', 'Dermaco', 'WOW', 'Mamaearth', 'Minimalist', 'Plum', 'mCaffeine',
+        'Sugar', 'Lakme', 'Biotique', 'Khadi', 'Forest Essentials', 'Kama Ayurveda', 'Boat', 'JBL', 'Pebble',
+        'VPLAK', 'Access', 'Noise', 'boAt', 'Pilgrim', 'Kaya'];
+    var mentioned = findLowercaseTerms(text, pages, knownBrands.map(function(b) { return b.toLowerCase(); }));
+    for (var bi = 0; bi < knownBrands.length; bi++) {
+        if (mentioned.has(knownBrands[bi].toLowerCase()) && findings.brandName.toLowerCase() !== knownBrands[bi].toLowerCase()) {
+            findings.competitors.push(knownBrands[bi]);
+        }
+    }
+
+    return findings;
+}
+
+async function parsePDF(file) {
+    const [arrayBuffer, pdfSrc] = await Promise.all([file.arrayBuffer(), loadVendorScript('pdfjs')]);
+    const worker = VENDOR_SCRIPTS.pdfjsWorker;
+    pdfjsLib.GlobalWorkerOptions.workerSrc = pdfSrc === VENDOR_SCRIPTS.pdfjs.src ? worker.src : worker.cdn;
+    const pdf = await pdfjsLib.getDocument({ data: arrayBuffer }).promise;
+    const numPages = pdf.numPages;
+    const extractor = createFindingsExtractor();
+    const pageTexts = new Array(numPages);
+    let nextPage = 1, parsed = 0, fed = 0;
+    let fullText = '';
+
+    updateProgress(20, 'Parsing PDF (' + numPages + ' pages)...');
+
+    // Up to 4 pages in flight at once; results are fed to the extractor in page order
+    async function readPages() {
+        while (nextPage <= numPages) {
+            const i = nextPage++;
+            const page = await pdf.getPage(i);
+            const content = await page.getTextContent();
+            page.cleanup();
+            pageTexts[i - 1] = content.items.map(item => item.str).join(' ');
+            parsed++;
+            while (fed < numPages && pageTexts[fed] !== undefined) {
+                // Same framing extractFindings sees when splitting the joined text
+                extractor.addPage('\n' + pageTexts[fed] + (fed < numPages - 1 ? '\n' : ''));
+                // The deck text grows as pages are fed; the page's own copy is dropped
+                fullText += '\n--- PAGE ' + (fed + 1) + ' ---\n' + pageTexts[fed];
+                pageTexts[fed] = null;
+                fed++;
+            }
+            updateProgress(20 + Math.round((parsed / numPages) * 70),
+                'Parsed ' + parsed + ' of ' + numPages + ' pages, ' + extractor.issueCount() + ' issues found...');
+        }
+    }
+    await Promise.all(Array.from({ length: Math.min(4, numPages) }, readPages));
+
+    return extractor.finish(fullText, file.name);
+}
+
+const PPTX_INFLATE_CONCURRENCY = 4;
+
+const PPTX_PARTS = {
+    slide: ['ppt/slides/slide', '.xml'],
+    notes: ['ppt/notesSlides/notesSlide', '.xml'],
+    notesRels: ['ppt/notesSlides/_rels/notesSlide', '.xml.rels']
+};
+
+function pptxPartNumber(name, part) {
+    const [prefix, suffix] = PPTX_PARTS[part];
+    if (!name.startsWith(prefix) || !name.endsWith(suffix)) return 0;
+    const digits = name.slice(prefix.length, name.length - suffix.length);
+    const n = parseInt(digits, 10);
+    return n > 0 && String(n) === digits ? n : 0;
+}
+
+function decodeXmlText(text) {
+    let amp = text.indexOf('&');
+    if (amp < 0) return text;
+    let out = '', pos = 0;
+    while (amp >= 0) {
+        const semi = text.indexOf(';', amp);
+        if (semi < 0) break;
+        const name = text.slice(amp + 1, semi);
+        let ch = null;
+        if (name === 'amp') ch = '&';
+        else if (name === 'lt') ch = '<';
+        else if (name === 'gt') ch = '>';
+        else if (name === 'quot') ch = '"';
+        else if (name === 'apos') ch = "'";
+        else if (name[0] === '#') {
+            const code = name[1] === 'x' || name[1] === 'X' ? parseInt(name.slice(2), 16) : parseInt(name.slice(1), 10);
+            if (code >= 0 && code <= 0x10ffff) ch = String.fromCodePoint(code);
+        }
+        if (ch !== null) {
+            out += text.slice(pos, amp) + ch;
+            pos = semi + 1;
+        }
+        amp = text.indexOf('&', ch !== null ? pos : amp + 1);
+    }
+    return out + text.slice(pos);
+}
+
+function xmlTagName(tag) {
+    let end = 0;
+    while (end < tag.length && tag.charCodeAt(end) > 32 && !(tag[end] === '/' && end > 0)) end++;
+    return tag.slice(0, end);
+}
+
+function createPPTXTextCollector() {
+    const runs = [];
+    let tag = null;     // source of a tag split across chunks
+    let run = null;     // raw text of the open <a:t> run
+    let inSlideNumber = false;
+
+    function closeTag(source) {
+        const name = xmlTagName(source);
+        if (name === 'a:t') {
+            if (source[source.length - 1] !== '/') run = '';
+        } else if (name === '/a:t') {
+            if (run && !inSlideNumber) runs.push(decodeXmlText(run));
+            run = null;
+        } else if (name === 'a:fld') {
+            inSlideNumber = source.includes('type="slidenum"');
+        } else if (name === '/a:fld') {
+            inSlideNumber = false;
+        }
+    }
+
+    return {
+        write(chunk) {
+            let pos = 0;
+            while (pos < chunk.length) {
+                if (tag !== null) {
+                    const end = chunk.indexOf('>', pos);
+                    if (end < 0) { tag += chunk.slice(pos); return; }
+                    closeTag(tag + chunk.slice(pos, end));
+                    tag = null;
+                    pos = end + 1;
+                } else {
+                    const lt = chunk.indexOf('<', pos);
+                    if (run !== null) run += chunk.slice(pos, lt < 0 ? chunk.length : lt);
+                    if (lt < 0) return;
+                    tag = '';
+                    pos = lt + 1;
+                }
+            }
+        },
+        text() { return runs.join(' '); }
+    };
+}
+
+function pptxStreamingSupported() {
+    if (typeof DecompressionStream === 'undefined' || typeof TextDecoderStream === 'undefined') return false;
+    try {
+        new DecompressionStream('deflate-raw');
+        return true;
+    } catch (e) {
+        return false;
+    }
+}
+
+async function readZipDirectory(blob) {
+    // End of central directory record: 22 bytes, rarely followed by a comment
+    // of up to 64 KB, which is only searched for when the record is not last
+    let tail, eocd = -1;
+    for (const length of [22, 22 + 0xffff]) {
+        tail = new DataView(await blob.slice(Math.max(0, blob.size - length)).arrayBuffer());
+        eocd = tail.byteLength - 22;
+        while (eocd >= 0 && tail.getUint32(eocd, true) !== 0x06054b50) eocd--;
+        if (eocd >= 0) break;
+    }
+    if (eocd < 0) throw new Error('Not a valid PPTX file');
+    const count = tail.getUint16(eocd + 10, true);
+    const size = tail.getUint32(eocd + 12, true);
+    const offset = tail.getUint32(eocd + 16, true);
+    if (count === 0xffff || size === 0xffffffff || offset === 0xffffffff) return null;
+
+    const dir = new DataView(await blob.slice(offset, offset + size).arrayBuffer());
+    const decoder = new TextDecoder();
+    const entries = new Map();
+    for (let p = 0, i = 0; i < count; i++) {
+        if (dir.getUint32(p, true) !== 0x02014b50) throw new Error('Corrupt PPTX file');
+        const nameLength = dir.getUint16(p + 28, true);
+        const skip = nameLength + dir.getUint16(p + 30, true) + dir.getUint16(p + 32, true);
+        entries.set(decoder.decode(new Uint8Array(dir.buffer, p + 46, nameLength)), {
+            method: dir.getUint16(p + 10, true),
+            compressedSize: dir.getUint32(p + 20, true),
+            offset: dir.getUint32(p + 42, true)
+        });
+        p += 46 + skip;
+    }
+    return entries;
+}
+
+async function openPPTXArchive(blob) {
+    const entries = pptxStreamingSupported() ? await readZipDirectory(blob) : null;
+    if (!entries) {
+        const [arrayBuffer] = await Promise.all([blob.arrayBuffer(), loadVendorScript('jszip')]);
+        const zip = await JSZip.loadAsync(arrayBuffer);
+        return {
+            names: Object.keys(zip.files),
+            size: () => 1,
+            read: async (name, write, progress) => { write(await zip.file(name).async('string')); progress(1); }
+        };
+    }
+    return {
+        names: Array.from(entries.keys()),
+        size: name => entries.get(name).compressedSize,
+        read: async (name, write, progress) => {
+            const entry = entries.get(name);
+            const header = new DataView(await blob.slice(entry.offset, entry.offset + 30).arrayBuffer());
+            const start = entry.offset + 30 + header.getUint16(26, true) + header.getUint16(28, true);
+            let stream = blob.slice(start, start + entry.compressedSize).stream().pipeThrough(new TransformStream({
+                transform(chunk, controller) { progress(chunk.byteLength); controller.enqueue(chunk); }
+            }));
+            if (entry.method === 8) stream = stream.pipeThrough(new DecompressionStream('deflate-raw'));
+            else if (entry.method !== 0) throw new Error('Unsupported compression in ' + name);
+            const reader = stream.pipeThrough(new TextDecoderStream()).getReader();
+            for (let chunk = await reader.read(); !chunk.done; chunk = await reader.read()) write(chunk.value);
+        }
+    };
+}
+
+async function parsePPTX(file) {
+    const blob = typeof Blob !== 'undefined' && file instanceof Blob ? file : new Blob([await file.arrayBuffer()]);
+    const archive = await openPPTXArchive(blob);
+    const slides = new Map(), notes = new Map(), notesRels = new Map();
+    const jobs = [];
+    for (const name of archive.names) {
+        const slide = pptxPartNumber(name, 'slide');
+        const note = pptxPartNumber(name, 'notes');
+        const rels = pptxPartNumber(name, 'notesRels');
+        if (slide || note) {
+            const collector = createPPTXTextCollector();
+            (slide ? slides : notes).set(slide || note, collector);
+            jobs.push([name, collector]);
+        } else if (rels) {
+            notesRels.set(rels, '');
+            jobs.push([name, { write: chunk => notesRels.set(rels, notesRels.get(rels) + chunk) }]);
+        }
+    }
+
+    const total = jobs.reduce((sum, [name]) => sum + archive.size(name), 0) || 1;
+    let read = 0, shown = -1, next = 0;
+    const progress = bytes => {
+        read += bytes;
+        const percent = 20 + Math.round((read / total) * 45);
+        if (percent === shown) return;
+        shown = percent;
+        updateProgress(percent, 'Parsing PPTX (' + slides.size + ' slides, ' +
+            Math.round(read / total * 100) + '% read)...');
+    };
+    updateProgress(20, 'Parsing PPTX (' + slides.size + ' slides)...');
+    async function readEntries() {
+        while (next < jobs.length) {
+            const [name, collector] = jobs[next++];
+            await archive.read(name, chunk => collector.write(chunk), progress);
+        }
+    }
+    await Promise.all(Array.from({ length: Math.min(PPTX_INFLATE_CONCURRENCY, jobs.length) }, readEntries));
+
+    // Notes belong to the slide their relationships point at
+    const slideNotes = new Map();
+    notes.forEach((collector, n) => {
+        const rels = notesRels.get(n) || '';
+        const at = rels.indexOf('slides/slide');
+        slideNotes.set(at < 0 ? n : parseInt(rels.slice(at + 12), 10), collector.text());
+    });
+
+    let fullText = '';
+    let slideNum = 0;
+    for (const n of Array.from(slides.keys()).sort((a, b) => a - b)) {
+        slideNum++;
+        const slideText = [slides.get(n).text(), slideNotes.get(n)].filter(Boolean).join('\n');
+        if (slideText) fullText += '\n--- SLIDE ' + slideNum + ' ---\n' + slideText;
+    }
+    return fullText;
+}
+
+async function extractFlowAFindings(file, ext) {
+    if (ext === 'pdf') return parsePDF(file);
+    const extractedText = await parsePPTX(file);
+    updateProgress(70, 'Extracting findings...');
+    return extractFindings(extractedText, file.name);
+}
@@ -0,0 +1,706 @@
+#!/usr/bin/env python3
+"""
+Release build for the CRO Reach-Out Generator page.
+
+Takes a built page (index.html by default) and writes a deployable
+directory:
+1. Inline CSS and JS are extracted into content-hashed files under assets/
+2. CSS, JS and HTML are minified with a small pure-Python minifier
+3. Every text asset gets precompressed .gz and .br siblings
+4. The logos are resized for their largest on-page size (2x for retina)
+   and emitted as WebP with an optimized PNG fallback
+5. The Flow A worker script is minified and hashed like the page script
+6. pdf.js and JSZip are vendored: the pinned CDN files are downloaded once
+   into vendor/, checked against the SRI hashes committed in
+   vendor/manifest.json (an unpinned URL fails the build), copied under
+   hashed names and referenced with SRI hashes, so the page needs no CDN
+7. A service worker (sw.js) precaches every file the page loads under its
+   content hash, so repeat visits are served from cache and work offline;
+   a new release downloads only the entries whose content changed. The
+   vendored libraries are left out and cached on their first use instead
+8. Dead code is dropped first: top-level page functions unreachable from
+   the markup's event handlers and the script's top-level code, and CSS
+   rules whose classes or ids nothing in the page can produce; the bytes
+   saved are reported (--keep-dead-code ships the page whole)
+
+Pillow (logo resizing) and brotli (.br files) are optional; without them
+the logos are copied as-is and .br files are skipped.
+
+Usage:
+    python release.py [index.html] [-o dist] [--keep-dead-code]
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import urllib.request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INPUT = os.path.join(BASE_DIR, "index.html")
+DEFAULT_OUT_DIR = os.path.join(BASE_DIR, "dist")
+ASSETS = 'assets'
+
+# Largest CSS height each logo is rendered at (.cover-logo img / .login-box .login-logo img)
+LOGOS = {
+    'growisto-logo-white.png': 60,
+    'growisto-logo.png': 40,
+}
+RETINA_SCALE = 2
+
+# Lazy-loaded libraries declared in the page; see build_v2.py section 11
+VENDOR_SCRIPTS = re.compile(r'const VENDOR_SCRIPTS = \{.*?\n\};', re.S)
+VENDOR_ENTRY = re.compile(r"(\w+): \{ src: '([^']*)', cdn: '([^']*)' \}")
+VENDOR_LOCK = os.path.join('vendor', 'manifest.json')
+SRI_ALGORITHMS = ('sha256', 'sha384', 'sha512')
+
+# Flow A worker written next to the page by build_v2.py
+WORKER_SRC = re.compile(r"const FLOWA_WORKER_SRC = '([^']+)';")
+
+# Served from the release root so its scope covers the whole page
+SERVICE_WORKER = 'sw.js'
+# Build records the page never fetches
+PRECACHE_SKIP = {SERVICE_WORKER, f"{ASSETS}/vendor-manifest.json"}
+
+
+# ===========================
+# MINIFIERS
+# ===========================
+CSS_TOKENS = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')|/\*.*?\*/', re.S)
+
+
+def minify_css(css):
+    """Drop comments and redundant whitespace; string literals are left untouched."""
+    out = []
+    pos = 0
+    for m in CSS_TOKENS.finditer(css):
+        out.append(_squeeze_css(css[pos:m.start()]))
+        if m.group(1):
+            out.append(m.group(1))
+        pos = m.end()
+    out.append(_squeeze_css(css[pos:]))
+    return ''.join(out).replace(';}', '}').strip()
+
+
+def _squeeze_css(chunk):
+    chunk = re.sub(r'\s+', ' ', chunk)
+    chunk = re.sub(r' ?([{};,>]) ?', r'\1', chunk)
+    return re.sub(r': ', ':', chunk)
+
+
+JS_WORD = re.compile(r'[A-Za-z0-9_$]+')
+# After these a `/` starts a regex literal rather than a division
+REGEX_AFTER_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_AFTER_WORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'instanceof', 'yield', 'await'}
+# Whitespace next to these is never needed
+JS_TIGHT = set('{}()[];,:=<>?&|!*%^~')
+
+
+def minify_js(src):
+    """Drop comments, indentation, blank lines and redundant spaces.
+
+    Line breaks between statements are kept so automatic semicolon insertion
+    is unaffected; strings, regex literals and template literal text
+    (including nested `${...}` expressions) are copied verbatim.
+    """
+    out = []
+    i, n = 0, len(src)
+    templates = []   # brace depth at each open `${`
+    depth = 0
+    last = ''        # previous significant token, for regex detection
+    pending_space = False
+
+    def emit(token):
+        nonlocal pending_space
+        if pending_space and out and out[-1][-1] not in '\n' and out[-1][-1] not in JS_TIGHT and token[0] not in JS_TIGHT:
+            out.append(' ')
+        pending_space = False
+        out.append(token)
+
+    def newline():
+        nonlocal pending_space
+        pending_space = False
+        while out and out[-1] == ' ':
+            out.pop()
+        if out and not out[-1].endswith('\n'):
+            out.append('\n')
+
+    def template_text(start):
+        # Copy template text from `start` up to and including the closing ` or `${`
+        j = start
+        while j < n:
+            if src[j] == '\\':
+                j += 2
+            elif src[j] == '`':
+                return j + 1, False
+            elif src.startswith('${', j):
+                return j + 2, True
+            else:
+                j += 1
+        return n, False
+
+    while i < n:
+        c = src[i]
+        if c in ' \t\r\f\v':
+            pending_space = True
+            i += 1
+        elif c == '\n':
+            newline()
+            i += 1
+        elif src.startswith('//', i):
+            j = src.find('\n', i)
+            i = n if j == -1 else j
+        elif src.startswith('/*', i):
+            j = src.find('*/', i + 2)
+            j = n if j == -1 else j + 2
+            if '\n' in src[i:j]:
+                newline()
+            else:
+                pending_space = True
+            i = j
+        elif c in '\'"':
+            j = i + 1
+            while j < n and src[j] != c:
+                j += 2 if src[j] == '\\' else 1
+            emit(src[i:j + 1])
+            i, last = j + 1, 'str'
+        elif c == '`' or (c == '}' and templates and templates[-1] == depth):
+            if c == '}':
+                templates.pop()
+            j, opened = template_text(i + 1)
+            if opened:
+                templates.append(depth)
+            # Template text is emitted as-is, never padded or trimmed
+            if c == '`':
+                emit(src[i:j])
+            else:
+                out.append(src[i:j])
+            i, last = j, ('{' if opened else 'str')
+        elif c == '/' and (last in REGEX_AFTER_CHARS or last in REGEX_AFTER_WORDS or last == ''):
+            j, in_class = i + 1, False
+            while j < n and (src[j] != '/' or in_class):
+                if src[j] == '\\':
+                    j += 1
+                elif src[j] == '[':
+                    in_class = True
+                elif src[j] == ']':
+                    in_class = False
+                j += 1
+            m = JS_WORD.match(src, j + 1)
+            j = m.end() if m else j + 1
+            emit(src[i:j])
+            i, last = j, 'regex'
+        else:
+            m = JS_WORD.match(src, i)
+            if m:
+                emit(m.group())
+                i, last = m.end(), m.group()
+                continue
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+            emit(c)
+            i, last = i + 1, c
+    return ''.join(out).strip() + '\n'
+
+
+def minify_html(html):
+    """Drop comments and line indentation outside <pre>/<textarea>."""
+    parts = re.split(r'(<(pre|textarea)\b.*?</\2>)', html, flags=re.S | re.I)
+    out = []
+    for n, part in enumerate(parts):
+        if n % 3 == 0:
+            part = re.sub(r'<!--(?!\[if).*?-->', '', part, flags=re.S)
+            part = re.sub(r'\n\s+', '\n', part)
+        if n % 3 != 2:
+            out.append(part)
+    return ''.join(out).strip() + '\n'
+
+
+# ===========================
+# DEAD CODE
+# ===========================
+# Top-level declarations follow the page's column-0 convention (see
+# build_v2.page_declaration): `function name(` up to the first `}` at column 0,
+# or just its own line when that closes the body
+TOP_LEVEL_FUNCTION = re.compile(r'^(?:async )?function ([A-Za-z0-9_$]+)\(', re.M)
+FUNCTION_END = re.compile(r'^\}(?:\n|$)', re.M)
+COLUMN_ZERO = re.compile(r'^\S', re.M)
+EVENT_HANDLER = re.compile(r'\son[a-z]+="([^"]*)"', re.I)
+CSS_WORD = re.compile(r'[\w-]+')
+# Dropped before reading a selector's names: a missing name inside these
+# never stops the selector from matching
+CSS_SELECTOR_NOISE = re.compile(r':not\([^)]*\)|\[[^\]]*\]|"[^"]*"|\'[^\']*\'')
+# At-rules whose blocks hold ordinary rules; any other at-rule is kept whole
+CSS_GROUPING_RULES = ('@media', '@supports')
+
+
+def script_functions(js):
+    """Return {name: (start, end)} for the script's top-level function declarations."""
+    functions = {}
+    for m in TOP_LEVEL_FUNCTION.finditer(js):
+        line_end = js.find('\n', m.start())
+        line_end = len(js) if line_end == -1 else line_end + 1
+        if js[m.start():line_end].rstrip().endswith('}'):
+            functions[m.group(1)] = (m.start(), line_end)
+            continue
+        end = FUNCTION_END.search(js, line_end)
+        if not end or COLUMN_ZERO.search(js, line_end).start() != end.start():
+            raise ValueError(f"function {m.group(1)} does not end with a closing brace at column 0")
+        functions[m.group(1)] = (m.start(), end.end())
+    return functions
+
+
+def reachable_functions(js, markup):
+    """Return the names of top-level functions the page can call.
+
+    Roots are the identifiers in the markup's on* handlers and in the
+    script outside function declarations; a function reaches every name
+    its body mentions. Names inside strings and template literals count
+    too, so handlers written into generated HTML stay reachable; comments
+    do not, since each chunk is minified before it is read.
+    """
+    functions = script_functions(js)
+    top_level, pos = [], 0
+    for start, end in sorted(functions.values()):
+        top_level.append(js[pos:start])
+        pos = end
+    top_level.append(js[pos:])
+
+    names = set(JS_WORD.findall(minify_js(''.join(top_level))))
+    for m in EVENT_HANDLER.finditer(markup):
+        names.update(JS_WORD.findall(m.group(1)))
+    pending = [name for name in names if name in functions]
+    reached = set()
+    while pending:
+        name = pending.pop()
+        if name in reached:
+            continue
+        reached.add(name)
+        start, end = functions[name]
+        pending.extend(ref for ref in JS_WORD.findall(minify_js(js[start:end]))
+                       if ref in functions and ref not in reached)
+    return reached
+
+
+def prune_js(js, markup):
+    """Drop unreachable top-level functions; return (js, dropped names)."""
+    functions = script_functions(js)
+    reached = reachable_functions(js, markup)
+    dropped = [name for name in functions if name not in reached]
+    for start, end in sorted((functions[name] for name in dropped), reverse=True):
+        js = js[:start] + js[end:]
+    return js, dropped
+
+
+def css_names_in_use(text):
+    """Return a predicate telling whether a class or id can appear in `text`.
+
+    Matching is case-insensitive (class names are often built from values
+    with toLowerCase()), and a word ending in a dash such as 'status-'
+    counts as a prefix, since names are also built by concatenation.
+    """
+    words = {word.lower() for word in CSS_WORD.findall(text)}
+    prefixes = tuple(word for word in words if len(word) > 1 and word.endswith('-'))
+    return lambda name: name.lower() in words or name.lower().startswith(prefixes)
+
+
+def prune_css(css, in_use):
+    """Drop selectors naming a class or id not `in_use`; return (css, dropped selectors).
+
+    `css` must be minified. A rule loses the dead selectors in its list and
+    goes when none is left; @media/@supports blocks go when emptied.
+    """
+    out, dropped = [], []
+    i = 0
+    while i < len(css):
+        brace = css.find('{', i)
+        if brace == -1:
+            out.append(css[i:])
+            break
+        head = css[i:brace]
+        if head.lstrip().startswith('@'):
+            depth, end = 1, brace + 1
+            while depth:
+                depth += {'{': 1, '}': -1}.get(css[end], 0)
+                end += 1
+            if head.lstrip().startswith(CSS_GROUPING_RULES):
+                body, inner = prune_css(css[brace + 1:end - 1], in_use)
+                dropped.extend(inner)
+                if body.strip():
+                    out.append(f"{head}{{{body}}}")
+            else:
+                out.append(css[i:end])
+            i = end
+            continue
+        end = css.index('}', brace) + 1
+        live = []
+        for selector in head.split(','):
+            names = re.findall(r'[.#](-?[_a-zA-Z][\w-]*)', CSS_SELECTOR_NOISE.sub('', selector))
+            if all(in_use(name) for name in names):
+                live.append(selector)
+            else:
+                dropped.append(selector.strip())
+        if live:
+            out.append(','.join(live) + css[brace:end])
+        i = end
+    return ''.join(out), dropped
+
+
+def prune_page(html):
+    """Drop dead functions and CSS from the page; return (html, stats).
+
+    stats holds the dropped function names and selectors, and the minified
+    script and stylesheet sizes before and after.
+    """
+    stats = {'functions': [], 'selectors': [], 'js': (0, 0), 'css': (0, 0)}
+    script = re.search(r'<script>(.*?)</script>', html, re.S)
+    if script:
+        js = script.group(1)
+        markup = html[:script.start()] + html[script.end():]
+        pruned, stats['functions'] = prune_js(js, markup)
+        stats['js'] = (len(minify_js(js).encode('utf-8')), len(minify_js(pruned).encode('utf-8')))
+        html = html[:script.start(1)] + pruned + html[script.end(1):]
+
+    style = re.search(r'<style>(.*?)</style>', html, re.S)
+    if style:
+        css = minify_css(style.group(1))
+        in_use = css_names_in_use(html[:style.start()] + html[style.end():])
+        pruned, stats['selectors'] = prune_css(css, in_use)
+        stats['css'] = (len(css.encode('utf-8')), len(pruned.encode('utf-8')))
+        html = html[:style.start(1)] + pruned + html[style.end(1):]
+    return html, stats
+
+
+def print_prune_report(stats):
+    kb = lambda v: f"{v / 1024:.1f} KB"
+    print(f"Dead code dropped: {len(stats['functions'])} functions, {len(stats['selectors'])} CSS selectors")
+    total = tuple(map(sum, zip(stats['js'], stats['css'])))
+    for label, (before, after) in (('script', stats['js']), ('stylesheet', stats['css']), ('total', total)):
+        print(f"  {label:<12} {kb(before):>10} -> {kb(after):>10}  (-{kb(before - after)})")
+    if stats['functions']:
+        print(f"  functions: {', '.join(stats['functions'])}")
+
+
+# ===========================
+# OUTPUT
+# ===========================
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def hashed_name(name, data):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{content_hash(data)}{ext}"
+
+
+def write_asset(out_dir, rel_path, data, compress=True):
+    """Write a file (and its .gz/.br siblings); return a size report row."""
+    path = os.path.join(out_dir, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    row = {'file': rel_path, 'bytes': len(data), 'gzip': None, 'brotli': None}
+    if compress:
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        with open(path + '.gz', 'wb') as f:
+            f.write(gz)
+        row['gzip'] = len(gz)
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            with open(path + '.br', 'wb') as f:
+                f.write(br)
+            row['brotli'] = len(br)
+    return row
+
+
+def sri_hash(data, algorithm='sha384'):
+    return f"{algorithm}-" + base64.b64encode(hashlib.new(algorithm, data).digest()).decode('ascii')
+
+
+def vendor_file(src, url, asset_dir, lock):
+    """Return the bytes of a vendored library, downloading it when missing.
+
+    `lock` maps each pinned URL to its SRI hash (as published by the CDN).
+    A URL missing from the lock is refused, and a download or local copy
+    that does not match its hash is rejected before it is used or kept.
+    """
+    if url not in lock:
+        raise ValueError(f"{url} is not pinned in {VENDOR_LOCK}; add its file and SRI hash there first")
+    integrity = lock[url]['integrity']
+    algorithm = integrity.split('-', 1)[0]
+    if algorithm not in SRI_ALGORITHMS:
+        raise ValueError(f"unsupported hash {algorithm!r} pinned in {VENDOR_LOCK} for {url}")
+
+    path = os.path.join(asset_dir, src)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if sri_hash(data, algorithm) != integrity:
+            raise ValueError(f"{src} does not match the hash pinned in {VENDOR_LOCK} for {url}")
+        return data
+    try:
+        with urllib.request.urlopen(url, timeout=60) as resp:
+            data = resp.read()
+    except OSError as e:
+        raise ValueError(f"could not download {url}: {e}")
+    if sri_hash(data, algorithm) != integrity:
+        raise ValueError(f"download of {url} does not match the hash pinned in {VENDOR_LOCK}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data
+
+
+def vendor_scripts(html, out_dir, asset_dir, report):
+    """Copy the page's lazy-loaded libraries into the release and point VENDOR_SCRIPTS at them."""
+    m = VENDOR_SCRIPTS.search(html)
+    if not m:
+        return html
+    lock_path = os.path.join(asset_dir, VENDOR_LOCK)
+    if not os.path.exists(lock_path):
+        raise ValueError(f"{VENDOR_LOCK} is missing; the vendored libraries cannot be verified")
+    with open(lock_path, 'r') as f:
+        lock = json.load(f)
+
+    manifest, entries = {}, []
+    for name, src, url in VENDOR_ENTRY.findall(m.group()):
+        data = vendor_file(src, url, asset_dir, lock)
+        rel = f"{ASSETS}/{hashed_name(os.path.basename(src), data)}"
+        # Only fetched on the first Flow A upload, so never precached
+        report.append(dict(write_asset(out_dir, rel, data), lazy=True))
+        manifest[name] = {'file': rel, 'source': url, 'integrity': lock[url]['integrity']}
+        entries.append(f"    {name}: {{ src: '{rel}', integrity: '{lock[url]['integrity']}' }}")
+
+    report.append(write_asset(out_dir, f"{ASSETS}/vendor-manifest.json",
+                              (json.dumps(manifest, indent=2) + '\n').encode('utf-8'), compress=False))
+    return html[:m.start()] + 'const VENDOR_SCRIPTS = {\n' + ',\n'.join(entries) + '\n};' + html[m.end():]
+
+
+# ===========================
+# SERVICE WORKER
+# ===========================
+service_worker_template_js = '''// Precaching service worker. Generated by release.py; do not edit.
+// Entries are cached under their URL plus content revision in one cache that
+// outlives releases: installing a new release fetches only the entries whose
+// revision changed, and activation drops the rest. Precached files are served
+// cache-first. Lazy entries (the vendored libraries) are not fetched at
+// install but go into the same cache, under their revision, the first time
+// the page loads them; the web fonts are cached the first time they load.
+const CACHE_VERSION = 1;
+const PRECACHE = 'cro-precache-v' + CACHE_VERSION;
+const RUNTIME = 'cro-runtime-v' + CACHE_VERSION;
+const RUNTIME_ORIGINS = ['https://fonts.googleapis.com', 'https://fonts.gstatic.com'];
+const PRECACHE_MANIFEST = __PRECACHE_MANIFEST__;
+const LAZY_MANIFEST = __LAZY_MANIFEST__;
+
+function revisionKeys(manifest) {
+    return new Map(manifest.map(entry => {
+        const url = new URL(entry.url, self.registration.scope).href;
+        return [url, url + '?__rev=' + entry.revision];
+    }));
+}
+
+const precacheKeys = revisionKeys(PRECACHE_MANIFEST);
+const lazyKeys = revisionKeys(LAZY_MANIFEST);
+
+function precacheKey(request) {
+    const url = new URL(request.url);
+    url.hash = '';
+    // The page is also reachable as the bare directory, with or without a query
+    if (request.mode === 'navigate' && url.origin + url.pathname === self.registration.scope) {
+        return precacheKeys.get(new URL('index.html', self.registration.scope).href);
+    }
+    return precacheKeys.get(url.href) || lazyKeys.get(url.href);
+}
+
+async function cacheFirst(cacheName, key, request) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(key);
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (response.ok || response.type === 'opaque') await cache.put(key, response.clone());
+    return response;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(PRECACHE).then(cache => Promise.all(
+        Array.from(precacheKeys, async ([url, key]) => {
+            if (await cache.match(key)) return;
+            const response = await fetch(url, { cache: 'reload' });
+            if (!response.ok) throw new Error('Precache of ' + url + ' failed: ' + response.status);
+            await cache.put(key, response);
+        })
+    )));
+});
+
+// A new release waits for every open tab to close before activating, so a
+// running page never loses the hashed files it still references
+self.addEventListener('activate', event => {
+    const current = new Set([...precacheKeys.values(), ...lazyKeys.values()]);
+    event.waitUntil((async () => {
+        for (const name of await caches.keys()) {
+            if (name.startsWith('cro-') && name !== PRECACHE && name !== RUNTIME) await caches.delete(name);
+        }
+        const cache = await caches.open(PRECACHE);
+        for (const request of await cache.keys()) {
+            if (!current.has(request.url)) await cache.delete(request);
+        }
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+    const key = precacheKey(request);
+    if (key) {
+        event.respondWith(cacheFirst(PRECACHE, key, request));
+    } else if (RUNTIME_ORIGINS.includes(new URL(request.url).origin)) {
+        event.respondWith(cacheFirst(RUNTIME, request, request));
+    }
+});
+'''
+
+# Registered once the page has loaded; file:// pages cannot use service workers
+service_worker_register_html = (
+    "<script>if ('serviceWorker' in navigator && location.protocol !== 'file:') "
+    "window.addEventListener('load', () => navigator.serviceWorker.register('" + SERVICE_WORKER + "')"
+    ".catch(err => console.warn('Service worker not registered:', err)));</script>\n"
+)
+
+
+def precache_manifest(out_dir, report, lazy=False):
+    """Return [{url, revision}] for every written file the page fetches.
+
+    With `lazy`, only the files the page loads on demand (rows marked lazy),
+    which the service worker caches on first use instead of at install.
+    """
+    manifest = []
+    for row in report:
+        if row['file'] in PRECACHE_SKIP or row.get('lazy', False) != lazy:
+            continue
+        with open(os.path.join(out_dir, row['file']), 'rb') as f:
+            manifest.append({'url': row['file'], 'revision': content_hash(f.read())})
+    return sorted(manifest, key=lambda entry: entry['url'])
+
+
+def service_worker_js(manifest, lazy=()):
+    return (service_worker_template_js.replace('__PRECACHE_MANIFEST__', json.dumps(manifest, indent=4))
+            .replace('__LAZY_MANIFEST__', json.dumps(list(lazy), indent=4)))
+
+
+def optimize_logo(src_path, css_height):
+    """Return {extension: bytes} for a logo resized to its on-page size."""
+    with open(src_path, 'rb') as f:
+        original = f.read()
+    if Image is None:
+        return {'.png': original}
+    with Image.open(io.BytesIO(original)) as img:
+        height = css_height * RETINA_SCALE
+        width = round(img.width * height / img.height)
+        img = img.resize((width, height), Image.LANCZOS)
+        webp, png = io.BytesIO(), io.BytesIO()
+        img.save(webp, 'WEBP', quality=90, method=6)
+        img.save(png, 'PNG', optimize=True)
+    return {'.webp': webp.getvalue(), '.png': png.getvalue()}
+
+
+def release_page(html, out_dir, asset_dir=BASE_DIR):
+    """Write the release build of `html` into `out_dir`; return the size report."""
+    report = []
+    html = vendor_scripts(html, out_dir, asset_dir, report)
+
+    m = WORKER_SRC.search(html)
+    if m and os.path.exists(os.path.join(asset_dir, m.group(1))):
+        with open(os.path.join(asset_dir, m.group(1)), 'r') as f:
+            data = minify_js(f.read()).encode('utf-8')
+        rel = f"{ASSETS}/{hashed_name(os.path.basename(m.group(1)), data)}"
+        report.append(write_asset(out_dir, rel, data))
+        html = html[:m.start()] + f"const FLOWA_WORKER_SRC = '{rel}';" + html[m.end():]
+
+    def extract(pattern, name, minify, tag):
+        nonlocal html
+        m = re.search(pattern, html, re.S)
+        if not m:
+            return
+        data = minify(m.group(1)).encode('utf-8')
+        rel = f"{ASSETS}/{hashed_name(name, data)}"
+        report.append(write_asset(out_dir, rel, data))
+        html = html[:m.start()] + tag.format(rel) + html[m.end():]
+
+    extract(r'<style>(.*?)</style>', 'app.css', minify_css, '<link rel="stylesheet" href="{}">')
+    extract(r'<script>(.*?)</script>', 'app.js', minify_js, '<script src="{}"></script>')
+
+    for logo, css_height in LOGOS.items():
+        src = os.path.join(asset_dir, logo)
+        if not os.path.exists(src) or logo not in html:
+            continue
+        variants = optimize_logo(src, css_height)
+        names = {}
+        for ext, data in variants.items():
+            names[ext] = f"{ASSETS}/{hashed_name(os.path.splitext(logo)[0] + ext, data)}"
+            report.append(write_asset(out_dir, names[ext], data, compress=False))
+        img = re.compile(r'<img src="' + re.escape(logo) + r'"([^>]*)>')
+        if '.webp' in names:
+            html = img.sub(lambda m: f'<picture><source srcset="{names[".webp"]}" type="image/webp">'
+                                     f'<img src="{names[".png"]}"{m.group(1)}></picture>', html)
+        else:
+            html = img.sub(lambda m: f'<img src="{names[".png"]}"{m.group(1)}>', html)
+
+    html = html.replace('</body>', service_worker_register_html + '</body>', 1)
+    report.insert(0, write_asset(out_dir, 'index.html', minify_html(html).encode('utf-8')))
+    sw = service_worker_js(precache_manifest(out_dir, report), precache_manifest(out_dir, report, lazy=True))
+    sw = minify_js(sw).encode('utf-8')
+    report.append(write_asset(out_dir, SERVICE_WORKER, sw))
+    return report
+
+
+def print_report(report):
+    kb = lambda v: '-' if v is None else f"{v / 1024:.1f} KB"
+    for row in report:
+        print(f"  {row['file']:<44} {kb(row['bytes']):>10}  gz {kb(row['gzip']):>9}  br {kb(row['brotli']):>9}")
+    if brotli is None:
+        print("  (brotli not installed: .br files skipped)")
+    if Image is None:
+        print("  (Pillow not installed: logos copied without resizing)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a minified, precompressed release build of the page.')
+    parser.add_argument('input', nargs='?', default=DEFAULT_INPUT, help='built page (default: index.html)')
+    parser.add_argument('-o', '--out-dir', default=DEFAULT_OUT_DIR, help='output directory (default: dist/)')
+    parser.add_argument('--keep-dead-code', action='store_true',
+                        help='ship unreachable functions and unused CSS instead of dropping them')
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r') as f:
+        html = f.read()
+    try:
+        if not args.keep_dead_code:
+            html, pruned = prune_page(html)
+            print_prune_report(pruned)
+        report = release_page(html, args.out_dir, asset_dir=os.path.dirname(os.path.abspath(args.input)))
+    except ValueError as e:
+        raise SystemExit(f"Release failed: {e}")
+    print(f"Release written to {args.out_dir}:")
+    print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+The benchmark suite's synthetic template must build like the v1 template,
+and compare must flag only real slowdowns.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+from benchmarks import suite  # noqa: E402
+
+
+def report(**medians):
+    return {'results': {name: {'median': ms} for name, ms in medians.items()}}
+
+
+def test_synthetic_template_builds_at_every_scale():
+    html = suite.read_page()
+    one, ten = suite.synthetic_template(html, 1), suite.synthetic_template(html, 10)
+    assert len(ten) > 9 * len(one) * 0.8
+    for template in (one, ten):
+        spans = build_v2.index_anchors(template, build_v2.PATCHES)
+        assert len(spans) == sum(p.count for p in build_v2.PATCHES)
+
+
+def test_compare_flags_regressions_above_threshold_and_noise():
+    baseline = report(slow=10.0, steady=10.0, tiny=0.01, gone=1.0)
+    current = report(slow=12.0, steady=11.0, tiny=0.05, new=3.0)
+    rows = {name: regressed for name, _, _, _, regressed in suite.compare(baseline, current, threshold=0.15)}
+    assert rows == {'slow': True, 'steady': False, 'tiny': False}
+
+
+def test_compare_exit_status(tmp_path):
+    base, cur = tmp_path / 'base.json', tmp_path / 'cur.json'
+    base.write_text('{"results": {"a": {"median": 1.0}}}')
+    cur.write_text('{"results": {"a": {"median": 2.0}}}')
+    assert suite.main(['compare', str(base), str(cur)]) == 1
+    assert suite.main(['compare', str(base), str(cur), '--threshold', '1.5']) == 0
@@ -0,0 +1,173 @@
+"""
+The windowed brand history list (build_v2.brand_list_js) under Node.js with
+a DOM stub. After any sequence of saves and deletes, updateBrandInList must
+leave brandList.order equal to a full lastUpdated sort; the status/phase
+filters must equal a scan of the brands map; and renderBrandWindow must
+only hold (and only create) rows for the visible band [first, last).
+"""
+
+import json
+import math
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+
+NODE = shutil.which('node')
+
+BRAND_LIST_DECLARATIONS = (
+    'BRAND_ROW_PITCH', 'BRAND_LIST_OVERSCAN', 'BRAND_LIST_EMPTY', 'BRAND_LIST_NO_MATCH', 'brandList',
+    'brandStatusKey', 'brandPhaseKey', 'compareBrands', 'indexBrand', 'unindexBrand', 'renderBrandList',
+    'updateBrandInList', 'filterBrandList', 'scheduleBrandWindow', 'renderBrandWindow', 'fillBrandRow',
+)
+STATUSES = ['active', 'paused', 'closed', None]
+PHASES = ['Phase 1 - Outreach', 'Phase 2 - Follow-up', 'Phase 3 - Call', '', None]
+VIEW_HEIGHT = 700
+
+# A sidebar scrolled to `scrollTop` with a fixed-height viewport; rows are
+# counted as they are created and removed
+NODE_RUNNER = '''
+const [brands, saves, filters, scrolls] = JSON.parse(require('fs').readFileSync(process.argv[2], 'utf8'));
+const data = { brands };
+function loadAllData() { return data; }
+function escapeHtml(text) { return String(text); }
+function viewBrandDetail(id) {}
+const window = { innerHeight: 900, addEventListener() {} };
+function requestAnimationFrame(fn) { return 1; }
+let created = 0, scrollTop = 0;
+const scroller = { clientHeight: %d, addEventListener() {}, getBoundingClientRect: () => ({ top: 0 }) };
+const win = { style: {}, children: new Set(), closest: () => scroller, getBoundingClientRect: () => ({ top: -scrollTop }),
+              appendChild(row) { this.children.add(row); row.parent = this; } };
+const elements = { brandListWindow: win, brandListEmpty: { style: {} },
+                   brandStatusFilter: { value: '' }, brandPhaseFilter: { value: '' } };
+const document = {
+    getElementById: id => elements[id],
+    createElement: () => { created++; return { style: {}, remove() { this.parent.children.delete(this); } }; }
+};
+const windowState = () => ({ rows: [...brandList.rows.keys()], dom: win.children.size,
+    tops: [...brandList.rows.values()].map(row => row.style.top), created });
+
+const out = { saves: [], filters: [], scrolls: [] };
+renderBrandList();
+out.initial = [...brandList.order];
+for (const [id, brand] of saves) {
+    if (brand) data.brands[id] = brand; else delete data.brands[id];
+    updateBrandInList(id);
+    out.saves.push([...brandList.order]);
+}
+for (const [status, phase] of filters) {
+    elements.brandStatusFilter.value = status;
+    elements.brandPhaseFilter.value = phase;
+    filterBrandList();
+    out.filters.push([...brandList.visible]);
+}
+elements.brandStatusFilter.value = elements.brandPhaseFilter.value = '';
+filterBrandList();
+for (const top of scrolls) {
+    scrollTop = top;
+    created = 0;
+    renderBrandWindow();
+    out.scrolls.push(windowState());
+}
+out.brands = data.brands;
+process.stdout.write(JSON.stringify(out));
+''' % VIEW_HEIGHT
+
+
+def random_brand(rng, brand_id, stamps):
+    # Distinct timestamps, so the full sort has a single answer
+    stamp = f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 86399):05d}'
+    while stamp in stamps:
+        stamp += '0'
+    stamps.add(stamp)
+    brand = {'id': brand_id, 'brandName': f'Brand {brand_id}', 'lastUpdated': stamp}
+    status, phase = rng.choice(STATUSES), rng.choice(PHASES)
+    if status:
+        brand['status'] = status
+    if phase is not None:
+        brand['currentPhase'] = phase
+    return brand
+
+
+def status_key(brand):
+    return brand.get('status') or 'active'
+
+
+def phase_key(brand):
+    m = re.match(r'Phase (\d)', brand.get('currentPhase') or '')
+    return 'phase' + m.group(1) if m else 'other'
+
+
+def full_sort(brands):
+    return [b['id'] for b in sorted(brands.values(), key=lambda b: b['lastUpdated'], reverse=True)]
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_windowed_brand_list(tmp_path):
+    rng = random.Random(12)
+    stamps = set()
+    brands = {f'b{i}': random_brand(rng, f'b{i}', stamps) for i in range(600)}
+    saves, state = [], dict(brands)
+    for n in range(300):
+        if n % 25 == 24:
+            brand_id = rng.choice(sorted(state))
+            saves.append([brand_id, None])
+            del state[brand_id]
+            continue
+        # Mostly edits of existing brands (to any time, not only newer), some new ones
+        brand_id = rng.choice(sorted(state)) if n % 5 else f'new{n}'
+        brand = random_brand(rng, brand_id, stamps)
+        saves.append([brand_id, brand])
+        state[brand_id] = brand
+    filters = [[status, phase] for status in ['', 'active', 'paused', 'closed', 'archived']
+               for phase in ['', 'phase1', 'phase2', 'phase3', 'other']]
+    scrolls = [0, 35, 300 * 70 + 10, 300 * 70 + 150, 10 ** 6]
+
+    script, data = tmp_path / 'brand-list.js', tmp_path / 'brand-list.json'
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    script.write_text(''.join(build_v2.page_declaration(html, name) for name in BRAND_LIST_DECLARATIONS) + NODE_RUNNER)
+    data.write_text(json.dumps([brands, saves, filters, scrolls]))
+    out = json.loads(subprocess.run([NODE, str(script), str(data)], capture_output=True, text=True, check=True).stdout)
+
+    # Binary-search re-slotting equals a full sort after every save
+    assert out['initial'] == full_sort(brands)
+    replay = dict(brands)
+    for (brand_id, brand), order in zip(saves, out['saves']):
+        if brand:
+            replay[brand_id] = brand
+        else:
+            del replay[brand_id]
+        assert order == full_sort(replay)
+    assert out['brands'] == replay
+
+    # Set intersections equal a scan of the brands map
+    order = full_sort(replay)
+    for (status, phase), visible in zip(filters, out['filters']):
+        assert visible == [i for i in order
+                           if (not status or status_key(replay[i]) == status)
+                           and (not phase or phase_key(replay[i]) == phase)]
+    assert any(out['filters']) and not all(out['filters'])
+
+    # Only rows in [first, last) exist, and scrolling creates only the new ones
+    pitch, overscan = 70, 4
+    # filterBrandList already painted the top of the list
+    previous = set(order[:math.ceil(VIEW_HEIGHT / pitch) + overscan])
+    for top, window in zip(scrolls, out['scrolls']):
+        first = max(0, math.floor(top / pitch) - overscan)
+        last = min(len(order), math.ceil((top + VIEW_HEIGHT) / pitch) + overscan)
+        band = order[first:last]
+        assert sorted(window['rows']) == sorted(band) and window['dom'] == len(band)
+        assert sorted(window['tops']) == sorted(f'{i * pitch}px' for i in range(first, last))
+        assert window['created'] == len(set(band) - previous)
+        previous = set(band)
+    assert out['scrolls'][1]['created'] < 3 and out['scrolls'][-1]['rows'] == []
@@ -0,0 +1,105 @@
+"""
+The build cache. An unchanged template and unchanged build sources must
+reuse the stored page; editing any of the Python sources that build it
+(not just the fragments) must rebuild, superseded outputs must be removed,
+and --force must rebuild while --stats reports what hit and missed.
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+
+TEMPLATE = '<!DOCTYPE html>\n<html><body>v1</body></html>\n'
+
+
+@pytest.fixture
+def builds(tmp_path, monkeypatch):
+    """Record build() calls and build from copies of the sources under tmp_path."""
+    calls = []
+
+    def build(template, perf=False):
+        calls.append(perf)
+        return f'{template}<!-- build {len(calls)}{" perf" if perf else ""} -->\n'
+    monkeypatch.setattr(build_v2, 'build', build)
+    sources = []
+    for path in build_v2.BUILD_SOURCES:
+        shutil.copy(path, tmp_path)
+        sources.append(str(tmp_path / os.path.basename(path)))
+    monkeypatch.setattr(build_v2, 'BUILD_SOURCES', tuple(sources))
+    return calls
+
+
+def stored(cache):
+    return sorted(os.listdir(cache.objects))
+
+
+def test_unchanged_inputs_hit(tmp_path, builds):
+    cache = build_v2.BuildCache(str(tmp_path / 'cache'))
+    first = build_v2.cached_build(TEMPLATE, cache)
+    assert 'output' in cache.stats['misses'] and 'sources' in cache.stats['misses']
+
+    cache = build_v2.BuildCache(str(tmp_path / 'cache'))
+    assert build_v2.cached_build(TEMPLATE, cache) == first
+    assert builds == [False]
+    assert cache.stats['misses'] == [] and {'output', 'sources', 'template'} <= set(cache.stats['hits'])
+
+
+def test_source_change_rebuilds_and_prunes(tmp_path, builds):
+    cache = build_v2.BuildCache(str(tmp_path / 'cache'))
+    build_v2.cached_build(TEMPLATE, cache)
+    build_v2.cached_build(TEMPLATE, cache, perf=True)
+    assert len(stored(cache)) == 2
+
+    # A second-stage change lives outside every fragment and patch
+    with open(build_v2.BUILD_SOURCES[2], 'a') as f:
+        f.write('\n# scoring tweak\n')
+    cache = build_v2.BuildCache(str(tmp_path / 'cache'))
+    html = build_v2.cached_build(TEMPLATE, cache)
+    assert html.endswith('<!-- build 3 -->\n') and builds == [False, True, False]
+    assert 'output' in cache.stats['misses'] and 'sources' in cache.stats['misses']
+    assert all(name in cache.stats['hits'] for name in build_v2.CACHED_FRAGMENTS)
+    # The superseded default output is gone; the perf output is still current for its mode
+    assert len(stored(cache)) == 2
+
+    build_v2.cached_build(TEMPLATE, cache, perf=True)
+    assert builds == [False, True, False, True] and len(stored(cache)) == 2
+
+    build_v2.cached_build(TEMPLATE.replace('v1', 'v1.1'), cache)
+    assert len(stored(cache)) == 2
+
+
+def test_force_and_stats(tmp_path, builds, monkeypatch, capsys):
+    template = tmp_path / 'index.html.v1.bak'
+    template.write_text(TEMPLATE)
+    monkeypatch.setattr(build_v2, 'V1_PATH', str(template))
+    monkeypatch.setattr(build_v2, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(build_v2, 'OUTPUT_PATH', str(tmp_path / 'index.html'))
+    monkeypatch.setattr(build_v2, 'WORKER_PATH', str(tmp_path / 'flowa-worker.js'))
+    monkeypatch.setattr(build_v2, 'flowa_worker_js', lambda html: '// worker\n')
+
+    def stats_lines():
+        out = capsys.readouterr().out
+        hits = next(line for line in out.splitlines() if line.startswith('Cache hits'))
+        misses = next(line for line in out.splitlines() if line.startswith('Cache misses'))
+        return hits, misses
+
+    build_v2.main(['--stats'])
+    hits, misses = stats_lines()
+    assert 'output' in misses and builds == [False]
+
+    build_v2.main(['--stats'])
+    hits, misses = stats_lines()
+    assert 'output' in hits and misses == 'Cache misses (0): -' and builds == [False]
+
+    build_v2.main(['--force', '--stats'])
+    hits, misses = stats_lines()
+    assert 'output' in misses and 'sources' in hits and builds == [False, False]
+    assert (tmp_path / 'index.html').read_text().endswith('<!-- build 2 -->\n')
+    assert len(os.listdir(tmp_path / 'cache' / 'objects')) == 1
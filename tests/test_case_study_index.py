@@ -0,0 +1,35 @@
+"""
+The indexed matchCaseStudies / getTopCaseStudiesForIssues must return
+exactly what the scan-and-sort versions returned, including after the case
+studies are edited and the index is invalidated.
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import case_studies  # noqa: E402
+
+NODE = shutil.which('node')
+
+
+def page_html():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        return f.read()
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+@pytest.mark.parametrize('n', [0, 1, 31, 32, 33, 300])
+def test_indexed_matching_matches_reference(n):
+    studies = case_studies.synthetic_studies(n, seed=n)
+    issue_sets = case_studies.synthetic_issue_sets(400, seed=n)
+    out = case_studies.run(page_html(), studies, issue_sets, calls=2)
+    assert out['indexed'] == out['reference']
+    assert out['indexedEdited'] == out['referenceEdited']
+    if n:
+        assert any(match for match, _ in out['reference'])
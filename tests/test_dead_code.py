@@ -0,0 +1,120 @@
+"""
+Dead code elimination in the release build. Functions the page can call
+(from on* handlers, top-level code, generated markup strings, or other
+reachable functions) must survive; the rest, and CSS rules whose classes
+or ids nothing in the page can produce, must go. On the real page the
+pruned script must still parse and declare every handler it calls.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import release  # noqa: E402
+
+NODE = shutil.which('node')
+
+PAGE = '''<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        .card { padding: 4px; }
+        .legacy-panel, .card:hover { color: red; }
+        .legacy-panel p { margin: 0; }
+        .status-active, .badge.high { font-weight: bold; }
+        .card:not(.legacy-only) { border: 0; }
+        #save-btn { color: blue; }
+        #old-btn { color: gray; }
+        @media (max-width: 600px) { .legacy-panel { display: none; } }
+        @media (max-width: 400px) { .card { padding: 0; } }
+        @keyframes spin { from { opacity: 0; } to { opacity: 1; } }
+    </style>
+</head>
+<body>
+    <div class="card"><button id="save-btn" onclick="saveBrand(); render()">Save</button></div>
+    <script>
+        const RENDERERS = { list: renderList };
+        document.addEventListener('DOMContentLoaded', init);
+
+        async function init() {
+            render();
+        }
+
+        function render() {
+            // renderLegacy() used to run here
+            const status = 'status-' + state;
+            badge.className = 'badge ' + 'HIGH'.toLowerCase();
+            list.innerHTML = `<button onclick="deleteBrand('${id}')">x</button>`;
+        }
+
+        function saveBrand() {
+            persist();
+        }
+
+        function persist() {}
+
+        function renderList() {}
+
+        function deleteBrand(id) {}
+
+        function renderLegacy() {
+            legacyHelper('legacy-panel');
+        }
+
+        function legacyHelper(name) {}
+    </script>
+</body>
+</html>
+'''
+
+
+def dedent_page(page):
+    # Top-level declarations sit at column 0 in the real page
+    return re.sub(r'^ {8}', '', page, flags=re.M)
+
+
+def test_prunes_unreachable_functions_and_unused_css():
+    html, stats = release.prune_page(dedent_page(PAGE))
+
+    assert sorted(stats['functions']) == ['legacyHelper', 'renderLegacy']
+    for name in ('init', 'render', 'saveBrand', 'persist', 'renderList', 'deleteBrand'):
+        assert f'function {name}(' in html
+    assert 'function renderLegacy(' not in html and 'function legacyHelper(' not in html
+
+    css = re.search(r'<style>(.*?)</style>', html, re.S).group(1)
+    assert sorted(stats['selectors']) == ['#old-btn', '.legacy-panel', '.legacy-panel', '.legacy-panel p']
+    assert '.card:hover{color:red}' in css
+    assert '.status-active,.badge.high{' in css and '.card:not(.legacy-only)' in css and '#save-btn' in css
+    assert '@media (max-width:600px)' not in css and '@media (max-width:400px){.card{padding:0}}' in css
+    assert '@keyframes spin' in css
+    js_before, js_after = stats['js']
+    css_before, css_after = stats['css']
+    assert js_after < js_before and css_after < css_before
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_pruned_page_script_parses_and_keeps_handlers(tmp_path):
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        page = f.read()
+    html, stats = release.prune_page(page)
+
+    assert {'generateFindingBullets', 'matchCaseStudies'} <= set(stats['functions'])
+    js = re.search(r'<script>(.*?)</script>', html, re.S).group(1)
+    declared = set(release.script_functions(js))
+    assert not declared & set(stats['functions'])
+    handlers = set()
+    for m in release.EVENT_HANDLER.finditer(html):
+        handlers.update(re.findall(r'([A-Za-z_$][\w$]*)\(', m.group(1)))
+    page_functions = set(release.script_functions(re.search(r'<script>(.*?)</script>', page, re.S).group(1)))
+    assert handlers & page_functions <= declared
+
+    script = tmp_path / 'pruned.js'
+    script.write_text(js)
+    subprocess.run([NODE, '--check', str(script)], check=True)
@@ -0,0 +1,191 @@
+"""
+The Flow A extraction cache. EXTRACTOR_VERSION must be stamped from the
+page's own extraction code, and under Node.js with an in-memory stand-in
+for the IndexedDB store a re-upload must skip extraction, a renamed or
+stale entry must miss, and saving must keep the store to its LRU limit.
+Opening the database must not hang on a tab holding the old version, and
+must let a newer version upgrade it.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+
+NODE = shutil.which('node')
+
+CACHE_DECLARATIONS = ('EXTRACTOR_VERSION', 'EXTRACTION_CACHE_LIMIT', 'EXTRACTION_HASH_CHUNK', 'hashUploadedFile',
+                      'getCachedExtraction', 'cacheExtraction', 'extractUploadedFile', 'idbRequest', 'idbTransaction')
+
+# An object store keyed by hash with a usedAt index: requests and cursor
+# steps settle on later ticks and the transaction completes once none is left
+FAKE_STORE = '''
+const rows = new Map();
+const clone = v => v === undefined ? v : JSON.parse(JSON.stringify(v));
+let storageDb = { transaction() {
+    let pending = 0;
+    const tx = {};
+    const settle = (req, result) => {
+        pending++;
+        setTimeout(() => {
+            pending--;
+            req.result = result();
+            if (req.onsuccess) req.onsuccess();
+            setTimeout(() => { if (!pending && tx.oncomplete) { tx.oncomplete(); tx.oncomplete = null; } });
+        });
+        return req;
+    };
+    tx.objectStore = () => ({
+        get: key => settle({}, () => clone(rows.get(key))),
+        put: value => settle({}, () => { rows.set(value.hash, clone(value)); }),
+        count: () => settle({}, () => rows.size),
+        index: () => ({ openCursor() {
+            const req = {};
+            let order = null, i = 0;
+            const cursor = () => {
+                if (!order) order = [...rows.values()].sort((a, b) => a.usedAt - b.usedAt).map(v => v.hash);
+                if (i >= order.length) return null;
+                const key = order[i];
+                return { value: clone(rows.get(key)), delete() { rows.delete(key); }, continue() { i++; settle(req, cursor); } };
+            };
+            return settle(req, cursor);
+        } })
+    });
+    return tx;
+} };
+'''
+
+NODE_RUNNER = '''
+let now = 1000;
+Date.now = () => now++;
+const progress = [];
+function updateProgress(percent, status) { progress.push(status); }
+function flowAWorkerAvailable() { return false; }
+let extractions = 0;
+async function extractFlowAFindings(file, ext) { extractions++; return { brand: 'Acme', issues: ['no_wishlist'], ext }; }
+const named = (parts, name) => { const blob = new Blob(parts); blob.name = name; return blob; };
+(async () => {
+    const big = new Uint8Array(9 * 1024 * 1024).map((_, i) => i % 251);
+    const deck = named([big], 'Acme - CRO Audit.pptx');
+    const hash = await hashUploadedFile(deck);
+    const first = await extractUploadedFile(deck, 'pptx');
+    await new Promise(resolve => setTimeout(resolve, 20));
+    const second = await extractUploadedFile(named([big], 'Acme - CRO Audit.pptx'), 'pptx');
+    const afterHit = extractions;
+    await extractUploadedFile(named([big], 'Renamed.pptx'), 'pptx');
+    const afterRename = extractions;
+    await new Promise(resolve => setTimeout(resolve, 20));
+
+    // Stale entries from another build, then more decks than the limit
+    rows.set('stale', { hash: 'stale', version: 'old', name: 'x', findings: {}, usedAt: now++ });
+    rows.get(hash).version = 'old';
+    const staleHit = await getCachedExtraction(hash, 'Renamed.pptx');
+    for (let i = 0; i < EXTRACTION_CACHE_LIMIT + 3; i++) await cacheExtraction('deck' + i, 'deck' + i + '.pdf', { i });
+    process.stdout.write(JSON.stringify({
+        hash, first, second, afterHit, afterRename, staleHit, progress,
+        keys: [...rows.keys()].sort(), versions: [...new Set([...rows.values()].map(r => r.version))]
+    }));
+})();
+'''
+
+
+def page_html():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        return f.read()
+
+
+def test_extractor_version_is_current():
+    html = page_html()
+    assert build_v2.page_declaration(html, 'EXTRACTOR_VERSION').strip() == \
+        f"const EXTRACTOR_VERSION = '{build_v2.extractor_version(html)}';"
+    # Editing TITLE_ISSUE_MAP or the parsers yields a new version
+    edited = html.replace("{ keywords: ['wishlist'], issue: 'no_wishlist' },", "{ keywords: ['wish list'], issue: 'no_wishlist' },")
+    assert edited != html and build_v2.extractor_version(edited) != build_v2.extractor_version(html)
+    edited = html.replace("const PPTX_INFLATE_CONCURRENCY = 4;", "const PPTX_INFLATE_CONCURRENCY = 8;")
+    assert edited != html and build_v2.extractor_version(edited) != build_v2.extractor_version(html)
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_reuploads_hit_and_the_store_stays_bounded(tmp_path):
+    html = page_html()
+    script = tmp_path / 'cache.js'
+    script.write_text(FAKE_STORE + ''.join(build_v2.page_declaration(html, name) for name in CACHE_DECLARATIONS)
+                      + NODE_RUNNER)
+    result = subprocess.run([NODE, str(script)], capture_output=True, text=True, check=True)
+    out = json.loads(result.stdout)
+
+    big = bytes(i % 251 for i in range(9 * 1024 * 1024))
+    chunk = 4 * 1024 * 1024
+    digests = b''.join(hashlib.sha256(big[i:i + chunk]).digest() for i in range(0, len(big), chunk))
+    assert out['hash'] == hashlib.sha256(digests + struct.pack('>d', len(big))).hexdigest()
+
+    assert out['second'] == out['first'] and out['afterHit'] == 1
+    assert out['progress'] == ['Loaded the saved extraction for this file...']
+    assert out['afterRename'] == 2
+    assert out['staleHit'] is None
+    limit = int(build_v2.page_declaration(html, 'EXTRACTION_CACHE_LIMIT').split('=')[1].strip(' ;\n'))
+    assert out['keys'] == sorted(f'deck{i}' for i in range(3, limit + 3))
+    assert out['versions'] == [build_v2.extractor_version(html)]
+
+
+# indexedDB.open whose upgrade is held by another tab until release() is called
+UPGRADE_RUNNER = '''
+let storageDb = null;
+const toasts = [];
+function showToast(message) { toasts.push(message); }
+function migrateLegacyData() { return Promise.resolve(); }
+function readStoredData() { return Promise.resolve(); }
+function loadLegacyData() { toasts.push('legacy'); }
+const db = { closed: false, close() { this.closed = true; } };
+let release;
+const indexedDB = { open(name, version) {
+    const request = {};
+    setTimeout(() => request.onblocked());
+    release = () => {
+        request.result = db;
+        request.onupgradeneeded({ oldVersion: version - 1 });
+        request.onsuccess();
+    };
+    return request;
+} };
+db.createObjectStore = () => ({ createIndex() {} });
+(async () => {
+    const out = {};
+    let ready = false;
+    const storageReady = openStorage().then(() => { ready = true; });
+    await new Promise(resolve => setTimeout(resolve, 10));
+    out.blocked = { ready, toasts: [...toasts] };
+    release();
+    await storageReady;
+    out.opened = storageDb === db;
+    db.onversionchange();
+    out.changed = { closed: db.closed, storageDb, toasts: toasts.slice(1) };
+    process.stdout.write(JSON.stringify(out));
+})();
+'''
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_storage_upgrade_waits_for_other_tabs(tmp_path):
+    html = page_html()
+    script = tmp_path / 'upgrade.js'
+    script.write_text(''.join(build_v2.page_declaration(html, name)
+                              for name in ('STORAGE_DB', 'STORAGE_VERSION', 'idbRequest', 'openStorage'))
+                      + UPGRADE_RUNNER)
+    out = json.loads(subprocess.run([NODE, str(script)], capture_output=True, text=True, check=True).stdout)
+
+    assert out['blocked']['ready'] is False and len(out['blocked']['toasts']) == 1
+    assert 'Close the other tabs' in out['blocked']['toasts'][0]
+    assert out['opened'] is True
+    assert out['changed']['closed'] is True and out['changed']['storageDb'] is None
+    assert len(out['changed']['toasts']) == 1 and 'Reload' in out['changed']['toasts'][0]
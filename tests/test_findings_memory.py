@@ -0,0 +1,67 @@
+"""
+Flow A extraction over one deck text with page ranges. On a synthetic deck
+the page's parsePDF and extractFindings must find exactly what the versions
+they replaced found, hold less heap at peak, and return evidence snippets
+(issue, page, span) in place of the deck text.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+from benchmarks import findings_memory  # noqa: E402
+
+NODE = shutil.which('node')
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_compact_findings_match_reference_with_less_heap():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    deck = findings_memory.synthetic_deck(html, 200, 300, seed=3)
+    results = findings_memory.run(html, deck)
+    _, entries = build_v2.parse_title_issue_map(html)
+    limit = int(build_v2.page_declaration(html, 'EVIDENCE_CHARS').split('=')[1].strip(' ;\n'))
+
+    for mode, versions in results.items():
+        ref, cur = versions['reference']['findings'], versions['page']['findings']
+        assert findings_memory.comparable(cur) == findings_memory.comparable(ref), mode
+        assert 'rawText' not in cur and len(cur['issues']) > 10
+        assert versions['page']['peak'] < versions['reference']['peak'], mode
+
+        # One snippet per issue, quoting the page text up to the keyword that completed the match
+        assert [e['issue'] for e in cur['evidence']] == cur['issues']
+        for e in cur['evidence']:
+            page = deck[e['page'] - 1]
+            text = '\n' + page + ('\n' if e['page'] < len(deck) else '')
+            span = text[e['start']:e['end']]
+            assert 0 < len(span) <= limit
+            assert e['text'] == ' '.join(span.split())
+            assert any(span.lower().endswith(kw) for kws, issue in entries if issue == e['issue'] for kw in kws)
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_unmarked_text_keeps_evidence_on_page_one(tmp_path):
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    text = 'Acme audit.\n  The   site has no Wishlist   and no size guide on product pages.'
+    names = findings_memory.SHARED_DECLARATIONS + findings_memory.PAGE_DECLARATIONS[:-1]
+    script = tmp_path / 'unmarked.js'
+    script.write_text(''.join(build_v2.page_declaration(html, name) for name in names)
+                      + f'process.stdout.write(JSON.stringify(extractFindings({json.dumps(text)}, "Acme.pptx")));')
+    out = json.loads(subprocess.run([NODE, str(script)], capture_output=True, text=True, check=True).stdout)
+
+    assert 'no_wishlist' in out['issues']
+    assert [e['issue'] for e in out['evidence']] == out['issues']
+    for e in out['evidence']:
+        assert e['page'] == 1 and e['text'] == ' '.join(text[e['start']:e['end']].split())
+    wishlist = next(e for e in out['evidence'] if e['issue'] == 'no_wishlist')
+    assert wishlist['text'] == 'Acme audit. The site has no Wishlist'
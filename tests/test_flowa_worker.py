@@ -0,0 +1,147 @@
+"""
+The Flow A worker (flowa-worker.js) is generated from index.html by
+build_v2.py. It must be current, and under Node.js with a stub pdf.js it
+must return the same findings as the page's extractFindings. A worker whose
+script cannot load must leave extraction to the main thread.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+
+NODE = shutil.which('node')
+
+PAGES = [
+    'Acme - CRO audit for www.acme.com',
+    'UX Insights',
+    'Sticky add to cart is missing on the product page\nObservation: no wishlist either',
+    'Performance Insights',
+    'Mobile performance score: 45/100, desktop performance score: 81/100',
+    'Observation: the buy now button is missing entirely on the PDP\nRecommendation: add one',
+]
+
+NODE_RUNNER = '''
+const vm = require('vm'), fs = require('fs');
+const [workerPath, pages] = [process.argv[2], JSON.parse(process.argv[3])];
+const messages = [];
+const pdfjsLib = { GlobalWorkerOptions: {}, getDocument: () => ({ promise: Promise.resolve({
+    numPages: pages.length,
+    getPage: async i => ({ cleanup() {}, getTextContent: async () => ({ items: [{ str: pages[i - 1] }] }) })
+}) }) };
+const ctx = { self: { postMessage: m => messages.push(m) }, importScripts: () => { ctx.pdfjsLib = pdfjsLib; } };
+vm.createContext(ctx);
+vm.runInContext(fs.readFileSync(workerPath, 'utf8'), ctx);
+const vendorScripts = { pdfjs: { src: 'http://x/pdf.min.js' }, pdfjsWorker: { src: 'http://x/pdf.worker.min.js' } };
+ctx.self.onmessage({ data: { name: 'Acme - CRO Audit.pdf', ext: 'pdf', buffer: new ArrayBuffer(8), vendorScripts } }).then(() => {
+    const fullText = pages.map((p, i) => '\\n--- PAGE ' + (i + 1) + ' ---\\n' + p).join('');
+    process.stdout.write(JSON.stringify({
+        messages, expected: vm.runInContext('extractFindings', ctx)(fullText, 'Acme - CRO Audit.pdf')
+    }));
+});
+'''
+
+
+def read(name):
+    with open(os.path.join(ROOT, name), 'r') as f:
+        return f.read()
+
+
+def test_worker_is_current():
+    assert read('flowa-worker.js') == build_v2.flowa_worker_js(read('index.html'))
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_worker_extracts_like_the_page():
+    with tempfile.TemporaryDirectory() as tmp:
+        script_path = os.path.join(tmp, 'worker_test.js')
+        with open(script_path, 'w') as f:
+            f.write(NODE_RUNNER)
+        result = subprocess.run([NODE, script_path, os.path.join(ROOT, 'flowa-worker.js'), json.dumps(PAGES)],
+                                capture_output=True, text=True, check=True)
+    out = json.loads(result.stdout)
+    *progress, done = out['messages']
+    assert all(m['type'] == 'progress' for m in progress)
+    assert progress[-1]['percent'] == 90
+    assert done['type'] == 'done'
+    assert done['findings'] == out['expected']
+    assert done['findings']['issues'] == ['no_sticky_atc', 'no_buy_now']
+
+
+CLIENT_DECLARATIONS = ('FLOWA_WORKER_SRC', 'flowAJob', 'flowAWorkerFailed', 'flowAWorkerAvailable',
+                       'extractWithoutWorker', 'extractInWorker', 'cancelFlowAWorker')
+
+# Stub workers: one whose script never loads, one blocked at construction,
+# and two that start and then fail. Posted messages are structured-cloned
+# with their transfer list, so a transferred buffer is detached as in a browser
+CLIENT_RUNNER = '''
+const location = { href: 'https://tools.example/cro/', protocol: 'https:' };
+const VENDOR_SCRIPTS = { pdfjs: { src: 'vendor/pdf.min.js', cdn: 'https://cdn.example/pdf.min.js' } };
+const progress = [], warnings = [];
+console.warn = (...args) => warnings.push(args.join(' '));
+function updateProgress(percent, status) { progress.push(status); }
+async function extractFlowAFindings(file, ext) {
+    return { brand: 'Acme', bytes: (await file.arrayBuffer()).byteLength, ext };
+}
+let behaviour, posted = [];
+class Worker {
+    constructor(src) {
+        if (behaviour === 'blocked') throw new Error('Refused to create a worker from ' + src);
+        this.src = src;
+    }
+    postMessage(msg, transfer) {
+        posted.push(structuredClone(msg, { transfer }));
+        setTimeout(() => {
+            if (behaviour === 'missing') return this.onerror({ type: 'error' });
+            this.onmessage({ data: { type: 'progress', percent: 20, status: 'Parsing PDF' } });
+            if (behaviour === 'reports') this.onmessage({ data: { type: 'error', message: 'Invalid PDF structure' } });
+            else this.onerror({ message: 'Uncaught RangeError' });
+        });
+    }
+    terminate() {}
+}
+const deck = new Blob([new Uint8Array(64)]);
+deck.name = 'Acme - CRO Audit.pdf';
+(async () => {
+    const out = {};
+    for (behaviour of ['missing', 'blocked', 'reports', 'crashes']) {
+        flowAWorkerFailed = false;
+        posted = [];
+        try {
+            out[behaviour] = { findings: await extractInWorker(deck, 'pdf') };
+        } catch (err) {
+            out[behaviour] = { error: err.message };
+        }
+        Object.assign(out[behaviour], { available: flowAWorkerAvailable(), posted: posted.length });
+    }
+    out.warnings = warnings.length;
+    process.stdout.write(JSON.stringify(out));
+})();
+'''
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_worker_that_fails_to_load_falls_back_to_the_main_thread(tmp_path):
+    html = read('index.html')
+    script = tmp_path / 'client.js'
+    script.write_text(''.join(build_v2.page_declaration(html, name) for name in CLIENT_DECLARATIONS) + CLIENT_RUNNER)
+    out = json.loads(subprocess.run([NODE, str(script)], capture_output=True, text=True, check=True).stdout)
+
+    # A worker script that never loads, or is blocked, extracts on the main
+    # thread from the whole file and is not tried again
+    main_thread = {'brand': 'Acme', 'bytes': 64, 'ext': 'pdf'}
+    assert out['missing'] == {'findings': main_thread, 'available': False, 'posted': 1}
+    assert out['blocked'] == {'findings': main_thread, 'available': False, 'posted': 0}
+    assert out['warnings'] == 2
+    # Failures from a worker that started are the upload's errors
+    assert out['reports'] == {'error': 'Invalid PDF structure', 'available': True, 'posted': 1}
+    assert out['crashes'] == {'error': 'Uncaught RangeError', 'available': True, 'posted': 1}
@@ -0,0 +1,183 @@
+"""
+History export and import under Node.js, against an in-memory stand-in for
+the IndexedDB stores. An export must be versioned NDJSON, one record per
+line; importing it must parse across chunk boundaries (including split
+UTF-8), merge by record id with last-writer-wins on lastUpdated, never
+duplicate records on a repeated import, and still accept version 1 JSON.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+
+NODE = shutil.which('node')
+
+TRANSFER_DECLARATIONS = (
+    'STORES', 'idbRequest', 'idbTransaction', 'withId', 'generateUUID', 'loadAllData', 'getRecordsByBrand',
+    'EXPORT_FORMAT', 'EXPORT_VERSION', 'TRANSFER_BATCH', 'IMPORT_CHUNK_BYTES', 'SETTING_KEYS', 'yieldToPage',
+    'createExportWriter', 'forEachStoredBatch', 'writeSettings', 'exportBrandJSON', 'exportAllData',
+    'parseExportHeader', 'readExportFile', 'readLegacyExport', 'isNewerRecord', 'mergeRecords', 'mergeIntoList',
+    'importExportFile',
+)
+
+# Object stores keyed by id (settings by key) with a brandId index; requests
+# settle on later ticks and a transaction completes once none is left
+FAKE_IDB = '''
+const stores = { brands: new Map(), messages: new Map(), conversations: new Map(), settings: new Map() };
+const clone = v => v === undefined ? v : JSON.parse(JSON.stringify(v));
+const keyOf = (name, value) => name === 'settings' ? value.key : value.id;
+const IDBKeyRange = { lowerBound: (lower, open) => ({ lower, open }) };
+let storageDb = { transaction() {
+    let pending = 0;
+    const tx = {};
+    const settle = (req, result) => {
+        pending++;
+        setTimeout(() => {
+            pending--;
+            req.result = result();
+            if (req.onsuccess) req.onsuccess();
+            setTimeout(() => { if (!pending && tx.oncomplete) { tx.oncomplete(); tx.oncomplete = null; } });
+        });
+        return req;
+    };
+    tx.objectStore = name => {
+        const rows = stores[name];
+        const sorted = () => [...rows.keys()].sort().map(k => clone(rows.get(k)));
+        return {
+            get: key => settle({}, () => clone(rows.get(key))),
+            put: value => settle({}, () => { rows.set(keyOf(name, value), clone(value)); }),
+            getAll: (range, count) => settle({}, () => sorted().filter(v => !range || keyOf(name, v) > range.lower).slice(0, count)),
+            index: () => ({ getAll: brandId => settle({}, () => sorted().filter(v => v.brandId === brandId)) })
+        };
+    };
+    return tx;
+} };
+let storageData = { brands: {}, messages: [], conversations: [], caseStudies: [], clientNames: [] };
+const toasts = [];
+function showToast(message) { toasts.push(message); }
+function renderBrandList() {}
+function renderSettings() {}
+function invalidateCaseStudyIndex() {}
+function saveLegacyData() {}
+let download = null;
+function downloadBlob(blob, filename) { download = { blob, filename }; }
+'''
+
+NODE_RUNNER = '''
+const named = (parts, name) => { const blob = new Blob(parts); blob.name = name; return blob; };
+const counts = () => Object.fromEntries(Object.entries(stores).map(([name, rows]) => [name, rows.size]));
+function reset() {
+    Object.values(stores).forEach(rows => rows.clear());
+    storageData = { brands: {}, messages: [], conversations: [], caseStudies: [], clientNames: [] };
+    toasts.length = 0;
+}
+(async () => {
+    const out = {};
+    // A team-sized history: more messages than one batch, non-ASCII names
+    for (let b = 0; b < 40; b++) {
+        const brand = { id: 'b' + b, brandName: 'Café ✓ ' + b, lastUpdated: '2026-01-' + String(10 + b % 9).padStart(2, '0') };
+        storageData.brands[brand.id] = brand;
+        stores.brands.set(brand.id, clone(brand));
+    }
+    for (let m = 0; m < 1300; m++) {
+        stores.messages.set('m' + String(m).padStart(4, '0'), { id: 'm' + String(m).padStart(4, '0'), brandId: 'b' + m % 40, content: 'Namasté — ' + m });
+    }
+    stores.conversations.set('c1', { id: 'c1', brandId: 'b1', summary: 'Call' });
+    storageData.caseStudies = [{ clientName: 'Acme', triggerIssues: [] }];
+    storageData.clientNames = ['Acme'];
+
+    await exportAllData();
+    const exported = await download.blob.text();
+    out.filename = download.filename;
+    out.type = download.blob.type;
+    out.lines = exported.split('\\n');
+    out.before = counts();
+
+    // Into an empty profile, then the same file again
+    reset();
+    await importExportFile(named([exported], 'export.ndjson'));
+    out.first = { counts: counts(), toast: toasts[toasts.length - 1], progress: toasts.length - 1 };
+    await importExportFile(named([exported], 'export.ndjson'));
+    out.again = { counts: counts(), toast: toasts[toasts.length - 1] };
+    out.brandName = storageData.brands.b3.brandName;
+    out.message = stores.messages.get('m0007');
+
+    // Last writer wins per record
+    const lines = exported.split('\\n').filter(Boolean).map(line => JSON.parse(line));
+    const edited = lines.map(line => {
+        if (!line.record || line.store !== 'brands') return line;
+        if (line.record.id === 'b1') return { store: 'brands', record: Object.assign({}, line.record, { brandName: 'Older', lastUpdated: '2025-12-31' }) };
+        if (line.record.id === 'b2') return { store: 'brands', record: Object.assign({}, line.record, { brandName: 'Newer', lastUpdated: '2026-02-01' }) };
+        return line;
+    });
+    await importExportFile(named([edited.map(line => JSON.stringify(line)).join('\\n')], 'edited.ndjson'));
+    out.lww = [storageData.brands.b1.brandName, storageData.brands.b2.brandName, stores.brands.get('b2').brandName, toasts[toasts.length - 1]];
+
+    // Version 1 brand export: merged, not appended
+    await importExportFile(named([JSON.stringify({ exportVersion: 1, brand: storageData.brands.b5,
+        messages: [stores.messages.get('m0005'), { brandId: 'b5', content: 'new' }], conversations: [] }, null, 2)], 'old.json'));
+    out.legacy = { counts: counts(), toast: toasts[toasts.length - 1] };
+
+    reset();
+    await importExportFile(named(['{"brands": 1}'], 'bad.json'));
+    out.invalid = toasts[toasts.length - 1];
+    try {
+        await importExportFile(named([JSON.stringify({ format: EXPORT_FORMAT, exportVersion: 99 }) + '\\n'], 'future.ndjson'));
+    } catch (err) { out.future = err.message; }
+    try {
+        await importExportFile(named([JSON.stringify(lines[0]) + '\\n' + JSON.stringify(lines[1]) + '\\n{oops\\n'], 'broken.ndjson'));
+    } catch (err) { out.broken = err.message; }
+    process.stdout.write(JSON.stringify(out));
+})();
+'''
+
+
+def transfer_script(html, chunk_bytes):
+    declarations = ''.join(build_v2.page_declaration(html, name) for name in TRANSFER_DECLARATIONS)
+    declarations = declarations.replace('const IMPORT_CHUNK_BYTES = 1024 * 1024;',
+                                        f'const IMPORT_CHUNK_BYTES = {chunk_bytes};')
+    assert f'const IMPORT_CHUNK_BYTES = {chunk_bytes};' in declarations
+    return FAKE_IDB + declarations + NODE_RUNNER
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+@pytest.mark.parametrize('chunk_bytes', [1024 * 1024, 4099])
+def test_ndjson_round_trip_merges_by_id(tmp_path, chunk_bytes):
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    script = tmp_path / 'transfer.js'
+    script.write_text(transfer_script(html, chunk_bytes))
+    result = subprocess.run([NODE, str(script)], capture_output=True, text=True, check=True)
+    out = json.loads(result.stdout)
+
+    header = json.loads(out['lines'][0])
+    assert header['format'] == 'cro-reachout' and header['exportVersion'] == 2 and header['kind'] == 'full'
+    assert out['filename'].endswith('.ndjson') and out['type'] == 'application/x-ndjson'
+    records = [json.loads(line) for line in out['lines'][1:] if line]
+    assert len(records) == 40 + 1300 + 1 + 2 and out['lines'][-1] == ''
+    assert out['before'] == {'brands': 40, 'messages': 1300, 'conversations': 1, 'settings': 0}
+
+    expected = {'brands': 40, 'messages': 1300, 'conversations': 1, 'settings': 2}
+    assert out['first']['counts'] == expected and out['first']['progress'] >= 3
+    assert out['first']['toast'] == 'Imported: 1341 new, 2 updated.'
+    assert out['again']['counts'] == expected
+    assert out['again']['toast'] == 'Imported: 0 new, 1343 updated.'
+    assert out['brandName'] == 'Café ✓ 3' and out['message']['content'] == 'Namasté — 7'
+
+    assert out['lww'][:3] == ['Café ✓ 1', 'Newer', 'Newer']
+    assert out['lww'][3] == 'Imported: 0 new, 1342 updated, 1 older copies skipped.'
+    assert out['legacy']['counts'] == dict(expected, messages=1301)
+    assert out['legacy']['toast'] == 'Imported: 1 new, 2 updated.'
+
+    assert out['invalid'] == 'Invalid import file format.'
+    assert 'newer version' in out['future']
+    assert out['broken'].startswith('line 3:')
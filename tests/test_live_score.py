@@ -0,0 +1,113 @@
+"""
+The Path 2 worksheet's incremental live score (build_v2.scoring_engine_js)
+must equal a full calculateEstimatedCROScore recompute after any sequence
+of checkbox toggles, PageSpeed edits and worksheet re-opens, and must
+write the page at most once per animation frame.
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+import cro_scoring  # noqa: E402
+
+NODE = shutil.which('node')
+
+LIVE_SCORE_DECLARATIONS = (
+    'FINDING_REGISTRY', 'newScoreTally', 'tallyIssue', 'scoreFromTally', 'calculateEstimatedCROScore',
+    'liveScore', 'selectLiveIssue', 'readLiveSpeed', 'scheduleLiveScore', 'updateLiveScore', 'toggleLiveScoreIssue',
+)
+
+# A worksheet stub: checkboxes (some sharing a value), the two PageSpeed inputs and the score element
+NODE_RUNNER = '''
+const [values, steps] = JSON.parse(require('fs').readFileSync(process.argv[2], 'utf8'));
+const boxes = values.map(value => ({ value, checked: false }));
+const inputs = { ws_mobilePS: { value: '' }, ws_desktopPS: { value: '' }, liveScoreNum: { textContent: '', style: {} } };
+const document = {
+    getElementById: id => inputs[id],
+    querySelectorAll: () => boxes.filter(b => b.checked)
+};
+let frames = [], writes = 0;
+function requestAnimationFrame(fn) { frames.push(fn); return frames.length; }
+function flush() { const run = frames; frames = []; run.forEach(fn => { fn(); writes++; }); return run.length; }
+function fullScore() {
+    const mps = parseInt(inputs.ws_mobilePS.value) || null;
+    const dps = parseInt(inputs.ws_desktopPS.value) || null;
+    const issues = boxes.filter(b => b.checked).map(b => b.value);
+    if (mps !== null && mps < 50) issues.push('slow_mobile');
+    if (mps !== null && mps < 30) issues.push('very_slow_mobile');
+    return calculateEstimatedCROScore([...new Set(issues)], { mobilePS: mps, desktopPS: dps });
+}
+const results = [];
+let toggles = 0;
+for (const [op, arg] of steps) {
+    if (op === 'toggle') {
+        boxes[arg].checked = !boxes[arg].checked;
+        toggleLiveScoreIssue(boxes[arg].value, boxes[arg].checked);
+        toggles++;
+    } else if (op === 'speed') {
+        inputs[arg[0]].value = arg[1];
+    } else if (op === 'show') {
+        updateLiveScore();
+    } else {
+        // PageSpeed edits alone do not schedule a frame, as before
+        const wrote = flush() > 0;
+        const expected = fullScore();
+        results.push([wrote ? String(expected.overall) : null, String(inputs.liveScoreNum.textContent), expected,
+                      scoreFromTally(liveScore.tally, readLiveSpeed())]);
+    }
+}
+process.stdout.write(JSON.stringify({ results, writes, toggles }));
+'''
+
+
+def random_steps(values, n, seed):
+    rng = random.Random(seed)
+    steps = [['show', None]]
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.75:
+            steps.append(['toggle', rng.randrange(len(values))])
+        elif r < 0.85:
+            field = rng.choice(['ws_mobilePS', 'ws_desktopPS'])
+            steps.append(['speed', [field, rng.choice(['', '0', '25', '45', '69', '90', 'abc'])]])
+        elif r < 0.88:
+            steps.append(['show', None])
+        else:
+            steps.append(['flush', None])
+    return steps + [['flush', None]]
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_incremental_live_score_matches_full_recompute(seed):
+    rng = random.Random(seed)
+    keys = list(cro_scoring.FINDING_REGISTRY)
+    values = keys + rng.sample(keys, 10) + ['not_a_finding']
+    steps = random_steps(values, 3000, seed)
+    script = '\n'.join(build_v2.page_declaration(build_v2.scoring_engine_js, name) for name in LIVE_SCORE_DECLARATIONS)
+    with tempfile.TemporaryDirectory() as tmp:
+        script_path = os.path.join(tmp, 'live_score.js')
+        steps_path = os.path.join(tmp, 'steps.json')
+        with open(script_path, 'w') as f:
+            f.write(script + NODE_RUNNER)
+        with open(steps_path, 'w') as f:
+            json.dump([values, steps], f)
+        result = subprocess.run([NODE, script_path, steps_path], capture_output=True, text=True, check=True)
+    out = json.loads(result.stdout)
+    for expected_text, text, expected, incremental in out['results']:
+        assert expected_text is None or text == expected_text
+        assert incremental == expected
+    # Toggles between two flushes share one frame
+    assert out['writes'] <= sum(1 for op, _ in steps if op == 'flush')
+    assert out['writes'] < out['toggles']
@@ -0,0 +1,219 @@
+"""
+Parity between the Python message generators (cro_messages.py) and the
+page's generateEmail, generateWhatsApp, generateFollowUpSequence,
+generateContextualReply and getTopCaseStudiesForIssues, run under a local
+Node.js runtime with the page's default settings. Both render the
+cro_templates.py table, which must be embedded in the page as built.
+
+MESSAGE_CASES (default 2000) and PARITY_SEED (default 20240601) control
+the run.
+"""
+
+import csv
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+import cro_messages  # noqa: E402
+import cro_scoring  # noqa: E402
+import cro_templates  # noqa: E402
+
+NODE = shutil.which('node')
+CASES = int(os.environ.get('MESSAGE_CASES', '2000'))
+SEED = int(os.environ.get('PARITY_SEED', '20240601'))
+
+PAGE_DECLARATIONS = (
+    'DEFAULT_CASE_STUDIES', 'DEFAULT_CLIENT_NAMES', 'FINDING_REGISTRY', 'getCaseStudies', 'getClientNames',
+    'getClientNamesForIndustry', 'CASE_STUDY_CACHE_LIMIT', 'caseStudyIndex', 'newBitset', 'setBit', 'popcount32',
+    'forEachBit', 'getCaseStudyIndex', 'caseStudyIssueKey', 'caseStudyQuery', 'cacheCaseStudies',
+    'getTopCaseStudiesForIssues', 'scoreFindingsByImpact', 'newScoreTally', 'tallyIssue', 'scoreFromTally',
+    'calculateEstimatedCROScore', 'ANALYSIS_STATS', 'currentAnalysis', 'analysisSignature', 'getAnalysis',
+    'MESSAGE_TEMPLATES', 'renderTemplate', 'scoreBand', 'generateSmartBullets', 'generateEmail',
+    'generateWhatsApp', 'generateFollowUpSequence', 'generateContextualReply',
+)
+BLOCKERS = ['no_response', 'internal_team', 'busy_sale', 'rescheduled', 'waiting_access',
+            'check_founder', 'price_concern', 'gone_cold', 'post_call', 'unknown']
+
+NODE_RUNNER = '''
+function loadAllData() {
+    return { caseStudies: JSON.parse(JSON.stringify(DEFAULT_CASE_STUDIES)), clientNames: [...DEFAULT_CLIENT_NAMES] };
+}
+const [cases, replies] = JSON.parse(require('fs').readFileSync(process.argv[2], 'utf8'));
+process.stdout.write(JSON.stringify({
+    settings: { caseStudies: DEFAULT_CASE_STUDIES, clientNames: DEFAULT_CLIENT_NAMES },
+    messages: cases.map(data => [
+        generateEmail(data), generateWhatsApp(data), generateFollowUpSequence(data),
+        getTopCaseStudiesForIssues(data.issues).map(cs => cs.clientName)
+    ]),
+    replies: replies.map(([brand, recipient, sender, blocker, days, context]) =>
+        generateContextualReply(brand, recipient, sender, 'phase1', blocker, days, context)),
+    stats: ANALYSIS_STATS
+}));
+'''
+
+
+def random_records(seed, n):
+    rng = random.Random(seed)
+    keys = list(cro_scoring.FINDING_REGISTRY) + ['not_a_finding']
+    industries = ['', 'skincare', 'fashion', 'home', 'other']
+    ps = lambda: '' if rng.random() < 0.3 else str(rng.randint(0, 100))
+    records = []
+    for i in range(n):
+        records.append({
+            'brand': f'Brand {i}', 'websiteUrl': rng.choice(['', f'https://brand{i}.example']),
+            'recipientName': rng.choice(['', 'Asha']), 'senderName': rng.choice(['', 'Ravi']),
+            'mobilePS': ps(), 'desktopPS': ps(), 'industry': rng.choice(industries),
+            'clientType': rng.choice(['new', 'new', 'exclient']),
+            'issues': '|'.join(rng.sample(keys, rng.randint(0, 8))),
+        })
+    return records
+
+
+def random_replies(seed, n):
+    rng = random.Random(seed)
+    return [[f'Brand {i}', rng.choice(['Asha', '[Name]']), 'Ravi', rng.choice(BLOCKERS),
+             rng.choice([0, 14, 15, 40]), rng.choice(['', 'the Diwali sale is on'])] for i in range(n)]
+
+
+def page_html():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        return f.read()
+
+
+def run_page(cases, replies):
+    html = page_html()
+    script = ''.join(build_v2.page_declaration(html, name) for name in PAGE_DECLARATIONS) + NODE_RUNNER
+    with tempfile.TemporaryDirectory() as tmp:
+        script_path = os.path.join(tmp, 'messages.js')
+        cases_path = os.path.join(tmp, 'cases.json')
+        with open(script_path, 'w') as f:
+            f.write(script)
+        with open(cases_path, 'w') as f:
+            json.dump([cases, replies], f)
+        result = subprocess.run([NODE, script_path, cases_path], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_js_and_python_messages_agree():
+    settings = cro_messages.load_settings()
+    records = random_records(SEED, CASES)
+    cases = [cro_messages.prospect_data(r) for r in records]
+    replies = random_replies(SEED, CASES // 4)
+    page = run_page(cases, replies)
+    assert settings == page['settings']
+    for record, data, (email, whatsapp, followups, studies) in zip(records, cases, page['messages']):
+        assert cro_messages.generate_email(data, settings) == email, f'seed={SEED} record={record}'
+        assert cro_messages.generate_whatsapp(data, settings) == whatsapp, f'seed={SEED} record={record}'
+        assert cro_messages.generate_follow_up_sequence(data) == followups, f'seed={SEED} record={record}'
+        assert [cs['clientName'] for cs in cro_messages.top_case_studies(data['issues'], settings)] == studies
+    for args, expected in zip(replies, page['replies']):
+        assert cro_messages.generate_contextual_reply(*args) == expected, f'seed={SEED} reply={args}'
+    # Email and WhatsApp share one analysis per snapshot, each stage running once
+    signatures = [(data['issues'], data['mobilePS'], data['desktopPS']) for data in cases]
+    fresh = [i for i, sig in enumerate(signatures) if i == 0 or sig != signatures[i - 1]]
+    assert page['stats']['analyses'] == len(fresh)
+    assert page['stats']['reused'] == 2 * len(cases) - len(fresh)
+    assert page['stats']['score'] == sum(1 for i in fresh if cases[i]['issues'])
+    assert page['stats']['bullets'] == 2 * len(fresh)
+
+
+def test_templates_match_embedded_js():
+    assert build_v2.page_declaration(page_html(), 'MESSAGE_TEMPLATES').strip() == cro_templates.templates_js()
+
+
+def test_template_validation():
+    assert cro_templates.validate_templates() == []
+    table = {'replies': {'x': {'short': {'email': 'Hi {recipeint}, {brand|there}', 'whatsapp': 'Hi {sender'}}}}
+    assert cro_templates.validate_templates(table) == [
+        'replies.x.short.email: unknown placeholder {recipeint}', 'replies.x.short.whatsapp: unmatched brace']
+    assert cro_templates.render(cro_templates.compile_template('Hi {brand|there}!'), {'brand': ''}) == 'Hi there!'
+
+
+def test_parse_js_literal():
+    source = '''[{ id: 'a', text: 'it\\'s \\u2014 "ok"', n: -2, on: true, off: null, list: ["x", 1.5,], }]'''
+    assert cro_messages.parse_js_literal(source) == [
+        {'id': 'a', 'text': 'it\'s — "ok"', 'n': -2, 'on': True, 'off': None, 'list': ['x', 1.5]}]
+
+
+def test_cli_streams_in_order_with_workers(tmp_path):
+    records = random_records(7, 60)
+    src = tmp_path / 'prospects.csv'
+    with open(src, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+    serial, pooled = tmp_path / 'serial.csv', tmp_path / 'pooled.csv'
+    cro_messages.main([str(src), '-o', str(serial), '--chunk-size', '7'])
+    cro_messages.main([str(src), '-o', str(pooled), '--chunk-size', '7', '--workers', '2'])
+    assert serial.read_bytes() == pooled.read_bytes()
+    with open(serial, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [r['brand'] for r in rows] == [r['brand'] for r in records]
+    assert list(rows[0])[-len(cro_messages.MESSAGE_FIELDS):] == cro_messages.MESSAGE_FIELDS
+    assert rows[0]['emailSubject'] == "Quick CRO wins I spotted on Brand 0's store"
+
+
+EXPORT_RUNNER = '''
+const storageData = {
+    caseStudies: [{ id: 'cs1', clientName: 'Zeta Labs', active: true, triggerIssues: ['no_wishlist'],
+                    emailSnippet: 'Zeta Labs grew 40%', whatsappSnippet: 'Zeta +40%' }],
+    clientNames: ['Zeta Labs', 'Café Noir']
+};
+(async () => {
+    const out = createExportWriter('full');
+    for (let i = 0; i < TRANSFER_BATCH + 3; i++) out.write('messages', { id: 'm' + i, brandId: 'b1', content: 'line ' + i });
+    writeSettings(out);
+    require('fs').writeFileSync(process.argv[2], await out.blob().text());
+})();
+'''
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_settings_from_page_export(tmp_path):
+    html = page_html()
+    names = ('EXPORT_FORMAT', 'EXPORT_VERSION', 'TRANSFER_BATCH', 'SETTING_KEYS', 'createExportWriter', 'writeSettings')
+    script, export = tmp_path / 'export.js', tmp_path / 'cro_reachout_full_export.ndjson'
+    script.write_text(''.join(build_v2.page_declaration(html, name) for name in names) + EXPORT_RUNNER)
+    subprocess.run([NODE, str(script), str(export)], check=True)
+    assert f"const EXPORT_FORMAT = '{cro_messages.EXPORT_FORMAT}';" in html
+    assert f'const EXPORT_VERSION = {cro_messages.EXPORT_VERSION};' in html
+
+    settings = cro_messages.load_settings(export=str(export))
+    assert settings['clientNames'] == ['Zeta Labs', 'Café Noir']
+    assert [cs['clientName'] for cs in settings['caseStudies']] == ['Zeta Labs']
+
+    # Version 1 JSON exports still load
+    legacy = tmp_path / 'cro_reachout_full_export.json'
+    legacy.write_text(json.dumps({'brands': {}, 'messages': [], 'clientNames': ['Old Co'], 'caseStudies': []}, indent=2))
+    settings = cro_messages.load_settings(export=str(legacy))
+    assert settings['clientNames'] == ['Old Co'] and settings['caseStudies'] == cro_messages.load_settings()['caseStudies']
+
+    src, out = tmp_path / 'prospects.csv', tmp_path / 'messages.csv'
+    src.write_text('brand,industry,issues\nAcme,skincare,no_wishlist\n')
+    cro_messages.main([str(src), '-o', str(out), '--settings', str(export)])
+    with open(out, newline='') as f:
+        row = next(csv.DictReader(f))
+    assert 'Zeta Labs, Café Noir' in row['emailBody'] and row['caseStudies'] == 'Zeta Labs'
+
+
+def test_settings_export_errors(tmp_path):
+    header = json.dumps({'format': cro_messages.EXPORT_FORMAT, 'exportVersion': 2, 'kind': 'full'})
+    broken = tmp_path / 'broken.ndjson'
+    broken.write_text(header + '\n{"store": "settings", "record": {"key": "clientNames", "value": ["A"]}}\n{oops\n')
+    with pytest.raises(ValueError, match='line 3'):
+        cro_messages.read_export_settings(str(broken))
+    future = tmp_path / 'future.ndjson'
+    future.write_text(json.dumps({'format': cro_messages.EXPORT_FORMAT, 'exportVersion': 99}) + '\n')
+    with pytest.raises(ValueError, match='newer version'):
+        cro_messages.read_export_settings(str(future))
@@ -0,0 +1,72 @@
+"""
+The build_v2 patch engine. Every anchor must match exactly as often as
+its patch says, or the build fails naming the patch; anchors must not
+overlap; an anchor that prefixes a longer one must not shadow it; and all
+replacements are made against the original source, never each other's
+output.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+from build_v2 import Patch, PatchError, apply_patches  # noqa: E402
+
+SOURCE = '<head><title>v1</title></head>\n<body onload="init()">\n<div id="a"></div><div id="b"></div>\n</body>\n'
+
+
+def test_replaces_every_anchor_in_one_pass():
+    patches = [Patch('title', '<title>v1</title>', '<title>v2</title>', 1),
+               Patch('divs', '></div>', '>x</div>', 2),
+               # Replacements are not rescanned: this one's output holds the title anchor
+               Patch('onload', 'onload="init()"', 'data-title="<title>v1</title>"', 1)]
+    assert apply_patches(SOURCE, patches) == (
+        '<head><title>v2</title></head>\n<body data-title="<title>v1</title>">\n'
+        '<div id="a">x</div><div id="b">x</div>\n</body>\n')
+
+
+@pytest.mark.parametrize('anchor, count, found', [('<div id="c">', 1, 0), ('<div id=', 1, 2), ('</body>', 2, 1)])
+def test_wrong_match_count_names_the_patch(anchor, count, found):
+    patches = [Patch('title', '<title>v1</title>', '<title>v2</title>', 1), Patch('broken', anchor, '', count)]
+    with pytest.raises(PatchError) as err:
+        apply_patches(SOURCE, patches)
+    assert str(err.value) == f"patch 'broken': expected {count} match(es), found {found}"
+
+
+def test_every_failing_patch_is_reported():
+    patches = [Patch('missing', '<nav>', '', 1), Patch('repeated', '<div', '', 1)]
+    with pytest.raises(PatchError) as err:
+        apply_patches(SOURCE, patches)
+    assert str(err.value).splitlines() == ["patch 'missing': expected 1 match(es), found 0",
+                                           "patch 'repeated': expected 1 match(es), found 2"]
+
+
+def test_reused_anchor_is_rejected():
+    patches = [Patch('first', '</head>', '<style></style></head>', 1), Patch('second', '</head>', '', 1)]
+    with pytest.raises(PatchError, match="patch 'second' reuses the anchor of 'first'"):
+        apply_patches(SOURCE, patches)
+
+
+def test_overlapping_anchors_are_rejected():
+    # '</title></head>' starts inside '<title>v1</title>'; only one of them can be replaced
+    patches = [Patch('title', '<title>v1</title>', '', 1), Patch('head-end', '</title></head>', '', 1)]
+    with pytest.raises(PatchError, match="patch 'head-end': expected 1 match\\(es\\), found 0"):
+        apply_patches(SOURCE, patches)
+
+
+def test_longest_anchor_wins():
+    source = '<div id="a"></div><div id="ab"></div>'
+    # Registered shortest first; the longer anchor must still claim its text
+    patches = [Patch('short', '<div id="a', '<p id="a', 1), Patch('long', '<div id="ab', '<span id="ab', 1)]
+    assert apply_patches(source, patches) == '<p id="a"></div><span id="ab"></div>'
+
+
+def test_registered_patches_have_unique_names_and_anchors():
+    for patches in (build_v2.PATCHES, build_v2.PERF_PATCHES):
+        assert len({p.name for p in patches}) == len(patches)
+        assert len({p.anchor for p in patches}) == len(patches)
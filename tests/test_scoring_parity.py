@@ -0,0 +1,135 @@
+"""
+Parity between the Python scoring port (cro_scoring.py) and the JavaScript
+scoring engine embedded in the page (as shipped, as patched in by
+build_v2.py, and as minified by release.py).
+
+Random issue lists drawn from FINDING_REGISTRY keys, with random or null
+mobilePS/desktopPS values, are scored by calculateEstimatedCROScore and
+scoreFindingsByImpact under a local Node.js runtime and by the Python port.
+Component scores, alerts and ranking must be identical, and score_bulk
+must match the scalar port column by column, per-priority counts included.
+
+PARITY_CASES (default 100000) and PARITY_SEED (default 20240601) control
+the run; a failure reports the seed so it can be replayed.
+"""
+
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from functools import lru_cache
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+import cro_scoring  # noqa: E402
+import release  # noqa: E402
+
+NODE = shutil.which('node')
+CASES = int(os.environ.get('PARITY_CASES', '100000'))
+SEED = int(os.environ.get('PARITY_SEED', '20240601'))
+
+JS_FUNCTIONS = re.compile(r'function scoreFindingsByImpact\(.*?\n\}\n.*?function calculateEstimatedCROScore\(.*?\n\}\n', re.S)
+JS_REGISTRY = re.compile(r'const FINDING_REGISTRY ?= ?\{.*?\n\};', re.S)
+
+NODE_RUNNER = '''
+const cases = JSON.parse(require('fs').readFileSync(process.argv[2], 'utf8'));
+const out = cases.map(([issues, mobilePS, desktopPS]) => [
+    calculateEstimatedCROScore(issues, { mobilePS, desktopPS }),
+    scoreFindingsByImpact(issues, { mobilePS, desktopPS }).map(f => f.issue + ':' + f.priority)
+]);
+process.stdout.write(JSON.stringify(out));
+'''
+
+
+def page_js():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        return f.read()
+
+
+def scoring_engine(source):
+    return JS_REGISTRY.search(source).group() + '\n' + JS_FUNCTIONS.search(source).group()
+
+
+SOURCES = {
+    'index.html': lambda: scoring_engine(page_js()),
+    'build_v2': lambda: scoring_engine(build_v2.scoring_engine_js),
+    'release': lambda: release.minify_js(scoring_engine(page_js())),
+}
+
+
+@lru_cache(maxsize=None)
+def random_cases(seed, n):
+    rng = random.Random(seed)
+    keys = list(cro_scoring.FINDING_REGISTRY)
+    ps = lambda: None if rng.random() < 0.3 else rng.randint(0, 100)
+    cases = []
+    for _ in range(n):
+        issues = rng.sample(keys, rng.randint(0, 15))
+        if issues and rng.random() < 0.1:
+            issues.append(rng.choice(issues))  # form flows can repeat a key
+        cases.append([issues, ps(), ps()])
+    return cases
+
+
+def run_js(engine, cases):
+    script = engine + NODE_RUNNER
+    with tempfile.TemporaryDirectory() as tmp:
+        script_path = os.path.join(tmp, 'parity.js')
+        cases_path = os.path.join(tmp, 'cases.json')
+        with open(script_path, 'w') as f:
+            f.write(script)
+        with open(cases_path, 'w') as f:
+            json.dump(cases, f)
+        result = subprocess.run([NODE, script_path, cases_path], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@lru_cache(maxsize=None)
+def python_results(seed, n):
+    cases = random_cases(seed, n)
+    out = []
+    for issues, mps, dps in cases:
+        data = {'mobilePS': mps, 'desktopPS': dps}
+        ranked = cro_scoring.score_findings_by_impact(issues, data)
+        out.append([cro_scoring.calculate_estimated_cro_score(issues, data),
+                    [f['issue'] + ':' + f['priority'] for f in ranked]])
+    return out
+
+
+@pytest.mark.parametrize('name', SOURCES)
+def test_registry_matches_embedded_js(name):
+    expected = cro_scoring.registry_js()
+    if name == 'release':
+        expected = release.minify_js(expected).strip()
+    assert JS_REGISTRY.search(SOURCES[name]()).group() == expected
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+@pytest.mark.parametrize('name', SOURCES)
+def test_js_and_python_scores_agree(name):
+    cases = random_cases(SEED, CASES)
+    js, py = run_js(SOURCES[name](), cases), python_results(SEED, CASES)
+    for case, expected, actual in zip(cases, js, py):
+        assert actual == expected, f'seed={SEED} case={case}'
+
+
+def test_bulk_matches_scalar():
+    cases = random_cases(SEED, CASES)[:20000]
+    bulk = cro_scoring.score_bulk(*zip(*cases))
+    for n, (issues, mps, dps) in enumerate(cases):
+        scalar = cro_scoring.calculate_estimated_cro_score(issues, {'mobilePS': mps, 'desktopPS': dps})
+        assert [int(bulk[k][n]) for k in ('overall', 'analytics', 'performance', 'seo', 'ux', 'conversion')] == \
+            [scalar[k] for k in ('overall', 'analytics', 'performance', 'seo', 'ux', 'conversion')], f'seed={SEED} case={n}'
+        texts = [alert['text'] for column, alert in cro_scoring.ALERT_COLUMNS if bulk[column][n]]
+        assert texts == [a['text'] for a in scalar['alerts']], f'seed={SEED} case={n}'
+        ranked = cro_scoring.score_findings_by_impact(issues, {'mobilePS': mps, 'desktopPS': dps})
+        assert [int(bulk[k][n]) for k in ('high', 'medium', 'low')] == \
+            [sum(f['priority'] == k.upper() for f in ranked) for k in ('high', 'medium', 'low')], f'seed={SEED} case={n}'
@@ -0,0 +1,178 @@
+"""
+The release build's service worker (sw.js). Its precache manifest must list
+every file the page fetches under its content hash except the vendored
+libraries, which are cached on first use. Under Node.js with an in-memory
+Cache Storage a second release must download only the entries that changed
+and serve the page from cache without touching the network.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import release  # noqa: E402
+
+NODE = shutil.which('node')
+VENDOR_LIBRARY = b'/* jszip */ window.JSZip = function() {};\n'
+SCOPE = 'https://example.github.io/cro/'
+
+PAGE = '''<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { color: %s; }
+    </style>
+</head>
+<body>
+    <img src="growisto-logo.png" alt="Growisto">
+    <script>
+const VENDOR_SCRIPTS = {
+    jszip: { src: 'vendor/jszip.min.js', cdn: 'https://cdn.example/jszip/3.10.1/jszip.min.js' }
+};
+        const FLOWA_WORKER_SRC = 'flowa-worker.js';
+        console.log('ready');
+    </script>
+</body>
+</html>
+'''
+
+# Installs and activates each release's sw.js in turn against one Cache
+# Storage, recording network fetches, then loads the page as a navigation
+NODE_RUNNER = '''
+const fs = require('fs');
+const [scope, releases] = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'));
+const stores = new Map();
+const keyOf = key => typeof key === 'string' ? key : key.url;
+const caches = {
+    async open(name) {
+        if (!stores.has(name)) stores.set(name, new Map());
+        const store = stores.get(name);
+        return {
+            async match(key) { const r = store.get(keyOf(key)); return r && r.clone(); },
+            async put(key, response) { store.set(keyOf(key), response); },
+            async keys() { return [...store.keys()].map(url => ({ url })); },
+            async delete(key) { return store.delete(keyOf(key)); }
+        };
+    },
+    async keys() { return [...stores.keys()]; },
+    async delete(name) { return stores.delete(name); }
+};
+const log = [];
+let files = {};
+async function fetch(request) {
+    const url = keyOf(request);
+    log.push(url.slice(scope.length));
+    const body = files[url.slice(scope.length)];
+    return body === undefined ? new Response('', { status: 404 }) : new Response(body);
+}
+async function dispatch(listeners, type, event) {
+    const pending = [];
+    event.waitUntil = p => pending.push(p);
+    event.respondWith = p => pending.push(p);
+    listeners[type](event);
+    return Promise.all(pending);
+}
+(async () => {
+    const out = [];
+    for (const release of releases) {
+        files = release.files;
+        const listeners = {};
+        const self = {
+            registration: { scope },
+            clients: { claim: async () => {} },
+            addEventListener: (type, fn) => { listeners[type] = fn; }
+        };
+        new Function('self', 'caches', 'fetch', release.sw)(self, caches, fetch);
+        log.length = 0;
+        await dispatch(listeners, 'install', {});
+        await dispatch(listeners, 'activate', {});
+        const installed = log.splice(0).sort();
+        const [page] = await dispatch(listeners, 'fetch', { request: { url: scope + '?utm=1', method: 'GET', mode: 'navigate' } });
+        const assets = await Promise.all(release.assets.map(async url => {
+            const [response] = await dispatch(listeners, 'fetch', { request: { url: scope + url, method: 'GET', mode: 'no-cors' } });
+            return await response.text();
+        }));
+        out.push({
+            installed, page: await page.text(), assets, network: log.splice(0),
+            cached: (await (await caches.open('cro-precache-v1')).keys()).map(r => r.url).sort()
+        });
+    }
+    process.stdout.write(JSON.stringify(out));
+})();
+'''
+
+
+def release_build(tmp_path, name, color):
+    src = tmp_path / f'{name}-src'
+    src.mkdir()
+    shutil.copy(os.path.join(ROOT, 'growisto-logo.png'), src)
+    (src / 'flowa-worker.js').write_text("self.onmessage = function(e) { self.postMessage(e.data); };\n")
+    (src / 'vendor').mkdir()
+    (src / 'vendor' / 'jszip.min.js').write_bytes(VENDOR_LIBRARY)
+    (src / 'vendor' / 'manifest.json').write_text(json.dumps({'https://cdn.example/jszip/3.10.1/jszip.min.js': {
+        'file': 'vendor/jszip.min.js', 'integrity': release.sri_hash(VENDOR_LIBRARY, 'sha512')}}))
+    out = tmp_path / name
+    report = release.release_page(PAGE % color, str(out), asset_dir=str(src))
+    return out, report
+
+
+def read_manifest(out, name='PRECACHE_MANIFEST'):
+    sw = (out / release.SERVICE_WORKER).read_text()
+    start = sw.index(name + '=') + len(name + '=')
+    return json.JSONDecoder().raw_decode(sw[start:])[0]
+
+
+def test_manifest_lists_every_fetched_file(tmp_path):
+    out, report = release_build(tmp_path, 'dist', 'red')
+    manifest = read_manifest(out)
+    vendored = [row['file'] for row in report if os.path.basename(row['file']).startswith('jszip.min.')]
+    assert len(vendored) == 1
+    written = sorted(row['file'] for row in report if row['file'] not in release.PRECACHE_SKIP)
+    assert [entry['url'] for entry in manifest] == sorted(set(written) - set(vendored))
+    # The vendored library is only cached once the page loads it
+    assert [entry['url'] for entry in read_manifest(out, 'LAZY_MANIFEST')] == vendored
+    assert 'index.html' in written and any(url.startswith('assets/app.') for url in written)
+    for entry in manifest:
+        assert entry['revision'] == release.content_hash((out / entry['url']).read_bytes())
+    assert "navigator.serviceWorker.register('sw.js')" in (out / 'index.html').read_text()
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_new_release_fetches_only_changed_entries(tmp_path):
+    releases = []
+    for name, color in (('v1', 'red'), ('v2', 'blue')):
+        out, _ = release_build(tmp_path, name, color)
+        manifest = read_manifest(out) + read_manifest(out, 'LAZY_MANIFEST')
+        releases.append({
+            'sw': (out / release.SERVICE_WORKER).read_text(),
+            'files': {entry['url']: (out / entry['url']).read_text(errors='replace') for entry in manifest},
+            'assets': [entry['url'] for entry in manifest if entry['url'] != 'index.html'],
+            'lazy': [entry['url'] for entry in read_manifest(out, 'LAZY_MANIFEST')],
+        })
+    runner = tmp_path / 'sw-runner.js'
+    data = tmp_path / 'releases.json'
+    runner.write_text(NODE_RUNNER)
+    data.write_text(json.dumps([SCOPE, releases]))
+    result = subprocess.run([NODE, str(runner), str(data)], capture_output=True, text=True, check=True)
+    first, second = json.loads(result.stdout)
+
+    lazy = releases[0]['lazy']
+    assert len(lazy) == 1 and lazy == releases[1]['lazy']
+    assert first['installed'] == sorted(set(releases[0]['files']) - set(lazy))
+    # Only the stylesheet changed, and with it the page that references it by hash
+    css = lambda r: next(url for url in r['files'] if url.startswith('assets/app.') and url.endswith('.css'))
+    assert second['installed'] == sorted([css(releases[1]), 'index.html'])
+    # The vendored library comes from the network once, then from the cache
+    assert first['network'] == lazy and second['network'] == []
+    for run, rel in zip((first, second), releases):
+        assert run['page'] == rel['files']['index.html']
+        assert run['assets'] == [rel['files'][url] for url in rel['assets']]
+        assert len(run['cached']) == len(rel['files'])
+    assert css(releases[0]) not in ' '.join(second['cached'])
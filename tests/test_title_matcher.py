@@ -0,0 +1,53 @@
+"""
+The compiled TITLE_ISSUE_MATCHER must return exactly what the per-entry
+includes() matcher returned: same issues, same order, same duplicates.
+"""
+
+import json
+import os
+import random
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+from benchmarks import title_matcher  # noqa: E402
+
+NODE = shutil.which('node')
+
+
+def page_html():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        return f.read()
+
+
+def adversarial_blocks(keywords, n, seed):
+    # Whole keywords, keyword prefixes/suffixes (partial trie walks), overlaps,
+    # mixed case and non-ASCII characters around them
+    rng = random.Random(seed)
+    pieces = keywords + [k[:rng.randint(1, len(k))] for k in keywords] + [k[rng.randint(0, len(k) - 1):] for k in keywords]
+    pieces += ['', ' ', '-', 'İ', 'K', 'é', '\n', 'ATC', 'Sticky']
+    return [rng.choice(['', ' ']).join(rng.choice(pieces) for _ in range(rng.randint(0, 30))) for _ in range(n)]
+
+
+def test_page_embeds_current_matcher():
+    html = page_html()
+    _, entries = build_v2.parse_title_issue_map(html)
+    data = json.dumps(build_v2.compile_title_matcher(entries), separators=(',', ':'))
+    assert 'var TITLE_ISSUE_MATCHER = ' + data + ';\n' in html
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_compiled_matcher_matches_reference():
+    html = page_html()
+    _, entries = build_v2.parse_title_issue_map(html)
+    keywords = sorted({k for kws, _ in entries for k in kws})
+    blocks = adversarial_blocks(keywords, 5000, seed=7) + title_matcher.synthetic_blocks(keywords, 50, seed=7)
+    out = title_matcher.run(html, blocks)
+    assert any(out['reference'])
+    for block, expected, actual in zip(blocks, out['reference'], out['compiled']):
+        assert actual == expected, repr(block)
@@ -0,0 +1,133 @@
+"""
+Batch builds of branded variants (build_v2.py --manifest). JSON and TOML
+manifests must describe the same variants with outputs relative to the
+manifest, invalid manifests and overrides must raise ValueError, every
+variant must find its Flow A worker script, and a rebuild with a worker
+pool must leave unchanged variants (and their mtimes) alone.
+"""
+
+import json
+import os
+import re
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_v2  # noqa: E402
+
+VARIANTS = [
+    {'name': 'pod-north', 'output': 'north/index.html', 'title': 'CRO Reach-Out Generator | North Pod',
+     'clientNames': ['Atomberg', 'Nobero'], 'scoringWeights': {'no_ga4': {'impactScore': 7}}},
+    {'name': 'pod-south', 'output': 'south/index.html', 'clientNames': ['Pilgrim']},
+]
+
+TOML = '''
+[[variants]]
+name = "pod-north"
+output = "north/index.html"
+title = "CRO Reach-Out Generator | North Pod"
+clientNames = ["Atomberg", "Nobero"]
+scoringWeights = { no_ga4 = { impactScore = 7 } }
+
+[[variants]]
+name = "pod-south"
+output = "south/index.html"
+clientNames = ["Pilgrim"]
+'''
+
+
+def page_html():
+    with open(os.path.join(ROOT, 'index.html'), 'r') as f:
+        return f.read()
+
+
+def worker_script(page_path):
+    # FLOWA_WORKER_SRC is resolved against the page's own URL
+    src = re.search(r"^const FLOWA_WORKER_SRC = '([^']+)';$", page_path.read_text(), re.M).group(1)
+    return page_path.parent / src
+
+
+def write_manifests(tmp_path):
+    json_path, toml_path = tmp_path / 'pods.json', tmp_path / 'pods.toml'
+    json_path.write_text(json.dumps({'variants': VARIANTS}))
+    toml_path.write_text(TOML)
+    return str(json_path), str(toml_path)
+
+
+def test_json_and_toml_manifests_agree(tmp_path):
+    json_path, toml_path = write_manifests(tmp_path)
+    variants = build_v2.load_manifest(json_path)
+    assert variants == build_v2.load_manifest(toml_path)
+    assert [v['output'] for v in variants] == [str(tmp_path / 'north' / 'index.html'),
+                                               str(tmp_path / 'south' / 'index.html')]
+
+
+@pytest.mark.parametrize('manifest, message', [
+    ({}, 'lists no variants'),
+    ({'variants': []}, 'lists no variants'),
+    ({'variants': [{'name': 'pod-north'}]}, "needs a 'name' and an 'output'"),
+    ({'variants': [{'output': 'x/index.html'}]}, "needs a 'name' and an 'output'"),
+])
+def test_invalid_manifest(tmp_path, manifest, message):
+    path = tmp_path / 'pods.json'
+    path.write_text(json.dumps(manifest))
+    with pytest.raises(ValueError, match=message):
+        build_v2.load_manifest(str(path))
+
+
+@pytest.mark.parametrize('weights, message', [
+    ({'no_such_finding': {'impactScore': 1}}, "unknown finding 'no_such_finding'"),
+    ({'no_ga4': {'label': 'x'}}, "cannot override 'label' of 'no_ga4'"),
+])
+def test_invalid_weights(weights, message):
+    with pytest.raises(ValueError, match=message):
+        build_v2.build_variant(page_html(), {'name': 'pod', 'output': 'x', 'scoringWeights': weights})
+
+
+def test_two_variants_with_two_workers(tmp_path, monkeypatch, capsys):
+    html = page_html()
+    template = tmp_path / 'index.html.v1.bak'
+    template.write_text('v1')
+    monkeypatch.setattr(build_v2, 'V1_PATH', str(template))
+    monkeypatch.setattr(build_v2, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(build_v2, 'cached_build', lambda template, cache, force=False, perf=False: html)
+    json_path, _ = write_manifests(tmp_path)
+    north, south = tmp_path / 'north' / 'index.html', tmp_path / 'south' / 'index.html'
+
+    build_v2.main(['--manifest', json_path, '--workers', '2'])
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split(':')[0].strip() for line in lines[:2]] == ['pod-north', 'pod-south']
+    assert all('(written)' in line for line in lines[:2]) and lines[2].startswith('2 variants built')
+
+    page = north.read_text()
+    assert '<title>CRO Reach-Out Generator | North Pod</title>' in page
+    assert 'const DEFAULT_CLIENT_NAMES = ["Atomberg", "Nobero"];' in page
+    assert build_v2.page_declaration(page, 'FINDING_REGISTRY').count('impactScore: 7,') == \
+        build_v2.page_declaration(html, 'FINDING_REGISTRY').count('impactScore: 7,') + 1
+    assert build_v2.V2_TITLE in south.read_text()
+    assert 'const DEFAULT_CLIENT_NAMES = ["Pilgrim"];' in south.read_text()
+    for path in (north, south):
+        assert worker_script(path).read_text() == build_v2.flowa_worker_js(path.read_text())
+
+    # Rebuilding the same manifest leaves every file untouched
+    for path in (north, south, worker_script(north), worker_script(south)):
+        os.utime(path, (1_000_000_000, 1_000_000_000))
+    build_v2.main(['--manifest', json_path, '--workers', '2'])
+    lines = capsys.readouterr().out.splitlines()
+    assert all('(unchanged)' in line for line in lines[:2])
+    assert north.stat().st_mtime == south.stat().st_mtime == 1_000_000_000
+    assert worker_script(north).stat().st_mtime == worker_script(south).stat().st_mtime == 1_000_000_000
+
+    # Changing one variant rewrites only that one
+    with open(json_path, 'r') as f:
+        variants = json.load(f)['variants']
+    variants[1]['clientNames'] = ['Pilgrim', 'OZiva']
+    with open(json_path, 'w') as f:
+        json.dump({'variants': variants}, f)
+    build_v2.main(['--manifest', json_path, '--workers', '2'])
+    lines = capsys.readouterr().out.splitlines()
+    assert '(unchanged)' in lines[0] and '(written)' in lines[1]
+    assert north.stat().st_mtime == 1_000_000_000 and south.stat().st_mtime != 1_000_000_000